@@ -14,11 +14,64 @@ COOKIE_HTTPONLY = os.getenv("COOKIE_HTTPONLY", "True").lower() == "true"
 DOWNLOADS_DIR = os.path.join(os.getcwd(), "downloads")
 CUTS_DIR = os.path.join(os.getcwd(), "cuts")
 TEMP_DIR = os.path.join(os.getcwd(), "temp")
+THUMBNAILS_DIR = os.path.join(os.getcwd(), "thumbnails")
+WATERMARKS_DIR = os.path.join(os.getcwd(), "watermarks")
+HLS_DIR = os.path.join(os.getcwd(), "hls")
+VIRTUAL_DIR = os.path.join(os.getcwd(), "virtual")
+SEGMENT_CACHE_DIR = os.path.join(os.getcwd(), "segment_cache")
+CUT_CACHE_DIR = os.path.join(os.getcwd(), "cut_cache")
 
 # Criar diretórios se não existirem
-for directory in [DOWNLOADS_DIR, CUTS_DIR, TEMP_DIR]:
+for directory in [DOWNLOADS_DIR, CUTS_DIR, TEMP_DIR, THUMBNAILS_DIR, WATERMARKS_DIR, HLS_DIR, VIRTUAL_DIR, SEGMENT_CACHE_DIR, CUT_CACHE_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+# Processos do pool que executa os cortes e concatenações
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", "2"))
+
+# Tamanho máximo (MB) dos cortes em cache, incluindo os arquivos entregues em CUTS_DIR (0 desativa o limite)
+CUT_CACHE_MAX_MB = int(os.getenv("CUT_CACHE_MAX_MB", "10240"))
+
+# Cache de segmentos recodificados (grade de N segundos alinhada aos keyframes) nos modos reencode e parallel
+CUT_SEGMENT_CACHE = os.getenv("CUT_SEGMENT_CACHE", "False").lower() == "true"
+CUT_SEGMENT_CACHE_MAX_MB = int(os.getenv("CUT_SEGMENT_CACHE_MAX_MB", "4096"))
+CUT_SEGMENT_SECONDS = float(os.getenv("CUT_SEGMENT_SECONDS", "10"))
+
+# Janela (segundos) em que cortes da mesma origem são reunidos em um único job (0 desativa) e tamanho máximo do lote
+CUT_BATCH_WINDOW = float(os.getenv("CUT_BATCH_WINDOW", "0"))
+CUT_BATCH_MAX_SIZE = int(os.getenv("CUT_BATCH_MAX_SIZE", "16"))
+
+# Download apenas do trecho usado em download-and-cut, com margem (segundos) em cada borda
+DOWNLOAD_SECTIONS = os.getenv("DOWNLOAD_SECTIONS", "True").lower() == "true"
+DOWNLOAD_SECTION_MARGIN = float(os.getenv("DOWNLOAD_SECTION_MARGIN", "5"))
+
+# Versão de trabalho (mezzanine) gerada após cada download, com keyframes a cada N segundos
+MEZZANINE_INGEST = os.getenv("MEZZANINE_INGEST", "False").lower() == "true"
+MEZZANINE_KEYFRAME_INTERVAL = float(os.getenv("MEZZANINE_KEYFRAME_INTERVAL", "1"))
+MEZZANINE_DIR = os.path.join(DOWNLOADS_DIR, "mezzanine")
+os.makedirs(MEZZANINE_DIR, exist_ok=True)
+
+# Transmissões simultâneas (cada uma com um ffmpeg próprio, fora do pool) antes de responder 503 (0 desativa o limite)
+STREAM_MAX_CONCURRENT = int(os.getenv("STREAM_MAX_CONCURRENT", "4"))
+
+# Duração alvo (segundos) dos segmentos HLS dos cortes (arredondada para o keyframe seguinte)
+HLS_SEGMENT_SECONDS = float(os.getenv("HLS_SEGMENT_SECONDS", "4"))
+
+# Largura (px) das miniaturas das sprite sheets
+THUMBNAIL_WIDTH = int(os.getenv("THUMBNAIL_WIDTH", "160"))
+
+# Detecção de cenas após o download (quadros/s e limiar da análise)
+SCENE_DETECTION = os.getenv("SCENE_DETECTION", "True").lower() == "true"
+SCENE_ANALYSIS_FPS = float(os.getenv("SCENE_ANALYSIS_FPS", "4"))
+SCENE_THRESHOLD = float(os.getenv("SCENE_THRESHOLD", "0.35"))
+
+# Análise de energia do áudio após o download (usada nos cortes com start_time="auto")
+AUDIO_ANALYSIS = os.getenv("AUDIO_ANALYSIS", "True").lower() == "true"
+
+# Diretório em memória (ex: /dev/shm) para os arquivos intermediários dos jobs (vazio desativa)
+TEMP_RAM_DIR = os.getenv("TEMP_RAM_DIR", "")
+# Memória (MB) que deve continuar livre ao usar o diretório em memória
+TEMP_RAM_RESERVE_MB = int(os.getenv("TEMP_RAM_RESERVE_MB", "1024"))
+
 # Configurações do banco de dados
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "3306")
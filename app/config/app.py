@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes.video_routes import router as video_router
+from app.routes.video_routes import router as video_router, video_controller
 from app.routes.health_routes import router as health_router
 from app.jobs.cookie_update_job import CookieUpdateJob
 
@@ -33,6 +33,16 @@ def create_app():
         cookie_job = CookieUpdateJob()
         cookie_job.start()
     
+    # Iniciar o pool de processos do motor de corte (pré-aquecido)
+    @app.on_event("startup")
+    def start_engine_pool():
+        video_controller.video_service.start_engine_pool()
+    
+    # Encerrar os processos do motor junto com a aplicação
+    @app.on_event("shutdown")
+    def stop_engine_pool():
+        video_controller.video_service.stop_engine_pool()
+    
     return app
 
 # Criar instância da aplicação
@@ -1,10 +1,12 @@
 from fastapi import HTTPException, Response, Request, Query
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
 import os
 from typing import Optional, Dict, Any, List, Union
 from app.services.video_service import VideoService
 from app.config import DOWNLOADS_DIR, CUTS_DIR
-from app.models.video_models import VideoDownloadRequest, VideoCutRequest, DownloadAndCutRequest
+from app.models.video_models import VideoDownloadRequest, VideoCutRequest, DownloadAndCutRequest, VideoConcatRequest, SilenceTrimRequest, PreviewRequest, VirtualMaterializeRequest
 
 class VideoController:
     """
@@ -53,7 +55,13 @@ class VideoController:
                 video_id=request.video_id,
                 start_time=request.start_time,
                 end_time=request.end_time,
-                output_filename=request.output_filename
+                output_filename=request.output_filename,
+                mode=request.mode,
+                ranges=[r.dict() for r in request.ranges] if request.ranges else None,
+                renditions=[r.dict() for r in request.renditions] if request.renditions else None,
+                transforms=[t.dict(exclude_none=True) for t in request.transforms] if request.transforms else None,
+                hls=request.hls,
+                virtual=request.virtual
             )
             
             # Se o status_code não for 200, lançar uma exceção HTTP
@@ -74,20 +82,100 @@ class VideoController:
         Endpoint para baixar e cortar vídeo em uma operação
         """
         try:
-            result = self.video_service.download_and_cut(
+            result, status_code = self.video_service.download_and_cut(
                 url=request.url,
                 start_time=request.start_time,
                 end_time=request.end_time,
                 filename=request.filename,
                 output_filename=request.output_filename,
                 cookies=request.cookies,
-                cookies_from_browser=request.cookies_from_browser
+                cookies_from_browser=request.cookies_from_browser,
+                mode=request.mode
+            )
+            
+            # Se o status_code não for 200, lançar uma exceção HTTP
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            return result
+            
+        except HTTPException as e:
+            # Repassar exceções HTTP
+            raise e
+        except Exception as e:
+            # Converter outras exceções em HTTPException
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def concat_videos(self, request: VideoConcatRequest):
+        """
+        Endpoint para concatenar cortes e vídeos
+        """
+        try:
+            # O método concat_videos retorna (resultado, status_code)
+            result, status_code = self.video_service.concat_videos(
+                inputs=[item.dict() for item in request.inputs],
+                output_filename=request.output_filename
+            )
+            
+            # Se o status_code não for 200, lançar uma exceção HTTP
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+                
+            return result
+            
+        except HTTPException as e:
+            # Repassar exceções HTTP
+            raise e
+        except Exception as e:
+            # Converter outras exceções em HTTPException
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def silence_trim(self, request: SilenceTrimRequest):
+        """
+        Endpoint para remover os silêncios de um vídeo
+        """
+        try:
+            # O método silence_trim retorna (resultado, status_code)
+            result, status_code = self.video_service.silence_trim(
+                video_id=request.video_id,
+                output_filename=request.output_filename,
+                threshold_db=request.threshold_db,
+                min_silence=request.min_silence,
+                padding=request.padding
+            )
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+                
+            return result
+            
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def create_preview(self, request: PreviewRequest):
+        """
+        Endpoint para gerar a prévia animada de um corte
+        """
+        try:
+            # O método create_preview retorna (resultado, status_code)
+            result, status_code = self.video_service.create_preview(
+                filename=request.filename,
+                fmt=request.format,
+                max_width=request.max_width,
+                max_fps=request.max_fps,
+                output_filename=request.output_filename
             )
             
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+                
             return result
             
+        except HTTPException as e:
+            raise e
         except Exception as e:
-            # Converter exceções em HTTPException
             raise HTTPException(status_code=500, detail={'error': str(e)})
     
     def get_task_status(self, task_id: str):
@@ -108,6 +196,27 @@ class VideoController:
         except Exception as e:
             raise HTTPException(status_code=500, detail={'error': str(e)})
     
+    def cancel_task(self, task_id: str):
+        """
+        Endpoint para cancelar uma tarefa
+        """
+        try:
+            # O método cancel_task retorna (resultado, status_code)
+            result, status_code = self.video_service.cancel_task(task_id)
+            
+            # Se o status_code não for 200, lançar uma exceção HTTP
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+                
+            return result
+            
+        except HTTPException as e:
+            # Repassar exceções HTTP
+            raise e
+        except Exception as e:
+            # Converter outras exceções em HTTPException
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
     def get_all_tasks(self):
         """
         Endpoint para listar todas as tarefas
@@ -175,12 +284,14 @@ class VideoController:
             # Listar arquivos na pasta de downloads
             download_files = []
             if os.path.exists(DOWNLOADS_DIR):
-                download_files = [f for f in os.listdir(DOWNLOADS_DIR) if os.path.isfile(os.path.join(DOWNLOADS_DIR, f))]
+                # Arquivos ocultos (ex: índices de keyframes) não são listados
+                download_files = [f for f in os.listdir(DOWNLOADS_DIR) if os.path.isfile(os.path.join(DOWNLOADS_DIR, f)) and not f.startswith('.')]
             
             # Listar arquivos na pasta de cortes
             cut_files = []
             if os.path.exists(CUTS_DIR):
-                cut_files = [f for f in os.listdir(CUTS_DIR) if os.path.isfile(os.path.join(CUTS_DIR, f))]
+                # Arquivos ocultos (ex: índice do cache de cortes) não são listados
+                cut_files = [f for f in os.listdir(CUTS_DIR) if os.path.isfile(os.path.join(CUTS_DIR, f)) and not f.startswith('.')]
             
             return {
                 'downloads': download_files,
@@ -190,6 +301,206 @@ class VideoController:
         except Exception as e:
             raise HTTPException(status_code=500, detail={'error': str(e)})
             
+    def get_thumbnails(self, video_id: str, interval: float):
+        """
+        Endpoint para obter as miniaturas de um vídeo
+        """
+        try:
+            # O método get_thumbnails retorna (resultado, status_code)
+            result, status_code = self.video_service.get_thumbnails(video_id, interval)
+            
+            if status_code >= 400:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            # 202: miniaturas ainda em geração
+            return JSONResponse(status_code=status_code, content=result)
+            
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_scenes(self, video_id: str):
+        """
+        Endpoint para obter os pontos de corte candidatos (mudanças de cena) de um vídeo
+        """
+        try:
+            # O método get_scenes retorna (resultado, status_code)
+            result, status_code = self.video_service.get_scenes(video_id)
+            
+            if status_code >= 400:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            # 202: cenas ainda em análise
+            return JSONResponse(status_code=status_code, content=result)
+            
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_thumbnail_file(self, video_id: str, interval: str, filename: str):
+        """
+        Endpoint para baixar uma sprite sheet ou índice de miniaturas
+        """
+        try:
+            result, status_code = self.video_service.get_thumbnail_file(video_id, interval, filename)
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            media_types = {'.jpg': 'image/jpeg', '.vtt': 'text/vtt', '.json': 'application/json'}
+            media_type = media_types.get(os.path.splitext(filename)[1], 'application/octet-stream')
+            return FileResponse(path=result, media_type=media_type)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_hls(self, filename: str):
+        """
+        Endpoint para obter o pacote HLS de um corte
+        """
+        try:
+            # O método get_hls retorna (resultado, status_code)
+            result, status_code = self.video_service.get_hls(filename)
+            
+            if status_code >= 400:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            # 202: pacote ainda em geração
+            return JSONResponse(status_code=status_code, content=result)
+            
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_hls_file(self, filename: str, name: str):
+        """
+        Endpoint para baixar a playlist ou um segmento do pacote HLS de um corte
+        """
+        try:
+            result, status_code = self.video_service.get_hls_file(filename, name)
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            media_types = {'.m3u8': 'application/vnd.apple.mpegurl', '.m4s': 'video/iso.segment', '.mp4': 'video/mp4', '.json': 'application/json'}
+            media_type = media_types.get(os.path.splitext(name)[1], 'application/octet-stream')
+            return FileResponse(path=result, media_type=media_type)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def _stream_response(self, stream, media_type: str, description: str):
+        """
+        Resposta com a saída de uma transmissão do ffmpeg (FFmpegStream), enviada enquanto é gerada
+        """
+        async def body():
+            # O ffmpeg só é iniciado quando a resposta começa a ser enviada; a leitura
+            # bloqueante roda em uma thread e, se o cliente desconectar, a resposta é
+            # cancelada e o ffmpeg encerrado no finally
+            try:
+                await run_in_threadpool(stream.start)
+                while True:
+                    chunk = await run_in_threadpool(stream.read)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                stream.close()
+                if stream.error:
+                    print(f"Erro na transmissão ({description}): {stream.error}")
+        
+        # close() também ao final da resposta, caso o corpo nunca tenha sido lido (libera a vaga)
+        return StreamingResponse(body(), media_type=media_type, background=BackgroundTask(stream.close))
+    
+    def stream_cut(self, video_id: str, start: str, end: str, mode: str):
+        """
+        Endpoint para transmitir um corte enquanto é gerado (MP4 fragmentado), sem gravar arquivo
+        """
+        try:
+            result, status_code = self.video_service.stream_cut(video_id, start, end, mode)
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            return self._stream_response(result, 'video/mp4', f"corte do vídeo {video_id}")
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_virtual_clip(self, clip_id: str):
+        """
+        Endpoint para obter as informações de um corte virtual
+        """
+        try:
+            result, status_code = self.video_service.get_virtual_clip(clip_id)
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            return result
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_virtual_playlist(self, clip_id: str):
+        """
+        Endpoint para obter a playlist HLS de um corte virtual
+        """
+        try:
+            result, status_code = self.video_service.get_virtual_playlist(clip_id)
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            return Response(content=result, media_type='application/vnd.apple.mpegurl')
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def get_virtual_segment(self, clip_id: str, number: int):
+        """
+        Endpoint para ler um segmento de um corte virtual diretamente da origem
+        """
+        try:
+            result, status_code = self.video_service.get_virtual_segment(clip_id, number)
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            return self._stream_response(result, 'video/mp2t', f"segmento {number} do corte virtual {clip_id}")
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
+    def materialize_virtual_clip(self, clip_id: str, request: Optional[VirtualMaterializeRequest] = None):
+        """
+        Endpoint para gerar o arquivo de um corte virtual
+        """
+        try:
+            result, status_code = self.video_service.materialize_virtual_clip(
+                clip_id,
+                output_filename=request.output_filename if request else None,
+                mode=request.mode if request else None
+            )
+            
+            if status_code != 200:
+                raise HTTPException(status_code=status_code, detail=result)
+            
+            return result
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise HTTPException(status_code=500, detail={'error': str(e)})
+    
     def download_file(self, file_type: str, filename: str):
         """
         Endpoint para baixar um arquivo
@@ -0,0 +1,48 @@
+# Inicialização do pacote engine
+from app.engine.errors import EngineError, FFmpegError, MediaParseError, JobCancelled
+from app.engine.ffmpeg import media_info
+from app.engine.cutter import CUT_MODES, validate_range, cut, cut_copy, cut_reencode, cut_smart, cut_parallel, cut_multiple, cut_renditions, cut_transforms, cut_cached_segments
+from app.engine.keyframe_index import KeyframeIndex, build_index, load_index, save_index, get_or_build_index
+from app.engine.concat import concat_videos, plan_concat
+from app.engine.parallel_encode import parallel_encode, plan_chunks
+from app.engine.segment_cache import SEGMENT_CACHE_MODES, plan_segments, cut_segmented
+from app.engine.renditions import RENDITION_CONTAINERS, normalize_rendition, render_ladder
+from app.engine.thumbnails import generate_thumbnails, load_thumbnails
+from app.engine.scenes import detect_scenes
+from app.engine.audio import analyze_audio, pick_highlight
+from app.engine.silence import detect_silences, plan_kept_segments, silence_trim
+from app.engine.transforms import TRANSFORM_TYPES, normalize_transform, build_transform_graph
+from app.engine.hls import package_hls, load_hls
+from app.engine.streaming import STREAM_MODES, FFmpegStream, StreamingCut
+from app.engine.virtual import plan_virtual_clip, virtual_clip_matches, virtual_playlist, stream_virtual_segment
+from app.engine.mezzanine import transcode_mezzanine
+from app.engine.preview import PREVIEW_FORMATS, PREVIEW_MAX_WIDTH, PREVIEW_MAX_FPS, render_preview
+from app.engine.progress import ProgressMeter, ChunkProgress, progress_reporter
+from app.engine.cache import LRUFileCache, content_hash, known_content_hash, file_identity, cache_key, link_file
+from app.engine.jobs import JOB_TYPES, parse_time, format_time, run_job
+from app.engine.pool import EnginePool
+from app.engine.workspace import Workspace
+
+# Exportar classes e funções
+__all__ = [
+    'EngineError', 'FFmpegError', 'MediaParseError', 'JobCancelled',
+    'media_info',
+    'CUT_MODES', 'validate_range', 'cut', 'cut_copy', 'cut_reencode', 'cut_smart', 'cut_parallel', 'cut_multiple', 'cut_renditions', 'cut_transforms', 'cut_cached_segments',
+    'KeyframeIndex', 'build_index', 'load_index', 'save_index', 'get_or_build_index',
+    'concat_videos', 'plan_concat',
+    'parallel_encode', 'plan_chunks',
+    'SEGMENT_CACHE_MODES', 'plan_segments', 'cut_segmented',
+    'RENDITION_CONTAINERS', 'normalize_rendition', 'render_ladder',
+    'generate_thumbnails', 'load_thumbnails',
+    'detect_scenes', 'analyze_audio', 'pick_highlight',
+    'detect_silences', 'plan_kept_segments', 'silence_trim',
+    'TRANSFORM_TYPES', 'normalize_transform', 'build_transform_graph',
+    'package_hls', 'load_hls',
+    'STREAM_MODES', 'FFmpegStream', 'StreamingCut',
+    'plan_virtual_clip', 'virtual_clip_matches', 'virtual_playlist', 'stream_virtual_segment',
+    'transcode_mezzanine',
+    'PREVIEW_FORMATS', 'PREVIEW_MAX_WIDTH', 'PREVIEW_MAX_FPS', 'render_preview',
+    'ProgressMeter', 'ChunkProgress', 'progress_reporter',
+    'LRUFileCache', 'content_hash', 'known_content_hash', 'file_identity', 'cache_key', 'link_file',
+    'JOB_TYPES', 'parse_time', 'format_time', 'run_job', 'EnginePool', 'Workspace'
+]
@@ -0,0 +1,175 @@
+import numpy as np
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import iter_ffmpeg_output, probe, get_stream, get_duration
+
+# Versão do formato das características de áudio (incrementar ao mudar a estrutura)
+AUDIO_FEATURES_VERSION = 1
+
+# Nível mínimo (dB) registrado, usado no lugar do silêncio absoluto (-inf)
+SILENCE_FLOOR_DB = -100.0
+
+# Bytes por amostra do PCM lido do ffmpeg (float 32 bits, mono)
+SAMPLE_BYTES = 4
+
+
+def energy_to_db(energy):
+    """
+    Converte energia média (amplitude ao quadrado) para decibéis em relação ao fundo de escala
+    """
+    return np.maximum(10 * np.log10(np.maximum(energy, 1e-12)), SILENCE_FLOOR_DB)
+
+
+def iter_pcm_blocks(input_path, sample_rate, block_samples):
+    """
+    Lê a primeira stream de áudio de um arquivo como PCM mono em blocos de tamanho fixo
+
+    Args:
+        input_path: Arquivo de mídia
+        sample_rate: Taxa de amostragem do PCM
+        block_samples: Amostras por bloco (o último pode ser menor)
+
+    Yields:
+        numpy.ndarray: Amostras float32 entre -1 e 1
+    """
+    pending = b''
+    for chunk in iter_ffmpeg_output([
+        '-i', input_path,
+        '-map', '0:a:0', '-vn', '-sn',
+        '-ac', '1', '-ar', str(sample_rate),
+        '-f', 'f32le', '-acodec', 'pcm_f32le',
+        'pipe:1'
+    ], block_samples * SAMPLE_BYTES):
+        data = pending + chunk
+        usable = len(data) - len(data) % SAMPLE_BYTES
+        pending = data[usable:]
+        if usable:
+            yield np.frombuffer(data, dtype=np.float32, count=usable // SAMPLE_BYTES)
+
+
+def analyze_audio(input_path, sample_rate=8000, hop_ms=50, block_seconds=30, log=None, progress=None):
+    """
+    Calcula as características de energia do áudio de um vídeo, segundo a segundo
+
+    O áudio é lido como PCM em blocos de block_seconds (memória constante, qualquer
+    que seja a duração). Cada bloco é dividido em janelas de hop_ms e, com operações
+    vetorizadas do NumPy, são calculados por segundo:
+        rms_db: nível RMS em dB (fundo de escala)
+        onset: força de ataques, média da variação positiva da energia (dB) entre janelas
+
+    Args:
+        input_path: Arquivo de vídeo
+        sample_rate: Taxa de amostragem usada na análise
+        hop_ms: Duração de cada janela de energia em milissegundos
+        block_seconds: Segundos de áudio processados por bloco
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o percentual (0-100) concluído (opcional)
+
+    Returns:
+        dict: Características por segundo ('rms_db', 'onset') e parâmetros da análise
+    """
+    hop = int(sample_rate * hop_ms / 1000)
+    if hop <= 0 or sample_rate % hop:
+        raise EngineError("A janela de análise deve dividir um segundo em partes iguais")
+    hops_per_second = sample_rate // hop
+
+    info = probe(input_path)
+    if get_stream(info, 'audio') is None:
+        raise EngineError(f"Nenhuma stream de áudio encontrada em {input_path}")
+    duration = get_duration(input_path)
+
+    if log:
+        log(f"Analisando áudio em janelas de {hop_ms} ms")
+
+    rms_db = []
+    onset = []
+    previous_db = None
+    pending = np.empty(0, dtype=np.float32)
+    samples_read = 0
+
+    def append(energy):
+        nonlocal previous_db
+        hop_db = energy_to_db(energy)
+        flat = hop_db.ravel()
+        # Variação de energia entre janelas, incluindo a fronteira com o bloco anterior
+        first = previous_db if previous_db is not None else flat[0]
+        rises = np.maximum(np.diff(flat, prepend=first), 0).reshape(hop_db.shape)
+        previous_db = flat[-1]
+
+        rms_db.extend(np.round(energy_to_db(energy.mean(axis=1)), 2).tolist())
+        onset.extend(np.round(rises.mean(axis=1), 3).tolist())
+
+    def process(samples, final=False):
+        seconds = len(samples) // sample_rate
+        if seconds:
+            energy = np.square(samples[:seconds * sample_rate], dtype=np.float64).reshape(seconds, hops_per_second, hop).mean(axis=2)
+            append(energy)
+        rest = samples[seconds * sample_rate:]
+        if final and len(rest) >= hop:
+            # Último segundo incompleto: apenas as janelas completas
+            hops = len(rest) // hop
+            energy = np.square(rest[:hops * hop], dtype=np.float64).reshape(1, hops, hop).mean(axis=2)
+            append(energy)
+            rest = rest[:0]
+        return rest
+
+    for block in iter_pcm_blocks(input_path, sample_rate, block_seconds * sample_rate):
+        samples_read += len(block)
+        pending = process(np.concatenate([pending, block]) if len(pending) else block)
+        if progress and duration:
+            progress(round(min(samples_read / sample_rate / duration, 1.0) * 100, 2))
+
+    process(pending, final=True)
+
+    if not rms_db:
+        raise EngineError(f"Nenhum áudio decodificado de {input_path}")
+
+    if log:
+        log(f"Características de áudio calculadas para {len(rms_db)} segundo(s)")
+
+    return {
+        'version': AUDIO_FEATURES_VERSION,
+        'sample_rate': sample_rate,
+        'hop_ms': hop_ms,
+        'duration': samples_read / sample_rate,
+        'seconds': len(rms_db),
+        'rms_db': rms_db,
+        'onset': onset,
+    }
+
+
+def pick_highlight(features, length):
+    """
+    Escolhe o trecho mais intenso do áudio com a duração informada
+
+    Cada segundo recebe a soma do nível RMS e da força de ataques, ambos
+    padronizados (z-score); o trecho escolhido é o de maior soma, calculada para
+    todas as posições com uma soma acumulada.
+
+    Args:
+        features: Características calculadas por analyze_audio
+        length: Duração do trecho em segundos
+
+    Returns:
+        tuple: (início, fim) do trecho em segundos
+    """
+    if length <= 0:
+        raise EngineError("A duração do trecho deve ser maior que zero")
+
+    duration = features.get('duration') or features['seconds']
+    rms = np.asarray(features['rms_db'], dtype=np.float64)
+    onset = np.asarray(features['onset'], dtype=np.float64)
+
+    window = int(np.ceil(length))
+    if window >= len(rms):
+        return 0.0, min(float(length), duration)
+
+    def standardize(values):
+        deviation = values.std()
+        return (values - values.mean()) / deviation if deviation > 0 else np.zeros_like(values)
+
+    score = standardize(rms) + standardize(onset)
+    sums = np.cumsum(np.concatenate([[0.0], score]))
+    window_scores = sums[window:] - sums[:-window]
+    start = float(np.argmax(window_scores))
+
+    return start, min(start + length, duration)
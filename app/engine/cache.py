@@ -0,0 +1,455 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sem trava entre processos, apenas entre threads
+    fcntl = None
+
+# Sufixo do arquivo oculto com o hash de conteúdo de um arquivo (ex: .video.mp4.sha256.json)
+HASH_SUFFIX = '.sha256.json'
+
+# Tamanho dos blocos lidos ao calcular o hash
+HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def _hash_path_for(path):
+    """
+    Obtém o caminho do arquivo com o hash de conteúdo de um arquivo
+    """
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f'.{filename}{HASH_SUFFIX}')
+
+
+def known_content_hash(path):
+    """
+    Obtém o SHA-256 já calculado de um arquivo, sem ler o conteúdo
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        str: Hash em hexadecimal ou None se ainda não calculado (ou se o arquivo mudou)
+    """
+    stat = os.stat(path)
+
+    try:
+        with open(_hash_path_for(path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('size') == stat.st_size and data.get('mtime') == stat.st_mtime:
+            return data['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    return None
+
+
+def file_identity(path):
+    """
+    Identifica o conteúdo de um arquivo para chaves de cache, sem ler o conteúdo
+
+    Usa o SHA-256 quando já calculado; caso contrário, o caminho real, o tamanho
+    e a data de modificação (o arquivo não é lido).
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        tuple: (identidade, True se for o hash do conteúdo)
+    """
+    sha256 = known_content_hash(path)
+    if sha256:
+        return sha256, True
+
+    stat = os.stat(path)
+    return f'stat:{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}', False
+
+
+def content_hash(path):
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, guardando o resultado ao lado dele
+
+    O hash é recalculado apenas se o tamanho ou a data de modificação mudarem.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        str: Hash em hexadecimal
+    """
+    sha256 = known_content_hash(path)
+    if sha256:
+        return sha256
+
+    stat = os.stat(path)
+    hash_path = _hash_path_for(path)
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+
+    try:
+        with open(f'{hash_path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': sha256}, f)
+        os.replace(f'{hash_path}.tmp', hash_path)
+    except OSError:
+        # Sem permissão de escrita: o hash continua válido nesta chamada
+        pass
+
+    return sha256
+
+
+def cache_key(*parts):
+    """
+    Monta a chave de cache de um resultado a partir dos parâmetros que o definem
+
+    Args:
+        parts: Valores serializáveis em JSON (ex: hash da origem, tempos, perfil)
+
+    Returns:
+        str: Chave em hexadecimal
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def link_file(source, target):
+    """
+    Cria target com o conteúdo de source, sem copiar os dados quando possível
+
+    Usa um link físico (os dois caminhos passam a ser o mesmo arquivo, e remover
+    um deles não afeta o outro); em sistemas de arquivos sem suporte, ou entre
+    dispositivos, o arquivo é copiado. Um target existente é substituído de
+    forma atômica.
+
+    Args:
+        source: Arquivo existente
+        target: Caminho a criar
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return
+
+    temp_path = os.path.join(os.path.dirname(target), f'.{os.path.basename(target)}.link.tmp')
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, target)
+
+
+class LRUFileCache:
+    """
+    Cache de arquivos gerados em um diretório, limitado por tamanho
+
+    Cada entrada associa uma chave a um arquivo do diretório e aos links físicos
+    desse arquivo entregues fora dele (ver add_link). O índice fica em um arquivo
+    oculto no próprio diretório; quando o total ultrapassa o limite, os arquivos
+    usados há mais tempo são removidos junto com os seus links, liberando o espaço.
+
+    Vários processos podem usar o mesmo diretório (ex: os processos do pool do
+    motor): cada operação trava um arquivo ao lado do índice e relê o índice se
+    outro processo o alterou.
+    """
+
+    def __init__(self, directory, max_bytes, index_name='.cache_index.json'):
+        """
+        Inicializa o cache e carrega o índice existente
+
+        Args:
+            directory: Diretório dos arquivos
+            max_bytes: Tamanho máximo somado dos arquivos do cache (0 desativa o limite)
+            index_name: Nome do arquivo de índice dentro do diretório
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, index_name)
+        self.lock_path = f'{self.index_path}.lock'
+        self._lock = threading.Lock()
+        self._index_stat = None
+        self.entries = {}
+        self._refresh()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Trava o índice para esta thread e para os demais processos, com o índice atualizado
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.lock_path, 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # A trava é liberada ao fechar o arquivo
+                self._refresh()
+                yield
+
+    def _refresh(self):
+        """
+        Relê o índice se ele foi gravado por outro processo desde a última leitura
+        """
+        try:
+            stat = os.stat(self.index_path)
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signature = None
+
+        if signature != self._index_stat:
+            self.entries = self._load()
+            self._index_stat = signature
+
+    def _load(self):
+        """
+        Carrega o índice, descartando entradas cujos arquivos não existem mais
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        return {
+            key: entry for key, entry in entries.items()
+            if os.path.isfile(os.path.join(self.directory, entry.get('filename', '')))
+        }
+
+    def _save(self):
+        """
+        Grava o índice (escrita atômica)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f'{self.index_path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(f'{self.index_path}.tmp', self.index_path)
+
+        stat = os.stat(self.index_path)
+        self._index_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def get(self, key):
+        """
+        Busca um arquivo no cache, marcando-o como usado
+
+        Args:
+            key: Chave do resultado
+
+        Returns:
+            str: Caminho do arquivo ou None se não estiver no cache
+        """
+        with self._locked():
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            path = os.path.join(self.directory, entry['filename'])
+            if not self._entry_valid(entry, path):
+                del self.entries[key]
+                self._save()
+                return None
+
+            entry['last_access'] = time.time()
+            self._save()
+            return path
+
+    def checkout(self, key, target):
+        """
+        Entrega o arquivo de uma entrada em target, marcando-o como usado
+
+        O arquivo é entregue (link físico quando possível, ver link_file) com o
+        índice travado: a remoção da entrada depois disso, inclusive por outro
+        processo, não afeta target.
+
+        Args:
+            key: Chave do resultado
+            target: Caminho a criar
+
+        Returns:
+            bool: True se o arquivo foi entregue, False se não estiver no cache
+        """
+        with self._locked():
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+
+            path = os.path.join(self.directory, entry['filename'])
+            if not self._entry_valid(entry, path):
+                del self.entries[key]
+                self._save()
+                return False
+
+            link_file(path, target)
+            entry['last_access'] = time.time()
+            self._save()
+            return True
+
+    def put(self, key, path, **meta):
+        """
+        Registra um arquivo gerado e remove os menos usados se o limite for ultrapassado
+
+        Args:
+            key: Chave do resultado
+            path: Caminho do arquivo (dentro do diretório do cache)
+            meta: Informações adicionais guardadas na entrada
+
+        Returns:
+            list: Caminhos dos arquivos removidos para respeitar o limite
+        """
+        filename = os.path.basename(path)
+        with self._locked():
+            # Um arquivo só pode pertencer a uma entrada
+            for other in [k for k, entry in self.entries.items() if entry['filename'] == filename]:
+                del self.entries[other]
+
+            stat = os.stat(path)
+            self.entries[key] = {
+                'filename': filename,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'inode': [stat.st_dev, stat.st_ino],
+                'links': [],
+                'last_access': time.time(),
+                **meta
+            }
+            removed = self._evict(keep=key)
+            self._save()
+        return removed
+
+    def store(self, key, path, **meta):
+        """
+        Guarda no cache um arquivo gerado fora do diretório
+
+        A cópia (um link físico quando possível, ver link_file) recebe o nome da
+        chave e o arquivo original é registrado como link da entrada: a remoção
+        pelo limite de tamanho apaga os dois.
+
+        Args:
+            key: Chave do resultado
+            path: Caminho do arquivo gerado
+            meta: Informações adicionais guardadas na entrada
+
+        Returns:
+            list: Caminhos dos arquivos removidos para respeitar o limite
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        cached_path = os.path.join(self.directory, f'{key}{os.path.splitext(path)[1]}')
+        link_file(path, cached_path)
+        removed = self.put(key, cached_path, **meta)
+        self.add_link(key, path)
+        return removed
+
+    def add_link(self, key, path):
+        """
+        Registra um arquivo entregue a partir de uma entrada (ex: link_file da cópia do cache)
+
+        O arquivo é removido junto com a entrada, se ainda for o mesmo arquivo
+        (mesmo inode) nesse momento; um arquivo regravado no lugar é mantido.
+
+        Args:
+            key: Chave da entrada
+            path: Caminho do arquivo entregue
+        """
+        with self._locked():
+            entry = self.entries.get(key)
+            if entry is None or not self._same_inode(entry, path):
+                return
+            links = entry.setdefault('links', [])
+            if path not in links:
+                links.append(path)
+                self._save()
+
+    def discard_file(self, path):
+        """
+        Remove do índice as entradas de um arquivo (ex: antes de sobrescrevê-lo)
+
+        Args:
+            path: Caminho do arquivo
+        """
+        filename = os.path.basename(path)
+        with self._locked():
+            keys = [key for key, entry in self.entries.items() if entry['filename'] == filename]
+            for key in keys:
+                del self.entries[key]
+            if keys:
+                self._save()
+
+    def total_bytes(self):
+        """
+        Obtém o tamanho somado dos arquivos do cache
+        """
+        with self._locked():
+            return sum(entry['size'] for entry in self.entries.values())
+
+    @staticmethod
+    def _same_inode(entry, path):
+        """
+        Verifica se um caminho ainda é um link físico do arquivo de uma entrada
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return entry.get('inode') == [stat.st_dev, stat.st_ino]
+
+    def _entry_valid(self, entry, path):
+        """
+        Verifica se o arquivo de uma entrada existe e não foi alterado desde que foi guardado
+
+        Um link físico do arquivo regravado no lugar (ex: um corte com o mesmo nome)
+        altera também a cópia do cache; o tamanho e a data de modificação detectam isso.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        if stat.st_size != entry['size']:
+            return False
+        return entry.get('mtime') is None or stat.st_mtime == entry['mtime']
+
+    def _evict(self, keep=None):
+        """
+        Remove os arquivos usados há mais tempo até o total caber no limite
+
+        Cada entrada conta uma vez o tamanho do seu arquivo; ele só deixa de
+        ocupar espaço quando todos os links registrados também são removidos.
+        """
+        if not self.max_bytes:
+            return []
+
+        total = sum(entry['size'] for entry in self.entries.values())
+        removed = []
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+
+            path = os.path.join(self.directory, entry['filename'])
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                continue
+
+            del self.entries[key]
+            total -= entry['size']
+            removed.append(path)
+
+            for link in entry.get('links', []):
+                if not self._same_inode(entry, link):
+                    continue
+                try:
+                    os.remove(link)
+                    removed.append(link)
+                except OSError:
+                    pass
+
+        return removed
@@ -0,0 +1,250 @@
+import os
+import shutil
+import tempfile
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import (
+    run_ffmpeg, probe, get_stream, matching_encoder_args,
+    concat_files, MATCHING_ENCODERS
+)
+
+# Codificadores usados para converter o áudio das entradas fora do padrão
+AUDIO_ENCODERS = {
+    'aac': 'aac',
+    'mp3': 'libmp3lame',
+}
+
+
+def _video_signature(stream):
+    """
+    Parâmetros de vídeo que precisam ser iguais para concatenar sem recodificar
+    """
+    if stream is None:
+        return None
+    sample_aspect_ratio = stream.get('sample_aspect_ratio')
+    if sample_aspect_ratio in (None, '0:1', 'N/A'):
+        sample_aspect_ratio = '1:1'
+    return (
+        stream.get('codec_name'),
+        stream.get('profile'),
+        stream.get('width'),
+        stream.get('height'),
+        stream.get('pix_fmt'),
+        stream.get('r_frame_rate'),
+        sample_aspect_ratio,
+    )
+
+
+def _audio_signature(stream):
+    """
+    Parâmetros de áudio que precisam ser iguais para concatenar sem recodificar
+    """
+    if stream is None:
+        return None
+    return (
+        stream.get('codec_name'),
+        str(stream.get('sample_rate')),
+        stream.get('channels'),
+    )
+
+
+def _can_encode(video_stream, audio_stream):
+    """
+    Verifica se é possível gerar novas entradas com os parâmetros informados
+    """
+    if video_stream is None or video_stream.get('codec_name') not in MATCHING_ENCODERS:
+        return False
+    return audio_stream is None or audio_stream.get('codec_name') in AUDIO_ENCODERS
+
+
+def _choose_target(entries):
+    """
+    Escolhe os parâmetros de referência da concatenação
+
+    A referência é o conjunto de parâmetros que cobre a maior duração somada,
+    de forma a recodificar o mínimo possível. Se houver entradas fora do padrão,
+    a referência precisa ter codecs que possam ser gerados pelos codificadores.
+    """
+    weights = {}
+    for entry in entries:
+        key = (entry['video_signature'], entry['audio_signature'])
+        weights[key] = weights.get(key, 0.0) + (entry['duration'] or 0.0)
+
+    candidates = sorted(weights, key=lambda key: weights[key], reverse=True)
+    by_key = {}
+    for entry in entries:
+        by_key.setdefault((entry['video_signature'], entry['audio_signature']), entry)
+
+    # Todas as entradas iguais: nada a recodificar
+    if len(candidates) == 1:
+        return by_key[candidates[0]]
+
+    for key in candidates:
+        entry = by_key[key]
+        if _can_encode(entry['video'], entry['audio']):
+            return entry
+
+    raise EngineError("As entradas têm parâmetros diferentes e nenhuma usa um codec que possa ser recodificado (h264/hevc com aac/mp3)")
+
+
+def _conforms(entry, target):
+    """
+    Verifica se uma entrada pode ser copiada para a concatenação
+    """
+    if entry['video_signature'] != target['video_signature']:
+        return False
+    # Sem áudio na referência, o áudio das entradas é apenas descartado
+    if target['audio'] is None:
+        return True
+    return entry['audio_signature'] == target['audio_signature']
+
+
+def _channel_layout(audio_stream):
+    """
+    Obtém o layout de canais de uma stream de áudio para o anullsrc
+    """
+    layout = audio_stream.get('channel_layout')
+    if layout:
+        return layout
+    return {1: 'mono', 2: 'stereo'}.get(audio_stream.get('channels'), 'stereo')
+
+
+def _copy_input(entry, part_path, target):
+    """
+    Remultiplexa uma entrada compatível em MPEG-TS, sem recodificar
+    """
+    args = ['-i', entry['path'], '-map', '0:v:0']
+    if target['audio'] is not None:
+        args += ['-map', '0:a:0']
+    else:
+        args += ['-an']
+    run_ffmpeg(args + ['-c', 'copy', '-f', 'mpegts', part_path])
+
+
+def _transcode_input(entry, part_path, target):
+    """
+    Recodifica uma entrada fora do padrão com os parâmetros da referência
+
+    O vídeo é redimensionado (com bordas, mantendo a proporção) para a resolução
+    da referência. Entradas sem áudio recebem silêncio quando a referência tem áudio.
+    """
+    video = target['video']
+    audio = target['audio']
+
+    sample_aspect_ratio = target['video_signature'][6].replace(':', '/')
+    filters = (
+        f"scale={video['width']}:{video['height']}:force_original_aspect_ratio=decrease,"
+        f"pad={video['width']}:{video['height']}:(ow-iw)/2:(oh-ih)/2,"
+        f"setsar={sample_aspect_ratio},"
+        f"fps={video['r_frame_rate']}"
+    )
+
+    args = ['-i', entry['path']]
+    if audio is not None and entry['audio'] is None:
+        args += ['-f', 'lavfi', '-i', f"anullsrc=r={audio['sample_rate']}:cl={_channel_layout(audio)}"]
+
+    args += ['-map', '0:v:0', '-vf', filters] + matching_encoder_args(video)
+
+    if audio is None:
+        args += ['-an']
+    else:
+        args += ['-map', '0:a:0' if entry['audio'] is not None else '1:a:0']
+        args += [
+            '-c:a', AUDIO_ENCODERS[audio['codec_name']],
+            '-ar', str(audio['sample_rate']),
+            '-ac', str(audio['channels']),
+            '-shortest',
+        ]
+
+    run_ffmpeg(args + ['-f', 'mpegts', part_path])
+
+
+def plan_concat(input_paths):
+    """
+    Analisa as entradas e decide quais podem ser copiadas e quais precisam ser recodificadas
+
+    Args:
+        input_paths: Lista de arquivos, na ordem da concatenação
+
+    Returns:
+        tuple: (entradas, referência), onde cada entrada é um dicionário com
+            'path', 'video', 'audio', 'duration', as assinaturas e 'action' ('copy' ou 'transcode')
+    """
+    entries = []
+    for path in input_paths:
+        info = probe(path)
+        video = get_stream(info, 'video')
+        if video is None:
+            raise EngineError(f"Nenhuma stream de vídeo encontrada em {path}")
+        audio = get_stream(info, 'audio')
+        duration = info.get('format', {}).get('duration')
+        entries.append({
+            'path': path,
+            'video': video,
+            'audio': audio,
+            'duration': float(duration) if duration else None,
+            'video_signature': _video_signature(video),
+            'audio_signature': _audio_signature(audio),
+        })
+
+    target = _choose_target(entries)
+    for entry in entries:
+        entry['action'] = 'copy' if _conforms(entry, target) else 'transcode'
+
+    return entries, target
+
+
+def concat_videos(input_paths, output_path, log=None, progress=None, work_dir=None):
+    """
+    Concatena vídeos com o demuxer concat, recodificando apenas as entradas fora do padrão
+
+    As entradas compatíveis com a referência são apenas remultiplexadas em MPEG-TS;
+    as demais são recodificadas com os mesmos parâmetros. Os trechos são então
+    unidos sem recodificar, como no smart cut.
+
+    Args:
+        input_paths: Lista de arquivos, na ordem da concatenação
+        output_path: Arquivo de saída
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o percentual (0-100) concluído (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+
+    Returns:
+        list: Relatório por entrada com 'input', 'action' ('copy' ou 'transcode') e 'duration'
+    """
+    if len(input_paths) < 2:
+        raise EngineError("Informe ao menos dois arquivos para concatenar")
+
+    entries, target = plan_concat(input_paths)
+    total_duration = sum(entry['duration'] or 0.0 for entry in entries)
+
+    temp_dir = tempfile.mkdtemp(prefix='concat_', dir=work_dir)
+
+    try:
+        parts = []
+        done = 0.0
+        for index, entry in enumerate(entries):
+            part_path = os.path.join(temp_dir, f'part_{index:03d}.ts')
+
+            if entry['action'] == 'copy':
+                if log:
+                    log(f"Copiando {entry['path']}")
+                _copy_input(entry, part_path, target)
+            else:
+                if log:
+                    log(f"Recodificando {entry['path']} (parâmetros diferentes da referência)")
+                _transcode_input(entry, part_path, target)
+
+            parts.append(part_path)
+
+            done += entry['duration'] or 0.0
+            if progress and total_duration:
+                progress(round(done / total_duration * 100, 2))
+
+        concat_files(parts, output_path, os.path.join(temp_dir, 'parts.txt'), ['-movflags', '+faststart'])
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return [
+        {'input': entry['path'], 'action': entry['action'], 'duration': entry['duration']}
+        for entry in entries
+    ]
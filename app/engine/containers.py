@@ -0,0 +1,863 @@
+import sys
+import mmap
+import array
+import struct
+from collections import namedtuple
+from app.engine.errors import MediaParseError
+
+# Caixas MP4 que contêm outras caixas
+MP4_CONTAINER_BOXES = (b'moov', b'trak', b'mdia', b'minf', b'stbl', b'edts', b'mvex', b'moof', b'traf')
+
+# Flag de amostra "não sincronizada" (sample_is_non_sync_sample) em fMP4
+MP4_NON_SYNC_FLAG = 0x00010000
+
+# IDs de elementos Matroska/WebM utilizados
+MKV_EBML = 0x1A45DFA3
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_TRACK_NUMBER = 0xD7
+MKV_TRACK_TYPE = 0x83
+MKV_CUES = 0x1C53BB6B
+MKV_CUE_POINT = 0xBB
+MKV_CUE_TIME = 0xB3
+MKV_CUE_TRACK_POSITIONS = 0xB7
+MKV_CUE_TRACK = 0xF7
+MKV_CUE_CLUSTER_POSITION = 0xF1
+MKV_CLUSTER = 0x1F43B675
+MKV_CLUSTER_TIMECODE = 0xE7
+MKV_SIMPLE_BLOCK = 0xA3
+MKV_BLOCK_GROUP = 0xA0
+MKV_BLOCK = 0xA1
+MKV_REFERENCE_BLOCK = 0xFB
+
+# Elementos de nível superior do Segment (encerram Clusters de tamanho desconhecido)
+MKV_TOP_LEVEL_IDS = (MKV_CLUSTER, MKV_CUES, MKV_INFO, MKV_TRACKS, 0x114D9B74, 0x1043A770, 0x1254C367, 0x1941A469)
+
+Box = namedtuple('Box', ['type', 'start', 'data_start', 'end'])
+
+
+def open_mmap(path):
+    """
+    Mapeia um arquivo em memória somente para leitura
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        tuple: (arquivo aberto, mmap) - ambos devem ser fechados pelo chamador
+
+    Raises:
+        MediaParseError: Se o arquivo estiver vazio
+    """
+    f = open(path, 'rb')
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        f.close()
+        raise MediaParseError(f"Arquivo vazio: {path}")
+    return f, mm
+
+
+def detect_container(mm):
+    """
+    Identifica o container pelo início do arquivo
+
+    Args:
+        mm: Conteúdo do arquivo (mmap ou bytes)
+
+    Returns:
+        str: 'mp4', 'mkv' ou None se desconhecido
+    """
+    if len(mm) >= 4 and struct.unpack_from('>I', mm, 0)[0] == MKV_EBML:
+        return 'mkv'
+    if len(mm) >= 8 and mm[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'styp'):
+        return 'mp4'
+    return None
+
+
+# ---------------------------------------------------------------------------
+# MP4 / MOV
+# ---------------------------------------------------------------------------
+
+def iter_boxes(mm, start, end):
+    """
+    Itera sobre as caixas MP4 de um intervalo
+
+    Args:
+        mm: Conteúdo do arquivo
+        start: Posição inicial
+        end: Posição final
+
+    Yields:
+        Box: Tipo, início, início dos dados e fim de cada caixa
+    """
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', mm, pos)
+        header = 8
+
+        if size == 1:
+            if pos + 16 > end:
+                break
+            size = struct.unpack_from('>Q', mm, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+
+        if size < header:
+            raise MediaParseError(f"Caixa MP4 inválida '{box_type!r}' na posição {pos}")
+
+        yield Box(box_type, pos, pos + header, min(pos + size, end))
+        pos += size
+
+
+def find_boxes(mm, start, end, box_type):
+    """
+    Lista as caixas de um tipo dentro de um intervalo (sem descer na hierarquia)
+    """
+    return [box for box in iter_boxes(mm, start, end) if box.type == box_type]
+
+
+def find_box(mm, start, end, box_type):
+    """
+    Obtém a primeira caixa de um tipo dentro de um intervalo
+    """
+    for box in iter_boxes(mm, start, end):
+        if box.type == box_type:
+            return box
+    return None
+
+
+def _read_uint_array(mm, pos, count, stride=1, column=0, wide=False):
+    """
+    Lê um vetor de inteiros big-endian de uma tabela MP4
+
+    Args:
+        mm: Conteúdo do arquivo
+        pos: Posição do primeiro registro
+        count: Quantidade de registros
+        stride: Quantidade de campos por registro
+        column: Campo a extrair de cada registro
+        wide: Campos de 64 bits em vez de 32
+
+    Returns:
+        array.array: Valores lidos
+    """
+    typecode = 'Q' if wide else 'I'
+    values = array.array(typecode)
+    item_size = values.itemsize
+    values.frombytes(mm[pos:pos + count * stride * item_size])
+    if sys.byteorder == 'little':
+        values.byteswap()
+    if stride > 1:
+        values = values[column::stride]
+    return values
+
+
+class Mp4Track:
+    """
+    Trilha de um arquivo MP4 com acesso às tabelas de amostras
+    """
+
+    def __init__(self, mm, trak, movie_timescale):
+        """
+        Interpreta uma caixa trak
+
+        Args:
+            mm: Conteúdo do arquivo
+            trak: Caixa trak
+            movie_timescale: Escala de tempo do mvhd
+        """
+        self.mm = mm
+        self.trak = trak
+        self.track_id = None
+        self.handler = None
+        self.timescale = None
+        self.duration = None
+        self.stbl = {}
+        self.edit_offset = 0
+
+        tkhd = find_box(mm, trak.data_start, trak.end, b'tkhd')
+        if tkhd:
+            version = mm[tkhd.data_start]
+            offset = tkhd.data_start + (20 if version == 1 else 12)
+            self.track_id = struct.unpack_from('>I', mm, offset)[0]
+
+        mdia = find_box(mm, trak.data_start, trak.end, b'mdia')
+        if mdia is None:
+            raise MediaParseError("Trilha MP4 sem caixa mdia")
+
+        mdhd = find_box(mm, mdia.data_start, mdia.end, b'mdhd')
+        if mdhd:
+            version = mm[mdhd.data_start]
+            if version == 1:
+                self.timescale, self.duration = struct.unpack_from('>IQ', mm, mdhd.data_start + 20)
+            else:
+                self.timescale, self.duration = struct.unpack_from('>II', mm, mdhd.data_start + 12)
+
+        hdlr = find_box(mm, mdia.data_start, mdia.end, b'hdlr')
+        if hdlr:
+            self.handler = mm[hdlr.data_start + 8:hdlr.data_start + 12].decode('latin-1')
+
+        minf = find_box(mm, mdia.data_start, mdia.end, b'minf')
+        stbl = find_box(mm, minf.data_start, minf.end, b'stbl') if minf else None
+        if stbl:
+            for box in iter_boxes(mm, stbl.data_start, stbl.end):
+                self.stbl[box.type] = box
+
+        self.edit_offset = self._read_edit_offset(movie_timescale)
+
+    def _read_edit_offset(self, movie_timescale):
+        """
+        Calcula o deslocamento de apresentação da lista de edição (em unidades da trilha)
+        """
+        edts = find_box(self.mm, self.trak.data_start, self.trak.end, b'edts')
+        elst = find_box(self.mm, edts.data_start, edts.end, b'elst') if edts else None
+        if elst is None or not self.timescale:
+            return 0
+
+        mm = self.mm
+        version = mm[elst.data_start]
+        count = struct.unpack_from('>I', mm, elst.data_start + 4)[0]
+        pos = elst.data_start + 8
+        empty_duration = 0
+
+        for _ in range(count):
+            if version == 1:
+                segment_duration, media_time = struct.unpack_from('>Qq', mm, pos)
+                pos += 20
+            else:
+                segment_duration, media_time = struct.unpack_from('>Ii', mm, pos)
+                pos += 12
+
+            if media_time == -1:
+                # Edição vazia: atrasa o início da apresentação
+                if movie_timescale:
+                    empty_duration += segment_duration * self.timescale // movie_timescale
+                continue
+
+            return empty_duration - media_time
+
+        return empty_duration
+
+    @property
+    def is_video(self):
+        return self.handler == 'vide'
+
+    @property
+    def is_audio(self):
+        return self.handler == 'soun'
+
+    @property
+    def sample_count(self):
+        stsz = self.stbl.get(b'stsz')
+        if stsz is None:
+            return 0
+        return struct.unpack_from('>I', self.mm, stsz.data_start + 8)[0]
+
+    def decode_times(self):
+        """
+        Calcula o tempo de decodificação de cada amostra (tabela stts)
+
+        Returns:
+            list: Tempos de decodificação em unidades da trilha
+        """
+        stts = self.stbl.get(b'stts')
+        if stts is None:
+            return []
+
+        count = struct.unpack_from('>I', self.mm, stts.data_start + 4)[0]
+        counts = _read_uint_array(self.mm, stts.data_start + 8, count, stride=2, column=0)
+        deltas = _read_uint_array(self.mm, stts.data_start + 8, count, stride=2, column=1)
+
+        times = []
+        current = 0
+        for sample_count, delta in zip(counts, deltas):
+            for _ in range(sample_count):
+                times.append(current)
+                current += delta
+        return times
+
+    def composition_offsets(self):
+        """
+        Obtém o deslocamento de composição de cada amostra (tabela ctts)
+
+        Returns:
+            list: Deslocamentos em unidades da trilha ou None se não houver ctts
+        """
+        ctts = self.stbl.get(b'ctts')
+        if ctts is None:
+            return None
+
+        count = struct.unpack_from('>I', self.mm, ctts.data_start + 4)[0]
+        counts = _read_uint_array(self.mm, ctts.data_start + 8, count, stride=2, column=0)
+        raw_offsets = _read_uint_array(self.mm, ctts.data_start + 8, count, stride=2, column=1)
+
+        offsets = []
+        for sample_count, offset in zip(counts, raw_offsets):
+            # Deslocamentos negativos (ctts versão 1) são lidos como unsigned
+            if offset >= 0x80000000:
+                offset -= 0x100000000
+            offsets.extend([offset] * sample_count)
+        return offsets
+
+    def sync_samples(self):
+        """
+        Lista os índices (base 0) das amostras de sincronização (tabela stss)
+
+        Returns:
+            list: Índices das amostras ou None se todas forem de sincronização
+        """
+        stss = self.stbl.get(b'stss')
+        if stss is None:
+            return None
+
+        count = struct.unpack_from('>I', self.mm, stss.data_start + 4)[0]
+        return [number - 1 for number in _read_uint_array(self.mm, stss.data_start + 8, count)]
+
+    def sample_sizes(self):
+        """
+        Obtém o tamanho de cada amostra (tabela stsz)
+
+        Returns:
+            list: Tamanhos em bytes
+        """
+        stsz = self.stbl.get(b'stsz')
+        if stsz is None:
+            if b'stz2' in self.stbl:
+                raise MediaParseError("Tabela stz2 não suportada")
+            return []
+
+        sample_size, count = struct.unpack_from('>II', self.mm, stsz.data_start + 4)
+        if sample_size:
+            return [sample_size] * count
+        return list(_read_uint_array(self.mm, stsz.data_start + 12, count))
+
+    def chunk_offsets(self):
+        """
+        Obtém a posição de cada chunk no arquivo (tabelas stco/co64)
+
+        Returns:
+            list: Posições absolutas em bytes
+        """
+        stco = self.stbl.get(b'stco')
+        if stco is not None:
+            count = struct.unpack_from('>I', self.mm, stco.data_start + 4)[0]
+            return list(_read_uint_array(self.mm, stco.data_start + 8, count))
+
+        co64 = self.stbl.get(b'co64')
+        if co64 is not None:
+            count = struct.unpack_from('>I', self.mm, co64.data_start + 4)[0]
+            return list(_read_uint_array(self.mm, co64.data_start + 8, count, wide=True))
+
+        return []
+
+    def sample_offsets(self):
+        """
+        Calcula a posição de cada amostra no arquivo (tabelas stsc, stco e stsz)
+
+        Returns:
+            list: Posições absolutas em bytes
+        """
+        sizes = self.sample_sizes()
+        chunks = self.chunk_offsets()
+        stsc = self.stbl.get(b'stsc')
+        if stsc is None or not chunks:
+            return []
+
+        count = struct.unpack_from('>I', self.mm, stsc.data_start + 4)[0]
+        first_chunks = _read_uint_array(self.mm, stsc.data_start + 8, count, stride=3, column=0)
+        per_chunk = _read_uint_array(self.mm, stsc.data_start + 8, count, stride=3, column=1)
+
+        offsets = []
+        sample = 0
+        total = len(sizes)
+
+        for entry in range(count):
+            chunk_start = first_chunks[entry] - 1
+            chunk_end = first_chunks[entry + 1] - 1 if entry + 1 < count else len(chunks)
+
+            for chunk in range(chunk_start, min(chunk_end, len(chunks))):
+                position = chunks[chunk]
+                for _ in range(per_chunk[entry]):
+                    if sample >= total:
+                        return offsets
+                    offsets.append(position)
+                    position += sizes[sample]
+                    sample += 1
+
+        return offsets
+
+    def keyframes(self):
+        """
+        Lista os keyframes da trilha a partir das tabelas de amostras
+
+        Returns:
+            list: Tuplas (tempo de apresentação em segundos, posição em bytes)
+        """
+        if not self.timescale:
+            return []
+
+        decode_times = self.decode_times()
+        composition = self.composition_offsets()
+        offsets = self.sample_offsets()
+        sync = self.sync_samples()
+        indexes = sync if sync is not None else range(len(decode_times))
+
+        keyframes = []
+        for index in indexes:
+            if index >= len(decode_times) or index >= len(offsets):
+                continue
+            pts = decode_times[index] + (composition[index] if composition and index < len(composition) else 0)
+            keyframes.append(((pts + self.edit_offset) / self.timescale, offsets[index]))
+
+        return keyframes
+
+
+def _parse_trex(mm, moov):
+    """
+    Lê os valores padrão das amostras de cada trilha fragmentada (mvex/trex)
+    """
+    defaults = {}
+    mvex = find_box(mm, moov.data_start, moov.end, b'mvex')
+    if mvex is None:
+        return defaults
+
+    for trex in find_boxes(mm, mvex.data_start, mvex.end, b'trex'):
+        track_id, _, duration, size, flags = struct.unpack_from('>IIIII', mm, trex.data_start + 4)
+        defaults[track_id] = {'duration': duration, 'size': size, 'flags': flags}
+    return defaults
+
+
+def _fragment_keyframes(mm, track, trex_defaults):
+    """
+    Lista os keyframes de uma trilha em um MP4 fragmentado (caixas moof)
+    """
+    defaults = trex_defaults.get(track.track_id, {'duration': 0, 'size': 0, 'flags': 0})
+    keyframes = []
+    next_decode_time = 0
+
+    for moof in find_boxes(mm, 0, len(mm), b'moof'):
+        for traf in find_boxes(mm, moof.data_start, moof.end, b'traf'):
+            tfhd = find_box(mm, traf.data_start, traf.end, b'tfhd')
+            if tfhd is None:
+                continue
+
+            tf_flags = struct.unpack_from('>I', mm, tfhd.data_start)[0] & 0xFFFFFF
+            track_id = struct.unpack_from('>I', mm, tfhd.data_start + 4)[0]
+            if track_id != track.track_id:
+                continue
+
+            pos = tfhd.data_start + 8
+            base_offset = moof.start
+            default_duration = defaults['duration']
+            default_size = defaults['size']
+            default_flags = defaults['flags']
+
+            if tf_flags & 0x000001:
+                base_offset = struct.unpack_from('>Q', mm, pos)[0]
+                pos += 8
+            if tf_flags & 0x000002:
+                pos += 4
+            if tf_flags & 0x000008:
+                default_duration = struct.unpack_from('>I', mm, pos)[0]
+                pos += 4
+            if tf_flags & 0x000010:
+                default_size = struct.unpack_from('>I', mm, pos)[0]
+                pos += 4
+            if tf_flags & 0x000020:
+                default_flags = struct.unpack_from('>I', mm, pos)[0]
+
+            tfdt = find_box(mm, traf.data_start, traf.end, b'tfdt')
+            if tfdt is not None:
+                if mm[tfdt.data_start] == 1:
+                    next_decode_time = struct.unpack_from('>Q', mm, tfdt.data_start + 4)[0]
+                else:
+                    next_decode_time = struct.unpack_from('>I', mm, tfdt.data_start + 4)[0]
+
+            for trun in find_boxes(mm, traf.data_start, traf.end, b'trun'):
+                version = mm[trun.data_start]
+                tr_flags = struct.unpack_from('>I', mm, trun.data_start)[0] & 0xFFFFFF
+                count = struct.unpack_from('>I', mm, trun.data_start + 4)[0]
+                pos = trun.data_start + 8
+
+                data_offset = base_offset
+                if tr_flags & 0x000001:
+                    data_offset += struct.unpack_from('>i', mm, pos)[0]
+                    pos += 4
+
+                first_flags = None
+                if tr_flags & 0x000004:
+                    first_flags = struct.unpack_from('>I', mm, pos)[0]
+                    pos += 4
+
+                for index in range(count):
+                    duration = default_duration
+                    size = default_size
+                    flags = default_flags
+                    composition = 0
+
+                    if tr_flags & 0x000100:
+                        duration = struct.unpack_from('>I', mm, pos)[0]
+                        pos += 4
+                    if tr_flags & 0x000200:
+                        size = struct.unpack_from('>I', mm, pos)[0]
+                        pos += 4
+                    if tr_flags & 0x000400:
+                        flags = struct.unpack_from('>I', mm, pos)[0]
+                        pos += 4
+                    if tr_flags & 0x000800:
+                        composition = struct.unpack_from('>i' if version == 1 else '>I', mm, pos)[0]
+                        pos += 4
+
+                    if index == 0 and first_flags is not None:
+                        flags = first_flags
+
+                    if not flags & MP4_NON_SYNC_FLAG:
+                        pts = next_decode_time + composition + track.edit_offset
+                        keyframes.append((pts / track.timescale, data_offset))
+
+                    next_decode_time += duration
+                    data_offset += size
+
+    return keyframes
+
+
+def parse_mp4(mm):
+    """
+    Interpreta a estrutura de um arquivo MP4/MOV
+
+    Args:
+        mm: Conteúdo do arquivo
+
+    Returns:
+        dict: Dados do filme com as chaves 'moov', 'timescale', 'duration' e 'tracks'
+
+    Raises:
+        MediaParseError: Se não houver caixa moov
+    """
+    moov = find_box(mm, 0, len(mm), b'moov')
+    if moov is None:
+        raise MediaParseError("Caixa moov não encontrada")
+
+    timescale = None
+    duration = None
+    mvhd = find_box(mm, moov.data_start, moov.end, b'mvhd')
+    if mvhd:
+        version = mm[mvhd.data_start]
+        if version == 1:
+            timescale, duration = struct.unpack_from('>IQ', mm, mvhd.data_start + 20)
+        else:
+            timescale, duration = struct.unpack_from('>II', mm, mvhd.data_start + 12)
+
+    tracks = [Mp4Track(mm, trak, timescale) for trak in find_boxes(mm, moov.data_start, moov.end, b'trak')]
+
+    return {
+        'moov': moov,
+        'timescale': timescale,
+        'duration': duration / timescale if timescale and duration else None,
+        'tracks': tracks,
+    }
+
+
+def mp4_keyframes(mm):
+    """
+    Lista os keyframes da primeira trilha de vídeo de um MP4
+
+    Args:
+        mm: Conteúdo do arquivo
+
+    Returns:
+        tuple: (duração em segundos, lista de tuplas (tempo, posição))
+    """
+    movie = parse_mp4(mm)
+    video = next((track for track in movie['tracks'] if track.is_video), None)
+    if video is None:
+        raise MediaParseError("Nenhuma trilha de vídeo encontrada")
+
+    if video.sample_count:
+        keyframes = video.keyframes()
+    else:
+        keyframes = _fragment_keyframes(mm, video, _parse_trex(mm, movie['moov']))
+
+    duration = movie['duration']
+    if not duration and video.duration and video.timescale:
+        duration = video.duration / video.timescale
+
+    return duration, sorted(keyframes)
+
+
+# ---------------------------------------------------------------------------
+# Matroska / WebM
+# ---------------------------------------------------------------------------
+
+def _read_vint(mm, pos, keep_marker=False):
+    """
+    Lê um inteiro de tamanho variável do EBML
+
+    Args:
+        mm: Conteúdo do arquivo
+        pos: Posição do primeiro byte
+        keep_marker: Manter o bit marcador (usado nos IDs de elementos)
+
+    Returns:
+        tuple: (valor, tamanho em bytes) - valor None indica tamanho desconhecido
+    """
+    first = mm[pos]
+    if first == 0:
+        raise MediaParseError(f"Inteiro EBML inválido na posição {pos}")
+
+    length = 1
+    mask = 0x80
+    while not first & mask:
+        mask >>= 1
+        length += 1
+
+    value = first if keep_marker else first & (mask - 1)
+    all_ones = (first & (mask - 1)) == mask - 1
+    for index in range(1, length):
+        byte = mm[pos + index]
+        value = (value << 8) | byte
+        all_ones = all_ones and byte == 0xFF
+
+    if all_ones and not keep_marker:
+        return None, length
+    return value, length
+
+
+def _read_element_header(mm, pos):
+    """
+    Lê o cabeçalho (ID e tamanho) de um elemento EBML
+
+    Returns:
+        tuple: (ID, posição dos dados, tamanho dos dados ou None se desconhecido)
+    """
+    element_id, id_length = _read_vint(mm, pos, keep_marker=True)
+    size, size_length = _read_vint(mm, pos + id_length)
+    return element_id, pos + id_length + size_length, size
+
+
+def _iter_elements(mm, start, end):
+    """
+    Itera sobre os elementos EBML de um intervalo
+
+    Yields:
+        tuple: (ID, início do elemento, posição dos dados, tamanho dos dados ou None)
+    """
+    pos = start
+    while pos < end:
+        element_id, data_start, size = _read_element_header(mm, pos)
+        yield element_id, pos, data_start, size
+        if size is None:
+            return
+        pos = data_start + size
+
+
+def _read_uint(mm, pos, size):
+    return int.from_bytes(mm[pos:pos + size], 'big')
+
+
+def _read_float(mm, pos, size):
+    if size == 4:
+        return struct.unpack_from('>f', mm, pos)[0]
+    if size == 8:
+        return struct.unpack_from('>d', mm, pos)[0]
+    return None
+
+
+def _mkv_video_track(mm, start, end):
+    """
+    Obtém o número da primeira trilha de vídeo no elemento Tracks
+    """
+    for element_id, _, data_start, size in _iter_elements(mm, start, end):
+        if element_id != MKV_TRACK_ENTRY or size is None:
+            continue
+        number = None
+        track_type = None
+        for child_id, _, child_start, child_size in _iter_elements(mm, data_start, data_start + size):
+            if child_id == MKV_TRACK_NUMBER:
+                number = _read_uint(mm, child_start, child_size)
+            elif child_id == MKV_TRACK_TYPE:
+                track_type = _read_uint(mm, child_start, child_size)
+        if track_type == 1:
+            return number
+    return None
+
+
+def _mkv_cues(mm, start, end, segment_start):
+    """
+    Lê os pontos de índice (Cues) como tuplas (tempo bruto, trilha, posição absoluta)
+    """
+    cues = []
+    for element_id, _, data_start, size in _iter_elements(mm, start, end):
+        if element_id != MKV_CUE_POINT or size is None:
+            continue
+        cue_time = None
+        positions = []
+        for child_id, _, child_start, child_size in _iter_elements(mm, data_start, data_start + size):
+            if child_id == MKV_CUE_TIME:
+                cue_time = _read_uint(mm, child_start, child_size)
+            elif child_id == MKV_CUE_TRACK_POSITIONS and child_size is not None:
+                track = None
+                cluster = None
+                for pos_id, _, pos_start, pos_size in _iter_elements(mm, child_start, child_start + child_size):
+                    if pos_id == MKV_CUE_TRACK:
+                        track = _read_uint(mm, pos_start, pos_size)
+                    elif pos_id == MKV_CUE_CLUSTER_POSITION:
+                        cluster = _read_uint(mm, pos_start, pos_size)
+                positions.append((track, cluster))
+        if cue_time is None:
+            continue
+        for track, cluster in positions:
+            if cluster is not None:
+                cues.append((cue_time, track, segment_start + cluster))
+    return cues
+
+
+def _mkv_cluster_keyframes(mm, cluster_start, data_start, end, video_track):
+    """
+    Varre um Cluster em busca de blocos-chave da trilha de vídeo
+
+    Returns:
+        tuple: (lista de (tempo bruto, posição do cluster), posição final do cluster)
+    """
+    keyframes = []
+    cluster_time = 0
+    pos = data_start
+
+    while pos < end:
+        element_id, child_start, size = _read_element_header(mm, pos)
+        if element_id in MKV_TOP_LEVEL_IDS:
+            # Fim de um Cluster de tamanho desconhecido
+            return keyframes, pos
+        if size is None:
+            raise MediaParseError(f"Elemento de tamanho desconhecido dentro do Cluster na posição {pos}")
+
+        if element_id == MKV_CLUSTER_TIMECODE:
+            cluster_time = _read_uint(mm, child_start, size)
+        elif element_id == MKV_SIMPLE_BLOCK:
+            track, length = _read_vint(mm, child_start)
+            relative, flags = struct.unpack_from('>hB', mm, child_start + length)
+            if track == video_track and flags & 0x80:
+                keyframes.append((cluster_time + relative, cluster_start))
+        elif element_id == MKV_BLOCK_GROUP:
+            block_time = None
+            referenced = False
+            for group_id, _, group_start, group_size in _iter_elements(mm, child_start, child_start + size):
+                if group_id == MKV_BLOCK:
+                    track, length = _read_vint(mm, group_start)
+                    if track == video_track:
+                        block_time = cluster_time + struct.unpack_from('>h', mm, group_start + length)[0]
+                elif group_id == MKV_REFERENCE_BLOCK:
+                    referenced = True
+            if block_time is not None and not referenced:
+                keyframes.append((block_time, cluster_start))
+
+        pos = child_start + size
+
+    return keyframes, pos
+
+
+def mkv_keyframes(mm):
+    """
+    Lista os keyframes da primeira trilha de vídeo de um Matroska/WebM
+
+    Usa o índice (Cues) quando disponível; caso contrário, varre os cabeçalhos
+    dos blocos dos Clusters sem ler os dados dos quadros.
+
+    Args:
+        mm: Conteúdo do arquivo
+
+    Returns:
+        tuple: (duração em segundos, lista de tuplas (tempo, posição do cluster))
+    """
+    file_end = len(mm)
+    segment = None
+    for element_id, _, data_start, size in _iter_elements(mm, 0, file_end):
+        if element_id == MKV_SEGMENT:
+            segment = (data_start, file_end if size is None else min(data_start + size, file_end))
+            break
+
+    if segment is None:
+        raise MediaParseError("Elemento Segment não encontrado")
+
+    segment_start, segment_end = segment
+    timecode_scale = 1000000
+    duration = None
+    video_track = None
+    cues = []
+    clusters = []
+
+    pos = segment_start
+    while pos < segment_end:
+        element_id, data_start, size = _read_element_header(mm, pos)
+        element_end = segment_end if size is None else min(data_start + size, segment_end)
+
+        if element_id == MKV_INFO:
+            for child_id, _, child_start, child_size in _iter_elements(mm, data_start, element_end):
+                if child_id == MKV_TIMECODE_SCALE:
+                    timecode_scale = _read_uint(mm, child_start, child_size)
+                elif child_id == MKV_DURATION:
+                    duration = _read_float(mm, child_start, child_size)
+        elif element_id == MKV_TRACKS:
+            video_track = _mkv_video_track(mm, data_start, element_end)
+        elif element_id == MKV_CUES:
+            cues = _mkv_cues(mm, data_start, element_end, segment_start)
+        elif element_id == MKV_CLUSTER:
+            clusters.append((pos, data_start, element_end))
+            if size is None:
+                # Cluster de tamanho desconhecido: o fim só é conhecido após varrê-lo
+                _, element_end = _mkv_cluster_keyframes(mm, pos, data_start, segment_end, video_track)
+                clusters[-1] = (pos, data_start, element_end)
+
+        pos = element_end
+
+    if video_track is None:
+        raise MediaParseError("Nenhuma trilha de vídeo encontrada")
+
+    raw_keyframes = [(cue_time, position) for cue_time, track, position in cues if track == video_track]
+
+    if not raw_keyframes:
+        for cluster_start, data_start, cluster_end in clusters:
+            found, _ = _mkv_cluster_keyframes(mm, cluster_start, data_start, cluster_end, video_track)
+            raw_keyframes.extend(found)
+
+    scale = timecode_scale / 1e9
+    keyframes = sorted((raw_time * scale, position) for raw_time, position in raw_keyframes)
+
+    return (duration * scale if duration else None), keyframes
+
+
+def read_keyframes(path):
+    """
+    Lê os keyframes de um arquivo MP4/MOV ou Matroska/WebM sem processos externos
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        tuple: (container, duração em segundos, lista de tuplas (tempo, posição))
+
+    Raises:
+        MediaParseError: Se o container não for suportado ou estiver corrompido
+    """
+    f, mm = open_mmap(path)
+    try:
+        container = detect_container(mm)
+        try:
+            if container == 'mp4':
+                duration, keyframes = mp4_keyframes(mm)
+            elif container == 'mkv':
+                duration, keyframes = mkv_keyframes(mm)
+            else:
+                raise MediaParseError(f"Container não suportado: {path}")
+        except (struct.error, IndexError) as e:
+            raise MediaParseError(f"Estrutura inválida em {path}: {str(e)}")
+        return container, duration, keyframes
+    finally:
+        mm.close()
+        f.close()
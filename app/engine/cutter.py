@@ -0,0 +1,371 @@
+import os
+import shutil
+import tempfile
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, get_duration, format_seconds, check_cancelled, cancel_check_enabled
+from app.engine.progress import progress_reporter, ProgressMeter
+from app.engine.smart_cut import smart_cut
+from app.engine.parallel_encode import parallel_encode
+from app.engine.segment_cache import cut_segmented
+from app.engine.renditions import render_ladder
+from app.engine.transforms import cut_transformed
+from app.engine.keyframe_index import get_or_build_index
+from app.engine.multi_cut import cut_ranges
+
+# Modos de corte suportados
+# - reencode: corte preciso, recodificando todos os quadros com moviepy
+# - copy: corte nos keyframes mais próximos, copiando as streams sem recodificar
+# - smart: corte preciso, recodificando apenas os GOPs parciais das bordas
+# - parallel: corte preciso, recodificando blocos entre keyframes em paralelo
+CUT_MODES = ('reencode', 'copy', 'smart', 'parallel')
+
+
+def _log(log, message):
+    """
+    Envia uma mensagem para o callback de log, se fornecido
+    """
+    if log:
+        log(message)
+
+
+def _prepare_output(output_path):
+    """
+    Cria o diretório de saída se não existir
+
+    Args:
+        output_path: Caminho do arquivo de saída
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+
+def validate_range(start_time, end_time, duration, log=None):
+    """
+    Valida o intervalo de corte contra a duração do vídeo
+
+    Args:
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        duration: Duração do vídeo em segundos (None se desconhecida)
+        log: Callback para mensagens (opcional)
+
+    Returns:
+        float: Tempo final ajustado à duração do vídeo
+
+    Raises:
+        EngineError: Se o intervalo for inválido
+    """
+    if start_time >= end_time:
+        raise EngineError("O tempo inicial deve ser menor que o tempo final.")
+
+    if duration is None:
+        return end_time
+
+    if end_time > duration:
+        _log(log, f"Aviso: Tempo final ({end_time}s) maior que duração do vídeo ({duration}s)")
+        end_time = duration
+
+    if start_time >= duration:
+        raise EngineError(f"Tempo inicial ({start_time}s) é maior que a duração do vídeo ({duration}s)")
+
+    return end_time
+
+
+def source_duration(input_path):
+    """
+    Obtém a duração do vídeo, preferindo o índice de keyframes ao ffprobe
+
+    Args:
+        input_path: Arquivo de entrada
+
+    Returns:
+        float: Duração em segundos ou None se desconhecida
+    """
+    index = get_or_build_index(input_path)
+    if index is not None and index.duration:
+        return index.duration
+    return get_duration(input_path)
+
+
+def cancellable_logger(on_frame=None):
+    """
+    Cria o logger do moviepy usado no modo reencode
+
+    Quando o corte executa no pool, o logger verifica o cancelamento a cada
+    atualização de progresso do moviepy e interrompe a escrita do vídeo.
+    Sem cancelamento nem callback de quadros, mantém a barra de progresso padrão.
+
+    Args:
+        on_frame: Callback chamado com o índice de cada quadro escrito (opcional)
+    """
+    cancellable = cancel_check_enabled()
+    if not cancellable and on_frame is None:
+        return 'bar'
+
+    from proglog import ProgressBarLogger
+
+    class CancellableLogger(ProgressBarLogger):
+        def bars_callback(self, bar, attr, value, old_value=None):
+            if cancellable:
+                check_cancelled()
+            if on_frame and bar == 'frame_index' and attr == 'index':
+                on_frame(value)
+
+    return CancellableLogger()
+
+
+def cut_reencode(input_path, output_path, start_time, end_time, log=None, work_dir=None, progress=None):
+    """
+    Corta o vídeo recodificando todos os quadros com moviepy (corte preciso)
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        log: Callback para mensagens (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+    """
+    # Importação tardia: o moviepy é pesado e só é necessário neste modo
+    from moviepy import VideoFileClip
+
+    clip = VideoFileClip(input_path)
+    # Áudio intermediário em diretório próprio, para cortes simultâneos não se sobrescreverem
+    temp_dir = tempfile.mkdtemp(prefix='reencode_', dir=work_dir)
+
+    try:
+        end_time = validate_range(start_time, end_time, clip.duration, log)
+
+        subclip = clip.subclipped(start_time, end_time)
+        _prepare_output(output_path)
+
+        # O moviepy informa apenas o índice do quadro: fps e velocidade são medidos
+        on_frame = None
+        if progress:
+            meter = ProgressMeter(end_time - start_time, progress)
+            frame_rate = subclip.fps or clip.fps or 30
+
+            def on_frame(index):
+                meter.update(index / frame_rate, frames=index)
+
+        subclip.write_videofile(
+            output_path,
+            codec="libx264",
+            audio_codec="aac",
+            temp_audiofile=os.path.join(temp_dir, "temp-audio.m4a"),
+            remove_temp=True,
+            logger=cancellable_logger(on_frame)
+        )
+
+        if progress:
+            meter.finish()
+
+        subclip.close()
+    finally:
+        clip.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def cut_copy(input_path, output_path, start_time, end_time, log=None, progress=None):
+    """
+    Corta o vídeo copiando as streams, sem recodificar
+
+    O seek é feito na entrada, então o corte começa no keyframe imediatamente
+    anterior ao tempo inicial. O resultado não tem precisão de quadro, mas o
+    custo é apenas de E/S.
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+    """
+    index = get_or_build_index(input_path)
+    end_time = validate_range(start_time, end_time, source_duration(input_path), log)
+    _prepare_output(output_path)
+
+    if index is not None:
+        keyframe = index.keyframe_before(start_time)
+        if keyframe is not None and keyframe[0] < start_time:
+            _log(log, f"O corte começará no keyframe em {keyframe[0]:.3f}s")
+
+    run_ffmpeg_progress([
+        '-ss', format_seconds(start_time),
+        '-i', input_path,
+        '-t', format_seconds(end_time - start_time),
+        '-map', '0:v?', '-map', '0:a?',
+        '-c', 'copy',
+        '-avoid_negative_ts', 'make_zero',
+        '-movflags', '+faststart',
+        output_path
+    ], progress_reporter(end_time - start_time, progress) if progress else None)
+
+
+def cut_smart(input_path, output_path, start_time, end_time, log=None, work_dir=None, progress=None):
+    """
+    Corta o vídeo com precisão de quadro recodificando apenas as bordas do intervalo
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        log: Callback para mensagens (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+    """
+    end_time = validate_range(start_time, end_time, source_duration(input_path), log)
+    _prepare_output(output_path)
+
+    smart_cut(input_path, output_path, start_time, end_time, log=log, work_dir=work_dir, progress=progress)
+
+
+def cut_parallel(input_path, output_path, start_time, end_time, log=None, progress=None, work_dir=None):
+    """
+    Corta o vídeo recodificando todos os quadros, com blocos codificados em paralelo
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+    """
+    end_time = validate_range(start_time, end_time, source_duration(input_path), log)
+    _prepare_output(output_path)
+
+    parallel_encode(input_path, output_path, start_time, end_time, log=log, progress=progress, work_dir=work_dir)
+
+
+def cut_cached_segments(input_path, output_path, start_time, end_time, cache, log=None, progress=None, work_dir=None):
+    """
+    Corta o vídeo recodificando todos os quadros, reaproveitando os segmentos do cache
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        cache: Opções do cache de segmentos: 'dir', 'max_bytes', 'segment_seconds' e
+            'source_hash' (opcional)
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+
+    Returns:
+        dict: Segmentos usados, obtidos do cache e codificados (ver cut_segmented)
+    """
+    end_time = validate_range(start_time, end_time, source_duration(input_path), log)
+    _prepare_output(output_path)
+
+    options = {key: cache[key] for key in ('max_bytes', 'segment_seconds', 'source_hash') if cache.get(key) is not None}
+    return cut_segmented(
+        input_path, output_path, start_time, end_time, cache['dir'],
+        log=log, progress=progress, work_dir=work_dir, **options
+    )
+
+
+def cut_renditions(input_path, start_time, end_time, renditions, log=None, progress=None):
+    """
+    Corta o vídeo gerando várias versões (resoluções, qualidades e containers) em uma única decodificação
+
+    Args:
+        input_path: Arquivo de entrada
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        renditions: Lista de perfis normalizados, cada um com 'output_path'
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+
+    Returns:
+        list: Caminho e tamanho de cada versão gerada
+    """
+    end_time = validate_range(start_time, end_time, source_duration(input_path), log)
+
+    return render_ladder(input_path, start_time, end_time, renditions, log=log, progress=progress)
+
+
+def cut_transforms(input_path, output_path, start_time, end_time, transforms, log=None, progress=None):
+    """
+    Corta o vídeo aplicando uma lista ordenada de transformações em uma única codificação
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        transforms: Lista de transformações normalizadas (ver normalize_transform)
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+    """
+    end_time = validate_range(start_time, end_time, source_duration(input_path), log)
+
+    cut_transformed(input_path, output_path, start_time, end_time, transforms, log=log, progress=progress)
+
+
+def cut(input_path, output_path, start_time, end_time, mode='reencode', log=None, progress=None, work_dir=None):
+    """
+    Corta um vídeo usando o modo informado
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        mode: Modo de corte (ver CUT_MODES)
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe um dicionário com 'percent' (0-100), 'out_time'
+            (segundos processados do intervalo), 'fps' e 'speed' (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+
+    Raises:
+        EngineError: Se o modo for inválido ou o corte falhar
+    """
+    if mode == 'copy':
+        cut_copy(input_path, output_path, start_time, end_time, log, progress)
+    elif mode == 'smart':
+        cut_smart(input_path, output_path, start_time, end_time, log, work_dir, progress)
+    elif mode == 'parallel':
+        cut_parallel(input_path, output_path, start_time, end_time, log, progress, work_dir)
+    elif mode == 'reencode':
+        cut_reencode(input_path, output_path, start_time, end_time, log, work_dir, progress)
+    else:
+        raise EngineError(f"Modo de corte inválido: {mode}. Use um dos modos: {', '.join(CUT_MODES)}")
+
+
+def cut_multiple(input_path, ranges, mode='reencode', log=None, progress=None, work_dir=None):
+    """
+    Corta vários intervalos de um vídeo lendo a origem uma única vez
+
+    Args:
+        input_path: Arquivo de entrada
+        ranges: Lista de tuplas (início em segundos, fim em segundos, arquivo de saída)
+        mode: Modo de corte (ver CUT_MODES)
+        log: Callback para mensagens (opcional)
+        progress: Callback para o progresso por intervalo (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+
+    Raises:
+        EngineError: Se o modo ou algum intervalo for inválido, ou se o corte falhar
+    """
+    if mode not in CUT_MODES:
+        raise EngineError(f"Modo de corte inválido: {mode}. Use um dos modos: {', '.join(CUT_MODES)}")
+
+    if not ranges:
+        raise EngineError("Nenhum intervalo de corte informado.")
+
+    duration = source_duration(input_path)
+
+    validated = []
+    for start_time, end_time, output_path in ranges:
+        end_time = validate_range(start_time, end_time, duration, log)
+        _prepare_output(output_path)
+        validated.append((start_time, end_time, output_path))
+
+    cut_ranges(input_path, validated, mode, log=log, progress=progress, work_dir=work_dir)
@@ -0,0 +1,40 @@
+class EngineError(Exception):
+    """
+    Erro genérico do motor de processamento de vídeo
+    """
+    pass
+
+
+class FFmpegError(EngineError):
+    """
+    Erro na execução do ffmpeg/ffprobe
+    """
+
+    def __init__(self, message, command=None, stderr=None, return_code=None):
+        """
+        Inicializa o erro do ffmpeg
+
+        Args:
+            message: Mensagem de erro
+            command: Comando executado (opcional)
+            stderr: Saída de erro do processo (opcional)
+            return_code: Código de retorno do processo (opcional)
+        """
+        super().__init__(message)
+        self.command = command
+        self.stderr = stderr
+        self.return_code = return_code
+
+
+class JobCancelled(EngineError):
+    """
+    Job interrompido por um pedido de cancelamento
+    """
+    pass
+
+
+class MediaParseError(EngineError):
+    """
+    Erro ao interpretar a estrutura de um container de mídia
+    """
+    pass
@@ -0,0 +1,532 @@
+import os
+import json
+import threading
+import subprocess
+from app.engine.errors import FFmpegError, JobCancelled
+
+# Binários utilizados pelo motor (podem ser sobrescritos por variáveis de ambiente)
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+FFPROBE_BIN = os.getenv("FFPROBE_BIN", "ffprobe")
+
+
+# Intervalo entre as verificações de cancelamento enquanto o ffmpeg executa (segundos)
+CANCEL_POLL_SECONDS = 0.5
+
+# Função que indica se o job atual foi cancelado (definida pelo processo de trabalho)
+_cancel_check = None
+
+
+# Codificadores usados para recodificar trechos mantendo o codec de origem
+MATCHING_ENCODERS = {
+    'h264': 'libx264',
+    'hevc': 'libx265',
+}
+
+# Perfis do ffprobe convertidos para os nomes aceitos pelos codificadores
+ENCODER_PROFILES = {
+    'Constrained Baseline': 'baseline',
+    'Baseline': 'baseline',
+    'Main': 'main',
+    'High': 'high',
+    'High 10': 'high10',
+    'High 4:2:2': 'high422',
+    'High 4:4:4 Predictive': 'high444',
+    'Main 10': 'main10',
+}
+
+# Incremento de niceness (POSIX) dos processos executados em baixa prioridade
+LOW_PRIORITY_NICENESS = 10
+
+# Codecs de áudio que podem ser copiados para MP4 sem recodificar
+MP4_AUDIO_CODECS = ('aac', 'mp3')
+
+
+def format_seconds(seconds, precision=3):
+    """
+    Formata segundos para uso em argumentos do ffmpeg
+
+    Args:
+        seconds: Tempo em segundos
+        precision: Casas decimais (padrão: 3, milissegundos)
+
+    Returns:
+        str: Tempo formatado (ex: 90.500)
+    """
+    return f"{max(seconds, 0):.{precision}f}"
+
+
+def set_cancel_check(check):
+    """
+    Define a função consultada para saber se o job atual foi cancelado
+
+    Enquanto ela retornar True, os processos do ffmpeg em execução são encerrados
+    e JobCancelled é lançado.
+
+    Args:
+        check: Função sem argumentos que retorna bool (ou None para desativar)
+    """
+    global _cancel_check
+    _cancel_check = check
+
+
+def cancel_check_enabled():
+    """
+    Indica se há uma verificação de cancelamento ativa (job executando no pool)
+    """
+    return _cancel_check is not None
+
+
+def check_cancelled(process=None):
+    """
+    Lança JobCancelled se o job atual foi cancelado, encerrando o processo informado
+
+    Args:
+        process: Processo do ffmpeg em execução (opcional)
+
+    Raises:
+        JobCancelled: Se o cancelamento foi solicitado
+    """
+    if _cancel_check is None or not _cancel_check():
+        return
+
+    if process is not None and process.poll() is None:
+        process.kill()
+        process.wait()
+
+    raise JobCancelled("Job cancelado")
+
+
+def run_ffmpeg(args):
+    """
+    Executa o ffmpeg com os argumentos informados
+
+    Args:
+        args: Lista de argumentos (sem o binário)
+
+    Returns:
+        subprocess.CompletedProcess: Resultado da execução
+
+    Raises:
+        FFmpegError: Se o ffmpeg não for encontrado ou terminar com erro
+        JobCancelled: Se o job for cancelado durante a execução
+    """
+    command = [FFMPEG_BIN, '-hide_banner', '-nostdin', '-loglevel', 'error', '-y'] + list(args)
+
+    check_cancelled()
+
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        raise FFmpegError(f"Executável do ffmpeg não encontrado: {FFMPEG_BIN}", command=command)
+
+    # Aguardar o término verificando periodicamente o cancelamento
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=CANCEL_POLL_SECONDS)
+            break
+        except subprocess.TimeoutExpired:
+            check_cancelled(process)
+
+    result = subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    if result.returncode != 0:
+        raise FFmpegError(
+            f"ffmpeg terminou com código {result.returncode}: {result.stderr.strip()}",
+            command=command,
+            stderr=result.stderr,
+            return_code=result.returncode
+        )
+
+    return result
+
+
+def _parse_progress_time(value):
+    """
+    Converte o campo out_time do -progress do ffmpeg (HH:MM:SS.micro) para segundos
+    """
+    try:
+        h, m, s = value.split(':')
+        return int(h) * 3600 + int(m) * 60 + float(s)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _priority_options(low_priority):
+    """
+    Obtém as opções do Popen para executar um processo em baixa prioridade de CPU
+    """
+    if not low_priority:
+        return {}
+    if os.name == 'nt':
+        return {'creationflags': subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+    return {'preexec_fn': lambda: os.nice(LOW_PRIORITY_NICENESS)}
+
+
+def run_ffmpeg_progress(args, on_progress=None, low_priority=False):
+    """
+    Executa o ffmpeg lendo o canal de progresso (-progress) em tempo real
+
+    Args:
+        args: Lista de argumentos (sem o binário)
+        on_progress: Callback chamado a cada atualização com um dicionário
+            contendo out_time (segundos), frame, fps, speed e progress
+        low_priority: Executar o ffmpeg com prioridade de CPU reduzida (padrão: False)
+
+    Raises:
+        FFmpegError: Se o ffmpeg não for encontrado ou terminar com erro
+        JobCancelled: Se o job for cancelado durante a execução
+    """
+    command = [
+        FFMPEG_BIN, '-hide_banner', '-nostdin', '-loglevel', 'error', '-y',
+        '-progress', 'pipe:1', '-nostats'
+    ] + list(args)
+
+    check_cancelled()
+
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            **_priority_options(low_priority)
+        )
+    except FileNotFoundError:
+        raise FFmpegError(f"Executável do ffmpeg não encontrado: {FFMPEG_BIN}", command=command)
+
+    # Drenar stderr em paralelo para o processo não bloquear com o pipe cheio
+    stderr_lines = []
+    stderr_thread = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+    stderr_thread.start()
+
+    block = {}
+    for line in process.stdout:
+        key, _, value = line.strip().partition('=')
+        if not key:
+            continue
+        block[key] = value
+
+        if key == 'progress':
+            # O ffmpeg envia um bloco de progresso a cada ~0,5s
+            check_cancelled(process)
+            if on_progress:
+                speed = block.get('speed', '').rstrip('x')
+                fps = block.get('fps')
+                on_progress({
+                    'out_time': _parse_progress_time(block.get('out_time')),
+                    'frame': int(block['frame']) if block.get('frame', '').isdigit() else None,
+                    'fps': float(fps) if fps and fps != 'N/A' else None,
+                    'speed': float(speed) if speed and speed != 'N/A' else None,
+                    'progress': value,
+                })
+            block = {}
+
+    process.wait()
+    stderr_thread.join()
+    stderr = ''.join(stderr_lines)
+
+    if process.returncode != 0:
+        raise FFmpegError(
+            f"ffmpeg terminou com código {process.returncode}: {stderr.strip()}",
+            command=command,
+            stderr=stderr,
+            return_code=process.returncode
+        )
+
+
+def iter_ffmpeg_output(args, chunk_size):
+    """
+    Executa o ffmpeg e lê a saída (stdout) em blocos de tamanho fixo
+
+    Usado para processar vídeo ou áudio brutos (rawvideo/PCM) em memória limitada.
+    O processo é encerrado se o consumidor parar de ler antes do fim.
+
+    Args:
+        args: Lista de argumentos (sem o binário); a saída deve ser pipe:1
+        chunk_size: Tamanho de cada bloco em bytes (o último pode ser menor)
+
+    Yields:
+        bytes: Blocos da saída do ffmpeg
+
+    Raises:
+        FFmpegError: Se o ffmpeg não for encontrado ou terminar com erro
+        JobCancelled: Se o job for cancelado durante a execução
+    """
+    command = [FFMPEG_BIN, '-hide_banner', '-nostdin', '-loglevel', 'error'] + list(args)
+
+    check_cancelled()
+
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise FFmpegError(f"Executável do ffmpeg não encontrado: {FFMPEG_BIN}", command=command)
+
+    # Drenar stderr em paralelo para o processo não bloquear com o pipe cheio
+    stderr_chunks = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.extend(process.stderr), daemon=True)
+    stderr_thread.start()
+
+    try:
+        while True:
+            check_cancelled(process)
+            chunk = process.stdout.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        # Consumidor interrompido: encerrar o ffmpeg
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+        stderr_thread.join()
+
+    stderr = b''.join(stderr_chunks).decode('utf-8', errors='replace')
+    if process.returncode != 0:
+        raise FFmpegError(
+            f"ffmpeg terminou com código {process.returncode}: {stderr.strip()}",
+            command=command,
+            stderr=stderr,
+            return_code=process.returncode
+        )
+
+
+def probe(path):
+    """
+    Lê os metadados de formato e streams de um arquivo com o ffprobe
+
+    O ffprobe lê apenas os cabeçalhos do container, sem decodificar o vídeo.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        dict: Saída JSON do ffprobe com as chaves 'format' e 'streams'
+
+    Raises:
+        FFmpegError: Se o ffprobe falhar
+    """
+    command = [
+        FFPROBE_BIN, '-v', 'error',
+        '-show_format', '-show_streams',
+        '-of', 'json',
+        path
+    ]
+
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise FFmpegError(f"Executável do ffprobe não encontrado: {FFPROBE_BIN}", command=command)
+
+    if result.returncode != 0:
+        raise FFmpegError(
+            f"ffprobe terminou com código {result.returncode}: {result.stderr.strip()}",
+            command=command,
+            stderr=result.stderr,
+            return_code=result.returncode
+        )
+
+    return json.loads(result.stdout or '{}')
+
+
+def get_duration(path):
+    """
+    Obtém a duração de um arquivo de mídia
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        float: Duração em segundos ou None se não for possível determinar
+    """
+    return _info_duration(probe(path))
+
+
+def _info_duration(info):
+    """
+    Obtém a duração a partir da saída do ffprobe
+    """
+    duration = info.get('format', {}).get('duration')
+
+    if duration is None:
+        # Alguns containers só informam a duração nas streams
+        durations = [float(s['duration']) for s in info.get('streams', []) if s.get('duration')]
+        return max(durations) if durations else None
+
+    return float(duration)
+
+
+def get_stream(info, codec_type):
+    """
+    Obtém a primeira stream de um tipo a partir da saída do ffprobe
+
+    Args:
+        info: Saída de probe()
+        codec_type: Tipo da stream ('video' ou 'audio')
+
+    Returns:
+        dict: Dados da stream ou None se não existir
+    """
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == codec_type:
+            return stream
+    return None
+
+
+def media_info(path):
+    """
+    Obtém as informações básicas de um arquivo de mídia lendo apenas os cabeçalhos
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        dict: 'duration' (segundos), 'width', 'height', 'video_codec', 'audio_codec'
+            e 'bitrate' (bits/s); valores ausentes no arquivo são None
+
+    Raises:
+        FFmpegError: Se o ffprobe falhar
+    """
+    info = probe(path)
+    video_stream = get_stream(info, 'video') or {}
+    audio_stream = get_stream(info, 'audio') or {}
+    bitrate = info.get('format', {}).get('bit_rate')
+
+    return {
+        'duration': _info_duration(info),
+        'width': video_stream.get('width'),
+        'height': video_stream.get('height'),
+        'video_codec': video_stream.get('codec_name'),
+        'audio_codec': audio_stream.get('codec_name'),
+        'bitrate': int(bitrate) if bitrate else None,
+    }
+
+
+def list_keyframes(path, start_time=None, end_time=None):
+    """
+    Lista os timestamps dos keyframes da primeira stream de vídeo
+
+    Lê apenas os pacotes (sem decodificar), limitado ao intervalo informado.
+
+    Args:
+        path: Caminho do arquivo
+        start_time: Início do intervalo em segundos (opcional)
+        end_time: Fim do intervalo em segundos (opcional)
+
+    Returns:
+        list: Timestamps dos keyframes em segundos, em ordem crescente
+
+    Raises:
+        FFmpegError: Se o ffprobe falhar
+    """
+    command = [
+        FFPROBE_BIN, '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0'
+    ]
+
+    if start_time is not None or end_time is not None:
+        interval_start = format_seconds(start_time or 0)
+        interval_end = format_seconds(end_time) if end_time is not None else ''
+        command += ['-read_intervals', f"{interval_start}%{interval_end}"]
+
+    command.append(path)
+
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise FFmpegError(f"Executável do ffprobe não encontrado: {FFPROBE_BIN}", command=command)
+
+    if result.returncode != 0:
+        raise FFmpegError(
+            f"ffprobe terminou com código {result.returncode}: {result.stderr.strip()}",
+            command=command,
+            stderr=result.stderr,
+            return_code=result.returncode
+        )
+
+    keyframes = set()
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(',')
+        if len(parts) < 2 or parts[0] in ('', 'N/A'):
+            continue
+        if 'K' in parts[1]:
+            keyframes.add(float(parts[0]))
+
+    return sorted(keyframes)
+
+
+def matching_encoder_args(video_stream, crf=18, preset='veryfast'):
+    """
+    Monta argumentos de codificação compatíveis com uma stream de vídeo
+
+    Os trechos recodificados usam o mesmo codec, perfil, nível e formato de
+    pixel da origem para poderem ser concatenados com trechos copiados.
+
+    Args:
+        video_stream: Stream de vídeo retornada pelo ffprobe
+        crf: Fator de qualidade constante (padrão: 18)
+        preset: Preset do codificador (padrão: veryfast)
+
+    Returns:
+        list: Argumentos do ffmpeg para o codificador de vídeo
+    """
+    encoder = MATCHING_ENCODERS.get(video_stream.get('codec_name'), 'libx264')
+    args = ['-c:v', encoder, '-preset', preset, '-crf', str(crf)]
+
+    profile = ENCODER_PROFILES.get(video_stream.get('profile'))
+    if profile and encoder == 'libx264':
+        args += ['-profile:v', profile]
+
+    level = video_stream.get('level')
+    if encoder == 'libx264' and isinstance(level, int) and level > 0:
+        args += ['-level:v', f"{level / 10:.1f}"]
+
+    if video_stream.get('pix_fmt'):
+        args += ['-pix_fmt', video_stream['pix_fmt']]
+
+    return args
+
+
+def audio_copy_args(audio_stream):
+    """
+    Monta argumentos para o áudio em saídas MP4
+
+    Copia o áudio quando o codec é compatível com MP4; caso contrário, recodifica em AAC.
+
+    Args:
+        audio_stream: Stream de áudio retornada pelo ffprobe (ou None)
+
+    Returns:
+        list: Argumentos do ffmpeg para o áudio
+    """
+    if audio_stream is None:
+        return ['-an']
+    if audio_stream.get('codec_name') in MP4_AUDIO_CODECS:
+        return ['-c:a', 'copy']
+    return ['-c:a', 'aac']
+
+
+def concat_files(parts, output_path, list_path, extra_args=None):
+    """
+    Concatena arquivos com o demuxer concat do ffmpeg, sem recodificar
+
+    Args:
+        parts: Lista de caminhos dos arquivos, na ordem
+        output_path: Arquivo de saída
+        list_path: Caminho do arquivo de lista usado pelo demuxer
+        extra_args: Argumentos adicionais de saída (opcional)
+    """
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for part in parts:
+            escaped = os.path.abspath(part).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    run_ffmpeg([
+        '-f', 'concat', '-safe', '0',
+        '-i', list_path,
+        '-map', '0',
+        '-c', 'copy',
+    ] + list(extra_args or []) + [output_path])
@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, get_duration
+from app.engine.progress import progress_reporter
+
+# Versão do formato do manifesto (incrementar ao mudar a estrutura)
+HLS_VERSION = 1
+
+# Nomes dos arquivos gerados no diretório do pacote
+MANIFEST_FILENAME = 'hls.json'
+PLAYLIST_FILENAME = 'playlist.m3u8'
+INIT_FILENAME = 'init.mp4'
+SEGMENT_PATTERN = 'segment_%05d.m4s'
+
+
+def load_hls(output_dir, input_path):
+    """
+    Carrega o manifesto do pacote HLS já gerado para um arquivo
+
+    Args:
+        output_dir: Diretório do pacote
+        input_path: Arquivo de vídeo de origem
+
+    Returns:
+        dict: Manifesto ou None se não existir, for de outra versão ou o arquivo tiver mudado
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(input_path)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('version') != HLS_VERSION:
+        return None
+    if manifest.get('source_size') != stat.st_size or manifest.get('source_mtime') != stat.st_mtime:
+        return None
+
+    return manifest
+
+
+def package_hls(input_path, output_dir, segment_seconds=4, log=None, progress=None):
+    """
+    Empacota um vídeo em HLS com segmentos fMP4, sem recodificar
+
+    As streams são copiadas para um segmento de inicialização e segmentos
+    .m4s, descritos por uma playlist VOD. Como não há recodificação, cada
+    segmento começa em um keyframe: sua duração é a de segment_seconds
+    arredondada para o keyframe seguinte.
+
+    Args:
+        input_path: Arquivo de vídeo (ex: um corte)
+        output_dir: Diretório onde a playlist e os segmentos são gravados
+        segment_seconds: Duração alvo de cada segmento em segundos
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+
+    Returns:
+        dict: Manifesto com a playlist, o segmento de inicialização e os segmentos
+    """
+    if segment_seconds <= 0:
+        raise EngineError("A duração dos segmentos deve ser maior que zero")
+
+    info = probe(input_path)
+    if get_stream(info, 'video') is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+    has_audio = get_stream(info, 'audio') is not None
+    duration = get_duration(input_path) or 0.0
+
+    # Segmentos de um pacote anterior não podem sobrar na pasta
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+
+    if log:
+        log(f"Empacotando em HLS (fMP4) com segmentos de ~{segment_seconds:g}s, sem recodificar")
+
+    args = ['-i', input_path, '-map', '0:v:0']
+    if has_audio:
+        args += ['-map', '0:a:0']
+    args += [
+        '-c', 'copy',
+        '-f', 'hls',
+        '-hls_time', f'{segment_seconds:g}',
+        '-hls_playlist_type', 'vod',
+        '-hls_segment_type', 'fmp4',
+        '-hls_fmp4_init_filename', INIT_FILENAME,
+        '-hls_segment_filename', os.path.join(output_dir, SEGMENT_PATTERN),
+        '-hls_flags', 'independent_segments',
+        os.path.join(output_dir, PLAYLIST_FILENAME)
+    ]
+
+    run_ffmpeg_progress(args, progress_reporter(duration, progress) if progress else None)
+
+    segments = sorted(name for name in os.listdir(output_dir) if name.endswith('.m4s'))
+    if not segments:
+        raise EngineError(f"Nenhum segmento HLS gerado para {input_path}")
+
+    stat = os.stat(input_path)
+    manifest = {
+        'version': HLS_VERSION,
+        'segment_seconds': segment_seconds,
+        'duration': duration,
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'playlist': PLAYLIST_FILENAME,
+        'init': INIT_FILENAME,
+        'segments': segments,
+    }
+
+    # Manifesto por último: sua presença indica que o empacotamento terminou
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    with open(f'{manifest_path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+
+    if log:
+        log(f"{len(segments)} segmento(s) HLS gerado(s)")
+
+    return manifest
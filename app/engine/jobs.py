@@ -0,0 +1,379 @@
+import os
+from app.engine.errors import EngineError, JobCancelled
+from app.engine.cutter import cut, cut_multiple, cut_renditions, cut_transforms, cut_cached_segments, validate_range, source_duration
+from app.engine.segment_cache import SEGMENT_CACHE_MODES
+from app.engine.concat import concat_videos
+from app.engine.thumbnails import generate_thumbnails
+from app.engine.scenes import detect_scenes
+from app.engine.audio import analyze_audio, pick_highlight
+from app.engine.silence import silence_trim
+from app.engine.preview import render_preview
+from app.engine.hls import package_hls
+from app.engine.mezzanine import transcode_mezzanine
+
+# Tipos de job aceitos pelo motor
+JOB_TYPES = ('cut', 'concat', 'thumbnails', 'scenes', 'audio', 'silence_trim', 'preview', 'hls', 'mezzanine')
+
+# Margem sobre a fração da origem estimada para os intermediários de um corte
+# (o bitrate varia ao longo do vídeo)
+WORK_BYTES_MARGIN = 0.25
+
+
+def parse_time(value):
+    """
+    Converte um tempo no formato HH:MM:SS[.mmm] para segundos
+
+    Args:
+        value: Tempo em texto (ex: 01:02:03.500)
+
+    Returns:
+        float: Tempo em segundos
+
+    Raises:
+        EngineError: Se o formato for inválido
+    """
+    try:
+        h, m, s = str(value).split(':')
+        seconds = int(h) * 3600 + int(m) * 60 + float(s)
+    except ValueError:
+        raise EngineError(f"Tempo inválido: {value}. Use o formato HH:MM:SS[.mmm]")
+
+    # Sinal em qualquer campo (ex: -00:00:01 seria lido como 1 segundo)
+    if seconds < 0 or '-' in str(value):
+        raise EngineError(f"Tempo inválido: {value}")
+
+    return seconds
+
+
+def format_time(seconds):
+    """
+    Formata segundos no formato HH:MM:SS.mmm (inverso de parse_time)
+
+    Args:
+        seconds: Tempo em segundos
+
+    Returns:
+        str: Tempo formatado (ex: 01:02:03.500)
+    """
+    milliseconds = int(round(max(seconds, 0) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+
+def estimate_work_bytes(job):
+    """
+    Estima o tamanho dos arquivos intermediários de um job
+
+    Usa o tamanho das entradas como limite superior: os trechos intermediários
+    nunca somam mais que a origem lida. Nos cortes, conta apenas a fração da
+    origem coberta pelos intervalos (soma das durações / duração da origem),
+    com a margem WORK_BYTES_MARGIN para a variação do bitrate.
+
+    Args:
+        job: Dicionário do job
+
+    Returns:
+        int: Tamanho estimado em bytes
+    """
+    paths = job.get('inputs') or [job.get('input')]
+    total = 0
+    for path in paths:
+        if path and os.path.exists(path):
+            total += os.path.getsize(path)
+
+    fraction = _cut_fraction(job) if job.get('type') == 'cut' and total else None
+    if fraction is None:
+        return total
+    return int(total * min(fraction * (1 + WORK_BYTES_MARGIN), 1))
+
+
+def _cut_fraction(job):
+    """
+    Fração da duração da origem coberta pelos intervalos de um corte
+
+    Returns:
+        float: Fração (pode passar de 1 com intervalos sobrepostos) ou None se desconhecida
+    """
+    if job.get('auto_length'):
+        seconds = job['auto_length']
+    else:
+        try:
+            seconds = sum(end_time - start_time for start_time, end_time, _ in job.get('ranges') or [])
+        except TypeError:
+            return None
+
+    try:
+        duration = source_duration(job['input'])
+    except EngineError:
+        return None
+    if not duration or seconds <= 0:
+        return None
+    return seconds / duration
+
+
+def _run_auto_cut(job, output_path, mode, log=None, progress=None, work_dir=None):
+    """
+    Corta o trecho mais intenso do áudio com a duração job['auto_length']
+
+    A análise de áudio (quando as características não foram informadas) ocupa a
+    primeira metade do progresso e o corte, a segunda.
+    """
+    features = job.get('audio_features')
+    computed = None
+
+    if not features:
+        report = (lambda percent: progress({'percent': round(percent / 2, 2)})) if progress else None
+        features = computed = analyze_audio(job['input'], log=log, progress=report)
+        offset, scale = 50, 0.5
+    else:
+        offset, scale = 0, 1
+
+    start_time, end_time = pick_highlight(features, job['auto_length'])
+    if log:
+        log(f"Trecho escolhido pelo áudio: {start_time:.3f}s a {end_time:.3f}s")
+
+    report = (lambda data: progress({**data, 'percent': round(offset + data['percent'] * scale, 2)})) if progress else None
+    cut(job['input'], output_path, start_time, end_time, mode=mode, log=log, progress=report, work_dir=work_dir)
+
+    result = {'output_paths': [output_path], 'auto_range': [start_time, end_time]}
+    if computed:
+        result['audio'] = computed
+    return result
+
+
+def _run_segmented_cut(job, ranges, log=None, progress=None, work_dir=None):
+    """
+    Corta cada intervalo pelo cache de segmentos (ver cut_cached_segments)
+
+    Os intervalos são cortados em sequência, de modo que intervalos sobrepostos do
+    mesmo job também reaproveitam os segmentos uns dos outros.
+    """
+    summaries = []
+    for i, (start_time, end_time, output_path) in enumerate(ranges):
+        report = progress
+        if progress and len(ranges) > 1:
+            def report(data, i=i):
+                progress({
+                    'percent': round((i * 100 + data['percent']) / len(ranges), 2),
+                    'ranges': [
+                        {'index': index, 'percent': 100.0 if index < i else data['percent'] if index == i else 0.0}
+                        for index in range(len(ranges))
+                    ]
+                })
+
+        summaries.append(cut_cached_segments(
+            job['input'], output_path, start_time, end_time, job['segment_cache'],
+            log=log, progress=report, work_dir=work_dir
+        ))
+
+    return {'output_paths': [output_path for _, _, output_path in ranges], 'segment_cache': summaries}
+
+
+def _range_reporter(progress, indexes):
+    """
+    Converte o progresso de um subconjunto dos intervalos para os índices do job
+    """
+    def report(data):
+        progress({
+            **data,
+            'ranges': [
+                {'index': indexes[entry['index']], 'percent': entry['percent']}
+                for entry in data.get('ranges', [])
+            ]
+        })
+    return report
+
+
+def _run_batch_cut(job, ranges, mode, log=None, progress=None, work_dir=None):
+    """
+    Corta os intervalos de um lote de cortes independentes ('batch' no job)
+
+    Cada intervalo pertence a uma requisição diferente: um intervalo inválido ou
+    que falhe não pode derrubar os demais. Os intervalos válidos são cortados
+    juntos, lendo a origem uma vez; se essa execução falhar, cada um é cortado
+    separadamente. O erro de cada intervalo (ou None) volta em 'range_errors'.
+    """
+    errors = [None] * len(ranges)
+    duration = source_duration(job['input'])
+
+    valid = []
+    for index, (start_time, end_time, output_path) in enumerate(ranges):
+        try:
+            valid.append((index, (start_time, validate_range(start_time, end_time, duration, log), output_path)))
+        except EngineError as e:
+            errors[index] = str(e)
+
+    indexes = [index for index, _ in valid]
+    valid_ranges = [cut_range for _, cut_range in valid]
+    result = {'output_paths': [output_path for _, _, output_path in ranges], 'range_errors': errors}
+
+    if job.get('segment_cache') and mode in SEGMENT_CACHE_MODES:
+        # Os intervalos já são cortados um a um
+        summaries = [None] * len(ranges)
+        for position, (index, cut_range) in enumerate(valid):
+            try:
+                summaries[index] = _run_segmented_cut(job, [cut_range], log=log, work_dir=work_dir)['segment_cache'][0]
+            except JobCancelled:
+                raise
+            except Exception as e:
+                errors[index] = str(e)
+            if progress:
+                progress({'percent': round((position + 1) / len(valid) * 100, 2), 'ranges': [{'index': index, 'percent': 100.0}]})
+        result['segment_cache'] = summaries
+        return result
+
+    if not valid:
+        return result
+
+    try:
+        report = _range_reporter(progress, indexes) if progress else None
+        cut_multiple(job['input'], valid_ranges, mode=mode, log=log, progress=report, work_dir=work_dir)
+        return result
+    except JobCancelled:
+        raise
+    except Exception as e:
+        if len(valid) == 1:
+            errors[indexes[0]] = str(e)
+            return result
+        if log:
+            log(f"Falha no corte conjunto dos intervalos ({str(e)}); cortando cada intervalo separadamente")
+
+    for index, (start_time, end_time, output_path) in valid:
+        try:
+            cut(job['input'], output_path, start_time, end_time, mode=mode, log=log, work_dir=work_dir)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            errors[index] = str(e)
+        if progress:
+            progress({'percent': round((indexes.index(index) + 1) / len(valid) * 100, 2), 'ranges': [{'index': index, 'percent': 100.0}]})
+
+    return result
+
+
+def run_job(job, log=None, progress=None, work_dir=None):
+    """
+    Executa um job do motor descrito por um dicionário
+
+    Formatos aceitos:
+        {'type': 'cut', 'input': caminho, 'mode': modo, 'ranges': [[início, fim, saída], ...]}
+        {'type': 'cut', 'input': caminho, 'ranges': [[início, fim, None]], 'renditions': [perfil, ...]}
+        {'type': 'cut', 'input': caminho, 'mode': modo, 'ranges': [[None, None, saída]], 'auto_length': segundos,
+         'audio_features': características (opcional)}
+        {'type': 'cut', 'input': caminho, 'mode': 'reencode' ou 'parallel', 'ranges': [...],
+         'segment_cache': {'dir': diretório, 'max_bytes': bytes, 'segment_seconds': segundos, 'source_hash': hash}}
+        {'type': 'cut', 'input': caminho, 'mode': modo, 'ranges': [...], 'batch': True} (intervalos independentes)
+        {'type': 'concat', 'inputs': [caminho, ...], 'output': caminho}
+        {'type': 'thumbnails', 'input': caminho, 'output_dir': diretório, 'interval': segundos, 'width': pixels}
+        {'type': 'scenes', 'input': caminho, 'fps': quadros/s, 'width': pixels, 'height': pixels, 'threshold': limiar}
+        {'type': 'audio', 'input': caminho}
+        {'type': 'silence_trim', 'input': caminho, 'output': caminho, 'threshold_db': dB,
+         'min_silence': segundos, 'padding': segundos}
+
+    Com 'batch', cada intervalo é de uma requisição diferente e falha sozinho
+    (ver _run_batch_cut); o resultado traz 'range_errors'.
+
+    Com 'auto_length', o início do corte é escolhido pelo trecho mais intenso do
+    áudio (ver pick_highlight), usando as características informadas ou
+    calculando-as antes do corte.
+
+    Os tempos dos intervalos são em segundos.
+
+    Args:
+        job: Dicionário do job
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe um dicionário com 'percent'; nos cortes, também
+            'out_time' (segundos processados do intervalo), 'fps' e 'speed' do
+            codificador e, com vários intervalos, a lista 'ranges' (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+
+    Returns:
+        dict: Resultado do job ('output_paths' no corte, mais 'renditions' quando há
+            perfis de saída e 'segment_cache' com o uso do cache de segmentos, 'inputs' na concatenação, o manifesto nas miniaturas,
+            as cenas na análise de cenas, as características na análise de áudio e
+            os segundos removidos na remoção de silêncios, o arquivo gerado na prévia e
+            o manifesto no empacotamento HLS e a versão de trabalho gerada na ingestão;
+            no corte automático, também 'auto_range' e as características calculadas em 'audio')
+
+    Raises:
+        EngineError: Se o job for inválido ou falhar
+    """
+    job_type = job.get('type')
+
+    if job_type == 'cut':
+        ranges = [tuple(cut_range) for cut_range in job['ranges']]
+        mode = job.get('mode', 'reencode')
+
+        if job.get('auto_length'):
+            return _run_auto_cut(job, ranges[0][2], mode, log=log, progress=progress, work_dir=work_dir)
+
+        if job.get('renditions'):
+            start_time, end_time, _ = ranges[0]
+            renditions = cut_renditions(job['input'], start_time, end_time, job['renditions'], log=log, progress=progress)
+            return {
+                'output_paths': [rendition['output_path'] for rendition in renditions],
+                'renditions': renditions
+            }
+
+        if job.get('transforms'):
+            # Transformações: sempre uma única decodificação e codificação, qualquer que seja o modo
+            start_time, end_time, output_path = ranges[0]
+            cut_transforms(job['input'], output_path, start_time, end_time, job['transforms'], log=log, progress=progress)
+            return {'output_paths': [output_path]}
+
+        if job.get('batch'):
+            return _run_batch_cut(job, ranges, mode, log=log, progress=progress, work_dir=work_dir)
+
+        if job.get('segment_cache') and mode in SEGMENT_CACHE_MODES:
+            return _run_segmented_cut(job, ranges, log=log, progress=progress, work_dir=work_dir)
+
+        if len(ranges) == 1:
+            start_time, end_time, output_path = ranges[0]
+            cut(job['input'], output_path, start_time, end_time, mode=mode, log=log, progress=progress, work_dir=work_dir)
+        else:
+            cut_multiple(job['input'], ranges, mode=mode, log=log, progress=progress, work_dir=work_dir)
+
+        return {'output_paths': [output_path for _, _, output_path in ranges]}
+
+    if job_type == 'concat':
+        report = (lambda percent: progress({'percent': percent})) if progress else None
+        inputs = concat_videos(job['inputs'], job['output'], log=log, progress=report, work_dir=work_dir)
+        return {'output_path': job['output'], 'inputs': inputs}
+
+    if job_type == 'thumbnails':
+        report = (lambda percent: progress({'percent': percent})) if progress else None
+        manifest = generate_thumbnails(
+            job['input'], job['output_dir'], job['interval'],
+            width=job.get('width', 160), log=log, progress=report
+        )
+        return {'output_dir': job['output_dir'], 'manifest': manifest}
+
+    if job_type == 'scenes':
+        report = (lambda percent: progress({'percent': percent})) if progress else None
+        options = {key: job[key] for key in ('fps', 'width', 'height', 'threshold', 'min_scene') if job.get(key) is not None}
+        return detect_scenes(job['input'], log=log, progress=report, **options)
+
+    if job_type == 'audio':
+        report = (lambda percent: progress({'percent': percent})) if progress else None
+        return analyze_audio(job['input'], log=log, progress=report)
+
+    if job_type == 'silence_trim':
+        report = (lambda percent: progress({'percent': percent})) if progress else None
+        options = {key: job[key] for key in ('threshold_db', 'min_silence', 'padding') if job.get(key) is not None}
+        return silence_trim(job['input'], job['output'], log=log, progress=report, work_dir=work_dir, **options)
+
+    if job_type == 'preview':
+        options = {key: job[key] for key in ('fmt', 'max_width', 'max_fps') if job.get(key) is not None}
+        return render_preview(job['input'], job['output'], log=log, progress=progress, **options)
+
+    if job_type == 'hls':
+        manifest = package_hls(job['input'], job['output_dir'], job.get('segment_seconds', 4), log=log, progress=progress)
+        return {'output_dir': job['output_dir'], 'manifest': manifest}
+
+    if job_type == 'mezzanine':
+        options = {key: job[key] for key in ('keyframe_interval', 'crf') if job.get(key) is not None}
+        return transcode_mezzanine(job['input'], job['output'], log=log, progress=progress, **options)
+
+    raise EngineError(f"Tipo de job inválido: {job_type}. Use um dos tipos: {', '.join(JOB_TYPES)}")
@@ -0,0 +1,261 @@
+import os
+import json
+import bisect
+from app.engine.errors import MediaParseError
+from app.engine.containers import read_keyframes
+from app.engine.ffmpeg import list_keyframes
+
+# Versão do formato do arquivo de índice (incrementar ao mudar a estrutura)
+INDEX_VERSION = 1
+
+# Sufixo do arquivo de índice salvo ao lado do vídeo
+INDEX_SUFFIX = '.kfindex.json'
+
+
+class KeyframeIndex:
+    """
+    Índice de keyframes (tempo e posição em bytes) de um arquivo de vídeo
+    """
+
+    def __init__(self, keyframes, duration=None, container=None, source_size=None, source_mtime=None):
+        """
+        Inicializa o índice
+
+        Args:
+            keyframes: Lista de tuplas (tempo em segundos, posição em bytes)
+            duration: Duração do vídeo em segundos (opcional)
+            container: Tipo de container ('mp4' ou 'mkv') (opcional)
+            source_size: Tamanho do arquivo indexado em bytes (opcional)
+            source_mtime: Data de modificação do arquivo indexado (opcional)
+        """
+        self.keyframes = sorted(keyframes)
+        self.times = [time for time, _ in self.keyframes]
+        self.duration = duration
+        self.container = container
+        self.source_size = source_size
+        self.source_mtime = source_mtime
+
+    def keyframes_between(self, start_time, end_time):
+        """
+        Lista os keyframes dentro de um intervalo
+
+        Args:
+            start_time: Início do intervalo em segundos
+            end_time: Fim do intervalo em segundos
+
+        Returns:
+            list: Timestamps dos keyframes no intervalo
+        """
+        first = bisect.bisect_left(self.times, start_time)
+        last = bisect.bisect_right(self.times, end_time)
+        return self.times[first:last]
+
+    def keyframe_before(self, time):
+        """
+        Obtém o último keyframe anterior ou igual a um tempo
+
+        Returns:
+            tuple: (tempo, posição) ou None se não houver
+        """
+        index = bisect.bisect_right(self.times, time) - 1
+        return self.keyframes[index] if index >= 0 else None
+
+    def keyframe_after(self, time):
+        """
+        Obtém o primeiro keyframe posterior ou igual a um tempo
+
+        Returns:
+            tuple: (tempo, posição) ou None se não houver
+        """
+        index = bisect.bisect_left(self.times, time)
+        return self.keyframes[index] if index < len(self.keyframes) else None
+
+    def matches(self, path):
+        """
+        Verifica se o índice ainda corresponde ao arquivo (tamanho e data de modificação)
+
+        Args:
+            path: Caminho do arquivo de vídeo
+
+        Returns:
+            bool: True se o arquivo não mudou desde a indexação
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return stat.st_size == self.source_size and stat.st_mtime == self.source_mtime
+
+    def to_dict(self):
+        """
+        Converte o índice para um dicionário serializável
+        """
+        return {
+            'version': INDEX_VERSION,
+            'container': self.container,
+            'duration': self.duration,
+            'source_size': self.source_size,
+            'source_mtime': self.source_mtime,
+            'keyframes': [[time, position] for time, position in self.keyframes],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Cria um índice a partir de um dicionário gerado por to_dict()
+        """
+        return cls(
+            keyframes=[(time, position) for time, position in data.get('keyframes', [])],
+            duration=data.get('duration'),
+            container=data.get('container'),
+            source_size=data.get('source_size'),
+            source_mtime=data.get('source_mtime')
+        )
+
+    def __repr__(self):
+        return f"<KeyframeIndex(container={self.container}, keyframes={len(self.keyframes)})>"
+
+
+def index_path_for(path):
+    """
+    Obtém o caminho do arquivo de índice de um vídeo
+
+    O índice fica ao lado do vídeo como arquivo oculto (ex: .video.mp4.kfindex.json).
+
+    Args:
+        path: Caminho do arquivo de vídeo
+
+    Returns:
+        str: Caminho do arquivo de índice
+    """
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f'.{filename}{INDEX_SUFFIX}')
+
+
+def build_index(path):
+    """
+    Constrói o índice de keyframes de um vídeo lendo o container em Python puro
+
+    Args:
+        path: Caminho do arquivo de vídeo
+
+    Returns:
+        KeyframeIndex: Índice construído
+
+    Raises:
+        MediaParseError: Se o container não for suportado
+    """
+    stat = os.stat(path)
+    container, duration, keyframes = read_keyframes(path)
+
+    if not keyframes:
+        raise MediaParseError(f"Nenhum keyframe encontrado em {path}")
+
+    return KeyframeIndex(
+        keyframes=keyframes,
+        duration=duration,
+        container=container,
+        source_size=stat.st_size,
+        source_mtime=stat.st_mtime
+    )
+
+
+def save_index(path, index):
+    """
+    Salva o índice ao lado do vídeo (escrita atômica)
+
+    Args:
+        path: Caminho do arquivo de vídeo
+        index: KeyframeIndex a salvar
+
+    Returns:
+        str: Caminho do arquivo de índice
+    """
+    index_path = index_path_for(path)
+    temp_path = f'{index_path}.tmp'
+
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index.to_dict(), f)
+    os.replace(temp_path, index_path)
+
+    return index_path
+
+
+def load_index(path):
+    """
+    Carrega o índice salvo de um vídeo
+
+    Args:
+        path: Caminho do arquivo de vídeo
+
+    Returns:
+        KeyframeIndex: Índice ou None se não existir, for de outra versão ou estiver desatualizado
+    """
+    index_path = index_path_for(path)
+    if not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get('version') != INDEX_VERSION:
+        return None
+
+    index = KeyframeIndex.from_dict(data)
+    if not index.matches(path):
+        # O arquivo mudou desde a indexação
+        return None
+
+    return index
+
+
+def get_or_build_index(path):
+    """
+    Carrega o índice de um vídeo, construindo e salvando se necessário
+
+    Args:
+        path: Caminho do arquivo de vídeo
+
+    Returns:
+        KeyframeIndex: Índice ou None se o container não puder ser indexado
+    """
+    index = load_index(path)
+    if index is not None:
+        return index
+
+    try:
+        index = build_index(path)
+    except MediaParseError:
+        return None
+
+    try:
+        save_index(path, index)
+    except OSError:
+        # Sem permissão de escrita: o índice continua válido em memória
+        pass
+
+    return index
+
+
+def find_keyframes(path, start_time, end_time):
+    """
+    Lista os keyframes de um intervalo usando o índice persistido
+
+    Recorre ao ffprobe apenas quando o container não pode ser indexado.
+
+    Args:
+        path: Caminho do arquivo de vídeo
+        start_time: Início do intervalo em segundos
+        end_time: Fim do intervalo em segundos
+
+    Returns:
+        list: Timestamps dos keyframes no intervalo
+    """
+    index = get_or_build_index(path)
+    if index is not None:
+        return index.keyframes_between(start_time, end_time)
+
+    return list_keyframes(path, start_time, end_time)
@@ -0,0 +1,89 @@
+import os
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, get_duration, audio_copy_args
+from app.engine.keyframe_index import get_or_build_index
+from app.engine.progress import progress_reporter
+
+# Intervalo padrão entre keyframes da versão de trabalho (segundos)
+MEZZANINE_KEYFRAME_INTERVAL = 1.0
+
+# CRF da versão de trabalho: visualmente sem perdas, para não degradar os cortes copiados dela
+MEZZANINE_CRF = 18
+
+
+def transcode_mezzanine(input_path, output_path, keyframe_interval=MEZZANINE_KEYFRAME_INTERVAL, crf=MEZZANINE_CRF,
+                        log=None, progress=None):
+    """
+    Recodifica um vídeo em uma versão de trabalho (mezzanine) com keyframes densos
+
+    Os keyframes são forçados a cada keyframe_interval segundos, em GOPs
+    fechados e sem keyframes extras por mudança de cena, de modo que cortes
+    copiados (modo copy) dessa versão comecem no máximo keyframe_interval
+    antes do tempo pedido. O ffmpeg é executado em baixa prioridade de CPU e a
+    saída é gravada em um arquivo temporário, renomeado apenas ao final. O
+    índice de keyframes da versão de trabalho é construído em seguida.
+
+    Args:
+        input_path: Arquivo de origem
+        output_path: Arquivo da versão de trabalho (MP4)
+        keyframe_interval: Intervalo entre keyframes em segundos
+        crf: Qualidade do H.264
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+
+    Returns:
+        dict: 'output_path', 'keyframe_interval', 'duration' e 'size' em bytes
+    """
+    if keyframe_interval <= 0:
+        raise EngineError("O intervalo entre keyframes deve ser maior que zero")
+
+    info = probe(input_path)
+    video_stream = get_stream(info, 'video')
+    if video_stream is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+    audio_stream = get_stream(info, 'audio')
+    duration = get_duration(input_path) or 0.0
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if log:
+        log(f"Gerando versão de trabalho com keyframes a cada {keyframe_interval:g}s (baixa prioridade)")
+
+    temp_path = f'{output_path}.part.mp4'
+    args = ['-i', input_path, '-map', '0:v:0']
+    if audio_stream is not None:
+        args += ['-map', '0:a:0']
+    args += [
+        '-c:v', 'libx264',
+        '-preset', 'veryfast',
+        '-crf', str(crf),
+        '-pix_fmt', 'yuv420p',
+        '-force_key_frames', f'expr:gte(t,n_forced*{keyframe_interval:g})',
+        '-sc_threshold', '0',
+        '-flags', '+cgop',
+    ] + audio_copy_args(audio_stream) + [
+        '-movflags', '+faststart',
+        temp_path
+    ]
+
+    try:
+        run_ffmpeg_progress(args, progress_reporter(duration, progress) if progress else None, low_priority=True)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # Índice de keyframes usado pelos cortes seguintes
+    get_or_build_index(output_path)
+
+    if log:
+        log(f"Versão de trabalho gerada: {output_path}")
+
+    return {
+        'output_path': output_path,
+        'keyframe_interval': keyframe_interval,
+        'duration': get_duration(output_path),
+        'size': os.path.getsize(output_path),
+    }
@@ -0,0 +1,333 @@
+import os
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, format_seconds, list_keyframes
+from app.engine.keyframe_index import get_or_build_index
+from app.engine.smart_cut import smart_cut
+from app.engine.parallel_encode import PARALLEL_ENCODER_ARGS, parallel_encode
+
+# Maior trecho (segundos) entre dois intervalos que ainda é lido (e, no modo
+# reencode, decodificado) para cortá-los em uma mesma leitura; acima disso, o trecho é pulado com seek
+RANGE_MAX_GAP_SECONDS = float(os.getenv("CUT_RANGE_MAX_GAP_SECONDS", "30"))
+
+# Tolerância para comparar timestamps de keyframes (em segundos)
+KEYFRAME_EPSILON = 0.001
+
+
+def range_progress(position, ranges):
+    """
+    Calcula o progresso de cada intervalo a partir da posição lida na origem
+
+    Args:
+        position: Posição atual na origem em segundos
+        ranges: Lista de tuplas (início, fim, saída)
+
+    Returns:
+        list: Percentual (0-100) de cada intervalo
+    """
+    percents = []
+    for start_time, end_time, _ in ranges:
+        done = (position - start_time) / (end_time - start_time)
+        percents.append(round(min(max(done, 0.0), 1.0) * 100, 2))
+    return percents
+
+
+def _progress_reporter(ranges, origin, span, progress):
+    """
+    Cria o callback que converte o progresso do ffmpeg em progresso por intervalo
+
+    Args:
+        ranges: Lista de tuplas (início, fim, saída)
+        origin: Tempo da origem correspondente ao instante zero da leitura
+        span: Duração total lida da origem em segundos
+        progress: Callback que recebe o dicionário de progresso
+    """
+    def report(data):
+        if data.get('out_time') is None:
+            return
+        position = origin + data['out_time']
+        if data.get('progress') == 'end':
+            position = origin + span
+        progress({
+            'percent': round(min(max((position - origin) / span, 0.0), 1.0) * 100, 2) if span else 100.0,
+            'out_time': round(min(max(position - origin, 0.0), span), 3),
+            'fps': data.get('fps'),
+            'speed': data.get('speed'),
+            'ranges': [
+                {'index': index, 'percent': percent}
+                for index, percent in enumerate(range_progress(position, ranges))
+            ]
+        })
+    return report
+
+
+def plan_range_groups(ranges, max_gap=RANGE_MAX_GAP_SECONDS):
+    """
+    Agrupa os intervalos que podem ser cortados em uma mesma leitura da origem
+
+    Intervalos (ordenados pelo início) ficam no mesmo grupo enquanto o trecho
+    entre o fim do grupo e o início do próximo intervalo não passar de max_gap;
+    trechos maiores são pulados com um seek em vez de lidos.
+
+    Args:
+        ranges: Lista de tuplas (início, fim, saída)
+        max_gap: Maior trecho (segundos) lido apenas para unir dois intervalos
+
+    Returns:
+        list: Grupos de índices de ranges, em ordem de início
+    """
+    groups = []
+    group_end = None
+    for index in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+        start_time, end_time, _ = ranges[index]
+        if groups and start_time - group_end <= max_gap:
+            groups[-1].append(index)
+            group_end = max(group_end, end_time)
+        else:
+            groups.append([index])
+            group_end = end_time
+    return groups
+
+
+def _run_groups(ranges, max_gap, run_group, progress=None):
+    """
+    Executa os grupos de intervalos (ver plan_range_groups) um após o outro
+
+    Cada grupo é uma execução do ffmpeg que lê da origem apenas o trecho que o
+    cobre; o progresso de cada grupo é convertido para o conjunto dos intervalos.
+
+    Args:
+        ranges: Lista de tuplas (início, fim, saída)
+        max_gap: Maior trecho (segundos) lido apenas para unir dois intervalos
+        run_group: Função chamada com (intervalos do grupo, callback de progresso do ffmpeg ou None)
+        progress: Callback que recebe o dicionário de progresso (opcional)
+    """
+    groups = plan_range_groups(ranges, max_gap)
+    spans = [
+        max(ranges[i][1] for i in group) - min(ranges[i][0] for i in group)
+        for group in groups
+    ]
+    total = sum(spans)
+    percents = [0.0] * len(ranges)
+    done = 0.0
+
+    for group, span in zip(groups, spans):
+        group_ranges = [ranges[i] for i in group]
+
+        on_progress = None
+        if progress:
+            def report(data, group=group, done=done):
+                for entry in data['ranges']:
+                    percents[group[entry['index']]] = entry['percent']
+                progress({
+                    'percent': round((done + data['out_time']) / total * 100, 2) if total else 100.0,
+                    'out_time': round(done + data['out_time'], 3),
+                    'fps': data.get('fps'),
+                    'speed': data.get('speed'),
+                    'ranges': [{'index': index, 'percent': percent} for index, percent in enumerate(percents)]
+                })
+
+            on_progress = _progress_reporter(group_ranges, group_ranges[0][0], span, report)
+
+        run_group(group_ranges, on_progress)
+        done += span
+
+
+def _keyframe_before(input_path, index, time):
+    """
+    Obtém o último keyframe anterior ou igual a um tempo
+
+    Sem índice (container não indexável), consulta o ffprobe: a leitura de um
+    trecho começa no keyframe anterior a ele, e apenas se nenhum for encontrado
+    a busca é refeita desde o início do arquivo.
+    """
+    if index is not None:
+        keyframe = index.keyframe_before(time)
+        return keyframe[0] if keyframe else time
+
+    for window_start in (time, 0.0):
+        keyframes = [k for k in list_keyframes(input_path, window_start, time + KEYFRAME_EPSILON) if k <= time + KEYFRAME_EPSILON]
+        if keyframes:
+            return keyframes[-1]
+    return time
+
+
+def _copy_group(input_path, ranges, on_progress=None):
+    """
+    Copia as streams de um grupo de intervalos já alinhados aos keyframes, em uma leitura da origem
+    """
+    origin = min(start for start, _, _ in ranges)
+    span = max(end for _, end, _ in ranges) - origin
+
+    args = ['-ss', format_seconds(origin, 6), '-t', format_seconds(span, 6), '-i', input_path]
+    for start_time, end_time, output_path in ranges:
+        # Recuo de meio milissegundo para o keyframe não ser descartado por arredondamento
+        args += [
+            '-ss', format_seconds(start_time - origin - 0.0005, 6),
+            '-t', format_seconds(end_time - start_time, 6),
+            '-map', '0:v?', '-map', '0:a?',
+            '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            '-movflags', '+faststart',
+            output_path
+        ]
+
+    run_ffmpeg_progress(args, on_progress)
+
+
+def _copy_ranges(input_path, ranges, progress=None, max_gap=RANGE_MAX_GAP_SECONDS):
+    """
+    Corta vários intervalos copiando as streams, lendo cada trecho da origem uma única vez
+
+    O início de cada intervalo é alinhado ao keyframe anterior (pelo índice de
+    keyframes ou, sem ele, pelo ffprobe), como no corte simples. Intervalos
+    próximos são copiados juntos (ver plan_range_groups); trechos maiores entre
+    eles são pulados com seek.
+    """
+    index = get_or_build_index(input_path)
+
+    aligned = [
+        (_keyframe_before(input_path, index, start_time), end_time, output_path)
+        for start_time, end_time, output_path in ranges
+    ]
+
+    _run_groups(aligned, max_gap, lambda group, on_progress: _copy_group(input_path, group, on_progress), progress)
+
+
+def _reencode_group(input_path, ranges, has_audio, on_progress=None):
+    """
+    Recodifica um grupo de intervalos decodificando o trecho que os cobre uma única vez
+
+    Monta um único filter graph que divide o vídeo (e o áudio) decodificado entre
+    as saídas com split/trim. Uma saída nula extra acompanha a posição de leitura
+    e serve de referência para o progresso de cada intervalo.
+    """
+    origin = min(start for start, _, _ in ranges)
+    span = max(end for _, end, _ in ranges) - origin
+    count = len(ranges)
+
+    video_labels = ''.join(f'[v{i}]' for i in range(count))
+    filters = [f"[0:v]split={count + 1}[vtap]{video_labels}", "[vtap]null[tap]"]
+    if has_audio:
+        audio_labels = ''.join(f'[a{i}]' for i in range(count))
+        filters.append(f"[0:a]asplit={count}{audio_labels}")
+
+    for i, (start_time, end_time, _) in enumerate(ranges):
+        trim_start = format_seconds(start_time - origin, 6)
+        trim_end = format_seconds(end_time - origin, 6)
+        filters.append(f"[v{i}]trim=start={trim_start}:end={trim_end},setpts=PTS-STARTPTS[ov{i}]")
+        if has_audio:
+            filters.append(f"[a{i}]atrim=start={trim_start}:end={trim_end},asetpts=PTS-STARTPTS[oa{i}]")
+
+    args = [
+        '-ss', format_seconds(origin, 6),
+        '-t', format_seconds(span, 6),
+        '-i', input_path,
+        '-filter_complex', ';'.join(filters),
+        # Primeira saída: acompanha a posição de leitura sem codificar nada relevante
+        '-map', '[tap]', '-f', 'null', '-',
+    ]
+
+    for i, (_, _, output_path) in enumerate(ranges):
+        args += ['-map', f'[ov{i}]'] + PARALLEL_ENCODER_ARGS
+        if has_audio:
+            args += ['-map', f'[oa{i}]', '-c:a', 'aac']
+        args += ['-movflags', '+faststart', output_path]
+
+    run_ffmpeg_progress(args, on_progress)
+
+
+def _reencode_ranges(input_path, ranges, progress=None, max_gap=RANGE_MAX_GAP_SECONDS):
+    """
+    Corta e recodifica vários intervalos, decodificando cada trecho da origem uma única vez
+
+    Intervalos próximos são recodificados juntos (ver plan_range_groups); cada grupo
+    lê da origem apenas o trecho que o cobre, com seek na entrada. Os parâmetros
+    de codificação são os mesmos do modo reencode.
+    """
+    info = probe(input_path)
+    has_video = get_stream(info, 'video') is not None
+    has_audio = get_stream(info, 'audio') is not None
+
+    if not has_video:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+
+    _run_groups(
+        ranges, max_gap,
+        lambda group, on_progress: _reencode_group(input_path, group, has_audio, on_progress),
+        progress
+    )
+
+
+def _smart_ranges(input_path, ranges, log=None, progress=None, work_dir=None):
+    """
+    Aplica o smart cut a cada intervalo
+
+    Cada intervalo lê da origem apenas os trechos que copia ou recodifica,
+    então não há uma decodificação completa a compartilhar entre eles.
+    """
+    for i, (start_time, end_time, output_path) in enumerate(ranges):
+        smart_cut(input_path, output_path, start_time, end_time, log=log, work_dir=work_dir)
+        if progress:
+            progress({
+                'percent': round((i + 1) / len(ranges) * 100, 2),
+                'ranges': [{'index': index, 'percent': 100.0 if index <= i else 0.0} for index in range(len(ranges))]
+            })
+
+
+def _parallel_ranges(input_path, ranges, log=None, progress=None, work_dir=None):
+    """
+    Recodifica cada intervalo em blocos paralelos
+
+    Os núcleos já são ocupados pelos blocos de um mesmo intervalo, então os
+    intervalos são processados um após o outro.
+    """
+    total = sum(end_time - start_time for start_time, end_time, _ in ranges)
+    done = 0.0
+
+    for i, (start_time, end_time, output_path) in enumerate(ranges):
+        def report(data, i=i, done=done):
+            percent = data['percent']
+            progress({
+                'percent': round((done + data['out_time']) / total * 100, 2) if total else 100.0,
+                'out_time': round(done + data['out_time'], 3),
+                'fps': data.get('fps'),
+                'speed': data.get('speed'),
+                'ranges': [
+                    {'index': index, 'percent': 100.0 if index < i else (percent if index == i else 0.0)}
+                    for index in range(len(ranges))
+                ]
+            })
+
+        parallel_encode(
+            input_path, output_path, start_time, end_time,
+            log=log, progress=report if progress else None,
+            work_dir=work_dir
+        )
+        done += end_time - start_time
+
+
+def cut_ranges(input_path, ranges, mode, log=None, progress=None, work_dir=None):
+    """
+    Corta vários intervalos de um mesmo vídeo em uma única execução
+
+    Args:
+        input_path: Arquivo de entrada
+        ranges: Lista de tuplas (início em segundos, fim em segundos, arquivo de saída),
+            já validadas contra a duração do vídeo
+        mode: Modo de corte ('reencode', 'copy', 'smart' ou 'parallel')
+        log: Callback para mensagens (opcional)
+        progress: Callback para o progresso; recebe um dicionário com 'percent',
+            'out_time', 'fps' e 'speed' (quando informados pelo codificador) e a
+            lista 'ranges' com o percentual de cada intervalo (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+    """
+    if mode == 'copy':
+        _copy_ranges(input_path, ranges, progress)
+    elif mode == 'smart':
+        _smart_ranges(input_path, ranges, log, progress, work_dir)
+    elif mode == 'parallel':
+        _parallel_ranges(input_path, ranges, log, progress, work_dir)
+    elif mode == 'reencode':
+        _reencode_ranges(input_path, ranges, progress)
+    else:
+        raise EngineError(f"Modo de corte inválido: {mode}")
@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, format_seconds, concat_files
+from app.engine.keyframe_index import find_keyframes
+from app.engine.smart_cut import mux_source_audio, SEGMENT_PRECISION, TIME_EPSILON
+from app.engine.progress import ChunkProgress
+
+# Número de codificações simultâneas (padrão: número de núcleos da máquina)
+PARALLEL_WORKERS = int(os.getenv("CUT_PARALLEL_WORKERS", "0")) or os.cpu_count() or 1
+
+# Duração mínima de cada bloco; blocos menores não compensam o custo de iniciar o codificador
+MIN_CHUNK_SECONDS = float(os.getenv("CUT_MIN_CHUNK_SECONDS", "10"))
+
+# Mesmos parâmetros de vídeo do modo reencode (libx264 com as opções padrão do moviepy)
+PARALLEL_ENCODER_ARGS = ['-c:v', 'libx264', '-preset', 'medium', '-pix_fmt', 'yuv420p']
+
+
+def plan_chunks(start_time, end_time, keyframes, workers, min_chunk=MIN_CHUNK_SECONDS):
+    """
+    Divide um intervalo em blocos que começam em keyframes
+
+    O número de blocos é limitado pela quantidade de codificadores simultâneos e
+    pela duração mínima de cada bloco. Cada divisão ideal (intervalo dividido em
+    partes iguais) é movida para o keyframe mais próximo, de forma que cada bloco
+    possa ser decodificado de forma independente.
+
+    Args:
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        keyframes: Timestamps dos keyframes em ordem crescente
+        workers: Número de codificações simultâneas
+        min_chunk: Duração mínima de cada bloco em segundos
+
+    Returns:
+        list: Lista de tuplas (início, fim) dos blocos, em ordem
+    """
+    duration = end_time - start_time
+    count = max(1, min(workers, int(duration // min_chunk) if min_chunk > 0 else workers))
+
+    inner = [k for k in keyframes if start_time + TIME_EPSILON < k < end_time - TIME_EPSILON]
+
+    boundaries = []
+    if inner:
+        for i in range(1, count):
+            ideal = start_time + duration * i / count
+            nearest = min(inner, key=lambda k: abs(k - ideal))
+            if nearest not in boundaries:
+                boundaries.append(nearest)
+        boundaries.sort()
+
+    points = [start_time] + boundaries + [end_time]
+    return list(zip(points[:-1], points[1:]))
+
+
+def encode_chunk(input_path, part_path, start_time, end_time, threads, on_progress):
+    """
+    Recodifica um bloco de vídeo (sem áudio) com precisão de quadro, em MPEG-TS
+    """
+    run_ffmpeg_progress([
+        '-ss', format_seconds(start_time, SEGMENT_PRECISION),
+        '-i', input_path,
+        '-t', format_seconds(end_time - start_time, SEGMENT_PRECISION),
+        '-map', '0:v:0', '-an',
+    ] + PARALLEL_ENCODER_ARGS + [
+        '-threads', str(threads),
+        '-fps_mode', 'passthrough',
+        '-f', 'mpegts',
+        part_path
+    ], on_progress)
+
+
+def encode_chunks(input_path, chunks, workers, reporter=None):
+    """
+    Recodifica blocos de vídeo simultaneamente (ver encode_chunk)
+
+    Args:
+        input_path: Arquivo de entrada
+        chunks: Lista de tuplas ((início, fim), arquivo do bloco)
+        workers: Número de codificações simultâneas
+        reporter: Função que recebe o índice do bloco na lista e retorna o callback de
+            progresso do seu codificador (opcional)
+    """
+    if not chunks:
+        return
+
+    # Dividir os núcleos entre os codificadores simultâneos
+    threads = max(1, (os.cpu_count() or 1) // min(workers, len(chunks)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                encode_chunk, input_path, part_path, chunk_start, chunk_end, threads,
+                reporter(index) if reporter else None
+            )
+            for index, ((chunk_start, chunk_end), part_path) in enumerate(chunks)
+        ]
+        # Propagar o primeiro erro de codificação, cancelando os blocos ainda não iniciados
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def parallel_encode(input_path, output_path, start_time, end_time, log=None, progress=None, work_dir=None, workers=None):
+    """
+    Recodifica um intervalo dividindo-o em blocos codificados simultaneamente
+
+    Os blocos começam em keyframes, são codificados em MPEG-TS por processos do
+    ffmpeg independentes e unidos sem recodificar. O áudio do intervalo é
+    multiplexado no final, como no smart cut.
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos (já validado contra a duração)
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter):
+            'out_time' soma o que já foi codificado em todos os blocos, e 'fps' e
+            'speed' somam os dos codificadores em execução (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+        workers: Número de codificações simultâneas (padrão: PARALLEL_WORKERS)
+
+    Returns:
+        list: Blocos codificados como tuplas (início, fim)
+    """
+    workers = workers or PARALLEL_WORKERS
+
+    info = probe(input_path)
+    audio_stream = get_stream(info, 'audio')
+    if get_stream(info, 'video') is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+
+    keyframes = find_keyframes(input_path, start_time, end_time)
+    chunks = plan_chunks(start_time, end_time, keyframes, workers)
+
+    if log:
+        log(f"Recodificando {len(chunks)} bloco(s) com até {workers} codificador(es) simultâneo(s)")
+
+    temp_dir = tempfile.mkdtemp(prefix='parallel_', dir=work_dir)
+
+    try:
+        parts = [os.path.join(temp_dir, f'chunk_{index:03d}.ts') for index in range(len(chunks))]
+        meter = ChunkProgress(chunks, progress) if progress else None
+        encode_chunks(input_path, list(zip(chunks, parts)), workers, meter.reporter if meter else None)
+
+        video_path = os.path.join(temp_dir, 'video.mp4')
+        concat_files(parts, video_path, os.path.join(temp_dir, 'parts.txt'))
+
+        mux_source_audio(video_path, input_path, output_path, start_time, end_time, audio_stream)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return chunks
@@ -0,0 +1,287 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.engine.errors import EngineError
+from app.engine.jobs import run_job, estimate_work_bytes
+from app.engine.ffmpeg import set_cancel_check, check_cancelled
+from app.engine.workspace import Workspace
+
+# Fila de mensagens do processo de trabalho (definida pelo inicializador)
+_message_queue = None
+
+
+def _init_worker(queue):
+    """
+    Inicializa um processo de trabalho
+
+    Guarda a fila de mensagens e pré-carrega o moviepy, que é pesado e seria
+    importado no primeiro corte recodificado.
+    """
+    global _message_queue
+    _message_queue = queue
+
+    try:
+        import moviepy  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _warmup():
+    """
+    Tarefa vazia usada para iniciar os processos antes do primeiro job
+    """
+    return os.getpid()
+
+
+def _execute(job_id, job, cancel_event, started_event):
+    """
+    Executa um job no processo de trabalho, enviando logs e progresso pela fila
+
+    O job roda em um workspace próprio (em job['temp_dir'] ou, havendo memória
+    livre, em job['ram_dir']), removido ao final mesmo em caso de erro ou
+    cancelamento. started_event é marcado antes de qualquer trabalho, para que o
+    pool saiba se o job já estava em execução quando um processo foi encerrado.
+    """
+    started_event.set()
+
+    def log(message):
+        _message_queue.put((job_id, 'log', message))
+
+    def progress(data):
+        _message_queue.put((job_id, 'progress', data))
+
+    set_cancel_check(cancel_event.is_set)
+
+    try:
+        # Cancelado enquanto aguardava na fila
+        check_cancelled()
+
+        workspace = Workspace(
+            base_dir=job.get('temp_dir'),
+            name=job_id,
+            ram_dir=job.get('ram_dir'),
+            estimated_bytes=estimate_work_bytes(job),
+            reserve_bytes=job.get('ram_reserve', 0)
+        )
+        with workspace:
+            if workspace.in_ram:
+                log(f"Arquivos intermediários em memória: {workspace.path}")
+            return run_job(job, log=log, progress=progress, work_dir=workspace.path)
+    finally:
+        set_cancel_check(None)
+
+
+class EnginePool:
+    """
+    Pool de processos persistentes que executam os jobs do motor
+
+    Os processos são iniciados uma única vez e reaproveitados entre os jobs,
+    evitando o custo de iniciar o interpretador e importar o moviepy a cada corte.
+    Logs e progresso voltam por uma fila compartilhada e são entregues ao callback
+    on_message por uma thread do processo principal.
+
+    Se um processo de trabalho for encerrado abruptamente (ex: falta de memória),
+    o executor é recriado: os jobs que estavam em execução falham com EngineError
+    e os que ainda aguardavam na fila são reenviados ao novo executor.
+    """
+
+    def __init__(self, workers=2, on_message=None):
+        """
+        Inicializa o pool e pré-aquece os processos
+
+        Args:
+            workers: Número de processos de trabalho
+            on_message: Callback chamado com (job_id, tipo, dados) para cada
+                mensagem ('log' ou 'progress') enviada pelos jobs (opcional)
+        """
+        # spawn: não herda threads e locks do servidor web (fork não é seguro aqui)
+        context = multiprocessing.get_context('spawn')
+
+        self.workers = max(1, workers)
+        self.on_message = on_message
+        self.queue = context.Queue()
+        # Eventos de cancelamento compartilhados com os processos de trabalho
+        self.manager = context.Manager()
+        self.jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._context = context
+        self._executor_lock = threading.Lock()
+        self._closed = False
+        self.executor = self._create_executor()
+
+        self.listener = threading.Thread(target=self._listen, daemon=True)
+        self.listener.start()
+
+    def _create_executor(self):
+        """
+        Cria o executor e inicia todos os processos agora, e não no primeiro job
+        """
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self.queue,)
+        )
+        for _ in range(self.workers):
+            executor.submit(_warmup)
+        return executor
+
+    def _replace_executor(self, broken):
+        """
+        Substitui o executor quebrado por um novo (uma única vez por executor quebrado)
+
+        O executor quebrado já encerra os próprios processos.
+
+        Returns:
+            ProcessPoolExecutor: Executor atual ou None se o pool foi encerrado
+        """
+        with self._executor_lock:
+            if self._closed:
+                return None
+            if self.executor is broken:
+                print("Processo de trabalho do motor encerrado abruptamente; reiniciando o pool")
+                self.executor = self._create_executor()
+            return self.executor
+
+    def _listen(self):
+        """
+        Repassa as mensagens dos processos de trabalho para o callback
+        """
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+
+            job_id, kind, data = message
+            if self.on_message:
+                try:
+                    self.on_message(job_id, kind, data)
+                except Exception as e:
+                    print(f"Erro ao processar mensagem do job {job_id}: {str(e)}")
+
+    def submit(self, job_id, job, on_done=None):
+        """
+        Envia um job para execução
+
+        Args:
+            job_id: Identificador usado nas mensagens do job
+            job: Dicionário do job (ver run_job)
+            on_done: Callback chamado com o Future quando o job terminar (opcional)
+
+        Returns:
+            Future: Resultado do job
+        """
+        entry = {
+            'future': Future(),
+            'inner': None,
+            'cancel_event': self.manager.Event(),
+            'started_event': self.manager.Event(),
+        }
+
+        with self._jobs_lock:
+            self.jobs[job_id] = entry
+
+        def done(future):
+            with self._jobs_lock:
+                self.jobs.pop(job_id, None)
+            if on_done:
+                on_done(future)
+
+        entry['future'].add_done_callback(done)
+        self._dispatch(job_id, job, entry)
+        return entry['future']
+
+    def _dispatch(self, job_id, job, entry):
+        """
+        Envia o job ao executor atual e repassa o resultado ao Future do job
+
+        Um job que ainda não havia começado quando o executor quebrou é reenviado.
+        """
+        with self._executor_lock:
+            executor = self.executor
+        try:
+            inner = executor.submit(_execute, job_id, job, entry['cancel_event'], entry['started_event'])
+        except BrokenProcessPool:
+            # Quebrado antes de o encerramento ser percebido: nada foi executado
+            executor = self._replace_executor(executor)
+            if executor is None:
+                raise
+            inner = executor.submit(_execute, job_id, job, entry['cancel_event'], entry['started_event'])
+
+        with self._jobs_lock:
+            entry['inner'] = inner
+
+        def relay(inner):
+            future = entry['future']
+            if inner.cancelled():
+                future.cancel()
+                return
+
+            error = inner.exception()
+            if isinstance(error, BrokenProcessPool):
+                replaced = self._replace_executor(executor) is not None
+                if replaced and not self._is_set(entry['started_event']) and not self._is_set(entry['cancel_event']):
+                    self._dispatch(job_id, job, entry)
+                    return
+                error = EngineError("O processo de trabalho foi encerrado abruptamente durante o job (ex: falta de memória)")
+
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(inner.result())
+
+        inner.add_done_callback(relay)
+
+    @staticmethod
+    def _is_set(event):
+        """
+        Consulta um evento compartilhado, considerando-o marcado se o gerenciador não responder
+        """
+        try:
+            return event.is_set()
+        except Exception:
+            return True
+
+    def cancel(self, job_id):
+        """
+        Cancela um job
+
+        Um job ainda na fila é descartado; um job em execução é interrompido pelo
+        processo de trabalho, que encerra o ffmpeg e remove o workspace.
+
+        Args:
+            job_id: Identificador do job
+
+        Returns:
+            bool: True se o cancelamento foi solicitado, False se o job não está em andamento
+        """
+        with self._jobs_lock:
+            entry = self.jobs.get(job_id)
+            inner = entry['inner'] if entry else None
+
+        if entry is None:
+            return False
+
+        # O evento é marcado antes para que um job reenviado não volte a executar
+        entry['cancel_event'].set()
+        if inner is not None:
+            inner.cancel()
+        return True
+
+    def shutdown(self, wait=True):
+        """
+        Encerra os processos de trabalho e a thread de mensagens
+        """
+        with self._jobs_lock:
+            running = list(self.jobs.values())
+        if not wait:
+            for entry in running:
+                entry['cancel_event'].set()
+
+        with self._executor_lock:
+            self._closed = True
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.queue.put(None)
+        self.manager.shutdown()
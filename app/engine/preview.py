@@ -0,0 +1,125 @@
+import os
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, get_duration
+from app.engine.progress import progress_reporter
+
+# Formatos de prévia animada aceitos
+PREVIEW_FORMATS = ('webp', 'gif')
+
+# Limites padrão de largura (px) e quadros por segundo das prévias
+PREVIEW_MAX_WIDTH = 480
+PREVIEW_MAX_FPS = 12.0
+
+
+def _frame_rate(stream):
+    """
+    Obtém a taxa de quadros média de uma stream de vídeo (None se desconhecida)
+    """
+    for key in ('avg_frame_rate', 'r_frame_rate'):
+        value = stream.get(key) or ''
+        numerator, _, denominator = value.partition('/')
+        try:
+            rate = float(numerator) / float(denominator or 1)
+        except (ValueError, ZeroDivisionError):
+            continue
+        if rate > 0:
+            return rate
+    return None
+
+
+def preview_filter(fmt, width, fps):
+    """
+    Monta o grafo de filtros de uma prévia animada
+
+    No GIF, a paleta é gerada e aplicada no mesmo grafo: os quadros reduzidos
+    são divididos entre o palettegen e o paletteuse, sem uma segunda leitura do
+    vídeo nem arquivo de paleta intermediário. O WebP usa cores completas e
+    dispensa a paleta.
+
+    Args:
+        fmt: Formato da prévia ('webp' ou 'gif')
+        width: Largura final em pixels (a altura mantém a proporção)
+        fps: Quadros por segundo da prévia
+
+    Returns:
+        str: Grafo para -filter_complex, com a saída rotulada [out]
+    """
+    base = f"[0:v:0]fps={fps:g},scale={width}:-2:flags=lanczos"
+    if fmt == 'gif':
+        return (
+            f"{base},split[frames][palette_input];"
+            "[palette_input]palettegen=stats_mode=diff[palette];"
+            "[frames][palette]paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle[out]"
+        )
+    return f"{base}[out]"
+
+
+def render_preview(input_path, output_path, fmt='webp', max_width=PREVIEW_MAX_WIDTH, max_fps=PREVIEW_MAX_FPS,
+                   quality=75, log=None, progress=None):
+    """
+    Gera uma prévia animada (WebP ou GIF) de um vídeo em uma única passada
+
+    A largura e a taxa de quadros da prévia são limitadas por max_width e
+    max_fps, sem nunca ampliar o vídeo nem duplicar quadros.
+
+    Args:
+        input_path: Arquivo de vídeo (ex: um corte)
+        output_path: Arquivo da prévia
+        fmt: Formato da prévia ('webp' ou 'gif')
+        max_width: Largura máxima em pixels
+        max_fps: Quadros por segundo máximos
+        quality: Qualidade do WebP (0-100; ignorada no GIF)
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+
+    Returns:
+        dict: 'output_path', 'format', 'width', 'fps' e 'size' em bytes
+
+    Raises:
+        EngineError: Se os parâmetros forem inválidos ou a geração falhar
+    """
+    if fmt not in PREVIEW_FORMATS:
+        raise EngineError(f"Formato de prévia inválido: {fmt}. Use um dos formatos: {', '.join(PREVIEW_FORMATS)}")
+    if max_width <= 0 or max_fps <= 0:
+        raise EngineError("A largura e a taxa de quadros máximas devem ser maiores que zero")
+
+    info = probe(input_path)
+    video_stream = get_stream(info, 'video')
+    if video_stream is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+
+    source_width = video_stream.get('width')
+    width = min(int(source_width), int(max_width)) if source_width else int(max_width)
+    # Largura par, exigida por alguns decodificadores ao reproduzir a prévia
+    width = max(width - width % 2, 2)
+    source_fps = _frame_rate(video_stream)
+    fps = round(min(source_fps, max_fps) if source_fps else max_fps, 3)
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if log:
+        log(f"Gerando prévia {fmt.upper()} com {width}px de largura a {fps:g} quadros/s")
+
+    args = [
+        '-i', input_path,
+        '-filter_complex', preview_filter(fmt, width, fps),
+        '-map', '[out]',
+        '-an', '-sn',
+        '-loop', '0',
+    ]
+    if fmt == 'webp':
+        args += ['-c:v', 'libwebp_anim', '-lossless', '0', '-q:v', str(quality), '-preset', 'picture']
+    args.append(output_path)
+
+    duration = get_duration(input_path) or 0.0
+    run_ffmpeg_progress(args, progress_reporter(duration, progress) if progress else None)
+
+    return {
+        'output_path': output_path,
+        'format': fmt,
+        'width': width,
+        'fps': fps,
+        'size': os.path.getsize(output_path),
+    }
@@ -0,0 +1,140 @@
+import time
+import threading
+
+# Intervalo mínimo entre atualizações de progresso calculadas pelo ProgressMeter (segundos)
+PROGRESS_INTERVAL = 0.5
+
+
+def progress_reporter(duration, progress):
+    """
+    Cria o callback de run_ffmpeg_progress que informa o progresso estruturado de um trecho
+
+    Os valores vêm do canal de progresso do codificador (-progress).
+
+    Args:
+        duration: Duração do trecho processado em segundos
+        progress: Callback que recebe um dicionário com 'percent' (0-100),
+            'out_time' (segundos processados do trecho), 'fps' e 'speed'
+
+    Returns:
+        callable: Callback para run_ffmpeg_progress
+    """
+    def report(data):
+        if data.get('progress') == 'end':
+            out_time = duration
+        elif data.get('out_time') is not None:
+            out_time = min(max(data['out_time'], 0.0), duration)
+        else:
+            return
+
+        progress({
+            'percent': round(out_time / duration * 100, 2) if duration else 100.0,
+            'out_time': round(out_time, 3),
+            'fps': data.get('fps'),
+            'speed': data.get('speed'),
+        })
+    return report
+
+
+class ProgressMeter:
+    """
+    Calcula o progresso estruturado de um processamento sem canal de progresso próprio
+
+    Usado quando a posição é conhecida, mas fps e velocidade não são informados
+    pelo codificador (ex: moviepy, trechos do smart cut): ambos são calculados a
+    partir do tempo decorrido desde o início.
+    """
+
+    def __init__(self, duration, progress, interval=PROGRESS_INTERVAL):
+        """
+        Inicializa o medidor
+
+        Args:
+            duration: Duração do trecho processado em segundos
+            progress: Callback que recebe o dicionário de progresso (ver progress_reporter)
+            interval: Intervalo mínimo entre atualizações em segundos
+        """
+        self.duration = duration
+        self.progress = progress
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = None
+
+    def update(self, out_time, frames=None, force=False):
+        """
+        Informa a posição atual, respeitando o intervalo mínimo entre atualizações
+
+        Args:
+            out_time: Segundos processados do trecho
+            frames: Quadros processados (opcional, usado no cálculo do fps)
+            force: Informar mesmo antes do intervalo mínimo
+        """
+        now = time.monotonic()
+        if not force and self.last_report is not None and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        out_time = min(max(out_time, 0.0), self.duration)
+        elapsed = now - self.started
+        self.progress({
+            'percent': round(out_time / self.duration * 100, 2) if self.duration else 100.0,
+            'out_time': round(out_time, 3),
+            'fps': round(frames / elapsed, 2) if frames is not None and elapsed > 0 else None,
+            'speed': round(out_time / elapsed, 3) if elapsed > 0 else None,
+        })
+
+    def finish(self, frames=None):
+        """
+        Informa a conclusão do trecho
+        """
+        self.update(self.duration, frames=frames, force=True)
+
+
+class ChunkProgress:
+    """
+    Soma o progresso de blocos de um intervalo codificados simultaneamente
+
+    'out_time' soma o que já foi codificado em todos os blocos, e 'fps' e 'speed'
+    somam os dos codificadores em execução.
+    """
+
+    def __init__(self, chunks, progress, done=()):
+        """
+        Inicializa o medidor
+
+        Args:
+            chunks: Lista de tuplas (início, fim) dos blocos
+            progress: Callback que recebe o dicionário de progresso (ver progress_reporter)
+            done: Índices dos blocos já prontos (ex: obtidos de um cache)
+        """
+        self.chunks = chunks
+        self.progress = progress
+        self.total = sum(chunk_end - chunk_start for chunk_start, chunk_end in chunks)
+        self.encoded = [chunk_end - chunk_start if index in done else 0.0 for index, (chunk_start, chunk_end) in enumerate(chunks)]
+        # fps e velocidade atuais de cada bloco (zerados quando o bloco termina)
+        self.rates = [(0.0, 0.0)] * len(chunks)
+        self.lock = threading.Lock()
+
+    def reporter(self, index):
+        """
+        Cria o callback de run_ffmpeg_progress do bloco informado
+        """
+        def report(data):
+            if data.get('out_time') is None and data.get('progress') != 'end':
+                return
+            chunk_start, chunk_end = self.chunks[index]
+            finished = data.get('progress') == 'end'
+            position = chunk_end - chunk_start if finished else data['out_time']
+            with self.lock:
+                self.encoded[index] = min(max(position, 0.0), chunk_end - chunk_start)
+                self.rates[index] = (0.0, 0.0) if finished else (data.get('fps') or 0.0, data.get('speed') or 0.0)
+                done = sum(self.encoded)
+                fps = sum(rate[0] for rate in self.rates)
+                speed = sum(rate[1] for rate in self.rates)
+            self.progress({
+                'percent': round(done / self.total * 100, 2) if self.total else 100.0,
+                'out_time': round(done, 3),
+                'fps': round(fps, 2) if fps else None,
+                'speed': round(speed, 3) if speed else None,
+            })
+        return report
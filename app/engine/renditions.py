@@ -0,0 +1,186 @@
+import os
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, format_seconds
+from app.engine.progress import progress_reporter
+
+# Codificadores de vídeo e áudio de cada container de saída
+RENDITION_CONTAINERS = {
+    'mp4': ('libx264', 'aac'),
+    'mkv': ('libx264', 'aac'),
+    'webm': ('libvpx-vp9', 'libopus'),
+}
+
+# CRF padrão de cada codificador quando nem CRF nem bitrate são informados
+DEFAULT_CRF = {
+    'libx264': 23,
+    'libvpx-vp9': 32,
+}
+
+
+def normalize_rendition(profile, index=0):
+    """
+    Valida um perfil de saída e preenche os valores padrão
+
+    Args:
+        profile: Dicionário com 'name', 'width', 'height', 'crf', 'video_bitrate',
+            'audio_bitrate' e 'container' (todos opcionais)
+        index: Posição do perfil na lista, usada no nome padrão
+
+    Returns:
+        dict: Perfil normalizado
+
+    Raises:
+        EngineError: Se o perfil for inválido
+    """
+    container = (profile.get('container') or 'mp4').lower()
+    if container not in RENDITION_CONTAINERS:
+        raise EngineError(f"Container inválido: {container}. Use um dos containers: {', '.join(RENDITION_CONTAINERS)}")
+
+    width = profile.get('width')
+    height = profile.get('height')
+    for value in (width, height):
+        if value is not None and (not isinstance(value, int) or value <= 0 or value % 2):
+            raise EngineError(f"Resolução inválida: {value}. Use valores inteiros, positivos e pares")
+
+    if profile.get('crf') is not None and profile.get('video_bitrate'):
+        raise EngineError("Informe crf ou video_bitrate, não ambos")
+
+    name = profile.get('name')
+    if not name:
+        if width and height:
+            name = f'{width}x{height}'
+        elif height:
+            name = f'{height}p'
+        elif width:
+            name = f'{width}w'
+        else:
+            name = f'r{index + 1}'
+
+    return {
+        'name': name,
+        'width': width,
+        'height': height,
+        'crf': profile.get('crf'),
+        'video_bitrate': profile.get('video_bitrate'),
+        'audio_bitrate': profile.get('audio_bitrate'),
+        'container': container,
+        'output_path': profile.get('output_path'),
+    }
+
+
+def scale_filter(rendition):
+    """
+    Monta o filtro de escala de um perfil
+
+    Com largura e altura, o vídeo preenche o quadro e o excesso é recortado
+    (ex: variante vertical). Com apenas uma dimensão, a proporção é mantida.
+    """
+    width = rendition['width']
+    height = rendition['height']
+
+    if width and height:
+        return f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height},setsar=1"
+    if height:
+        return f"scale=-2:{height}"
+    if width:
+        return f"scale={width}:-2"
+    return "null"
+
+
+def rendition_encoder_args(rendition, has_audio):
+    """
+    Monta os argumentos de codificação de um perfil
+    """
+    video_encoder, audio_encoder = RENDITION_CONTAINERS[rendition['container']]
+
+    args = ['-c:v', video_encoder, '-pix_fmt', 'yuv420p']
+    if rendition['video_bitrate']:
+        args += ['-b:v', str(rendition['video_bitrate'])]
+    else:
+        args += ['-crf', str(rendition['crf'] if rendition['crf'] is not None else DEFAULT_CRF[video_encoder])]
+        if video_encoder == 'libvpx-vp9':
+            # Qualidade constante no VP9 exige bitrate zero
+            args += ['-b:v', '0']
+
+    if video_encoder == 'libx264':
+        args += ['-preset', 'veryfast']
+    else:
+        args += ['-deadline', 'good', '-cpu-used', '4', '-row-mt', '1']
+
+    if has_audio:
+        args += ['-c:a', audio_encoder]
+        if rendition['audio_bitrate']:
+            args += ['-b:a', str(rendition['audio_bitrate'])]
+
+    if rendition['container'] == 'mp4':
+        args += ['-movflags', '+faststart']
+
+    return args
+
+
+def render_ladder(input_path, start_time, end_time, renditions, log=None, progress=None):
+    """
+    Gera várias versões (resoluções, qualidades e containers) de um intervalo decodificando-o uma única vez
+
+    O vídeo decodificado é dividido com split em um único filter graph, com uma
+    escala por perfil; o áudio é dividido com asplit. Cada saída é codificada
+    com os parâmetros do seu perfil.
+
+    Args:
+        input_path: Arquivo de entrada
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos (já validado contra a duração)
+        renditions: Lista de perfis já normalizados (ver normalize_rendition), com 'output_path'
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+
+    Returns:
+        list: Para cada perfil, um dicionário com 'name', 'container', 'output_path' e 'size' em bytes
+    """
+    if not renditions:
+        raise EngineError("Nenhum perfil de saída informado")
+
+    info = probe(input_path)
+    if get_stream(info, 'video') is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+    has_audio = get_stream(info, 'audio') is not None
+
+    count = len(renditions)
+    filters = [f"[0:v]split={count}" + ''.join(f'[v{i}]' for i in range(count))]
+    if has_audio:
+        filters.append(f"[0:a]asplit={count}" + ''.join(f'[a{i}]' for i in range(count)))
+    for i, rendition in enumerate(renditions):
+        filters.append(f"[v{i}]{scale_filter(rendition)}[ov{i}]")
+
+    duration = end_time - start_time
+    args = [
+        '-ss', format_seconds(start_time, 6),
+        '-t', format_seconds(duration, 6),
+        '-i', input_path,
+        '-filter_complex', ';'.join(filters),
+    ]
+
+    for i, rendition in enumerate(renditions):
+        output_dir = os.path.dirname(rendition['output_path'])
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        args += ['-map', f'[ov{i}]']
+        if has_audio:
+            args += ['-map', f'[a{i}]']
+        args += rendition_encoder_args(rendition, has_audio) + [rendition['output_path']]
+
+    if log:
+        log(f"Gerando {count} versão(ões) em uma única decodificação: {', '.join(r['name'] for r in renditions)}")
+
+    run_ffmpeg_progress(args, progress_reporter(duration, progress) if progress else None)
+
+    return [
+        {
+            'name': rendition['name'],
+            'container': rendition['container'],
+            'output_path': rendition['output_path'],
+            'size': os.path.getsize(rendition['output_path']) if os.path.exists(rendition['output_path']) else None,
+        }
+        for rendition in renditions
+    ]
@@ -0,0 +1,141 @@
+import numpy as np
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import iter_ffmpeg_output, probe, get_stream, get_duration
+
+# Número de faixas do histograma de luminância de cada quadro
+HISTOGRAM_BINS = 32
+
+
+def _histograms(frames):
+    """
+    Calcula o histograma de luminância normalizado de cada quadro de um bloco
+
+    Um único bincount cobre o bloco inteiro: cada quadro usa uma faixa própria de
+    índices (deslocada por HISTOGRAM_BINS), evitando um laço por quadro.
+
+    Args:
+        frames: Array (quadros, pixels) de luminância em uint8
+
+    Returns:
+        numpy.ndarray: Array (quadros, HISTOGRAM_BINS) com a fração de pixels em cada faixa
+    """
+    count, pixels = frames.shape
+    shift = 8 - int(np.log2(HISTOGRAM_BINS))
+    indexes = (frames >> shift).astype(np.int64) + (np.arange(count, dtype=np.int64) * HISTOGRAM_BINS)[:, None]
+    histograms = np.bincount(indexes.ravel(), minlength=count * HISTOGRAM_BINS)
+    return histograms.reshape(count, HISTOGRAM_BINS) / pixels
+
+
+def detect_scenes(input_path, fps=4, width=160, height=90, threshold=0.35, min_scene=1.0,
+                  block_frames=256, log=None, progress=None):
+    """
+    Detecta as mudanças de cena de um vídeo
+
+    O vídeo é decodificado uma única vez em baixa resolução e taxa de quadros,
+    em tons de cinza, e lido do ffmpeg em blocos de quadros. Para cada bloco, os
+    histogramas de luminância e a distância entre quadros consecutivos são
+    calculados com operações vetorizadas do NumPy.
+
+    Args:
+        input_path: Arquivo de vídeo
+        fps: Quadros por segundo analisados
+        width: Largura dos quadros analisados em pixels
+        height: Altura dos quadros analisados em pixels
+        threshold: Distância mínima entre histogramas (0-1) para uma mudança de cena
+        min_scene: Duração mínima de uma cena em segundos
+        block_frames: Quadros processados por bloco
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o percentual (0-100) concluído (opcional)
+
+    Returns:
+        dict: 'cuts_ms' (pontos de corte em milissegundos), 'scenes' (início, fim e
+            pontuação de cada cena) e os parâmetros usados na análise
+    """
+    if fps <= 0 or width <= 0 or height <= 0:
+        raise EngineError("Parâmetros de análise de cenas inválidos")
+    if not 0 < threshold <= 1:
+        raise EngineError("O limiar de mudança de cena deve estar entre 0 e 1")
+
+    info = probe(input_path)
+    if get_stream(info, 'video') is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+    duration = get_duration(input_path)
+
+    if log:
+        log(f"Analisando cenas a {fps} quadros/s em {width}x{height}")
+
+    frame_size = width * height
+    expected_frames = int(duration * fps) if duration else 0
+
+    cuts = []
+    scores = []
+    previous = None
+    frames_read = 0
+    pending = b''
+    last_cut_time = 0.0
+
+    for chunk in iter_ffmpeg_output([
+        '-i', input_path,
+        '-map', '0:v:0', '-an', '-sn',
+        '-vf', f'fps={fps},scale={width}:{height},format=gray',
+        '-f', 'rawvideo', '-pix_fmt', 'gray',
+        'pipe:1'
+    ], frame_size * block_frames):
+        data = pending + chunk
+        count = len(data) // frame_size
+        pending = data[count * frame_size:]
+        if not count:
+            continue
+
+        frames = np.frombuffer(data, dtype=np.uint8, count=count * frame_size).reshape(count, frame_size)
+        histograms = _histograms(frames)
+
+        # Incluir o último quadro do bloco anterior para comparar a fronteira entre blocos
+        if previous is not None:
+            histograms = np.vstack([previous, histograms])
+            first_index = frames_read - 1
+        else:
+            first_index = 0
+        previous = histograms[-1:]
+
+        distances = np.abs(np.diff(histograms, axis=0)).sum(axis=1) / 2
+        for offset in np.flatnonzero(distances >= threshold):
+            time = (first_index + offset + 1) / fps
+            if time - last_cut_time >= min_scene:
+                cuts.append(time)
+                scores.append(float(distances[offset]))
+                last_cut_time = time
+
+        frames_read += count
+        if progress and expected_frames:
+            progress(round(min(frames_read / expected_frames, 1.0) * 100, 2))
+
+    if not frames_read:
+        raise EngineError(f"Nenhum quadro decodificado de {input_path}")
+
+    duration = duration or frames_read / fps
+    boundaries = [0.0] + cuts + [duration]
+    scenes = [
+        {
+            'start_ms': int(round(start * 1000)),
+            'end_ms': int(round(end * 1000)),
+            'score': round(scores[i - 1], 4) if i else None,
+        }
+        for i, (start, end) in enumerate(zip(boundaries, boundaries[1:]))
+        if end > start
+    ]
+
+    if log:
+        log(f"{len(cuts)} mudança(s) de cena em {frames_read} quadro(s) analisado(s)")
+
+    return {
+        'fps': fps,
+        'width': width,
+        'height': height,
+        'threshold': threshold,
+        'min_scene': min_scene,
+        'duration': duration,
+        'frames': frames_read,
+        'cuts_ms': [int(round(time * 1000)) for time in cuts],
+        'scenes': scenes,
+    }
@@ -0,0 +1,169 @@
+import os
+import math
+import bisect
+import shutil
+import tempfile
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import probe, get_stream, get_duration, concat_files
+from app.engine.keyframe_index import find_keyframes
+from app.engine.cache import LRUFileCache, file_identity, cache_key
+from app.engine.parallel_encode import PARALLEL_WORKERS, PARALLEL_ENCODER_ARGS, encode_chunks
+from app.engine.smart_cut import mux_source_audio, TIME_EPSILON
+from app.engine.progress import ChunkProgress
+
+# Modos de corte que recodificam todo o intervalo e podem usar o cache de segmentos
+SEGMENT_CACHE_MODES = ('reencode', 'parallel')
+
+# Duração padrão da grade de segmentos alinhados (segundos)
+SEGMENT_SECONDS = 10.0
+
+# Versão do formato dos segmentos (incrementar ao mudar a codificação)
+SEGMENT_CACHE_VERSION = 1
+
+# Nome do índice do cache dentro do diretório dos segmentos
+SEGMENT_CACHE_INDEX = '.segment_cache.json'
+
+
+def plan_segments(start_time, end_time, keyframes, segment_seconds=SEGMENT_SECONDS):
+    """
+    Divide um intervalo em segmentos de uma grade alinhada aos keyframes da origem
+
+    O segmento n da grade começa no primeiro keyframe a partir de
+    n * segment_seconds e termina onde começa o seguinte. A grade depende apenas
+    da origem, de modo que cortes sobrepostos compartilham os mesmos segmentos.
+    As bordas do intervalo que não cobrem um segmento inteiro formam partes
+    próprias, sem índice.
+
+    Args:
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        keyframes: Timestamps dos keyframes da origem em ordem crescente
+        segment_seconds: Duração da grade em segundos
+
+    Returns:
+        list: Tuplas (início, fim, índice do segmento na grade ou None nas bordas), em ordem
+    """
+    if segment_seconds <= 0:
+        raise EngineError("A duração dos segmentos deve ser maior que zero")
+
+    # Pontos da grade que podem cair no intervalo (um keyframe abre no máximo um segmento)
+    points = []
+    for n in range(int(start_time // segment_seconds), int(math.ceil(end_time / segment_seconds)) + 1):
+        position = bisect.bisect_left(keyframes, n * segment_seconds - TIME_EPSILON)
+        if position == len(keyframes):
+            break
+        if not points or keyframes[position] > points[-1][1]:
+            points.append((n, keyframes[position]))
+
+    segments = [
+        (segment_start, segment_end, n)
+        for (n, segment_start), (_, segment_end) in zip(points[:-1], points[1:])
+        if segment_start >= start_time - TIME_EPSILON and segment_end <= end_time + TIME_EPSILON
+    ]
+    if not segments:
+        return [(start_time, end_time, None)]
+
+    parts = []
+    if segments[0][0] - start_time > TIME_EPSILON:
+        parts.append((start_time, segments[0][0], None))
+    parts += segments
+    if end_time - segments[-1][1] > TIME_EPSILON:
+        parts.append((segments[-1][1], end_time, None))
+    return parts
+
+
+def cut_segmented(input_path, output_path, start_time, end_time, cache_dir, max_bytes=0,
+                  segment_seconds=SEGMENT_SECONDS, source_hash=None, log=None, progress=None,
+                  work_dir=None, workers=None):
+    """
+    Recodifica um intervalo reaproveitando segmentos já codificados por outros cortes
+
+    O intervalo é dividido na grade de segmentos alinhados (ver plan_segments).
+    Os segmentos inteiros ficam em um cache limitado por tamanho, indexado pelo
+    hash da origem, pelo índice e pelos limites do segmento e pelo perfil de
+    codificação; apenas os que não estão no cache e as bordas do intervalo são
+    codificados, em paralelo como no modo parallel. As partes são unidas sem
+    recodificar e o áudio do intervalo é multiplexado no final.
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos (já validado contra a duração)
+        cache_dir: Diretório do cache de segmentos
+        max_bytes: Tamanho máximo do cache (0 desativa o limite)
+        segment_seconds: Duração da grade de segmentos em segundos
+        source_hash: Identidade do conteúdo da origem (ex: o hash calculado após o
+            download); sem ela, usa file_identity, sem ler o arquivo
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver ChunkProgress) (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+        workers: Número de codificações simultâneas (padrão: PARALLEL_WORKERS)
+
+    Returns:
+        dict: 'segments' (segmentos alinhados usados), 'cached' (obtidos do cache) e
+            'encoded' (partes codificadas, incluindo as bordas)
+    """
+    workers = workers or PARALLEL_WORKERS
+
+    info = probe(input_path)
+    audio_stream = get_stream(info, 'audio')
+    if get_stream(info, 'video') is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+
+    keyframes = find_keyframes(input_path, 0, get_duration(input_path) or end_time)
+    parts = plan_segments(start_time, end_time, keyframes, segment_seconds)
+
+    cache = LRUFileCache(cache_dir, max_bytes, index_name=SEGMENT_CACHE_INDEX)
+    source_hash = source_hash or file_identity(input_path)[0]
+    profile = {'version': SEGMENT_CACHE_VERSION, 'encoder': PARALLEL_ENCODER_ARGS, 'segment_seconds': segment_seconds}
+    keys = [
+        cache_key(source_hash, index, round(part_start, 6), round(part_end, 6), profile) if index is not None else None
+        for part_start, part_end, index in parts
+    ]
+    temp_dir = tempfile.mkdtemp(prefix='segments_', dir=work_dir)
+
+    try:
+        paths = [os.path.join(temp_dir, f'part_{index:03d}.ts') for index in range(len(parts))]
+        # Os segmentos do cache são entregues no diretório do job: a remoção pelo
+        # limite de tamanho (inclusive por outro processo) não os afeta
+        cached = [bool(key) and cache.checkout(key, paths[index]) for index, key in enumerate(keys)]
+        pending = [index for index, hit in enumerate(cached) if not hit]
+
+        segments = sum(1 for key in keys if key)
+        hits = sum(1 for hit in cached if hit)
+        if log:
+            log(f"{segments} segmento(s) alinhado(s) no intervalo: {hits} do cache, {len(pending)} parte(s) a codificar")
+
+        chunks = [(part_start, part_end) for part_start, part_end, _ in parts]
+
+        meter = ChunkProgress(chunks, progress, done=[index for index in range(len(parts)) if cached[index]]) if progress else None
+        encode_chunks(
+            input_path,
+            [(chunks[index], paths[index]) for index in pending],
+            workers,
+            (lambda position: meter.reporter(pending[position])) if meter else None
+        )
+
+        video_path = os.path.join(temp_dir, 'video.mp4')
+        concat_files(paths, video_path, os.path.join(temp_dir, 'parts.txt'))
+
+        mux_source_audio(video_path, input_path, output_path, start_time, end_time, audio_stream)
+
+        # Guardar os segmentos novos só depois da montagem
+        for index in pending:
+            if keys[index] is None:
+                continue
+            os.makedirs(cache_dir, exist_ok=True)
+            segment_path = os.path.join(cache_dir, f'{keys[index]}.ts')
+            shutil.move(paths[index], segment_path)
+            removed = cache.put(keys[index], segment_path, start=parts[index][0], end=parts[index][1])
+            if removed and log:
+                log(f"{len(removed)} segmento(s) removido(s) do cache (limite de tamanho)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if progress:
+        progress({'percent': 100.0, 'out_time': round(end_time - start_time, 3), 'fps': None, 'speed': None})
+
+    return {'segments': segments, 'cached': hits, 'encoded': len(pending)}
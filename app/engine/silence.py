@@ -0,0 +1,231 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg, probe, get_stream, get_duration, format_seconds, matching_encoder_args, concat_files
+from app.engine.audio import iter_pcm_blocks, energy_to_db
+from app.engine.keyframe_index import find_keyframes
+from app.engine.smart_cut import plan_smart_cut, encode_segment, copy_segment, SEGMENT_PRECISION
+
+# Trechos mantidos mais curtos que isso (em segundos) são descartados
+MIN_KEPT_SECONDS = 0.1
+
+
+def detect_silences(input_path, threshold_db=-35.0, min_silence=1.0, sample_rate=8000, hop_ms=20,
+                    block_seconds=30, progress=None):
+    """
+    Detecta os trechos de silêncio do áudio de um vídeo em uma única leitura
+
+    O áudio é lido como PCM em blocos (memória constante). Em cada bloco, o nível
+    de cada janela de hop_ms é calculado de forma vetorizada e apenas as
+    transições entre som e silêncio são percorridas.
+
+    Args:
+        input_path: Arquivo de mídia
+        threshold_db: Nível (dB, fundo de escala) abaixo do qual a janela é silêncio
+        min_silence: Duração mínima de um silêncio em segundos
+        sample_rate: Taxa de amostragem usada na análise
+        hop_ms: Duração de cada janela em milissegundos
+        block_seconds: Segundos de áudio processados por bloco
+        progress: Callback que recebe o percentual (0-100) lido (opcional)
+
+    Returns:
+        tuple: (silêncios, duração) - Lista de (início, fim) em segundos e a duração do áudio lido
+    """
+    hop = int(sample_rate * hop_ms / 1000)
+    if hop <= 0:
+        raise EngineError("Janela de análise inválida")
+
+    duration = get_duration(input_path)
+
+    silences = []
+    silence_start = None
+    silent = False
+    hops_read = 0
+    samples_read = 0
+    pending = np.empty(0, dtype=np.float32)
+
+    def close(end):
+        if silence_start is not None and end - silence_start >= min_silence:
+            silences.append((silence_start, end))
+
+    for block in iter_pcm_blocks(input_path, sample_rate, block_seconds * sample_rate):
+        samples_read += len(block)
+        samples = np.concatenate([pending, block]) if len(pending) else block
+        count = len(samples) // hop
+        pending = samples[count * hop:]
+        if not count:
+            continue
+
+        energy = np.square(samples[:count * hop], dtype=np.float64).reshape(count, hop).mean(axis=1)
+        is_silent = energy_to_db(energy) < threshold_db
+
+        # Índices das janelas em que o estado muda em relação à janela anterior
+        states = np.concatenate([[silent], is_silent])
+        for index in np.flatnonzero(states[1:] != states[:-1]):
+            time = float(hops_read + index) * hop / sample_rate
+            if is_silent[index]:
+                silence_start = time
+            else:
+                close(time)
+                silence_start = None
+        silent = bool(is_silent[-1])
+        hops_read += count
+
+        if progress and duration:
+            progress(round(min(samples_read / sample_rate / duration, 1.0) * 100, 2))
+
+    audio_duration = samples_read / sample_rate
+    if silent:
+        close(audio_duration)
+
+    return silences, audio_duration
+
+
+def plan_kept_segments(silences, duration, padding=0.1):
+    """
+    Calcula os trechos mantidos a partir dos silêncios detectados
+
+    Cada silêncio é reduzido em padding nas duas bordas, para que as falas
+    não sejam cortadas de forma abrupta.
+
+    Args:
+        silences: Lista de (início, fim) dos silêncios em segundos
+        duration: Duração total em segundos
+        padding: Silêncio mantido em cada borda em segundos
+
+    Returns:
+        list: Lista de (início, fim) dos trechos mantidos
+    """
+    kept = []
+    position = 0.0
+    for start, end in silences:
+        cut_start = start + padding if start > 0 else 0.0
+        cut_end = end - padding if end < duration else duration
+        if cut_end <= cut_start:
+            continue
+        if cut_start - position >= MIN_KEPT_SECONDS:
+            kept.append((position, cut_start))
+        position = cut_end
+
+    if duration - position >= MIN_KEPT_SECONDS:
+        kept.append((position, duration))
+
+    return kept
+
+
+def silence_trim(input_path, output_path, threshold_db=-35.0, min_silence=1.0, padding=0.1,
+                 log=None, progress=None, work_dir=None):
+    """
+    Remove os silêncios de um vídeo (jump cut), gerando um único arquivo
+
+    O vídeo de cada trecho mantido é montado como no smart cut: os GOPs inteiros
+    são copiados e apenas os GOPs parciais nas bordas são recodificados. O áudio
+    dos trechos mantidos é recodificado em uma única passada (aselect), já que as
+    bordas raramente coincidem com os quadros de áudio da origem.
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        threshold_db: Nível (dB) abaixo do qual o áudio é considerado silêncio
+        min_silence: Duração mínima de um silêncio removido em segundos
+        padding: Silêncio mantido em cada borda em segundos
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o percentual (0-100) concluído (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+
+    Returns:
+        dict: 'removed_seconds', 'kept_seconds', 'duration' e os trechos mantidos em 'segments'
+    """
+    if min_silence <= 0:
+        raise EngineError("A duração mínima do silêncio deve ser maior que zero")
+    if padding < 0 or padding * 2 >= min_silence:
+        raise EngineError("A margem deve ser positiva e menor que metade da duração mínima do silêncio")
+
+    info = probe(input_path)
+    video_stream = get_stream(info, 'video')
+    audio_stream = get_stream(info, 'audio')
+    if video_stream is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+    if audio_stream is None:
+        raise EngineError(f"Nenhuma stream de áudio encontrada em {input_path}")
+
+    if log:
+        log(f"Detectando silêncios abaixo de {threshold_db} dB com pelo menos {min_silence}s")
+
+    report = (lambda percent: progress(round(percent / 2, 2))) if progress else None
+    silences, audio_duration = detect_silences(input_path, threshold_db, min_silence, progress=report)
+    # O vídeo termina na menor das durações entre o contêiner e o áudio lido
+    source_duration = get_duration(input_path)
+    duration = min(source_duration, audio_duration) if source_duration else audio_duration
+
+    kept = plan_kept_segments(silences, duration, padding)
+    if not kept:
+        raise EngineError("O vídeo inteiro é silêncio; nada a manter")
+
+    kept_seconds = sum(end - start for start, end in kept)
+    if log:
+        log(f"{len(silences)} silêncio(s) encontrado(s); mantendo {len(kept)} trecho(s) ({kept_seconds:.3f}s de {duration:.3f}s)")
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    keyframes = find_keyframes(input_path, 0, duration)
+    encoder_args = matching_encoder_args(video_stream)
+    temp_dir = tempfile.mkdtemp(prefix='silencetrim_', dir=work_dir)
+
+    try:
+        parts = []
+        copied = 0.0
+        for kept_index, (start, end) in enumerate(kept):
+            for kind, segment_start, segment_end in plan_smart_cut(start, end, keyframes):
+                part_path = os.path.join(temp_dir, f'part_{len(parts):05d}.ts')
+                if kind == 'copy':
+                    copy_segment(input_path, part_path, segment_start, segment_end)
+                    copied += segment_end - segment_start
+                else:
+                    encode_segment(input_path, part_path, segment_start, segment_end, encoder_args)
+                parts.append(part_path)
+
+            if progress:
+                progress(round(50 + (kept_index + 1) / len(kept) * 45, 2))
+
+        video_path = os.path.join(temp_dir, 'video.mp4')
+        concat_files(parts, video_path, os.path.join(temp_dir, 'parts.txt'))
+
+        # Áudio dos trechos mantidos, em uma única passada
+        selection = '+'.join(
+            f"between(t,{format_seconds(start, SEGMENT_PRECISION)},{format_seconds(end, SEGMENT_PRECISION)})"
+            for start, end in kept
+        )
+        run_ffmpeg([
+            '-i', video_path,
+            '-i', input_path,
+            '-map', '0:v:0',
+            '-map', '1:a:0',
+            '-af', f"aselect='{selection}',asetpts=N/SR/TB",
+            '-c:v', 'copy',
+            '-c:a', 'aac',
+            '-shortest',
+            '-movflags', '+faststart',
+            output_path
+        ])
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if progress:
+        progress(100.0)
+
+    if log:
+        log(f"Removidos {duration - kept_seconds:.3f}s de silêncio ({copied:.3f}s de vídeo copiados sem recodificar)")
+
+    return {
+        'output_path': output_path,
+        'duration': round(duration, 3),
+        'kept_seconds': round(kept_seconds, 3),
+        'removed_seconds': round(duration - kept_seconds, 3),
+        'copied_seconds': round(copied, 3),
+        'segments': [[round(start, 3), round(end, 3)] for start, end in kept],
+    }
@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import (
+    run_ffmpeg, probe, get_stream, format_seconds,
+    matching_encoder_args, audio_copy_args, concat_files
+)
+from app.engine.keyframe_index import find_keyframes
+from app.engine.progress import ProgressMeter
+
+# Tolerância para comparar timestamps (em segundos)
+TIME_EPSILON = 0.001
+
+# Precisão usada nos argumentos de tempo dos trechos
+SEGMENT_PRECISION = 6
+
+
+def plan_smart_cut(start_time, end_time, keyframes):
+    """
+    Planeja os trechos de um smart cut
+
+    O trecho entre o primeiro keyframe após o início e o último keyframe antes
+    do fim é copiado; apenas os GOPs parciais das bordas são recodificados.
+
+    Args:
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos
+        keyframes: Timestamps dos keyframes em ordem crescente
+
+    Returns:
+        list: Lista de tuplas (tipo, início, fim), onde tipo é 'encode' ou 'copy'
+    """
+    inner = [k for k in keyframes if start_time - TIME_EPSILON <= k <= end_time + TIME_EPSILON]
+
+    # Sem keyframes dentro do intervalo: todo o trecho precisa ser recodificado
+    if not inner:
+        return [('encode', start_time, end_time)]
+
+    first_keyframe = inner[0]
+    last_keyframe = inner[-1]
+
+    segments = []
+
+    if first_keyframe - start_time > TIME_EPSILON:
+        segments.append(('encode', start_time, first_keyframe))
+
+    if last_keyframe - first_keyframe > TIME_EPSILON:
+        segments.append(('copy', first_keyframe, last_keyframe))
+
+    if end_time - last_keyframe > TIME_EPSILON:
+        segments.append(('encode', last_keyframe, end_time))
+
+    return segments
+
+
+def encode_segment(input_path, output_path, start_time, end_time, encoder_args):
+    """
+    Recodifica um trecho de vídeo (sem áudio) com precisão de quadro
+    """
+    run_ffmpeg([
+        '-ss', format_seconds(start_time, SEGMENT_PRECISION),
+        '-i', input_path,
+        '-t', format_seconds(end_time - start_time, SEGMENT_PRECISION),
+        '-map', '0:v:0', '-an',
+    ] + encoder_args + [
+        '-fps_mode', 'passthrough',
+        output_path
+    ])
+
+
+def copy_segment(input_path, output_path, start_time, end_time):
+    """
+    Copia um trecho de vídeo (sem áudio) que começa exatamente em um keyframe
+    """
+    # O seek é levemente deslocado para frente para não cair no keyframe anterior
+    # por arredondamento, e a duração é reduzida na mesma medida para não incluir
+    # o keyframe final, que pertence ao trecho seguinte.
+    run_ffmpeg([
+        '-ss', format_seconds(start_time + TIME_EPSILON, SEGMENT_PRECISION),
+        '-i', input_path,
+        '-t', format_seconds(end_time - start_time - 2 * TIME_EPSILON, SEGMENT_PRECISION),
+        '-map', '0:v:0', '-an',
+        '-c:v', 'copy',
+        output_path
+    ])
+
+
+def mux_source_audio(video_path, input_path, output_path, start_time, end_time, audio_stream):
+    """
+    Multiplexa um vídeo já montado com o áudio do mesmo intervalo da origem
+
+    Args:
+        video_path: Vídeo montado (sem áudio)
+        input_path: Arquivo de origem
+        output_path: Arquivo de saída
+        start_time: Tempo inicial do intervalo na origem em segundos
+        end_time: Tempo final do intervalo na origem em segundos
+        audio_stream: Stream de áudio da origem retornada pelo ffprobe (ou None)
+    """
+    run_ffmpeg([
+        '-i', video_path,
+        '-ss', format_seconds(start_time, SEGMENT_PRECISION),
+        '-i', input_path,
+        '-t', format_seconds(end_time - start_time, SEGMENT_PRECISION),
+        '-map', '0:v:0', '-map', '1:a:0?',
+        '-c:v', 'copy',
+    ] + audio_copy_args(audio_stream) + [
+        '-shortest',
+        '-movflags', '+faststart',
+        output_path
+    ])
+
+
+def smart_cut(input_path, output_path, start_time, end_time, log=None, work_dir=None, progress=None):
+    """
+    Corta um vídeo com precisão de quadro recodificando apenas as bordas
+
+    Os trechos são gerados em MPEG-TS, que repete os parâmetros do codec em cada
+    keyframe, permitindo juntar trechos recodificados e copiados sem recodificar
+    o conjunto. O áudio é cortado da origem e multiplexado no final.
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos (já validado contra a duração)
+        log: Callback para mensagens (opcional)
+        work_dir: Diretório para arquivos intermediários (opcional)
+        progress: Callback que recebe o progresso estruturado a cada trecho concluído
+            (ver progress_reporter) (opcional)
+    """
+    info = probe(input_path)
+    video_stream = get_stream(info, 'video')
+    audio_stream = get_stream(info, 'audio')
+
+    if video_stream is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+
+    keyframes = find_keyframes(input_path, start_time, end_time)
+    segments = plan_smart_cut(start_time, end_time, keyframes)
+    encoder_args = matching_encoder_args(video_stream)
+
+    temp_dir = tempfile.mkdtemp(prefix='smartcut_', dir=work_dir)
+    meter = ProgressMeter(end_time - start_time, progress) if progress else None
+
+    try:
+        parts = []
+        for index, (kind, segment_start, segment_end) in enumerate(segments):
+            part_path = os.path.join(temp_dir, f'part_{index:03d}.ts')
+
+            if kind == 'copy':
+                if log:
+                    log(f"Copiando trecho {segment_start:.3f}s - {segment_end:.3f}s")
+                copy_segment(input_path, part_path, segment_start, segment_end)
+            else:
+                if log:
+                    log(f"Recodificando trecho {segment_start:.3f}s - {segment_end:.3f}s")
+                encode_segment(input_path, part_path, segment_start, segment_end, encoder_args)
+
+            parts.append(part_path)
+            if meter:
+                meter.update(segment_end - start_time, force=True)
+
+        video_path = os.path.join(temp_dir, 'video.mp4')
+        concat_files(parts, video_path, os.path.join(temp_dir, 'parts.txt'))
+
+        # Multiplexar o vídeo montado com o áudio do intervalo original
+        mux_source_audio(video_path, input_path, output_path, start_time, end_time, audio_stream)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if meter:
+        meter.finish()
+
+    return segments
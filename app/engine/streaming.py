@@ -0,0 +1,146 @@
+import weakref
+import threading
+import subprocess
+from app.engine.errors import EngineError, FFmpegError
+from app.engine.ffmpeg import FFMPEG_BIN, format_seconds
+
+# Modos do corte transmitido: cópia das streams ou recodificação rápida
+STREAM_MODES = ('copy', 'fast')
+
+# Tamanho máximo de cada bloco lido do ffmpeg (bytes); blocos menores são
+# repassados assim que ficam disponíveis
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Intervalo entre keyframes (e fragmentos) na recodificação rápida (segundos)
+STREAM_KEYFRAME_INTERVAL = 1
+
+# MP4 fragmentado: o cabeçalho vai primeiro e cada fragmento é enviado assim que fica pronto
+FRAGMENTED_MP4_ARGS = ['-movflags', 'frag_keyframe+empty_moov+default_base_moof', '-flush_packets', '1', '-f', 'mp4']
+
+
+class FFmpegStream:
+    """
+    Saída do ffmpeg transmitida enquanto é gerada, sem gravar arquivo
+
+    O ffmpeg só é iniciado por start() e escreve na saída padrão, lida em blocos
+    por read(). close() encerra o processo a qualquer momento (ex: cliente
+    desconectado), inclusive durante uma leitura em outra thread.
+    """
+
+    def __init__(self, args, chunk_size=STREAM_CHUNK_SIZE, on_close=None):
+        """
+        Inicializa a transmissão
+
+        Args:
+            args: Lista de argumentos do ffmpeg (sem o binário); a saída deve ser pipe:1
+            chunk_size: Tamanho máximo de cada bloco em bytes
+            on_close: Função chamada uma única vez no primeiro close(), ou quando a
+                transmissão é descartada sem ser encerrada (ex: liberar a vaga da transmissão)
+        """
+        self.chunk_size = chunk_size
+        self.process = None
+        self.stderr_chunks = []
+        # Encerrado por close() antes do fim (ex: cliente desconectado)
+        self.interrupted = False
+        self._on_close = weakref.finalize(self, on_close) if on_close else None
+        self.command = [FFMPEG_BIN, '-hide_banner', '-nostdin', '-loglevel', 'error'] + list(args)
+
+    def start(self):
+        """
+        Inicia o ffmpeg
+
+        Returns:
+            FFmpegStream: A própria transmissão
+
+        Raises:
+            FFmpegError: Se o ffmpeg não for encontrado
+        """
+        try:
+            self.process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise FFmpegError(f"Executável do ffmpeg não encontrado: {FFMPEG_BIN}", command=self.command)
+
+        # Drenar stderr em paralelo para o processo não bloquear com o pipe cheio
+        threading.Thread(target=lambda: self.stderr_chunks.extend(self.process.stderr), daemon=True).start()
+        return self
+
+    def read(self):
+        """
+        Lê o próximo bloco disponível da saída, sem esperar o bloco completo
+
+        Returns:
+            bytes: Bloco da saída (vazio ao final ou após close())
+        """
+        try:
+            return self.process.stdout.read1(self.chunk_size)
+        except (OSError, ValueError):
+            # Saída fechada por close()
+            return b''
+
+    def close(self):
+        """
+        Encerra o ffmpeg se ainda estiver em execução e libera a saída
+
+        Pode ser chamado mais de uma vez, inclusive antes de start().
+        """
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.interrupted = True
+                self.process.kill()
+            self.process.wait()
+            self.process.stdout.close()
+
+        if self._on_close is not None:
+            # weakref.finalize executa a função apenas uma vez
+            self._on_close()
+
+    @property
+    def error(self):
+        """
+        Mensagem de erro do ffmpeg (None se terminou com sucesso, foi interrompido ou ainda está em execução)
+        """
+        if self.process is None or self.interrupted or self.process.poll() in (None, 0):
+            return None
+        return b''.join(self.stderr_chunks).decode('utf-8', errors='replace').strip() or f"ffmpeg terminou com código {self.process.returncode}"
+
+
+class StreamingCut(FFmpegStream):
+    """
+    Corte transmitido enquanto é gerado, como MP4 fragmentado
+    """
+
+    def __init__(self, input_path, start_time, end_time, mode='copy', chunk_size=STREAM_CHUNK_SIZE, on_close=None):
+        """
+        Inicializa o corte
+
+        Args:
+            input_path: Arquivo de entrada
+            start_time: Tempo inicial em segundos
+            end_time: Tempo final em segundos (já validado contra a duração)
+            mode: 'copy' (começa no keyframe anterior ao início, sem recodificar) ou
+                'fast' (preciso, recodifica com o preset mais rápido do libx264)
+            chunk_size: Tamanho máximo de cada bloco em bytes
+            on_close: Função chamada uma única vez ao encerrar (ver FFmpegStream)
+
+        Raises:
+            EngineError: Se o modo for inválido
+        """
+        if mode not in STREAM_MODES:
+            raise EngineError(f"Modo de transmissão inválido: {mode}. Use um dos modos: {', '.join(STREAM_MODES)}")
+
+        args = [
+            '-ss', format_seconds(start_time),
+            '-i', input_path,
+            '-t', format_seconds(end_time - start_time),
+            '-map', '0:v:0', '-map', '0:a:0?',
+        ]
+        if mode == 'copy':
+            args += ['-c', 'copy', '-avoid_negative_ts', 'make_zero']
+        else:
+            args += [
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'zerolatency', '-pix_fmt', 'yuv420p',
+                '-force_key_frames', f'expr:gte(t,n_forced*{STREAM_KEYFRAME_INTERVAL})',
+                '-c:a', 'aac', '-b:a', '128k',
+            ]
+
+        super().__init__(args + FRAGMENTED_MP4_ARGS + ['pipe:1'], chunk_size, on_close)
@@ -0,0 +1,205 @@
+import os
+import json
+import math
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, get_duration, list_keyframes
+from app.engine.keyframe_index import get_or_build_index
+
+# Versão do formato do manifesto (incrementar ao mudar a estrutura)
+THUMBNAILS_VERSION = 1
+
+# Nomes dos arquivos gerados no diretório de miniaturas
+MANIFEST_FILENAME = 'thumbnails.json'
+VTT_FILENAME = 'thumbnails.vtt'
+SHEET_PATTERN = 'sprite_%03d.jpg'
+
+# Altura máxima de cada sprite sheet; acima disso as miniaturas seguem em outra imagem
+MAX_SHEET_HEIGHT = 8192
+
+
+def plan_thumbnail_times(keyframes, interval):
+    """
+    Escolhe os keyframes usados como miniaturas
+
+    Seleciona o primeiro keyframe e, a partir dele, o primeiro keyframe distante
+    pelo menos um intervalo do último escolhido (mesma regra do filtro select).
+
+    Args:
+        keyframes: Timestamps dos keyframes em ordem crescente
+        interval: Intervalo mínimo entre miniaturas em segundos
+
+    Returns:
+        list: Timestamps das miniaturas
+    """
+    times = []
+    for time in keyframes:
+        if not times or time - times[-1] >= interval - 0.001:
+            times.append(time)
+    return times
+
+
+def _format_vtt_time(seconds):
+    """
+    Formata segundos no padrão do WebVTT (HH:MM:SS.mmm)
+    """
+    milliseconds = int(round(max(seconds, 0) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+
+def load_thumbnails(output_dir, input_path):
+    """
+    Carrega o manifesto de miniaturas já gerado para um vídeo
+
+    Args:
+        output_dir: Diretório das miniaturas
+        input_path: Arquivo de vídeo de origem
+
+    Returns:
+        dict: Manifesto ou None se não existir, for de outra versão ou o vídeo tiver mudado
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(input_path)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('version') != THUMBNAILS_VERSION:
+        return None
+    if manifest.get('source_size') != stat.st_size or manifest.get('source_mtime') != stat.st_mtime:
+        return None
+
+    return manifest
+
+
+def generate_thumbnails(input_path, output_dir, interval, width=160, columns=10, log=None, progress=None):
+    """
+    Gera sprite sheets de miniaturas e os índices WebVTT e JSON em uma única passada
+
+    O vídeo é lido decodificando apenas os keyframes (-skip_frame nokey); o filtro
+    select escolhe um keyframe a cada intervalo, que é reduzido e montado na
+    grade da sprite sheet com o filtro tile.
+
+    Args:
+        input_path: Arquivo de vídeo
+        output_dir: Diretório onde as imagens e os índices são gravados
+        interval: Intervalo entre miniaturas em segundos
+        width: Largura de cada miniatura em pixels
+        columns: Miniaturas por linha da sprite sheet
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o percentual (0-100) concluído (opcional)
+
+    Returns:
+        dict: Manifesto com as sprite sheets e a posição de cada miniatura
+    """
+    if interval <= 0:
+        raise EngineError("O intervalo entre miniaturas deve ser maior que zero")
+
+    info = probe(input_path)
+    video_stream = get_stream(info, 'video')
+    if video_stream is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+
+    # Tempos das miniaturas a partir do índice de keyframes (ou do ffprobe)
+    index = get_or_build_index(input_path)
+    if index is not None:
+        keyframes = index.times
+        duration = index.duration or get_duration(input_path)
+    else:
+        keyframes = list_keyframes(input_path)
+        duration = get_duration(input_path)
+
+    times = plan_thumbnail_times(keyframes, interval)
+    if not times:
+        raise EngineError(f"Nenhum keyframe encontrado em {input_path}")
+
+    # Altura proporcional (par) e grade de cada sprite sheet
+    source_width = video_stream.get('width') or 16
+    source_height = video_stream.get('height') or 9
+    height = max(2, int(round(width * source_height / source_width / 2)) * 2)
+    columns = max(1, min(columns, len(times)))
+    rows = max(1, min(math.ceil(len(times) / columns), MAX_SHEET_HEIGHT // height))
+    per_sheet = columns * rows
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    if log:
+        log(f"Gerando {len(times)} miniatura(s) a cada {interval}s em {math.ceil(len(times) / per_sheet)} sprite sheet(s)")
+
+    filters = (
+        f"select='isnan(prev_selected_t)+gte(t-prev_selected_t,{interval - 0.001})',"
+        f"scale={width}:{height},"
+        f"tile={columns}x{rows}"
+    )
+
+    def report(data):
+        if data.get('progress') == 'end':
+            progress(100.0)
+        elif data.get('out_time') is not None and duration:
+            progress(round(min(data['out_time'] / duration, 1.0) * 100, 2))
+
+    run_ffmpeg_progress([
+        '-skip_frame', 'nokey',
+        '-i', input_path,
+        '-map', '0:v:0', '-an',
+        '-vf', filters,
+        '-fps_mode', 'vfr',
+        '-q:v', '4',
+        os.path.join(output_dir, SHEET_PATTERN)
+    ], report if progress else None)
+
+    # Posição de cada miniatura nas sprite sheets
+    thumbnails = []
+    for i, time in enumerate(times):
+        sheet_index, position = divmod(i, per_sheet)
+        row, column = divmod(position, columns)
+        thumbnails.append({
+            'time': round(time, 3),
+            'end': round(times[i + 1] if i + 1 < len(times) else (duration or time + interval), 3),
+            'sheet': SHEET_PATTERN % (sheet_index + 1),
+            'x': column * width,
+            'y': row * height,
+            'w': width,
+            'h': height,
+        })
+
+    # Índice WebVTT (referências relativas às sprite sheets)
+    lines = ['WEBVTT', '']
+    for thumbnail in thumbnails:
+        lines.append(f"{_format_vtt_time(thumbnail['time'])} --> {_format_vtt_time(thumbnail['end'])}")
+        lines.append(f"{thumbnail['sheet']}#xywh={thumbnail['x']},{thumbnail['y']},{thumbnail['w']},{thumbnail['h']}")
+        lines.append('')
+
+    with open(os.path.join(output_dir, VTT_FILENAME), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+    stat = os.stat(input_path)
+    manifest = {
+        'version': THUMBNAILS_VERSION,
+        'interval': interval,
+        'width': width,
+        'height': height,
+        'columns': columns,
+        'rows': rows,
+        'duration': duration,
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'sheets': sorted({thumbnail['sheet'] for thumbnail in thumbnails}),
+        'vtt': VTT_FILENAME,
+        'thumbnails': thumbnails,
+    }
+
+    # Manifesto por último: sua presença indica que a geração terminou
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    with open(f'{manifest_path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+
+    return manifest
@@ -0,0 +1,224 @@
+import os
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import run_ffmpeg_progress, probe, get_stream, format_seconds
+from app.engine.progress import progress_reporter
+from app.engine.renditions import RENDITION_CONTAINERS, normalize_rendition, scale_filter, rendition_encoder_args
+
+# Transformações aceitas, aplicadas na ordem informada
+TRANSFORM_TYPES = ('scale', 'fps', 'watermark', 'loudnorm')
+
+# Posições da marca d'água (expressões x:y do filtro overlay)
+WATERMARK_POSITIONS = {
+    'top-left': ('{m}', '{m}'),
+    'top-right': ('W-w-{m}', '{m}'),
+    'bottom-left': ('{m}', 'H-h-{m}'),
+    'bottom-right': ('W-w-{m}', 'H-h-{m}'),
+    'center': ('(W-w)/2', '(H-h)/2'),
+}
+
+# Taxa de amostragem do áudio após o loudnorm (que processa internamente a 192 kHz)
+LOUDNORM_SAMPLE_RATE = 48000
+
+
+def normalize_transform(transform, index=0):
+    """
+    Valida uma transformação e preenche os valores padrão
+
+    Args:
+        transform: Dicionário com 'type' e os parâmetros do tipo:
+            scale: 'width' e/ou 'height' (pares; com ambos, preenche o quadro e recorta o excesso)
+            fps: 'fps'
+            watermark: 'image' (caminho), 'position', 'margin' (px), 'opacity' (0-1) e 'width' (px, opcional)
+            loudnorm: 'integrated' (LUFS), 'true_peak' (dBTP) e 'lra' (LU)
+        index: Posição da transformação na lista, usada nas mensagens de erro
+
+    Returns:
+        dict: Transformação normalizada
+
+    Raises:
+        EngineError: Se a transformação for inválida
+    """
+    kind = transform.get('type')
+    label = f"Transformação {index + 1}"
+
+    if kind == 'scale':
+        width = transform.get('width')
+        height = transform.get('height')
+        if not width and not height:
+            raise EngineError(f"{label}: informe width e/ou height")
+        for value in (width, height):
+            if value is not None and (not isinstance(value, int) or value <= 0 or value % 2):
+                raise EngineError(f"{label}: resolução inválida ({value}). Use valores inteiros, positivos e pares")
+        return {'type': kind, 'width': width, 'height': height}
+
+    if kind == 'fps':
+        fps = transform.get('fps')
+        if not isinstance(fps, (int, float)) or fps <= 0:
+            raise EngineError(f"{label}: fps deve ser maior que zero")
+        return {'type': kind, 'fps': float(fps)}
+
+    if kind == 'watermark':
+        if not transform.get('image'):
+            raise EngineError(f"{label}: informe a imagem da marca d'água")
+        position = transform.get('position') or 'bottom-right'
+        if position not in WATERMARK_POSITIONS:
+            raise EngineError(f"{label}: posição inválida ({position}). Use uma das posições: {', '.join(WATERMARK_POSITIONS)}")
+        margin = transform.get('margin', 10)
+        opacity = transform.get('opacity', 1.0)
+        width = transform.get('width')
+        if not isinstance(margin, int) or margin < 0:
+            raise EngineError(f"{label}: a margem deve ser um inteiro positivo")
+        if not isinstance(opacity, (int, float)) or not 0 < opacity <= 1:
+            raise EngineError(f"{label}: a opacidade deve estar entre 0 e 1")
+        if width is not None and (not isinstance(width, int) or width <= 0):
+            raise EngineError(f"{label}: a largura da marca d'água deve ser um inteiro positivo")
+        return {
+            'type': kind,
+            'image': transform['image'],
+            'position': position,
+            'margin': margin,
+            'opacity': float(opacity),
+            'width': width,
+        }
+
+    if kind == 'loudnorm':
+        options = {'integrated': -16.0, 'true_peak': -1.5, 'lra': 11.0}
+        limits = {'integrated': (-70, -5), 'true_peak': (-9, 0), 'lra': (1, 50)}
+        for key, (low, high) in limits.items():
+            value = transform.get(key)
+            if value is None:
+                continue
+            if not isinstance(value, (int, float)) or not low <= value <= high:
+                raise EngineError(f"{label}: {key} deve estar entre {low} e {high}")
+            options[key] = float(value)
+        return {'type': kind, **options}
+
+    raise EngineError(f"{label}: tipo inválido ({kind}). Use um dos tipos: {', '.join(TRANSFORM_TYPES)}")
+
+
+def build_transform_graph(transforms, has_audio):
+    """
+    Compila as transformações em um único grafo de filtros
+
+    As transformações de vídeo (escala, fps, marca d'água) formam uma cadeia na
+    ordem informada; a normalização de áudio forma a cadeia do áudio. Cada marca
+    d'água é uma entrada adicional do ffmpeg (a partir do índice 1).
+
+    Args:
+        transforms: Lista de transformações normalizadas (ver normalize_transform)
+        has_audio: Se a entrada tem stream de áudio
+
+    Returns:
+        tuple: (grafo para -filter_complex, imagens das entradas adicionais,
+            rótulo da saída de vídeo, rótulo da saída de áudio ou None para copiar a stream original)
+
+    Raises:
+        EngineError: Se houver normalização de áudio sem stream de áudio
+    """
+    filters = []
+    images = []
+    video = '[0:v:0]'
+    audio = None
+
+    for index, transform in enumerate(transforms):
+        kind = transform['type']
+        output = f'[v{index}]'
+
+        if kind == 'scale':
+            filters.append(f"{video}{scale_filter(transform)}{output}")
+        elif kind == 'fps':
+            filters.append(f"{video}fps={transform['fps']:g}{output}")
+        elif kind == 'watermark':
+            images.append(transform['image'])
+            mark = f'[wm{index}]'
+            chain = [f"[{len(images)}:v]format=rgba"]
+            if transform['width']:
+                chain.append(f"scale={transform['width']}:-1")
+            if transform['opacity'] < 1:
+                chain.append(f"colorchannelmixer=aa={transform['opacity']:g}")
+            filters.append(','.join(chain) + mark)
+            x, y = (value.format(m=transform['margin']) for value in WATERMARK_POSITIONS[transform['position']])
+            filters.append(f"{video}{mark}overlay={x}:{y}:format=auto{output}")
+        elif kind == 'loudnorm':
+            if not has_audio:
+                raise EngineError("Normalização de áudio solicitada, mas a entrada não tem stream de áudio")
+            source = audio or '[0:a:0]'
+            audio = f'[a{index}]'
+            filters.append(
+                f"{source}loudnorm=I={transform['integrated']:g}:TP={transform['true_peak']:g}:LRA={transform['lra']:g},"
+                f"aresample={LOUDNORM_SAMPLE_RATE}{audio}"
+            )
+            continue
+        else:
+            raise EngineError(f"Tipo de transformação inválido: {kind}")
+
+        video = output
+
+    if video == '[0:v:0]':
+        # Apenas transformações de áudio: o vídeo passa pelo grafo sem alterações
+        filters.append('[0:v:0]null[v]')
+        video = '[v]'
+
+    return ';'.join(filters), images, video, audio
+
+
+def cut_transformed(input_path, output_path, start_time, end_time, transforms, log=None, progress=None):
+    """
+    Corta um intervalo aplicando as transformações em uma única decodificação e codificação
+
+    O intervalo é lido com seek na entrada, as transformações são compiladas em
+    um único grafo de filtros (ver build_transform_graph) e a saída é codificada
+    uma única vez, com os codificadores do container do arquivo de saída.
+
+    Args:
+        input_path: Arquivo de entrada
+        output_path: Arquivo de saída (mp4, mkv ou webm)
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos (já validado contra a duração)
+        transforms: Lista de transformações normalizadas, na ordem de aplicação
+        log: Callback para mensagens (opcional)
+        progress: Callback que recebe o progresso estruturado (ver progress_reporter) (opcional)
+
+    Raises:
+        EngineError: Se a entrada não tiver vídeo ou as transformações forem inválidas
+    """
+    if not transforms:
+        raise EngineError("Nenhuma transformação informada")
+
+    info = probe(input_path)
+    if get_stream(info, 'video') is None:
+        raise EngineError(f"Nenhuma stream de vídeo encontrada em {input_path}")
+    has_audio = get_stream(info, 'audio') is not None
+
+    graph, images, video_label, audio_label = build_transform_graph(transforms, has_audio)
+    for image in images:
+        if not os.path.isfile(image):
+            raise EngineError(f"Imagem da marca d'água não encontrada: {image}")
+
+    container = os.path.splitext(output_path)[1].lstrip('.').lower()
+    profile = normalize_rendition({'container': container if container in RENDITION_CONTAINERS else 'mp4'})
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    duration = end_time - start_time
+    args = [
+        '-ss', format_seconds(start_time, 6),
+        '-t', format_seconds(duration, 6),
+        '-i', input_path,
+    ]
+    for image in images:
+        args += ['-i', image]
+
+    args += ['-filter_complex', graph, '-map', video_label]
+    if audio_label:
+        args += ['-map', audio_label]
+    elif has_audio:
+        args += ['-map', '0:a:0']
+    args += rendition_encoder_args(profile, has_audio) + [output_path]
+
+    if log:
+        log(f"Aplicando {len(transforms)} transformação(ões) em uma única codificação: {', '.join(t['type'] for t in transforms)}")
+
+    run_ffmpeg_progress(args, progress_reporter(duration, progress) if progress else None)
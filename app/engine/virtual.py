@@ -0,0 +1,169 @@
+import os
+import math
+import bisect
+from app.engine.errors import EngineError
+from app.engine.ffmpeg import list_keyframes, format_seconds
+from app.engine.keyframe_index import get_or_build_index
+from app.engine.streaming import FFmpegStream
+
+# Versão do formato do manifesto de corte virtual (incrementar ao mudar a estrutura)
+VIRTUAL_VERSION = 1
+
+# Tamanho dos blocos lidos do ffmpeg ao servir um segmento (bytes)
+SEGMENT_CHUNK_SIZE = 64 * 1024
+
+
+def plan_virtual_clip(input_path, start_time, end_time, segment_seconds=4):
+    """
+    Planeja um corte virtual: segmentos do arquivo de origem alinhados aos keyframes
+
+    Nenhum arquivo de vídeo é gerado. O corte começa no último keyframe anterior
+    ou igual a start_time (como no modo copy) e é dividido em segmentos de
+    ~segment_seconds, cada um começando em um keyframe. Quando o container é
+    indexado, cada segmento traz também a posição em bytes do seu keyframe e o
+    tamanho até o keyframe seguinte, ou seja, o trecho da origem que ele lê.
+
+    Args:
+        input_path: Arquivo de origem
+        start_time: Tempo inicial em segundos
+        end_time: Tempo final em segundos (já validado contra a duração)
+        segment_seconds: Duração alvo de cada segmento em segundos
+
+    Returns:
+        dict: Manifesto com o início real, a duração, os segmentos e a identificação da origem
+
+    Raises:
+        EngineError: Se o intervalo ou a duração dos segmentos forem inválidos
+    """
+    if segment_seconds <= 0:
+        raise EngineError("A duração dos segmentos deve ser maior que zero")
+    if end_time <= start_time:
+        raise EngineError("O tempo final deve ser maior que o tempo inicial")
+
+    index = get_or_build_index(input_path)
+    if index is not None:
+        keyframes = index.keyframes
+    else:
+        # Container sem índice: apenas os tempos, via ffprobe
+        keyframes = [(time, None) for time in list_keyframes(input_path, 0, end_time)]
+
+    times = [time for time, _ in keyframes]
+    first = bisect.bisect_right(times, start_time) - 1
+    if first < 0:
+        first = 0
+        if not times or times[0] >= end_time:
+            raise EngineError(f"Nenhum keyframe encontrado no intervalo de {input_path}")
+    last = bisect.bisect_left(times, end_time)
+
+    # Keyframes que podem abrir segmentos, mais o keyframe seguinte ao fim (limite em bytes)
+    boundaries = keyframes[first:last]
+    following = keyframes[last] if last < len(keyframes) else None
+
+    segments = []
+    for time, offset in boundaries:
+        if segments and time - segments[-1]['start'] < segment_seconds:
+            continue
+        if segments:
+            segments[-1]['end'] = time
+        segments.append({'start': time, 'end': end_time, 'offset': offset})
+
+    # Tamanho em bytes: do keyframe do segmento até o keyframe que abre o seguinte
+    offsets = [segment['offset'] for segment in segments[1:]] + [following[1] if following else None]
+    for segment, next_offset in zip(segments, offsets):
+        if segment['offset'] is not None and next_offset is not None:
+            segment['length'] = next_offset - segment['offset']
+        else:
+            segment['length'] = None
+        segment['duration'] = round(segment['end'] - segment['start'], 6)
+
+    stat = os.stat(input_path)
+    return {
+        'version': VIRTUAL_VERSION,
+        'requested_start': start_time,
+        'start': segments[0]['start'],
+        'end': end_time,
+        'duration': round(end_time - segments[0]['start'], 6),
+        'segment_seconds': segment_seconds,
+        'source_size': stat.st_size,
+        'source_mtime': stat.st_mtime,
+        'segments': segments,
+    }
+
+
+def virtual_clip_matches(manifest, input_path):
+    """
+    Verifica se o arquivo de origem ainda é o mesmo do manifesto (tamanho e data de modificação)
+
+    Args:
+        manifest: Manifesto gerado por plan_virtual_clip
+        input_path: Arquivo de origem
+
+    Returns:
+        bool: True se a origem não mudou e o manifesto é da versão atual
+    """
+    try:
+        stat = os.stat(input_path)
+    except OSError:
+        return False
+    return (
+        manifest.get('version') == VIRTUAL_VERSION
+        and manifest.get('source_size') == stat.st_size
+        and manifest.get('source_mtime') == stat.st_mtime
+    )
+
+
+def virtual_playlist(manifest, segment_url):
+    """
+    Monta a playlist HLS (VOD) de um corte virtual
+
+    Args:
+        manifest: Manifesto gerado por plan_virtual_clip
+        segment_url: Função que recebe o número do segmento e retorna sua URL
+
+    Returns:
+        str: Conteúdo da playlist .m3u8
+    """
+    segments = manifest['segments']
+    target = max(math.ceil(segment['duration']) for segment in segments)
+    lines = [
+        '#EXTM3U',
+        '#EXT-X-VERSION:3',
+        f'#EXT-X-TARGETDURATION:{max(target, 1)}',
+        '#EXT-X-MEDIA-SEQUENCE:0',
+        '#EXT-X-PLAYLIST-TYPE:VOD',
+    ]
+    for number, segment in enumerate(segments):
+        lines.append(f"#EXTINF:{segment['duration']:.6f},")
+        lines.append(segment_url(number))
+    lines.append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+
+def stream_virtual_segment(input_path, segment, chunk_size=SEGMENT_CHUNK_SIZE, on_close=None):
+    """
+    Prepara a leitura de um segmento de um corte virtual diretamente da origem, como MPEG-TS
+
+    O ffmpeg busca o keyframe do segmento e copia as streams até o fim dele,
+    lendo da origem apenas esse trecho. Os timestamps originais são mantidos
+    para que os segmentos sejam contínuos na playlist. O processo só é iniciado
+    por start() e é encerrado por close() (ex: cliente desconectado).
+
+    Args:
+        input_path: Arquivo de origem
+        segment: Segmento do manifesto ('start' e 'end' em segundos)
+        chunk_size: Tamanho máximo dos blocos em bytes
+        on_close: Função chamada uma única vez ao encerrar (ver FFmpegStream)
+
+    Returns:
+        FFmpegStream: Transmissão do segmento, ainda não iniciada
+    """
+    return FFmpegStream([
+        '-ss', format_seconds(segment['start'], 6),
+        '-i', input_path,
+        '-to', format_seconds(segment['end'], 6),
+        '-copyts',
+        '-map', '0:v:0', '-map', '0:a:0?',
+        '-c', 'copy',
+        '-f', 'mpegts',
+        'pipe:1'
+    ], chunk_size, on_close)
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+
+def memory_available():
+    """
+    Obtém a memória disponível do sistema em bytes (MemAvailable do /proc/meminfo)
+
+    Returns:
+        int: Bytes disponíveis ou None se não for possível determinar
+    """
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def ram_staging_fits(ram_dir, estimated_bytes, reserve_bytes=0):
+    """
+    Verifica se os arquivos intermediários de um job cabem em um diretório em memória
+
+    Considera o espaço livre do diretório (tmpfs) e a memória disponível do sistema,
+    mantendo a reserva informada.
+
+    Args:
+        ram_dir: Diretório em memória (ex: /dev/shm)
+        estimated_bytes: Tamanho estimado dos arquivos intermediários
+        reserve_bytes: Memória que deve continuar livre
+
+    Returns:
+        bool: True se o job pode usar o diretório em memória
+    """
+    if not ram_dir or not os.path.isdir(ram_dir):
+        return False
+
+    try:
+        free = shutil.disk_usage(ram_dir).free
+    except OSError:
+        return False
+
+    available = memory_available()
+    if available is not None:
+        free = min(free, available)
+
+    return free >= estimated_bytes + reserve_bytes
+
+
+class Workspace:
+    """
+    Diretório temporário exclusivo de um job, removido ao final
+
+    Usado como gerenciador de contexto: o diretório é removido na saída do bloco,
+    seja por sucesso, erro ou cancelamento.
+    """
+
+    def __init__(self, base_dir=None, name=None, ram_dir=None, estimated_bytes=0, reserve_bytes=0):
+        """
+        Inicializa o workspace
+
+        Args:
+            base_dir: Diretório onde o workspace é criado (padrão: temporário do sistema)
+            name: Identificador do job, usado no nome do diretório (opcional)
+            ram_dir: Diretório em memória usado quando houver memória livre suficiente (opcional)
+            estimated_bytes: Tamanho estimado dos arquivos intermediários
+            reserve_bytes: Memória que deve continuar livre ao usar o diretório em memória
+        """
+        self.in_ram = ram_staging_fits(ram_dir, estimated_bytes, reserve_bytes)
+        self.base_dir = ram_dir if self.in_ram else base_dir
+        self.name = name
+        self.path = None
+
+    def __enter__(self):
+        if self.base_dir:
+            os.makedirs(self.base_dir, exist_ok=True)
+        prefix = f'job_{self.name}_' if self.name else 'job_'
+        self.path = tempfile.mkdtemp(prefix=prefix, dir=self.base_dir)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+
+    def cleanup(self):
+        """
+        Remove o diretório do workspace e todo o seu conteúdo
+        """
+        if self.path:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
+
+    def __repr__(self):
+        return f"<Workspace(path={self.path}, in_ram={self.in_ram})>"
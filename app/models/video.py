@@ -6,7 +6,9 @@ class Video:
     """
     
     def __init__(self, id=None, platform=None, url=None, filename=None, 
-                 status="pending", duration=None, created_at=None, updated_at=None):
+                 status="pending", duration=None, width=None, height=None, video_codec=None,
+                 audio_codec=None, bitrate=None, mezzanine_filename=None, mezzanine_keyframe_interval=None,
+                 created_at=None, updated_at=None):
         """
         Inicializa um objeto Video
         
@@ -15,8 +17,15 @@ class Video:
             platform: Plataforma de origem do vídeo
             url: URL do vídeo
             filename: Nome do arquivo
-            status: Status do vídeo (pending, downloading, completed, error)
+            status: Status do vídeo (pending, downloading, processing, completed, partial, error)
             duration: Duração do vídeo em segundos
+            width: Largura do vídeo em pixels
+            height: Altura do vídeo em pixels
+            video_codec: Codec da stream de vídeo
+            audio_codec: Codec da stream de áudio
+            bitrate: Taxa de bits total em bits/s
+            mezzanine_filename: Arquivo da versão de trabalho com keyframes densos (em downloads/mezzanine)
+            mezzanine_keyframe_interval: Intervalo entre keyframes da versão de trabalho em segundos
             created_at: Data de criação
             updated_at: Data de atualização
         """
@@ -26,6 +35,13 @@ class Video:
         self.filename = filename
         self.status = status
         self.duration = duration
+        self.width = width
+        self.height = height
+        self.video_codec = video_codec
+        self.audio_codec = audio_codec
+        self.bitrate = bitrate
+        self.mezzanine_filename = mezzanine_filename
+        self.mezzanine_keyframe_interval = mezzanine_keyframe_interval
         self.created_at = created_at or datetime.now()
         self.updated_at = updated_at or datetime.now()
     
@@ -47,6 +63,13 @@ class Video:
             filename=data.get('filename'),
             status=data.get('status', 'pending'),
             duration=data.get('duration'),
+            width=data.get('width'),
+            height=data.get('height'),
+            video_codec=data.get('video_codec'),
+            audio_codec=data.get('audio_codec'),
+            bitrate=data.get('bitrate'),
+            mezzanine_filename=data.get('mezzanine_filename'),
+            mezzanine_keyframe_interval=data.get('mezzanine_keyframe_interval'),
             created_at=data.get('created_at'),
             updated_at=data.get('updated_at')
         )
@@ -65,6 +88,13 @@ class Video:
             "filename": self.filename,
             "status": self.status,
             "duration": self.duration,
+            "width": self.width,
+            "height": self.height,
+            "video_codec": self.video_codec,
+            "audio_codec": self.audio_codec,
+            "bitrate": self.bitrate,
+            "mezzanine_filename": self.mezzanine_filename,
+            "mezzanine_keyframe_interval": self.mezzanine_keyframe_interval,
             "created_at": self.created_at.isoformat() if hasattr(self.created_at, 'isoformat') else self.created_at,
             "updated_at": self.updated_at.isoformat() if hasattr(self.updated_at, 'isoformat') else self.updated_at
         }
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel
 
 class VideoDownloadRequest(BaseModel):
@@ -8,12 +8,45 @@ class VideoDownloadRequest(BaseModel):
     cookies: Optional[str] = None
     cookies_from_browser: Optional[str] = None
 
-class VideoCutRequest(BaseModel):
-    video_id: str
+class CutRange(BaseModel):
     start_time: str
     end_time: str
     output_filename: Optional[str] = None
 
+class RenditionProfile(BaseModel):
+    name: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    crf: Optional[int] = None
+    video_bitrate: Optional[str] = None
+    audio_bitrate: Optional[str] = None
+    container: str = "mp4"
+
+class CutTransform(BaseModel):
+    type: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    image: Optional[str] = None
+    position: Optional[str] = None
+    margin: Optional[int] = None
+    opacity: Optional[float] = None
+    integrated: Optional[float] = None
+    true_peak: Optional[float] = None
+    lra: Optional[float] = None
+
+class VideoCutRequest(BaseModel):
+    video_id: str
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    output_filename: Optional[str] = None
+    mode: str = "reencode"
+    ranges: Optional[List[CutRange]] = None
+    renditions: Optional[List[RenditionProfile]] = None
+    transforms: Optional[List[CutTransform]] = None
+    hls: bool = False
+    virtual: bool = False
+
 class DownloadAndCutRequest(BaseModel):
     url: str
     start_time: str
@@ -22,6 +55,33 @@ class DownloadAndCutRequest(BaseModel):
     output_filename: Optional[str] = None
     cookies: Optional[str] = None
     cookies_from_browser: Optional[str] = None
+    mode: str = "reencode"
+
+class ConcatInput(BaseModel):
+    filename: Optional[str] = None
+    video_id: Optional[str] = None
+
+class VideoConcatRequest(BaseModel):
+    inputs: List[ConcatInput]
+    output_filename: Optional[str] = None
+
+class SilenceTrimRequest(BaseModel):
+    video_id: str
+    output_filename: Optional[str] = None
+    threshold_db: float = -35.0
+    min_silence: float = 1.0
+    padding: float = 0.1
+
+class VirtualMaterializeRequest(BaseModel):
+    output_filename: Optional[str] = None
+    mode: Optional[str] = None
+
+class PreviewRequest(BaseModel):
+    filename: str
+    format: str = "webp"
+    max_width: int = 480
+    max_fps: float = 12.0
+    output_filename: Optional[str] = None
 
 class HealthResponse(BaseModel):
     status: str
@@ -1,5 +1,6 @@
 # Inicialização do pacote repositories
 from app.repositories.video_repository import VideoRepository
+from app.repositories.video_analysis_repository import VideoAnalysisRepository
 
 # Exportar classes
-__all__ = ['VideoRepository']
\ No newline at end of file
+__all__ = ['VideoRepository', 'VideoAnalysisRepository']
\ No newline at end of file
@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+from app.repositories.mysql_repository import BaseRepository
+
+class VideoAnalysisRepository(BaseRepository):
+    """
+    Repositório para os resultados das análises de vídeos (ex: cenas)
+    
+    Cada vídeo tem no máximo um resultado por tipo de análise, gravado em JSON.
+    """
+    
+    def __init__(self):
+        """
+        Inicializa o repositório de análises
+        """
+        super().__init__(table_name="video_analysis", primary_key="id")
+    
+    def save_analysis(self, video_id, kind, data):
+        """
+        Grava (ou substitui) o resultado de uma análise de um vídeo
+        
+        Args:
+            video_id: ID do vídeo
+            kind: Tipo da análise (ex: scenes)
+            data: Resultado da análise (serializável em JSON)
+            
+        Returns:
+            dict: Registro gravado
+        """
+        record, _ = self.update_or_create(
+            {"video_id": video_id, "kind": kind},
+            {"data": json.dumps(data), "updated_at": datetime.now()}
+        )
+        return record
+    
+    def find_analysis(self, video_id, kind):
+        """
+        Busca o resultado de uma análise de um vídeo
+        
+        Args:
+            video_id: ID do vídeo
+            kind: Tipo da análise (ex: scenes)
+            
+        Returns:
+            dict: Resultado da análise ou None se não existir
+        """
+        record = self.query().where("video_id", video_id).where("kind", kind).first()
+        if not record or not record.get("data"):
+            return None
+        
+        return json.loads(record["data"])
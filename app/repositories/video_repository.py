@@ -45,7 +45,7 @@ class VideoRepository(BaseRepository):
         
         Args:
             video_id: ID do vídeo
-            status: Novo status (pending, downloading, completed, error)
+            status: Novo status (pending, downloading, processing, completed, partial, error)
             
         Returns:
             bool: True se atualizado com sucesso
@@ -69,6 +69,40 @@ class VideoRepository(BaseRepository):
         """
         return self.update(video_id, {"duration": duration, "updated_at": datetime.now()})
     
+    def update_media_info(self, video_id, info):
+        """
+        Atualiza a duração, a resolução, os codecs e a taxa de bits de um vídeo
+        
+        Args:
+            video_id: ID do vídeo
+            info: Dicionário com 'duration', 'width', 'height', 'video_codec', 'audio_codec' e 'bitrate'
+            
+        Returns:
+            bool: True se atualizado com sucesso
+        """
+        fields = ("duration", "width", "height", "video_codec", "audio_codec", "bitrate")
+        data = {field: info.get(field) for field in fields}
+        data["updated_at"] = datetime.now()
+        return self.update(video_id, data)
+    
+    def update_mezzanine(self, video_id, filename, keyframe_interval):
+        """
+        Registra a versão de trabalho (mezzanine) de um vídeo
+        
+        Args:
+            video_id: ID do vídeo
+            filename: Nome do arquivo da versão de trabalho
+            keyframe_interval: Intervalo entre keyframes em segundos
+            
+        Returns:
+            bool: True se atualizado com sucesso
+        """
+        return self.update(video_id, {
+            "mezzanine_filename": filename,
+            "mezzanine_keyframe_interval": keyframe_interval,
+            "updated_at": datetime.now()
+        })
+    
     def find_by_id(self, video_id):
         """
         Busca um vídeo pelo ID
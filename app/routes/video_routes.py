@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Path, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List
 from app.controllers.video_controller import VideoController
-from app.models.video_models import VideoDownloadRequest, VideoCutRequest, DownloadAndCutRequest
+from app.models.video_models import VideoDownloadRequest, VideoCutRequest, DownloadAndCutRequest, VideoConcatRequest, SilenceTrimRequest, PreviewRequest, VirtualMaterializeRequest
 
 # Criar router para rotas de vídeo
 router = APIRouter(prefix="/videos", tags=["Videos"])
@@ -22,10 +23,26 @@ async def get_all_videos(limit: Optional[int] = Query(None)):
 async def download_and_cut(request: DownloadAndCutRequest):
     return video_controller.download_and_cut(request)
 
+@router.post('/concat')
+async def concat_videos(request: VideoConcatRequest):
+    return video_controller.concat_videos(request)
+
+@router.post('/preview')
+async def create_preview(request: PreviewRequest):
+    return video_controller.create_preview(request)
+
 @router.get('/files')
 async def list_files():
     return video_controller.list_files()
 
+@router.get('/files/cut/{filename}/hls')
+async def get_hls(filename: str = Path(...)):
+    return video_controller.get_hls(filename)
+
+@router.get('/files/cut/{filename}/hls/{name}')
+async def get_hls_file(filename: str = Path(...), name: str = Path(...)):
+    return video_controller.get_hls_file(filename, name)
+
 @router.get('/files/{file_type}/{filename}')
 async def download_file(file_type: str = Path(...), filename: str = Path(...)):
     return video_controller.download_file(file_type, filename)
@@ -38,15 +55,56 @@ async def get_all_tasks():
 async def get_task_status(task_id: str = Path(...)):
     return video_controller.get_task_status(task_id)
 
+@router.post('/tasks/{task_id}/cancel')
+async def cancel_task(task_id: str = Path(...)):
+    return video_controller.cancel_task(task_id)
+
+@router.get('/virtual/{clip_id}')
+async def get_virtual_clip(clip_id: str = Path(...)):
+    return video_controller.get_virtual_clip(clip_id)
+
+@router.get('/virtual/{clip_id}/playlist.m3u8')
+async def get_virtual_playlist(clip_id: str = Path(...)):
+    return video_controller.get_virtual_playlist(clip_id)
+
+@router.get('/virtual/{clip_id}/segments/{number}.ts')
+async def get_virtual_segment(clip_id: str = Path(...), number: int = Path(...)):
+    return video_controller.get_virtual_segment(clip_id, number)
+
+@router.post('/virtual/{clip_id}/materialize')
+async def materialize_virtual_clip(clip_id: str = Path(...), request: VirtualMaterializeRequest = None):
+    return video_controller.materialize_virtual_clip(clip_id, request)
+
 # Rotas com parâmetros de caminho por último
 @router.post('/{video_id}/cut')
 async def cut_video(video_id: int = Path(...), request: VideoCutRequest = None):
-    return video_controller.cut_video(request)
+    # Fora do event loop: o corte virtual pode construir o índice de keyframes da origem (ffprobe)
+    return await run_in_threadpool(video_controller.cut_video, request)
+
+@router.post('/{video_id}/silence-trim')
+async def silence_trim(video_id: int = Path(...), request: SilenceTrimRequest = None):
+    return video_controller.silence_trim(request)
 
 @router.get('/{video_id}')
 async def get_video(video_id: str = Path(...)):
     return video_controller.get_video(video_id)
 
+@router.get('/{video_id}/thumbnails')
+async def get_thumbnails(video_id: str = Path(...), interval: float = Query(10)):
+    return video_controller.get_thumbnails(video_id, interval)
+
+@router.get('/{video_id}/thumbnails/{interval}/{filename}')
+async def get_thumbnail_file(video_id: str = Path(...), interval: str = Path(...), filename: str = Path(...)):
+    return video_controller.get_thumbnail_file(video_id, interval, filename)
+
+@router.get('/{video_id}/stream')
+async def stream_cut(video_id: str = Path(...), start: str = Query(...), end: str = Query(...), mode: str = Query('copy')):
+    return video_controller.stream_cut(video_id, start, end, mode)
+
+@router.get('/{video_id}/scenes')
+async def get_scenes(video_id: str = Path(...)):
+    return video_controller.get_scenes(video_id)
+
 @router.get('/{video_id}/error')
 async def get_video_error(video_id: str = Path(...)):
     return video_controller.get_video_error(video_id)
\ No newline at end of file
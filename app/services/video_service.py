@@ -1,16 +1,20 @@
 import os
+import glob
 import uuid
 import json
 import threading
 import subprocess
+from concurrent.futures import CancelledError, Future
 from datetime import datetime
 from typing import Dict, Any, Tuple, Optional, List, Union
 from urllib.parse import urlparse
 from app.repositories.video_repository import VideoRepository
-from app.config import DOWNLOADS_DIR, CUTS_DIR, TEMP_DIR
+from app.repositories.video_analysis_repository import VideoAnalysisRepository
+from app.config import DOWNLOADS_DIR, CUTS_DIR, CUT_CACHE_DIR, TEMP_DIR, THUMBNAILS_DIR, WATERMARKS_DIR, HLS_DIR, VIRTUAL_DIR, SEGMENT_CACHE_DIR, MEZZANINE_DIR, MEZZANINE_INGEST, MEZZANINE_KEYFRAME_INTERVAL, HLS_SEGMENT_SECONDS, CUT_CACHE_MAX_MB, CUT_BATCH_WINDOW, CUT_BATCH_MAX_SIZE, CUT_SEGMENT_CACHE, CUT_SEGMENT_CACHE_MAX_MB, CUT_SEGMENT_SECONDS, DOWNLOAD_SECTIONS, DOWNLOAD_SECTION_MARGIN, THUMBNAIL_WIDTH, SCENE_DETECTION, SCENE_ANALYSIS_FPS, SCENE_THRESHOLD, AUDIO_ANALYSIS, ENGINE_WORKERS, STREAM_MAX_CONCURRENT, TEMP_RAM_DIR, TEMP_RAM_RESERVE_MB
 from app.utils.cookie_manager import CookieManager
 from app.config.cookies import get_cookies_file_path, is_valid_browser
 from app.services.auth_service import AuthService, SUPPORTED_PLATFORMS
+from app.engine import CUT_MODES, SEGMENT_CACHE_MODES, STREAM_MODES, StreamingCut, PREVIEW_FORMATS, PREVIEW_MAX_WIDTH, PREVIEW_MAX_FPS, EngineError, media_info, validate_range, normalize_transform, load_hls, plan_virtual_clip, virtual_clip_matches, virtual_playlist, stream_virtual_segment, JobCancelled, EnginePool, get_or_build_index, parse_time, format_time, normalize_rendition, load_thumbnails, LRUFileCache, content_hash, file_identity, cache_key, link_file
 
 class VideoService:
     """
@@ -22,8 +26,47 @@ class VideoService:
         Inicializa o serviço de vídeos
         """
         self.video_repository = VideoRepository()
+        self.analysis_repository = VideoAnalysisRepository()
         self.tasks = {}
         self.auth_service = AuthService()
+        self.engine_pool = None
+        self._engine_pool_lock = threading.Lock()
+        # Cortes já gerados (cópias próprias, por conteúdo da origem, intervalo e perfil),
+        # cortes em andamento e arquivos com o hash sendo calculado em segundo plano
+        self.cut_cache = LRUFileCache(CUT_CACHE_DIR, CUT_CACHE_MAX_MB * 1024 * 1024, index_name='.cut_cache.json')
+        self._inflight_cuts = {}
+        self._hashing = set()
+        self._cut_cache_lock = threading.Lock()
+        # Cortes aguardando a janela de agrupamento, por origem e modo
+        self._cut_batches = {}
+        self._cut_batch_lock = threading.Lock()
+        # Vagas das transmissões, que executam o ffmpeg fora do pool
+        self._stream_slots = threading.BoundedSemaphore(STREAM_MAX_CONCURRENT) if STREAM_MAX_CONCURRENT > 0 else None
+    
+    def start_engine_pool(self):
+        """
+        Inicia (uma única vez) o pool de processos que executa os cortes e concatenações
+        
+        Chamado na inicialização da aplicação para que os processos já estejam
+        prontos no primeiro job; se não tiver sido chamado, o pool é iniciado no
+        primeiro job.
+        
+        Returns:
+            EnginePool: Pool de processos do motor
+        """
+        with self._engine_pool_lock:
+            if self.engine_pool is None:
+                self.engine_pool = EnginePool(workers=ENGINE_WORKERS, on_message=self._on_job_message)
+            return self.engine_pool
+    
+    def stop_engine_pool(self):
+        """
+        Encerra o pool de processos do motor
+        """
+        with self._engine_pool_lock:
+            if self.engine_pool is not None:
+                self.engine_pool.shutdown(wait=False)
+                self.engine_pool = None
     
     def download_video(self, url, filename=None, validate=True, cookies=None, cookies_from_browser=None):
         """
@@ -137,19 +180,64 @@ class VideoService:
         
         return result, 200
     
-    def cut_video(self, video_id, start_time, end_time, output_filename=None):
+    def cut_video(self, video_id, start_time=None, end_time=None, output_filename=None, mode='reencode', ranges=None, renditions=None, transforms=None, hls=False, virtual=False):
         """
         Inicia o corte de um vídeo
         
         Args:
             video_id: ID do vídeo a ser cortado
-            start_time: Tempo inicial do corte (formato HH:MM:SS)
-            end_time: Tempo final do corte (formato HH:MM:SS)
+            start_time: Tempo inicial do corte (formato HH:MM:SS) ou 'auto' para escolher o
+                trecho mais intenso do áudio
+            end_time: Tempo final do corte (formato HH:MM:SS); com start_time='auto', a duração do trecho
             output_filename: Nome do arquivo de saída (opcional)
+            mode: Modo de corte - 'reencode' (preciso), 'copy' (nos keyframes, sem recodificar), 'smart' (preciso, recodifica só as bordas) ou 'parallel' (preciso, recodifica blocos em paralelo)
+            ranges: Lista de intervalos {'start_time', 'end_time', 'output_filename'} cortados
+                em uma única leitura do vídeo (opcional, substitui start_time/end_time)
+            renditions: Lista de perfis de saída {'name', 'width', 'height', 'crf', 'video_bitrate',
+                'audio_bitrate', 'container'} gerados em uma única decodificação (opcional; sempre recodifica)
+            transforms: Lista ordenada de transformações ('scale', 'fps', 'watermark', 'loudnorm')
+                aplicadas ao corte em uma única codificação (opcional; sempre recodifica)
+            hls: Empacotar cada arquivo gerado em HLS (fMP4) ao final do corte (opcional)
+            virtual: Criar um corte virtual (apenas o manifesto, sem gerar arquivo), materializável depois
             
         Returns:
-            dict: Informações da tarefa iniciada ou erro
+            tuple: (resultado, status_code) - Informações da tarefa iniciada (ou do corte virtual) ou erro e código de status HTTP
         """
+        # Validar modo de corte
+        if mode not in CUT_MODES:
+            return {'error': f'Modo de corte inválido: {mode}. Use um dos modos: {", ".join(CUT_MODES)}'}, 400
+        
+        # Validar intervalos
+        if not ranges and not (start_time and end_time):
+            return {'error': 'Informe start_time e end_time ou a lista de intervalos (ranges)'}, 400
+        
+        if renditions and ranges:
+            return {'error': 'Perfis de saída (renditions) só podem ser usados com start_time e end_time'}, 400
+        
+        auto = not ranges and start_time == 'auto'
+        if auto and renditions:
+            return {'error': 'start_time="auto" não pode ser usado com perfis de saída (renditions)'}, 400
+        
+        if transforms and (ranges or renditions or auto):
+            return {'error': 'Transformações (transforms) só podem ser usadas com start_time e end_time'}, 400
+        
+        if virtual and (ranges or renditions or transforms or auto or hls):
+            return {'error': 'Cortes virtuais só podem ser usados com start_time e end_time, sem renditions, transforms ou hls'}, 400
+        
+        # Validar as transformações e resolver as imagens das marcas d'água
+        if transforms:
+            try:
+                transforms = [normalize_transform(transform, i) for i, transform in enumerate(transforms)]
+            except EngineError as e:
+                return {'error': str(e)}, 400
+            
+            for transform in transforms:
+                if transform['type'] == 'watermark':
+                    # Apenas o nome do arquivo, sem permitir sair da pasta de marcas d'água
+                    transform['image'] = os.path.join(WATERMARKS_DIR, os.path.basename(transform['image']))
+                    if not os.path.isfile(transform['image']):
+                        return {'error': f"Imagem da marca d'água não encontrada: {os.path.basename(transform['image'])}"}, 404
+        
         # Buscar informações do vídeo
         video = self.video_repository.find(video_id)
         if not video:
@@ -159,23 +247,47 @@ class VideoService:
         if video['status'] != 'completed':
             return {'error': f'Vídeo com ID {video_id} não está pronto para corte (status: {video["status"]})'}, 400
         
+        # Vários intervalos: um único job de corte para todos
+        if ranges:
+            return self._cut_video_ranges(video, ranges, output_filename, mode, hls)
+        
+        # Converter os tempos para segundos (no início automático, end_time é a duração do trecho)
+        # e validá-los contra a duração gravada no download, antes de iniciar qualquer processamento
+        try:
+            start_seconds = None if auto else parse_time(start_time)
+            end_seconds = parse_time(end_time)
+            if not auto:
+                end_seconds = validate_range(start_seconds, end_seconds, video.get('duration'))
+        except EngineError as e:
+            return {'error': str(e)}, 400
+        
+        if auto and end_seconds <= 0:
+            return {'error': 'Com start_time="auto", end_time deve ser a duração do trecho (maior que zero)'}, 400
+        
+        # Corte virtual: apenas o manifesto, sem codificar nem copiar o vídeo
+        if virtual:
+            return self._create_virtual_clip(video, start_seconds, end_seconds, start_time, end_time, mode)
+        
         # Gerar nome de arquivo de saída se não fornecido
         if not output_filename:
             output_filename = f'cut_{uuid.uuid4().hex[:8]}.mp4'
         
-        # Caminhos completos
-        input_file = os.path.join(DOWNLOADS_DIR, video['filename'])
+        # Caminhos completos (perfis de saída e transformações sempre recodificam: usam a origem)
+        input_file = self._cut_input_file(video, None if renditions or transforms else mode)
         output_path = os.path.join(CUTS_DIR, output_filename)
         
         # Verificar se arquivo de entrada existe
         if not os.path.exists(input_file):
             return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
         
+        # Várias versões do mesmo corte: uma única decodificação para todas
+        if renditions:
+            return self._cut_video_renditions(video, input_file, start_seconds, end_seconds, start_time, end_time, output_filename, renditions, hls)
+        
         # Gerar ID da tarefa
         task_id = str(uuid.uuid4())
         
-        # Inicializar tarefa
-        self.tasks[task_id] = {
+        task = {
             'id': task_id,
             'video_id': video_id,
             'type': 'cut',
@@ -184,18 +296,79 @@ class VideoService:
             'output_path': output_path,
             'start_time': start_time,
             'end_time': end_time,
+            'mode': mode,
+            'hls': hls,
             'created_at': datetime.now().isoformat(),
             'output': '',
             'error': ''
         }
+        if transforms:
+            task['transforms'] = [transform['type'] for transform in transforms]
+        
+        # Cache de cortes: o mesmo conteúdo de origem, intervalo e perfil de saída
+        # reaproveita o arquivo já gerado ou a tarefa idêntica em andamento, sempre
+        # entregue com o nome de arquivo pedido
+        if not auto:
+            profile = {'mode': mode, 'format': os.path.splitext(output_filename)[1].lower() or '.mp4'}
+            if transforms:
+                # As marcas d'água entram na chave pelo conteúdo, não pelo caminho
+                profile['transforms'] = [
+                    {**transform, 'image': self._source_identity(transform['image'])} if transform['type'] == 'watermark' else transform
+                    for transform in transforms
+                ]
+            task['cache_key'] = cache_key(
+                self._source_identity(input_file),
+                round(start_seconds, 3),
+                round(end_seconds, 3),
+                profile
+            )
+            
+            cached_path, running_id = self._claim_cached_task(task)
+            if running_id:
+                return {
+                    'task_id': task_id,
+                    'video_id': video_id,
+                    'status': 'started',
+                    'message': 'Corte idêntico já em andamento',
+                    'output_path': output_path
+                }, 200
+            
+            if cached_path:
+                if hls:
+                    self._package_hls_outputs(task)
+                return {
+                    'task_id': task_id,
+                    'video_id': video_id,
+                    'status': 'completed',
+                    'message': 'Corte obtido do cache',
+                    'output_path': output_path,
+                    'cached': True
+                }, 200
+            
+            self._detach_output(output_path)
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = task
+        
+        job = {
+            'type': 'cut',
+            'input': input_file,
+            'mode': mode,
+            'ranges': [[start_seconds, end_seconds, output_path]]
+        }
+        if transforms:
+            job['transforms'] = transforms
+        elif not auto:
+            self._add_segment_cache(job)
         
-        # Comando para corte
-        command = f'python cut.py --input "{input_file}" --output "{output_path}" --start "{start_time}" --end "{end_time}"'
+        # Início automático: o trecho é escolhido no job pelas características do áudio
+        # (as já gravadas para o vídeo ou calculadas antes do corte)
+        if auto:
+            job['auto_length'] = end_seconds
+            job['audio_features'] = self.analysis_repository.find_analysis(video['id'], 'audio')
         
-        # Executar em thread separada
-        thread = threading.Thread(target=self._run_command, args=(task_id, command))
-        thread.daemon = True
-        thread.start()
+        # Enviar o corte para o pool do motor (ou para o lote da mesma origem)
+        self._schedule_cut(task_id, job)
         
         return {
             'task_id': task_id,
@@ -203,24 +376,256 @@ class VideoService:
             'status': 'started',
             'message': 'Corte iniciado',
             'output_path': output_path
+        }, 200
+    
+    def _cut_video_ranges(self, video, ranges, output_filename, mode, hls=False):
+        """
+        Inicia o corte de vários intervalos de um vídeo em um único job
+        
+        Args:
+            video: Registro do vídeo
+            ranges: Lista de intervalos {'start_time', 'end_time', 'output_filename'}
+            output_filename: Nome base dos arquivos de saída (opcional)
+            mode: Modo de corte
+            hls: Empacotar cada corte em HLS ao final (opcional)
+            
+        Returns:
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
+        """
+        video_id = video['id']
+        input_file = self._cut_input_file(video, mode)
+        
+        # Verificar se arquivo de entrada existe
+        if not os.path.exists(input_file):
+            return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+        
+        # Montar os intervalos com o caminho de saída de cada um
+        task_ranges = []
+        for i, cut_range in enumerate(ranges):
+            if not cut_range.get('start_time') or not cut_range.get('end_time'):
+                return {'error': f'Intervalo {i + 1} sem start_time ou end_time'}, 400
+            
+            try:
+                start_seconds = parse_time(cut_range['start_time'])
+                end_seconds = validate_range(start_seconds, parse_time(cut_range['end_time']), video.get('duration'))
+            except EngineError as e:
+                return {'error': f'Intervalo {i + 1}: {str(e)}'}, 400
+            
+            range_filename = cut_range.get('output_filename')
+            if not range_filename and output_filename:
+                base, ext = os.path.splitext(output_filename)
+                range_filename = f'{base}_{i + 1}{ext or ".mp4"}'
+            if not range_filename:
+                range_filename = f'cut_{uuid.uuid4().hex[:8]}.mp4'
+            
+            task_ranges.append({
+                'index': i,
+                'start_time': cut_range['start_time'],
+                'end_time': cut_range['end_time'],
+                'start_seconds': start_seconds,
+                'end_seconds': end_seconds,
+                'output_path': os.path.join(CUTS_DIR, range_filename),
+                'status': 'pending',
+                'progress': 0
+            })
+        
+        output_paths = [cut_range['output_path'] for cut_range in task_ranges]
+        if len(set(output_paths)) != len(output_paths):
+            return {'error': 'Os intervalos precisam ter arquivos de saída distintos'}, 400
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = {
+            'id': task_id,
+            'video_id': video_id,
+            'type': 'cut',
+            'status': 'running',
+            'input_file': input_file,
+            'output_paths': output_paths,
+            'ranges': task_ranges,
+            'mode': mode,
+            'hls': hls,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        job = {
+            'type': 'cut',
+            'input': input_file,
+            'mode': mode,
+            'ranges': [
+                [cut_range['start_seconds'], cut_range['end_seconds'], cut_range['output_path']]
+                for cut_range in task_ranges
+            ]
+        }
+        self._add_segment_cache(job)
+        
+        # Enviar o corte de todos os intervalos para o pool do motor
+        self._submit_job(task_id, job)
+        
+        return {
+            'task_id': task_id,
+            'video_id': video_id,
+            'status': 'started',
+            'message': f'Corte de {len(task_ranges)} intervalos iniciado',
+            'output_paths': output_paths
+        }, 200
+    
+    def _add_segment_cache(self, job):
+        """
+        Habilita o cache de segmentos recodificados em um job de corte, se configurado
+        
+        Nos modos que recodificam todo o intervalo, os segmentos de uma grade alinhada
+        aos keyframes da origem ficam em cache e são reaproveitados por cortes
+        sobrepostos, que codificam apenas os segmentos que faltam e as bordas.
+        
+        Args:
+            job: Dicionário do job de corte
+        """
+        if not CUT_SEGMENT_CACHE or job['mode'] not in SEGMENT_CACHE_MODES:
+            return
+        
+        # Identidade da origem sem lê-la (o hash é calculado em segundo plano, se faltar)
+        job['segment_cache'] = {
+            'dir': SEGMENT_CACHE_DIR,
+            'max_bytes': CUT_SEGMENT_CACHE_MAX_MB * 1024 * 1024,
+            'segment_seconds': CUT_SEGMENT_SECONDS,
+            'source_hash': self._source_identity(job['input'])
+        }
+    
+    def _cut_input_file(self, video, mode):
+        """
+        Escolhe o arquivo de entrada de um corte
+        
+        Nos modos que copiam as streams ('copy' e 'smart'), a versão de trabalho com
+        keyframes densos é usada quando existe: o corte copiado começa no máximo um
+        intervalo de keyframes antes do tempo pedido. Os demais modos recodificam a
+        partir da origem.
+        
+        Args:
+            video: Registro do vídeo
+            mode: Modo de corte (None quando o corte sempre recodifica)
+            
+        Returns:
+            str: Caminho do arquivo de entrada
+        """
+        if mode in ('copy', 'smart') and video.get('mezzanine_filename'):
+            mezzanine_path = os.path.join(MEZZANINE_DIR, os.path.basename(video['mezzanine_filename']))
+            if os.path.exists(mezzanine_path):
+                return mezzanine_path
+        
+        return self._resolve_download_path(os.path.join(DOWNLOADS_DIR, video['filename']))
+    
+    def _cut_video_renditions(self, video, input_file, start_seconds, end_seconds, start_time, end_time, output_filename, renditions, hls=False):
+        """
+        Inicia o corte de um intervalo em várias versões (perfis de saída) em um único job
+        
+        Args:
+            video: Registro do vídeo
+            input_file: Arquivo de entrada
+            start_seconds: Tempo inicial em segundos
+            end_seconds: Tempo final em segundos
+            start_time: Tempo inicial informado (formato HH:MM:SS)
+            end_time: Tempo final informado (formato HH:MM:SS)
+            output_filename: Nome base dos arquivos de saída
+            renditions: Lista de perfis de saída
+            hls: Empacotar cada versão em HLS ao final (opcional)
+            
+        Returns:
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
+        """
+        video_id = video['id']
+        base = os.path.splitext(output_filename)[0]
+        
+        # Validar os perfis e definir o arquivo de cada versão
+        profiles = []
+        for i, rendition in enumerate(renditions):
+            try:
+                profile = normalize_rendition(rendition, i)
+            except EngineError as e:
+                return {'error': f'Perfil {i + 1}: {str(e)}'}, 400
+            profile['output_path'] = os.path.join(CUTS_DIR, f'{base}_{profile["name"]}.{profile["container"]}')
+            profiles.append(profile)
+        
+        output_paths = [profile['output_path'] for profile in profiles]
+        if len(set(output_paths)) != len(output_paths):
+            return {'error': 'Os perfis de saída precisam ter nomes distintos'}, 400
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = {
+            'id': task_id,
+            'video_id': video_id,
+            'type': 'cut',
+            'status': 'running',
+            'input_file': input_file,
+            'output_paths': output_paths,
+            'hls': hls,
+            'renditions': [
+                {'name': profile['name'], 'container': profile['container'], 'output_path': profile['output_path'], 'size': None}
+                for profile in profiles
+            ],
+            'start_time': start_time,
+            'end_time': end_time,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
         }
+        
+        # Enviar o corte de todas as versões para o pool do motor
+        self._submit_job(task_id, {
+            'type': 'cut',
+            'input': input_file,
+            'ranges': [[start_seconds, end_seconds, None]],
+            'renditions': profiles
+        })
+        
+        return {
+            'task_id': task_id,
+            'video_id': video_id,
+            'status': 'started',
+            'message': f'Corte em {len(profiles)} versões iniciado',
+            'output_paths': output_paths
+        }, 200
     
-    def download_and_cut(self, url, start_time, end_time, filename=None, output_filename=None, cookies=None, cookies_from_browser=None):
+    def download_and_cut(self, url, start_time, end_time, filename=None, output_filename=None, cookies=None, cookies_from_browser=None, mode='reencode'):
         """
         Inicia o download e corte de um vídeo em uma operação
         
         Args:
             url: URL do vídeo
-            start_time: Tempo inicial do corte (formato HH:MM:SS)
-            end_time: Tempo final do corte (formato HH:MM:SS)
+            start_time: Tempo inicial do corte (formato HH:MM:SS) ou 'auto' para escolher o
+                trecho mais intenso do áudio
+            end_time: Tempo final do corte (formato HH:MM:SS); com start_time='auto', a duração do trecho
             filename: Nome do arquivo de download (opcional)
             output_filename: Nome do arquivo de saída (opcional)
             cookies: Caminho para o arquivo de cookies (opcional)
             cookies_from_browser: Navegador para extrair cookies (chrome, firefox, opera, edge, safari) (opcional)
+            mode: Modo de corte - 'reencode' (preciso), 'copy' (nos keyframes, sem recodificar), 'smart' (preciso, recodifica só as bordas) ou 'parallel' (preciso, recodifica blocos em paralelo)
             
         Returns:
-            dict: Informações da tarefa iniciada
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
         """
+        # Validar modo de corte
+        if mode not in CUT_MODES:
+            return {'error': f'Modo de corte inválido: {mode}. Use um dos modos: {", ".join(CUT_MODES)}'}, 400
+        
+        # Validar os tempos antes de iniciar o download (no início automático, end_time é a duração do trecho)
+        auto = start_time == 'auto'
+        try:
+            start_seconds = None if auto else parse_time(start_time)
+            end_seconds = parse_time(end_time)
+        except EngineError as e:
+            return {'error': str(e)}, 400
+        
+        if auto and end_seconds <= 0:
+            return {'error': 'Com start_time="auto", end_time deve ser a duração do trecho (maior que zero)'}, 400
+        
         # Gerar nomes de arquivo se não fornecidos
         if not filename:
             filename = f'video_{uuid.uuid4().hex[:8]}'
@@ -260,6 +665,7 @@ class VideoService:
             'cut_path': cut_path,
             'start_time': start_time,
             'end_time': end_time,
+            'mode': mode,
             'created_at': datetime.now().isoformat(),
             'output': '',
             'error': ''
@@ -268,7 +674,7 @@ class VideoService:
         # Iniciar thread para download e corte
         thread = threading.Thread(
             target=self._download_and_cut_thread,
-            args=(task_id, url, download_path, cut_path, start_time, end_time, video_id, cookies, cookies_from_browser)
+            args=(task_id, url, download_path, cut_path, start_seconds, end_seconds, video_id, cookies, cookies_from_browser, mode)
         )
         thread.daemon = True
         thread.start()
@@ -280,98 +686,887 @@ class VideoService:
             'message': 'Download e corte iniciados',
             'download_path': download_path,
             'cut_path': cut_path
-        }
+        }, 200
     
-    def get_task_status(self, task_id):
+    def concat_videos(self, inputs, output_filename=None):
         """
-        Obtém o status de uma tarefa
+        Inicia a concatenação de cortes e vídeos baixados em um único arquivo
+        
+        As entradas com os mesmos parâmetros de codec são unidas sem recodificar;
+        apenas as entradas fora do padrão são recodificadas.
         
         Args:
-            task_id: ID da tarefa
+            inputs: Lista de entradas, na ordem, cada uma com 'filename' (arquivo na pasta de cortes)
+                ou 'video_id' (vídeo baixado)
+            output_filename: Nome do arquivo de saída (opcional)
             
         Returns:
-            dict: Informações da tarefa ou erro
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
         """
-        if task_id not in self.tasks:
-            return {'error': f'Tarefa com ID {task_id} não encontrada'}, 404
+        if not inputs or len(inputs) < 2:
+            return {'error': 'Informe ao menos duas entradas para concatenar'}, 400
         
-        return self.tasks[task_id], 200
+        # Resolver o arquivo de cada entrada
+        input_files = []
+        for i, item in enumerate(inputs):
+            if item.get('filename'):
+                # Apenas o nome do arquivo, sem permitir sair da pasta de cortes
+                input_file = os.path.join(CUTS_DIR, os.path.basename(item['filename']))
+            elif item.get('video_id') is not None:
+                video = self.video_repository.find(item['video_id'])
+                if not video:
+                    return {'error': f'Vídeo com ID {item["video_id"]} não encontrado'}, 404
+                if video['status'] != 'completed':
+                    return {'error': f'Vídeo com ID {item["video_id"]} não está pronto (status: {video["status"]})'}, 400
+                input_file = self._resolve_download_path(os.path.join(DOWNLOADS_DIR, video['filename']))
+            else:
+                return {'error': f'Entrada {i + 1} sem filename ou video_id'}, 400
+            
+            if not os.path.exists(input_file):
+                return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+            input_files.append(input_file)
         
-    def get_video_error_details(self, video_id):
+        # Gerar nome de arquivo de saída se não fornecido
+        if not output_filename:
+            output_filename = f'concat_{uuid.uuid4().hex[:8]}.mp4'
+        output_path = os.path.join(CUTS_DIR, output_filename)
+        
+        if output_path in input_files:
+            return {'error': 'O arquivo de saída não pode ser uma das entradas'}, 400
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = {
+            'id': task_id,
+            'type': 'concat',
+            'status': 'running',
+            'input_files': input_files,
+            'output_path': output_path,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        # Enviar a concatenação para o pool do motor
+        self._submit_job(task_id, {
+            'type': 'concat',
+            'inputs': input_files,
+            'output': output_path
+        })
+        
+        return {
+            'task_id': task_id,
+            'status': 'started',
+            'message': 'Concatenação iniciada',
+            'output_path': output_path
+        }, 200
+    
+    def silence_trim(self, video_id, output_filename=None, threshold_db=-35.0, min_silence=1.0, padding=0.1):
         """
-        Obtém detalhes de erro de um vídeo
+        Inicia a remoção dos silêncios de um vídeo (jump cut)
+        
+        Os silêncios são detectados em uma única leitura do áudio e os trechos
+        mantidos são unidos em um único arquivo, copiando o vídeo sempre que os
+        limites coincidem com keyframes.
         
         Args:
             video_id: ID do vídeo
+            output_filename: Nome do arquivo de saída (opcional)
+            threshold_db: Nível (dB) abaixo do qual o áudio é considerado silêncio
+            min_silence: Duração mínima de um silêncio removido em segundos
+            padding: Silêncio mantido em cada borda dos trechos em segundos
             
         Returns:
-            tuple: (detalhes do erro, código de status HTTP)
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
         """
-        # Buscar o vídeo no repositório
-        video = self.video_repository.find_by_id(video_id)
+        if threshold_db >= 0:
+            return {'error': 'O limiar de silêncio deve ser negativo (dB em relação ao fundo de escala)'}, 400
+        if min_silence <= 0:
+            return {'error': 'A duração mínima do silêncio deve ser maior que zero'}, 400
+        if padding < 0 or padding * 2 >= min_silence:
+            return {'error': 'A margem (padding) deve ser positiva e menor que metade de min_silence'}, 400
         
+        # Buscar informações do vídeo
+        video = self.video_repository.find(video_id)
         if not video:
             return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
-            
-        if video['status'] != 'error':
-            return {'error': 'Este vídeo não está em estado de erro'}, 400
-            
-        # Buscar tarefas relacionadas a este vídeo
-        error_details = {'video': video}
         
-        # Procurar nas tarefas por informações de erro relacionadas a este vídeo
-        related_tasks = []
-        for task_id, task in self.tasks.items():
-            # Verificar se o video_id está diretamente na tarefa
-            task_video_id = task.get('video_id')
-            
-            # Se video_id for um dicionário, extrair o ID
-            if isinstance(task_video_id, dict) and 'id' in task_video_id:
-                task_video_id = task_video_id['id']
-                
-            # Comparar com o ID do vídeo
-            if task_video_id == video_id:
-                task_info = {
-                    'task_id': task_id,
-                    'type': task.get('type'),
-                    'status': task.get('status'),
-                    'error': task.get('error'),
-                    'error_details': task.get('error_details')
-                }
-                related_tasks.append(task_info)
+        if video['status'] != 'completed':
+            return {'error': f'Vídeo com ID {video_id} não está pronto para corte (status: {video["status"]})'}, 400
         
-        error_details['related_tasks'] = related_tasks
+        if not output_filename:
+            output_filename = f'trim_{uuid.uuid4().hex[:8]}.mp4'
         
-        return error_details, 200
-    
-    def get_all_tasks(self):
-        """
-        Obtém todas as tarefas
+        input_file = self._resolve_download_path(os.path.join(DOWNLOADS_DIR, video['filename']))
+        output_path = os.path.join(CUTS_DIR, output_filename)
         
-        Returns:
-            list: Lista de tarefas
-        """
-        return list(self.tasks.values())
+        if not os.path.exists(input_file):
+            return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = {
+            'id': task_id,
+            'video_id': video_id,
+            'type': 'silence_trim',
+            'status': 'running',
+            'input_file': input_file,
+            'output_path': output_path,
+            'threshold_db': threshold_db,
+            'min_silence': min_silence,
+            'padding': padding,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        self._submit_job(task_id, {
+            'type': 'silence_trim',
+            'input': input_file,
+            'output': output_path,
+            'threshold_db': threshold_db,
+            'min_silence': min_silence,
+            'padding': padding
+        })
+        
+        return {
+            'task_id': task_id,
+            'video_id': video_id,
+            'status': 'started',
+            'message': 'Remoção de silêncios iniciada',
+            'output_path': output_path
+        }, 200
     
-    def get_video(self, video_id):
+    def create_preview(self, filename, fmt='webp', max_width=PREVIEW_MAX_WIDTH, max_fps=PREVIEW_MAX_FPS, output_filename=None):
         """
-        Obtém informações de um vídeo
+        Inicia a geração da prévia animada (WebP ou GIF) de um corte
+        
+        A prévia é gerada em uma única passada (no GIF, a paleta é gerada e
+        aplicada no mesmo grafo de filtros) e fica em cache ao lado do corte: a
+        mesma origem com o mesmo formato e limites reaproveita o arquivo gerado.
         
         Args:
-            video_id: ID do vídeo
+            filename: Nome do corte (arquivo na pasta de cortes)
+            fmt: Formato da prévia ('webp' ou 'gif')
+            max_width: Largura máxima da prévia em pixels
+            max_fps: Quadros por segundo máximos da prévia
+            output_filename: Nome do arquivo da prévia (opcional)
             
         Returns:
-            dict: Informações do vídeo ou erro
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
         """
-        video = self.video_repository.find_by_id(video_id)
-        if not video:
-            return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
+        if fmt not in PREVIEW_FORMATS:
+            return {'error': f'Formato de prévia inválido: {fmt}. Use um dos formatos: {", ".join(PREVIEW_FORMATS)}'}, 400
+        if max_width <= 0 or max_fps <= 0:
+            return {'error': 'max_width e max_fps devem ser maiores que zero'}, 400
         
-        return video, 200
-    
-    def get_all_videos(self, limit=None):
-        """
-        Obtém todos os vídeos
+        # Apenas o nome do arquivo, sem permitir sair da pasta de cortes
+        input_file = os.path.join(CUTS_DIR, os.path.basename(filename))
+        if not os.path.isfile(input_file):
+            return {'error': f'Corte não encontrado: {filename}'}, 404
+        
+        if not output_filename:
+            base = os.path.splitext(os.path.basename(filename))[0]
+            output_filename = f'{base}_preview_{max_width}_{max_fps:g}.{fmt}'
+        output_path = os.path.join(CUTS_DIR, os.path.basename(output_filename))
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        task = {
+            'id': task_id,
+            'type': 'preview',
+            'status': 'running',
+            'input_file': input_file,
+            'output_path': output_path,
+            'format': fmt,
+            'max_width': max_width,
+            'max_fps': max_fps,
+            'cache_key': cache_key(self._source_identity(input_file), 'preview', {'format': fmt, 'max_width': max_width, 'max_fps': max_fps}),
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        cached_path, running_id = self._claim_cached_task(task)
+        if cached_path:
+            return {
+                'task_id': task_id,
+                'status': 'completed',
+                'message': 'Prévia obtida do cache',
+                'output_path': output_path,
+                'cached': True
+            }, 200
+        if running_id:
+            return {
+                'task_id': task_id,
+                'status': 'started',
+                'message': 'Prévia idêntica já em andamento',
+                'output_path': output_path
+            }, 200
+        
+        self._detach_output(output_path)
+        
+        self._submit_job(task_id, {
+            'type': 'preview',
+            'input': input_file,
+            'output': output_path,
+            'fmt': fmt,
+            'max_width': max_width,
+            'max_fps': max_fps
+        })
+        
+        return {
+            'task_id': task_id,
+            'status': 'started',
+            'message': 'Geração da prévia iniciada',
+            'output_path': output_path
+        }, 200
+    
+    def cancel_task(self, task_id):
+        """
+        Cancela uma tarefa de corte ou concatenação
+        
+        Uma tarefa na fila é descartada; uma tarefa em execução tem o ffmpeg encerrado.
+        Em ambos os casos o workspace temporário e as saídas parciais são removidos.
+        
+        Args:
+            task_id: ID da tarefa
+            
+        Returns:
+            tuple: (resultado, status_code) - Situação do cancelamento ou erro e código de status HTTP
+        """
+        task = self.tasks.get(task_id)
+        if not task:
+            return {'error': f'Tarefa com ID {task_id} não encontrada'}, 404
+        
+        if task['status'] in ('completed', 'error', 'cancelled'):
+            return {'error': f'Tarefa com ID {task_id} já foi finalizada (status: {task["status"]})'}, 400
+        
+        # Tarefa aguardando um corte idêntico: o corte em andamento continua para as demais
+        if task.get('follows'):
+            task['status'] = 'cancelled'
+            task['output'] += 'Tarefa cancelada.\n'
+            return {
+                'task_id': task_id,
+                'status': 'cancelled',
+                'message': 'Tarefa cancelada (o corte idêntico em andamento continua)'
+            }, 200
+        
+        # Corte aguardando a janela de agrupamento: sai do lote antes de ser enviado
+        if self._cancel_waiting_cut(task_id):
+            self._release_cached_cut(task)
+            task['status'] = 'cancelled'
+            task['output'] += 'Tarefa cancelada.\n'
+            return {
+                'task_id': task_id,
+                'status': 'cancelled',
+                'message': 'Tarefa cancelada antes do envio'
+            }, 200
+        
+        # Corte já enviado em um lote: os demais cortes do lote continuam
+        if task.get('batch_id'):
+            self._cancel_batch_member(task)
+            return {
+                'task_id': task_id,
+                'status': 'cancelled',
+                'message': 'Tarefa cancelada (os demais cortes do lote continuam)'
+            }, 200
+        
+        if self.engine_pool is None or not self.engine_pool.cancel(task_id):
+            return {'error': f'Tarefa com ID {task_id} não pode ser cancelada no momento (status: {task["status"]})'}, 409
+        
+        task['status'] = 'cancelling'
+        
+        return {
+            'task_id': task_id,
+            'status': 'cancelling',
+            'message': 'Cancelamento solicitado'
+        }, 200
+    
+    def get_task_status(self, task_id):
+        """
+        Obtém o status de uma tarefa
+        
+        Args:
+            task_id: ID da tarefa
+            
+        Returns:
+            dict: Informações da tarefa ou erro
+        """
+        if task_id not in self.tasks:
+            return {'error': f'Tarefa com ID {task_id} não encontrada'}, 404
+        
+        return self.tasks[task_id], 200
+        
+    def get_video_error_details(self, video_id):
+        """
+        Obtém detalhes de erro de um vídeo
+        
+        Args:
+            video_id: ID do vídeo
+            
+        Returns:
+            tuple: (detalhes do erro, código de status HTTP)
+        """
+        # Buscar o vídeo no repositório
+        video = self.video_repository.find_by_id(video_id)
+        
+        if not video:
+            return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
+            
+        if video['status'] != 'error':
+            return {'error': 'Este vídeo não está em estado de erro'}, 400
+            
+        # Buscar tarefas relacionadas a este vídeo
+        error_details = {'video': video}
+        
+        # Procurar nas tarefas por informações de erro relacionadas a este vídeo
+        related_tasks = []
+        for task_id, task in self.tasks.items():
+            # Verificar se o video_id está diretamente na tarefa
+            task_video_id = task.get('video_id')
+            
+            # Se video_id for um dicionário, extrair o ID
+            if isinstance(task_video_id, dict) and 'id' in task_video_id:
+                task_video_id = task_video_id['id']
+                
+            # Comparar com o ID do vídeo
+            if task_video_id == video_id:
+                task_info = {
+                    'task_id': task_id,
+                    'type': task.get('type'),
+                    'status': task.get('status'),
+                    'error': task.get('error'),
+                    'error_details': task.get('error_details')
+                }
+                related_tasks.append(task_info)
+        
+        error_details['related_tasks'] = related_tasks
+        
+        return error_details, 200
+    
+    def get_all_tasks(self):
+        """
+        Obtém todas as tarefas
+        
+        Returns:
+            list: Lista de tarefas
+        """
+        return list(self.tasks.values())
+    
+    def get_thumbnails(self, video_id, interval=10):
+        """
+        Obtém as miniaturas (sprite sheets e índices WebVTT/JSON) de um vídeo
+        
+        As miniaturas ficam em cache por vídeo e intervalo. Se ainda não existirem,
+        uma tarefa de geração é iniciada (ou a tarefa em andamento é informada).
+        
+        Args:
+            video_id: ID do vídeo
+            interval: Intervalo entre miniaturas em segundos
+            
+        Returns:
+            tuple: (resultado, status_code) - Manifesto (200), tarefa em andamento (202) ou erro e código de status HTTP
+        """
+        if interval is None or interval < 1 or interval > 3600:
+            return {'error': 'O intervalo deve estar entre 1 e 3600 segundos'}, 400
+        
+        # Buscar informações do vídeo
+        video = self.video_repository.find(video_id)
+        if not video:
+            return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
+        
+        if video['status'] != 'completed':
+            return {'error': f'Vídeo com ID {video_id} não está pronto (status: {video["status"]})'}, 400
+        
+        input_file = self._resolve_download_path(os.path.join(DOWNLOADS_DIR, video['filename']))
+        if not os.path.exists(input_file):
+            return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+        
+        interval_key = f'{interval:g}'
+        output_dir = os.path.join(THUMBNAILS_DIR, str(video['id']), interval_key)
+        base_url = f'/videos/{video["id"]}/thumbnails/{interval_key}'
+        
+        # Miniaturas em cache (invalidadas se o arquivo do vídeo mudar)
+        manifest = load_thumbnails(output_dir, input_file)
+        if manifest:
+            return {
+                'video_id': video['id'],
+                'status': 'completed',
+                'base_url': base_url,
+                'vtt_url': f'{base_url}/{manifest["vtt"]}',
+                'sheet_urls': [f'{base_url}/{sheet}' for sheet in manifest['sheets']],
+                **manifest
+            }, 200
+        
+        # Geração já em andamento para o mesmo vídeo e intervalo
+        for task in self.tasks.values():
+            if task['type'] == 'thumbnails' and task.get('output_dir') == output_dir and task['status'] == 'running':
+                return {
+                    'task_id': task['id'],
+                    'video_id': video['id'],
+                    'status': 'processing',
+                    'message': 'Geração de miniaturas em andamento'
+                }, 202
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = {
+            'id': task_id,
+            'video_id': video['id'],
+            'type': 'thumbnails',
+            'status': 'running',
+            'input_file': input_file,
+            'output_dir': output_dir,
+            'interval': interval,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        self._submit_job(task_id, {
+            'type': 'thumbnails',
+            'input': input_file,
+            'output_dir': output_dir,
+            'interval': interval,
+            'width': THUMBNAIL_WIDTH
+        })
+        
+        return {
+            'task_id': task_id,
+            'video_id': video['id'],
+            'status': 'processing',
+            'message': 'Geração de miniaturas iniciada'
+        }, 202
+    
+    def get_scenes(self, video_id):
+        """
+        Obtém os pontos de corte candidatos (mudanças de cena) de um vídeo
+        
+        As cenas são detectadas uma única vez após o download e gravadas por vídeo.
+        Se ainda não existirem, a análise é iniciada (ou a tarefa em andamento é informada).
+        
+        Args:
+            video_id: ID do vídeo
+            
+        Returns:
+            tuple: (resultado, status_code) - Cenas (200), tarefa em andamento (202) ou erro e código de status HTTP
+        """
+        # Buscar informações do vídeo
+        video = self.video_repository.find(video_id)
+        if not video:
+            return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
+        
+        analysis = self.analysis_repository.find_analysis(video['id'], 'scenes')
+        if analysis:
+            return {
+                'video_id': video['id'],
+                'status': 'completed',
+                **analysis
+            }, 200
+        
+        if video['status'] != 'completed':
+            return {'error': f'Vídeo com ID {video_id} não está pronto (status: {video["status"]})'}, 400
+        
+        input_file = self._resolve_download_path(os.path.join(DOWNLOADS_DIR, video['filename']))
+        if not os.path.exists(input_file):
+            return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+        
+        task_id, started = self._start_analysis(video['id'], 'scenes', input_file)
+        
+        return {
+            'task_id': task_id,
+            'video_id': video['id'],
+            'status': 'processing',
+            'message': 'Detecção de cenas iniciada' if started else 'Detecção de cenas em andamento'
+        }, 202
+    
+    def get_thumbnail_file(self, video_id, interval, filename):
+        """
+        Obtém o caminho de um arquivo de miniaturas (sprite sheet, VTT ou JSON)
+        
+        Args:
+            video_id: ID do vídeo
+            interval: Intervalo das miniaturas (como aparece na URL)
+            filename: Nome do arquivo
+            
+        Returns:
+            tuple: (caminho, status_code) - Caminho do arquivo ou erro e código de status HTTP
+        """
+        # Apenas nomes de arquivo, sem permitir sair do diretório de miniaturas
+        if os.path.basename(filename) != filename or os.path.basename(interval) != interval:
+            return {'error': 'Arquivo inválido'}, 400
+        
+        file_path = os.path.join(THUMBNAILS_DIR, str(video_id), interval, filename)
+        if not os.path.exists(file_path):
+            return {'error': 'Arquivo não encontrado'}, 404
+        
+        return file_path, 200
+    
+    def get_hls(self, filename):
+        """
+        Obtém o pacote HLS (playlist e segmentos fMP4) de um corte
+        
+        O pacote é gerado sem recodificar e fica em cache por corte (invalidado se o
+        arquivo mudar). Se ainda não existir, uma tarefa de empacotamento é iniciada
+        (ou a tarefa em andamento é informada).
+        
+        Args:
+            filename: Nome do corte (arquivo na pasta de cortes)
+            
+        Returns:
+            tuple: (resultado, status_code) - Manifesto (200), tarefa em andamento (202) ou erro e código de status HTTP
+        """
+        # Apenas o nome do arquivo, sem permitir sair da pasta de cortes
+        if os.path.basename(filename) != filename or filename.startswith('.'):
+            return {'error': 'Arquivo inválido'}, 400
+        
+        input_file = os.path.join(CUTS_DIR, filename)
+        if not os.path.isfile(input_file):
+            return {'error': f'Corte não encontrado: {filename}'}, 404
+        
+        output_dir = os.path.join(HLS_DIR, filename)
+        base_url = f'/videos/files/cut/{filename}/hls'
+        
+        # Pacote em cache (invalidado se o corte mudar)
+        manifest = load_hls(output_dir, input_file)
+        if manifest:
+            return {
+                'filename': filename,
+                'status': 'completed',
+                'base_url': base_url,
+                'playlist_url': f'{base_url}/{manifest["playlist"]}',
+                **manifest
+            }, 200
+        
+        # Empacotamento já em andamento para o mesmo corte
+        for task in self.tasks.values():
+            if task['type'] == 'hls' and task.get('output_dir') == output_dir and task['status'] == 'running':
+                return {
+                    'task_id': task['id'],
+                    'filename': filename,
+                    'status': 'processing',
+                    'message': 'Empacotamento HLS em andamento'
+                }, 202
+        
+        # Gerar ID da tarefa
+        task_id = str(uuid.uuid4())
+        
+        # Inicializar tarefa
+        self.tasks[task_id] = {
+            'id': task_id,
+            'type': 'hls',
+            'status': 'running',
+            'input_file': input_file,
+            'output_dir': output_dir,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        self._submit_job(task_id, {
+            'type': 'hls',
+            'input': input_file,
+            'output_dir': output_dir,
+            'segment_seconds': HLS_SEGMENT_SECONDS
+        })
+        
+        return {
+            'task_id': task_id,
+            'filename': filename,
+            'status': 'processing',
+            'message': 'Empacotamento HLS iniciado'
+        }, 202
+    
+    def get_hls_file(self, filename, name):
+        """
+        Obtém o caminho de um arquivo do pacote HLS de um corte (playlist ou segmento)
+        
+        Args:
+            filename: Nome do corte
+            name: Nome do arquivo do pacote
+            
+        Returns:
+            tuple: (caminho, status_code) - Caminho do arquivo ou erro e código de status HTTP
+        """
+        # Apenas nomes de arquivo, sem permitir sair do diretório do pacote
+        if os.path.basename(filename) != filename or os.path.basename(name) != name or filename.startswith('.'):
+            return {'error': 'Arquivo inválido'}, 400
+        
+        file_path = os.path.join(HLS_DIR, filename, name)
+        if not os.path.isfile(file_path):
+            return {'error': 'Arquivo não encontrado'}, 404
+        
+        return file_path, 200
+    
+    def stream_cut(self, video_id, start_time, end_time, mode='copy'):
+        """
+        Prepara um corte transmitido diretamente ao cliente, sem gravar arquivo
+        
+        O corte reserva uma das STREAM_MAX_CONCURRENT vagas de transmissão, liberada
+        em close(). O ffmpeg só é iniciado por start(), quando a resposta começa a
+        ser enviada; a saída (MP4 fragmentado) deve ser lida com read() e encerrada
+        com close() quando o cliente terminar ou desconectar.
+        
+        Args:
+            video_id: ID do vídeo
+            start_time: Tempo inicial (formato HH:MM:SS)
+            end_time: Tempo final (formato HH:MM:SS)
+            mode: 'copy' (começa no keyframe anterior, sem recodificar) ou 'fast' (preciso, recodificação rápida)
+            
+        Returns:
+            tuple: (corte, status_code) - StreamingCut ainda não iniciado ou erro e código de status HTTP
+        """
+        if mode not in STREAM_MODES:
+            return {'error': f'Modo de transmissão inválido: {mode}. Use um dos modos: {", ".join(STREAM_MODES)}'}, 400
+        
+        video = self.video_repository.find(video_id)
+        if not video:
+            return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
+        
+        if video['status'] != 'completed':
+            return {'error': f'Vídeo com ID {video_id} não está pronto para corte (status: {video["status"]})'}, 400
+        
+        try:
+            start_seconds = parse_time(start_time)
+            end_seconds = validate_range(start_seconds, parse_time(end_time), video.get('duration'))
+        except EngineError as e:
+            return {'error': str(e)}, 400
+        
+        input_file = self._cut_input_file(video, mode)
+        if not os.path.exists(input_file):
+            return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+        
+        release = self._acquire_stream_slot()
+        if release is None:
+            return {'error': f'Limite de {STREAM_MAX_CONCURRENT} transmissões simultâneas atingido, tente novamente em instantes'}, 503
+        
+        return StreamingCut(input_file, start_seconds, end_seconds, mode, on_close=release), 200
+    
+    def _acquire_stream_slot(self):
+        """
+        Reserva uma vaga de transmissão, sem esperar
+        
+        Returns:
+            callable: Função que libera a vaga (chamar uma única vez) ou None se não houver vaga livre
+        """
+        if self._stream_slots is None:
+            return lambda: None
+        
+        if not self._stream_slots.acquire(blocking=False):
+            return None
+        return self._stream_slots.release
+    
+    def _create_virtual_clip(self, video, start_seconds, end_seconds, start_time, end_time, mode):
+        """
+        Cria um corte virtual: um manifesto com os segmentos da origem que cobrem o intervalo
+        
+        Nada é codificado nem copiado; o manifesto é gravado em VIRTUAL_DIR e os
+        segmentos são lidos da origem ao serem servidos. Como os segmentos começam em
+        keyframes, o corte virtual começa no keyframe anterior ou igual ao start_time.
+        
+        Args:
+            video: Registro do vídeo
+            start_seconds: Tempo inicial em segundos
+            end_seconds: Tempo final em segundos (já validado contra a duração)
+            start_time: Tempo inicial informado (usado ao materializar)
+            end_time: Tempo final informado (usado ao materializar)
+            mode: Modo de corte usado ao materializar
+        
+        Returns:
+            tuple: (resultado, status_code) - Informações do corte virtual ou erro e código de status HTTP
+        """
+        input_file = self._cut_input_file(video, 'copy')
+        if not os.path.exists(input_file):
+            return {'error': f'Arquivo de entrada não encontrado: {input_file}'}, 404
+        
+        try:
+            manifest = plan_virtual_clip(input_file, start_seconds, end_seconds, HLS_SEGMENT_SECONDS)
+        except EngineError as e:
+            return {'error': str(e)}, 400
+        
+        clip_id = uuid.uuid4().hex[:12]
+        clip = {
+            'clip_id': clip_id,
+            'video_id': video['id'],
+            'input_file': input_file,
+            'start_time': start_time,
+            'end_time': end_time,
+            'mode': mode,
+            'created_at': datetime.now().isoformat(),
+            **manifest
+        }
+        
+        # Escrita atômica: um manifesto parcial nunca é servido
+        clip_path = os.path.join(VIRTUAL_DIR, f'{clip_id}.json')
+        with open(f'{clip_path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(clip, f)
+        os.replace(f'{clip_path}.tmp', clip_path)
+        
+        return self._virtual_clip_response(clip), 200
+    
+    def _virtual_clip_response(self, clip):
+        """
+        Monta a resposta pública de um corte virtual (sem o caminho da origem)
+        """
+        base_url = f"/videos/virtual/{clip['clip_id']}"
+        return {
+            'clip_id': clip['clip_id'],
+            'video_id': clip['video_id'],
+            'status': 'virtual',
+            'start_time': clip['start_time'],
+            'end_time': clip['end_time'],
+            'mode': clip['mode'],
+            'start': clip['start'],
+            'end': clip['end'],
+            'duration': clip['duration'],
+            'segments': [
+                {key: segment[key] for key in ('start', 'end', 'duration', 'offset', 'length')}
+                for segment in clip['segments']
+            ],
+            'playlist_url': f'{base_url}/playlist.m3u8',
+            'materialize_url': f'{base_url}/materialize',
+            'created_at': clip['created_at']
+        }
+    
+    def _load_virtual_clip(self, clip_id):
+        """
+        Carrega o manifesto de um corte virtual, verificando se a origem não mudou
+        
+        Args:
+            clip_id: ID do corte virtual
+        
+        Returns:
+            tuple: (manifesto, status_code) - Manifesto ou erro e código de status HTTP
+        """
+        # Apenas IDs gerados por _create_virtual_clip, sem permitir sair da pasta
+        if not clip_id.isalnum():
+            return {'error': 'Corte virtual inválido'}, 400
+        
+        clip_path = os.path.join(VIRTUAL_DIR, f'{clip_id}.json')
+        try:
+            with open(clip_path, 'r', encoding='utf-8') as f:
+                clip = json.load(f)
+        except (OSError, ValueError):
+            return {'error': f'Corte virtual não encontrado: {clip_id}'}, 404
+        
+        if not virtual_clip_matches(clip, clip['input_file']):
+            return {'error': 'O arquivo de origem do corte virtual mudou ou não existe mais'}, 409
+        
+        return clip, 200
+    
+    def get_virtual_clip(self, clip_id):
+        """
+        Obtém as informações de um corte virtual
+        
+        Args:
+            clip_id: ID do corte virtual
+        
+        Returns:
+            tuple: (resultado, status_code) - Informações do corte virtual ou erro e código de status HTTP
+        """
+        clip, status_code = self._load_virtual_clip(clip_id)
+        if status_code != 200:
+            return clip, status_code
+        
+        return self._virtual_clip_response(clip), 200
+    
+    def get_virtual_playlist(self, clip_id):
+        """
+        Obtém a playlist HLS de um corte virtual
+        
+        Args:
+            clip_id: ID do corte virtual
+        
+        Returns:
+            tuple: (playlist, status_code) - Conteúdo da playlist .m3u8 ou erro e código de status HTTP
+        """
+        clip, status_code = self._load_virtual_clip(clip_id)
+        if status_code != 200:
+            return clip, status_code
+        
+        # URLs relativas à playlist
+        return virtual_playlist(clip, lambda number: f'segments/{number}.ts'), 200
+    
+    def get_virtual_segment(self, clip_id, number):
+        """
+        Obtém um segmento de um corte virtual, lido da origem sob demanda
+        
+        Args:
+            clip_id: ID do corte virtual
+            number: Número do segmento na playlist (a partir de 0)
+        
+        Returns:
+            tuple: (segmento, status_code) - FFmpegStream ainda não iniciado (MPEG-TS) ou erro e código de status HTTP
+        """
+        clip, status_code = self._load_virtual_clip(clip_id)
+        if status_code != 200:
+            return clip, status_code
+        
+        if not 0 <= number < len(clip['segments']):
+            return {'error': f'Segmento não encontrado: {number}'}, 404
+        
+        # Cada segmento executa um ffmpeg próprio: usa as mesmas vagas das transmissões
+        release = self._acquire_stream_slot()
+        if release is None:
+            return {'error': f'Limite de {STREAM_MAX_CONCURRENT} transmissões simultâneas atingido, tente novamente em instantes'}, 503
+        
+        return stream_virtual_segment(clip['input_file'], clip['segments'][number], on_close=release), 200
+    
+    def materialize_virtual_clip(self, clip_id, output_filename=None, mode=None):
+        """
+        Gera o arquivo de um corte virtual, como um corte comum do mesmo intervalo
+        
+        Args:
+            clip_id: ID do corte virtual
+            output_filename: Nome do arquivo de saída (opcional)
+            mode: Modo de corte (opcional; padrão: o modo informado ao criar o corte virtual)
+        
+        Returns:
+            tuple: (resultado, status_code) - Informações da tarefa iniciada ou erro e código de status HTTP
+        """
+        clip, status_code = self._load_virtual_clip(clip_id)
+        if status_code != 200:
+            return clip, status_code
+        
+        result, status_code = self.cut_video(
+            clip['video_id'],
+            start_time=clip['start_time'],
+            end_time=clip['end_time'],
+            output_filename=output_filename,
+            mode=mode or clip['mode']
+        )
+        if status_code == 200:
+            result['clip_id'] = clip_id
+        
+        return result, status_code
+    
+    def get_video(self, video_id):
+        """
+        Obtém informações de um vídeo
+        
+        Args:
+            video_id: ID do vídeo
+            
+        Returns:
+            dict: Informações do vídeo ou erro
+        """
+        video = self.video_repository.find_by_id(video_id)
+        if not video:
+            return {'error': f'Vídeo com ID {video_id} não encontrado'}, 404
+        
+        return video, 200
+    
+    def get_all_videos(self, limit=None):
+        """
+        Obtém todos os vídeos
         
         Args:
             limit: Limite de vídeos a retornar (opcional)
@@ -408,27 +1603,225 @@ class VideoService:
         else:
             return 'unknown'
     
-    def _get_platform_name(self, platform):
+    def _get_platform_name(self, platform):
+        """
+        Converte o nome da plataforma para o formato usado pelo serviço de autenticação
+        
+        Args:
+            platform: Nome da plataforma detectada
+            
+        Returns:
+            str: Nome da plataforma no formato do serviço de autenticação
+        """
+        # Mapeamento de plataformas detectadas para plataformas suportadas pelo serviço de autenticação
+        platform_mapping = {
+            'youtube': 'youtube',
+            'instagram': 'instagram',
+            'facebook': 'facebook',
+            'kwai': 'kwai',
+            'pinterest': 'pinterest',
+            # Adicionar outros mapeamentos conforme necessário
+        }
+        
+        return platform_mapping.get(platform.lower(), 'unknown')
+    
+    def _resolve_download_path(self, path):
+        """
+        Resolve o caminho real de um arquivo baixado
+        
+        O yt-dlp substitui o template %(ext)s pela extensão do formato baixado,
+        então o caminho registrado pode não existir literalmente no disco.
+        
+        Args:
+            path: Caminho registrado (pode conter %(ext)s)
+            
+        Returns:
+            str: Caminho do arquivo baixado ou o caminho original se não encontrado
+        """
+        if '%(ext)s' not in path:
+            return path
+        
+        prefix = path.replace('%(ext)s', '')
+        for candidate in sorted(glob.glob(glob.escape(prefix) + '*')):
+            # Ignorar arquivos parciais e temporários do yt-dlp
+            if not candidate.endswith(('.part', '.ytdl', '.tmp')) and os.path.isfile(candidate):
+                return candidate
+        
+        return path
+    
+    def _on_download_completed(self, task_id, download_path, analyze_audio=True, partial=False, ingest=False):
+        """
+        Executa as etapas posteriores ao download de um vídeo
+        
+        Lê os cabeçalhos do arquivo (duração, resolução, codecs e taxa de bits,
+        gravados no registro do vídeo e usados para validar os cortes), constrói o
+        índice de keyframes, usado pelos cortes seguintes para planejar os limites
+        sem reler o vídeo inteiro, calcula o hash do conteúdo usado pelo cache de
+        cortes e inicia as análises de cenas e de áudio e, se configurada, a
+        geração da versão de trabalho (mezzanine).
+        
+        Um trecho baixado (download-and-cut com DOWNLOAD_SECTIONS) serve apenas ao
+        corte da própria tarefa: seu tempo zero não é o início do vídeo, então nada
+        é gravado no registro do vídeo e as demais etapas não são executadas.
+        
+        Args:
+            task_id: ID da tarefa
+            download_path: Caminho registrado do download
+            analyze_audio: Iniciar a análise de áudio (False quando o próprio corte a calcula)
+            partial: Apenas um trecho do vídeo foi baixado
+            ingest: Gerar a versão de trabalho com keyframes densos (com MEZZANINE_INGEST)
+            
+        Returns:
+            str: Caminho real do arquivo baixado
+        """
+        file_path = self._resolve_download_path(download_path)
+        video_id = self._task_video_id(self.tasks[task_id])
+        
+        try:
+            info = media_info(file_path)
+            self.tasks[task_id]['media_info'] = info
+            if video_id is not None and not partial:
+                self.video_repository.update_media_info(video_id, info)
+        except Exception as e:
+            print(f"Erro ao ler as informações de mídia de {file_path}: {str(e)}")
+        
+        if partial:
+            return file_path
+        
+        try:
+            index = get_or_build_index(file_path)
+            if index is not None:
+                self.tasks[task_id]['keyframe_index'] = {
+                    'container': index.container,
+                    'keyframes': len(index.keyframes),
+                    'duration': index.duration
+                }
+            else:
+                print(f"Container não suportado para indexação de keyframes: {file_path}")
+        except Exception as e:
+            # O índice é uma otimização: falhas não devem afetar o download
+            print(f"Erro ao indexar keyframes de {file_path}: {str(e)}")
+        
+        try:
+            # Hash do conteúdo usado pelo cache de cortes (calculado uma única vez)
+            content_hash(file_path)
+        except OSError as e:
+            print(f"Erro ao calcular o hash de {file_path}: {str(e)}")
+        
+        analyses = []
+        if SCENE_DETECTION:
+            analyses.append('scenes')
+        if AUDIO_ANALYSIS and analyze_audio:
+            analyses.append('audio')
+        
+        for kind in analyses:
+            try:
+                self._start_analysis(video_id, kind, file_path)
+            except Exception as e:
+                print(f"Erro ao iniciar a análise '{kind}' de {file_path}: {str(e)}")
+        
+        if MEZZANINE_INGEST and ingest and video_id is not None:
+            try:
+                self._start_mezzanine(video_id, file_path)
+            except Exception as e:
+                print(f"Erro ao iniciar a versão de trabalho de {file_path}: {str(e)}")
+        
+        return file_path
+    
+    def _start_mezzanine(self, video_id, input_file):
+        """
+        Inicia a geração da versão de trabalho (mezzanine) de um vídeo no pool do motor
+        
+        O vídeo é recodificado uma única vez, em baixa prioridade, com keyframes a
+        cada MEZZANINE_KEYFRAME_INTERVAL segundos; ao final, a versão é registrada
+        no vídeo e passa a ser usada pelos cortes copiados.
+        
+        Args:
+            video_id: ID do vídeo
+            input_file: Arquivo baixado
+            
+        Returns:
+            str: ID da tarefa
+        """
+        task_id = str(uuid.uuid4())
+        output_path = os.path.join(MEZZANINE_DIR, f'{os.path.splitext(os.path.basename(input_file))[0]}.mp4')
+        
+        self.tasks[task_id] = {
+            'id': task_id,
+            'video_id': video_id,
+            'type': 'mezzanine',
+            'status': 'running',
+            'input_file': input_file,
+            'output_path': output_path,
+            'keyframe_interval': MEZZANINE_KEYFRAME_INTERVAL,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        self._submit_job(task_id, {
+            'type': 'mezzanine',
+            'input': input_file,
+            'output': output_path,
+            'keyframe_interval': MEZZANINE_KEYFRAME_INTERVAL
+        })
+        
+        return task_id
+    
+    def _start_analysis(self, video_id, kind, input_file):
         """
-        Converte o nome da plataforma para o formato usado pelo serviço de autenticação
+        Inicia uma análise de um vídeo (cenas ou áudio) no pool do motor
         
         Args:
-            platform: Nome da plataforma detectada
+            video_id: ID do vídeo
+            kind: Tipo da análise ('scenes' ou 'audio')
+            input_file: Arquivo do vídeo
             
         Returns:
-            str: Nome da plataforma no formato do serviço de autenticação
+            tuple: (task_id, iniciada) - ID da tarefa e False se já havia uma análise em andamento
         """
-        # Mapeamento de plataformas detectadas para plataformas suportadas pelo serviço de autenticação
-        platform_mapping = {
-            'youtube': 'youtube',
-            'instagram': 'instagram',
-            'facebook': 'facebook',
-            'kwai': 'kwai',
-            'pinterest': 'pinterest',
-            # Adicionar outros mapeamentos conforme necessário
+        for task in self.tasks.values():
+            if task['type'] == kind and task.get('video_id') == video_id and task['status'] == 'running':
+                return task['id'], False
+        
+        task_id = str(uuid.uuid4())
+        
+        self.tasks[task_id] = {
+            'id': task_id,
+            'video_id': video_id,
+            'type': kind,
+            'status': 'running',
+            'input_file': input_file,
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
         }
         
-        return platform_mapping.get(platform.lower(), 'unknown')
+        job = {'type': kind, 'input': input_file}
+        if kind == 'scenes':
+            job['fps'] = SCENE_ANALYSIS_FPS
+            job['threshold'] = SCENE_THRESHOLD
+        
+        self._submit_job(task_id, job)
+        
+        return task_id, True
+    
+    def _task_video_id(self, task):
+        """
+        Obtém o ID do vídeo de uma tarefa
+        
+        Nas tarefas de download, video_id guarda o registro criado (dicionário).
+        
+        Args:
+            task: Registro da tarefa
+            
+        Returns:
+            int: ID do vídeo ou None
+        """
+        video_id = task.get('video_id')
+        if isinstance(video_id, dict):
+            video_id = video_id.get('id')
+        return video_id
     
     def _run_command(self, task_id, command, video_id=None):
         """
@@ -497,6 +1890,9 @@ class VideoService:
                         video_id = video_id['id']
                     result = self.video_repository.update_status(video_id, 'completed')
                     print(f"Resultado da chamada update_status: {result}")
+                    
+                    # Etapas executadas uma única vez após o download
+                    self._on_download_completed(task_id, self.tasks[task_id]['output_path'], ingest=True)
             else:
                 self.tasks[task_id]['status'] = 'error'
                 
@@ -544,7 +1940,637 @@ class VideoService:
             if video_id:
                 self.video_repository.update_status(video_id, 'error')
     
-    def _download_and_cut_thread(self, task_id, url, download_path, cut_path, start_time, end_time, video_id, cookies=None, cookies_from_browser=None):
+    def _submit_job(self, task_id, job, video_id=None, on_done=None):
+        """
+        Envia um job ao pool do motor, associado a uma tarefa
+        
+        Args:
+            task_id: ID da tarefa
+            job: Dicionário do job (ver app.engine.run_job)
+            video_id: ID do vídeo cujo status deve refletir o resultado (opcional)
+            on_done: Função chamada com o Future ao final (padrão: _on_job_done)
+        
+        Returns:
+            Future: Resultado do job
+        """
+        self.tasks[task_id]['progress'] = 0
+        
+        # Workspace temporário do job (em memória quando configurado e houver espaço)
+        job['temp_dir'] = TEMP_DIR
+        job['ram_dir'] = TEMP_RAM_DIR or None
+        job['ram_reserve'] = TEMP_RAM_RESERVE_MB * 1024 * 1024
+        
+        pool = self.start_engine_pool()
+        return pool.submit(task_id, job, on_done=on_done or (lambda future: self._on_job_done(task_id, future, video_id)))
+    
+    def _on_job_message(self, task_id, kind, data):
+        """
+        Recebe logs e progresso enviados por um job do pool
+        
+        Args:
+            task_id: ID da tarefa
+            kind: Tipo da mensagem ('log' ou 'progress')
+            data: Texto do log ou dicionário de progresso
+        """
+        task = self.tasks.get(task_id)
+        if not task:
+            return
+        
+        if kind == 'log':
+            task['output'] += f'{data}\n'
+        elif kind == 'progress' and task['status'] not in ('completed', 'error', 'cancelling', 'cancelled'):
+            # Progresso geral e, nos cortes com vários intervalos, de cada intervalo
+            task['progress'] = data.get('percent', task.get('progress', 0))
+            if 'out_time' in data:
+                # Detalhes do codificador, no mesmo formato do progresso do download
+                task['progress_details'] = {
+                    'status': 'cutting',
+                    'percent': task['progress'],
+                    'out_time': data['out_time'],
+                    'fps': data.get('fps'),
+                    'speed': data.get('speed'),
+                }
+            for range_progress in data.get('ranges', []):
+                self._update_range_progress(task_id, range_progress)
+            
+            # Tarefas idênticas aguardando este corte
+            for follower_id in task.get('followers', []):
+                follower = self.tasks.get(follower_id)
+                if follower and follower['status'] == 'running':
+                    follower['progress'] = task['progress']
+            
+            # Lote de cortes: progresso de cada tarefa original
+            if task['type'] == 'cut_batch':
+                for cut_range in task['ranges']:
+                    member = self.tasks.get(cut_range['task_id'])
+                    if member and member['status'] == 'running':
+                        member['progress'] = cut_range['progress']
+    
+    def _on_job_done(self, task_id, future, video_id=None):
+        """
+        Atualiza a tarefa (e o vídeo, se informado) com o resultado de um job do pool
+        
+        Args:
+            task_id: ID da tarefa
+            future: Future do job concluído
+            video_id: ID do vídeo (opcional)
+        """
+        task = self.tasks.get(task_id)
+        if not task:
+            return
+        
+        try:
+            result = future.result()
+        except (CancelledError, JobCancelled):
+            self._release_cached_cut(task)
+            task['status'] = 'cancelled'
+            task['output'] += 'Tarefa cancelada.\n'
+            self._remove_partial_outputs(task)
+            self._finish_followers(task)
+            
+            # No download e corte, o vídeo baixado continua disponível (exceto um trecho parcial)
+            if video_id:
+                self.video_repository.update_status(video_id, 'partial' if task.get('download_section') else 'completed')
+            return
+        except Exception as e:
+            self._release_cached_cut(task)
+            task['status'] = 'error'
+            task['error'] = str(e)
+            for cut_range in task.get('ranges', []):
+                cut_range['status'] = 'error'
+            self._finish_followers(task)
+            print(f"ERRO NO JOB {task_id}: {str(e)}")
+            
+            if video_id:
+                self.video_repository.update_status(video_id, 'error')
+            return
+        
+        # Marcar cada intervalo conforme o arquivo gerado
+        for cut_range in task.get('ranges', []):
+            if os.path.exists(cut_range['output_path']):
+                cut_range['status'] = 'completed'
+                cut_range['progress'] = 100
+            else:
+                cut_range['status'] = 'error'
+        
+        # Segmentos alinhados usados, obtidos do cache e codificados em cada intervalo
+        if 'segment_cache' in result:
+            task['segment_cache'] = result['segment_cache']
+        
+        # Caminho e tamanho de cada versão gerada
+        if 'renditions' in result:
+            task['renditions'] = result['renditions']
+        
+        # Registrar quais entradas foram copiadas e quais recodificadas
+        if 'inputs' in result:
+            task['inputs'] = result['inputs']
+            task['copied'] = [item['input'] for item in result['inputs'] if item.get('action') == 'copy']
+            task['transcoded'] = [item['input'] for item in result['inputs'] if item.get('action') == 'transcode']
+        
+        # Trecho escolhido no corte com início automático
+        if 'auto_range' in result:
+            start_time, end_time = result['auto_range']
+            task['start_time'] = format_time(start_time)
+            task['end_time'] = format_time(end_time)
+        
+        # Gravar as análises para não reanalisar o vídeo
+        analyses = {}
+        if task['type'] in ('scenes', 'audio'):
+            analyses[task['type']] = result
+        if result.get('audio'):
+            analyses['audio'] = result['audio']
+        
+        for kind, data in analyses.items():
+            try:
+                self.analysis_repository.save_analysis(self._task_video_id(task), kind, data)
+            except Exception as e:
+                if task['type'] == kind:
+                    task['status'] = 'error'
+                    task['error'] = f'Erro ao gravar a análise: {str(e)}'
+                    return
+                print(f"Erro ao gravar a análise '{kind}' da tarefa {task_id}: {str(e)}")
+        
+        if task['type'] == 'scenes':
+            task['cuts'] = len(result['cuts_ms'])
+        
+        # Resumo da remoção de silêncios
+        if task['type'] == 'silence_trim':
+            for key in ('duration', 'kept_seconds', 'removed_seconds', 'copied_seconds', 'segments'):
+                task[key] = result[key]
+        
+        # Registrar a versão de trabalho no vídeo
+        if task['type'] == 'mezzanine':
+            try:
+                self.video_repository.update_mezzanine(
+                    self._task_video_id(task), os.path.basename(result['output_path']), result['keyframe_interval']
+                )
+            except Exception as e:
+                task['status'] = 'error'
+                task['error'] = f'Erro ao registrar a versão de trabalho: {str(e)}'
+                return
+            task['size'] = result['size']
+        
+        # Dimensões e tamanho da prévia gerada
+        if task['type'] == 'preview':
+            for key in ('width', 'fps', 'size'):
+                task[key] = result[key]
+        
+        # Registrar o corte no cache antes de liberar as requisições idênticas
+        # (a remoção pelo limite de tamanho apaga a cópia do cache e os arquivos entregues)
+        if task.get('cache_key') and os.path.exists(task['output_path']):
+            with self._cut_cache_lock:
+                try:
+                    for removed in self.cut_cache.store(task['cache_key'], task['output_path']):
+                        print(f"Corte removido do cache (limite de tamanho): {removed}")
+                except OSError as e:
+                    print(f"Erro ao registrar o corte no cache: {str(e)}")
+        self._release_cached_cut(task)
+        
+        task['status'] = 'completed'
+        task['progress'] = 100
+        
+        # Empacotamento HLS solicitado junto com o corte
+        if task.get('hls'):
+            self._package_hls_outputs(task)
+        
+        self._finish_followers(task)
+        
+        if task['type'] == 'download_and_cut':
+            task['output'] += 'Corte concluído com sucesso.\n'
+        
+        # Um trecho parcial não é uma origem reutilizável para outros cortes do vídeo
+        if video_id:
+            self.video_repository.update_status(video_id, 'partial' if task.get('download_section') else 'completed')
+    
+    def _schedule_cut(self, task_id, job):
+        """
+        Envia um corte ao pool ou o reserva para o lote da mesma origem
+        
+        Com CUT_BATCH_WINDOW, cortes simples (um intervalo, sem transformações nem
+        início automático) da mesma origem e modo recebidos dentro da janela são
+        reunidos em um único job de vários intervalos, que lê a origem uma vez. O
+        lote é enviado ao fim da janela ou ao atingir CUT_BATCH_MAX_SIZE cortes.
+        
+        O modo reencode sem cache de segmentos não é agrupado: sozinho, o corte é
+        codificado pelo moviepy, e no lote seria pelo filter graph do ffmpeg, com
+        um resultado diferente conforme o momento da requisição.
+        
+        Args:
+            task_id: ID da tarefa
+            job: Dicionário do job de corte
+        """
+        batchable = (
+            CUT_BATCH_WINDOW > 0 and len(job['ranges']) == 1
+            and not job.get('transforms') and not job.get('auto_length')
+            and (job['mode'] != 'reencode' or job.get('segment_cache'))
+        )
+        if not batchable:
+            self._submit_job(task_id, job)
+            return
+        
+        key = (job['input'], job['mode'])
+        full = None
+        with self._cut_batch_lock:
+            batch = self._cut_batches.get(key)
+            if batch is None:
+                batch = self._cut_batches[key] = []
+                timer = threading.Timer(CUT_BATCH_WINDOW, self._flush_cut_batch, args=(key, batch))
+                timer.daemon = True
+                timer.start()
+            batch.append((task_id, job))
+        
+            if len(batch) >= CUT_BATCH_MAX_SIZE:
+                full = self._cut_batches.pop(key)
+        
+        self.tasks[task_id]['output'] += 'Aguardando outros cortes da mesma origem.\n'
+        
+        if full:
+            self._run_cut_batch(full)
+    
+    def _flush_cut_batch(self, key, batch):
+        """
+        Envia o lote de uma origem ao fim da janela (se ainda não foi enviado por estar cheio)
+        
+        Args:
+            key: Origem e modo do lote
+            batch: Lista de (ID da tarefa, job) criada para a janela
+        """
+        with self._cut_batch_lock:
+            if self._cut_batches.get(key) is not batch:
+                return
+            del self._cut_batches[key]
+        
+        self._run_cut_batch(batch)
+    
+    def _run_cut_batch(self, batch):
+        """
+        Envia um lote de cortes da mesma origem ao pool como um único job
+        
+        Os intervalos de todas as tarefas são cortados em uma única leitura da
+        origem; o progresso e o resultado de cada intervalo são repassados à sua
+        tarefa original (ver _on_cut_batch_done).
+        Tarefas com o mesmo arquivo de saída de outra do lote são enviadas
+        separadamente.
+        
+        Args:
+            batch: Lista de (ID da tarefa, job)
+        """
+        entries = []
+        separate = []
+        output_paths = set()
+        for task_id, job in batch:
+            # Cancelada durante a janela
+            if self.tasks[task_id]['status'] != 'running':
+                continue
+            output_path = job['ranges'][0][2]
+            if output_path in output_paths:
+                separate.append((task_id, job))
+            else:
+                output_paths.add(output_path)
+                entries.append((task_id, job))
+        
+        if len(entries) == 1:
+            separate.insert(0, entries.pop())
+        
+        for task_id, job in separate:
+            self._submit_job(task_id, job)
+        
+        if not entries:
+            return
+        
+        batch_id = str(uuid.uuid4())
+        first_job = entries[0][1]
+        self.tasks[batch_id] = {
+            'id': batch_id,
+            'type': 'cut_batch',
+            'status': 'running',
+            'input_file': first_job['input'],
+            'mode': first_job['mode'],
+            'task_ids': [task_id for task_id, _ in entries],
+            'ranges': [
+                {'index': i, 'task_id': task_id, 'output_path': job['ranges'][0][2], 'status': 'pending', 'progress': 0}
+                for i, (task_id, job) in enumerate(entries)
+            ],
+            'created_at': datetime.now().isoformat(),
+            'output': '',
+            'error': ''
+        }
+        
+        for task_id, _ in entries:
+            self.tasks[task_id]['batch_id'] = batch_id
+            self.tasks[task_id]['output'] += f'Corte agrupado no lote {batch_id} ({len(entries)} cortes da mesma origem).\n'
+        
+        batch_job = {
+            'type': 'cut',
+            'input': first_job['input'],
+            'mode': first_job['mode'],
+            'ranges': [job['ranges'][0] for _, job in entries],
+            'batch': True
+        }
+        if first_job.get('segment_cache'):
+            batch_job['segment_cache'] = first_job['segment_cache']
+        
+        self._submit_job(batch_id, batch_job, on_done=lambda future: self._on_cut_batch_done(batch_id, future))
+    
+    def _cancel_waiting_cut(self, task_id):
+        """
+        Retira um corte de um lote que ainda não foi enviado ao pool
+        
+        Args:
+            task_id: ID da tarefa
+        
+        Returns:
+            bool: True se a tarefa aguardava em um lote
+        """
+        with self._cut_batch_lock:
+            for batch in self._cut_batches.values():
+                for entry in batch:
+                    if entry[0] == task_id:
+                        batch.remove(entry)
+                        return True
+        return False
+    
+    def _on_cut_batch_done(self, batch_id, future):
+        """
+        Repassa o resultado de um lote de cortes a cada tarefa original
+        
+        Cada tarefa recebe apenas o resultado do seu intervalo: falha sozinha se o
+        seu intervalo falhou, e a saída de uma tarefa cancelada durante o lote é
+        removida. Se o job inteiro falhar (ex: processo encerrado), todas falham.
+        
+        Args:
+            batch_id: ID da tarefa do lote
+            future: Future do job concluído
+        """
+        self._on_job_done(batch_id, future)
+        
+        try:
+            result = future.result()
+        except BaseException:
+            result = None
+        
+        batch = self.tasks[batch_id]
+        for index, task_id in enumerate(batch['task_ids']):
+            task = self.tasks[task_id]
+            if task['status'] == 'cancelled':
+                self._remove_partial_outputs(task)
+                batch['ranges'][index]['status'] = 'cancelled'
+                continue
+            
+            if result is None:
+                self._on_job_done(task_id, future)
+                continue
+            
+            member_future = Future()
+            error = result.get('range_errors', [None] * (index + 1))[index]
+            if error:
+                batch['ranges'][index]['status'] = 'error'
+                member_future.set_exception(EngineError(error))
+            else:
+                member_result = {'output_paths': [result['output_paths'][index]]}
+                if result.get('segment_cache'):
+                    member_result['segment_cache'] = [result['segment_cache'][index]]
+                member_future.set_result(member_result)
+            self._on_job_done(task_id, member_future)
+    
+    def _cancel_batch_member(self, task):
+        """
+        Cancela a tarefa de um corte já enviado em um lote
+        
+        O intervalo continua no job do lote (os demais cortes não são afetados) e a
+        sua saída é removida ao final; se todas as tarefas do lote forem canceladas,
+        o job do lote também é.
+        
+        Args:
+            task: Registro da tarefa
+        """
+        self._release_cached_cut(task)
+        task['status'] = 'cancelled'
+        task['output'] += 'Tarefa cancelada (a saída será descartada ao final do lote).\n'
+        self._finish_followers(task)
+        
+        batch = self.tasks.get(task['batch_id'])
+        if batch and all(self.tasks[task_id]['status'] == 'cancelled' for task_id in batch['task_ids']):
+            if self.engine_pool is not None and self.engine_pool.cancel(batch['id']):
+                batch['status'] = 'cancelling'
+    
+    def _package_hls_outputs(self, task):
+        """
+        Inicia o empacotamento HLS de cada arquivo gerado por uma tarefa de corte
+        
+        Args:
+            task: Registro da tarefa concluída
+        """
+        packages = []
+        for path in task.get('output_paths') or [task['output_path']]:
+            if not path or not os.path.exists(path):
+                continue
+            filename = os.path.basename(path)
+            result, status_code = self.get_hls(filename)
+            packages.append({
+                'filename': filename,
+                'status': result.get('status', 'error'),
+                'task_id': result.get('task_id'),
+                'url': f'/videos/files/cut/{filename}/hls'
+            })
+        task['hls_packages'] = packages
+    
+    def _claim_cached_task(self, task):
+        """
+        Consulta o cache e as tarefas em andamento para a chave de cache de uma tarefa
+        
+        Se o resultado estiver no cache, ele é entregue no arquivo de saída da
+        tarefa (link físico da cópia do cache, registrado na entrada para ser
+        removido junto com ela) e a tarefa é registrada como
+        concluída; se houver tarefa idêntica em andamento, a tarefa é registrada
+        para receber o arquivo ao final dela (ver _finish_followers); caso
+        contrário, é registrada como em andamento.
+        
+        Args:
+            task: Registro da tarefa, com 'cache_key' e 'output_path'
+            
+        Returns:
+            tuple: (caminho no cache, ID da tarefa idêntica em andamento) - ambos None
+                quando a tarefa deve ser executada
+        """
+        with self._cut_cache_lock:
+            cached_path = self.cut_cache.get(task['cache_key'])
+            running_id = None if cached_path else self._inflight_cuts.get(task['cache_key'])
+            
+            if cached_path:
+                try:
+                    link_file(cached_path, task['output_path'])
+                    self.cut_cache.add_link(task['cache_key'], task['output_path'])
+                except OSError as e:
+                    print(f"Erro ao entregar o corte do cache em {task['output_path']}: {str(e)}")
+                    cached_path = None
+                    running_id = self._inflight_cuts.get(task['cache_key'])
+            
+            if cached_path:
+                task.update({'status': 'completed', 'progress': 100, 'cached': True})
+            elif running_id:
+                task['follows'] = running_id
+                task['output'] += f'Aguardando a tarefa idêntica em andamento {running_id}.\n'
+                self.tasks[running_id].setdefault('followers', []).append(task['id'])
+            else:
+                self._inflight_cuts[task['cache_key']] = task['id']
+            self.tasks[task['id']] = task
+        
+        return cached_path, running_id
+    
+    def _finish_followers(self, task):
+        """
+        Finaliza as tarefas que aguardavam uma tarefa idêntica
+        
+        Com a tarefa concluída, o arquivo gerado é entregue no arquivo de saída
+        de cada uma (link físico); em caso de erro ou cancelamento, elas recebem
+        o mesmo status.
+        
+        Args:
+            task: Registro da tarefa finalizada
+        """
+        for follower_id in task.get('followers', []):
+            follower = self.tasks.get(follower_id)
+            if not follower or follower['status'] != 'running':
+                continue
+            
+            if task['status'] != 'completed':
+                follower['status'] = task['status']
+                follower['error'] = task.get('error', '')
+                follower['output'] += f"Tarefa idêntica {task['id']} finalizada com status {task['status']}.\n"
+                continue
+            
+            try:
+                link_file(task['output_path'], follower['output_path'])
+                if task.get('cache_key'):
+                    with self._cut_cache_lock:
+                        self.cut_cache.add_link(task['cache_key'], follower['output_path'])
+            except OSError as e:
+                follower['status'] = 'error'
+                follower['error'] = f'Erro ao entregar o arquivo gerado: {str(e)}'
+                continue
+            
+            for key in ('width', 'fps', 'size'):
+                if key in task:
+                    follower[key] = task[key]
+            follower['status'] = 'completed'
+            follower['progress'] = 100
+            
+            if follower.get('hls'):
+                self._package_hls_outputs(follower)
+    
+    def _source_identity(self, path):
+        """
+        Identifica o conteúdo de um arquivo para as chaves de cache, sem lê-lo na requisição
+        
+        Usa o hash do conteúdo já calculado (ex: após o download); caso contrário,
+        usa o caminho, o tamanho e a data de modificação e calcula o hash em
+        segundo plano para as requisições seguintes.
+        
+        Args:
+            path: Caminho do arquivo
+            
+        Returns:
+            str: Identidade do conteúdo
+        """
+        identity, hashed = file_identity(path)
+        if not hashed:
+            self._hash_in_background(path)
+        return identity
+    
+    def _hash_in_background(self, path):
+        """
+        Calcula o hash do conteúdo de um arquivo em uma thread separada (uma por arquivo)
+        
+        Args:
+            path: Caminho do arquivo
+        """
+        with self._cut_cache_lock:
+            if path in self._hashing:
+                return
+            self._hashing.add(path)
+        
+        def run():
+            try:
+                content_hash(path)
+            except OSError as e:
+                print(f"Erro ao calcular o hash de {path}: {str(e)}")
+            finally:
+                with self._cut_cache_lock:
+                    self._hashing.discard(path)
+        
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+    
+    def _detach_output(self, path):
+        """
+        Remove um arquivo de saída existente antes de ser regravado
+        
+        O arquivo pode ser um link físico de uma cópia do cache: gravá-lo no lugar
+        alteraria também a cópia.
+        
+        Args:
+            path: Caminho do arquivo de saída
+        """
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"Não foi possível remover a saída anterior {path}: {str(e)}")
+    
+    def _release_cached_cut(self, task):
+        """
+        Remove um corte da lista de cortes em andamento
+        
+        Args:
+            task: Registro da tarefa
+        """
+        if task.get('cache_key'):
+            with self._cut_cache_lock:
+                if self._inflight_cuts.get(task['cache_key']) == task['id']:
+                    del self._inflight_cuts[task['cache_key']]
+    
+    def _remove_partial_outputs(self, task):
+        """
+        Remove os arquivos de saída incompletos de uma tarefa cancelada
+        
+        Args:
+            task: Registro da tarefa
+        """
+        paths = list(task.get('output_paths', []))
+        for key in ('output_path', 'cut_path'):
+            if task.get(key):
+                paths.append(task[key])
+        
+        for path in paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Não foi possível remover a saída parcial {path}: {str(e)}")
+        
+        for cut_range in task.get('ranges', []):
+            cut_range['status'] = 'cancelled'
+    
+    def _update_range_progress(self, task_id, range_progress):
+        """
+        Atualiza o progresso de um intervalo de uma tarefa de corte
+        
+        Args:
+            task_id: ID da tarefa
+            range_progress: Dicionário {'index', 'percent'} informado pelo cut.py
+        """
+        ranges = self.tasks[task_id].get('ranges', [])
+        index = range_progress.get('index')
+        if index is None or not 0 <= index < len(ranges):
+            return
+        
+        ranges[index]['progress'] = range_progress.get('percent', 0)
+        if ranges[index]['status'] == 'pending':
+            ranges[index]['status'] = 'running'
+    
+    def _download_and_cut_thread(self, task_id, url, download_path, cut_path, start_time, end_time, video_id, cookies=None, cookies_from_browser=None, mode='reencode'):
         """
         Thread para download e corte sequencial
         
@@ -553,11 +2579,12 @@ class VideoService:
             url: URL do vídeo
             download_path: Caminho para download
             cut_path: Caminho para o corte
-            start_time: Tempo inicial do corte
-            end_time: Tempo final do corte
+            start_time: Tempo inicial do corte em segundos (None para escolher pelo áudio)
+            end_time: Tempo final do corte em segundos (com start_time None, a duração do trecho)
             video_id: ID do vídeo
             cookies: Caminho para o arquivo de cookies (opcional)
             cookies_from_browser: Navegador para extrair cookies (opcional)
+            mode: Modo de corte (opcional)
         """
         try:
             # Atualizar status da tarefa
@@ -592,17 +2619,49 @@ class VideoService:
             elif cookies_from_browser:
                 download_command += f' --cookies-from-browser "{cookies_from_browser}"'
             
+            # Baixar apenas o trecho do corte, com margem (o início automático precisa do áudio inteiro)
+            if DOWNLOAD_SECTIONS and start_time is not None:
+                section_start = max(start_time - DOWNLOAD_SECTION_MARGIN, 0.0)
+                section_end = end_time + DOWNLOAD_SECTION_MARGIN
+                download_command += f' --section-start {section_start:.3f} --section-end {section_end:.3f}'
+            
             # Executar comando de download
             download_process = subprocess.Popen(
                 download_command,
                 shell=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                bufsize=1  # Line buffered
             )
             
-            # Capturar saída e erro
-            download_stdout, download_stderr = download_process.communicate()
+            # Ler o erro em paralelo para que o processo não bloqueie com o pipe cheio
+            stderr_lines = []
+            stderr_thread = threading.Thread(target=lambda: stderr_lines.extend(download_process.stderr), daemon=True)
+            stderr_thread.start()
+            
+            # Capturar o progresso do download em tempo real
+            section = None
+            for line in download_process.stdout:
+                try:
+                    json_start = line.find('{')
+                    if json_start >= 0:
+                        progress_data = json.loads(line[json_start:])
+                        if not isinstance(progress_data, dict):
+                            continue
+                        if progress_data.get('status') == 'downloading' and 'percent' in progress_data:
+                            self.tasks[task_id]['progress'] = progress_data['percent']
+                            self.tasks[task_id]['progress_details'] = progress_data
+                        elif progress_data.get('status') == 'section':
+                            # Apenas o trecho foi baixado
+                            section = progress_data
+                except Exception:
+                    # Ignorar linhas que não são JSON válido
+                    pass
+            
+            download_process.wait()
+            stderr_thread.join()
+            download_stderr = ''.join(stderr_lines)
             
             # Verificar resultado do download
             if download_process.returncode != 0:
@@ -625,33 +2684,41 @@ class VideoService:
             
             # Atualizar status da tarefa e do vídeo
             self.tasks[task_id]['status'] = 'cutting'
+            self.tasks[task_id]['progress'] = 0
             self.tasks[task_id]['output'] += 'Download concluído. Iniciando corte...\n'
             self.video_repository.update_status(video_id, 'processing')
             
-            # Comando para corte
-            cut_command = f'python cut.py --input "{download_path}" --output "{cut_path}" --start "{start_time}" --end "{end_time}"'
+            if section:
+                # O início do trecho baixado é o tempo zero do arquivo: os tempos do corte são relativos a ele
+                self.tasks[task_id]['download_section'] = {
+                    'start': section['start'],
+                    'end': section['end'],
+                    'downloaded_bytes': section['downloaded_bytes'],
+                    'source_bytes': section.get('source_bytes')
+                }
+                self.tasks[task_id]['bytes_saved'] = section.get('saved_bytes')
+                self.tasks[task_id]['output'] += f"Baixado apenas o trecho de {section['start']:.3f}s a {section['end']:.3f}s\n"
+                start_time -= section['start']
+                end_time -= section['start']
             
-            # Executar comando de corte
-            cut_process = subprocess.Popen(
-                cut_command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            # Etapas executadas uma única vez após o download (no início automático,
+            # o próprio corte calcula as características do áudio; um trecho parcial
+            # serve apenas a este corte e não é registrado como origem do vídeo)
+            auto = start_time is None
+            download_path = self._on_download_completed(task_id, download_path, analyze_audio=not auto, partial=section is not None)
             
-            # Capturar saída e erro
-            cut_stdout, cut_stderr = cut_process.communicate()
+            job = {
+                'type': 'cut',
+                'input': download_path,
+                'mode': mode,
+                'ranges': [[start_time, end_time, cut_path]]
+            }
+            if auto:
+                job['ranges'] = [[None, None, cut_path]]
+                job['auto_length'] = end_time
             
-            # Verificar resultado do corte
-            if cut_process.returncode == 0:
-                self.tasks[task_id]['status'] = 'completed'
-                self.tasks[task_id]['output'] += 'Corte concluído com sucesso.\n'
-                self.video_repository.update_status(video_id, 'completed')
-            else:
-                self.tasks[task_id]['status'] = 'error'
-                self.tasks[task_id]['error'] = cut_stderr
-                self.video_repository.update_status(video_id, 'error')
+            # Enviar o corte para o pool do motor; o status do vídeo é atualizado ao final
+            self._submit_job(task_id, job, video_id=video_id)
         
         except Exception as e:
             import traceback
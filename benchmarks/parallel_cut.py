@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark do corte recodificado: modo reencode (moviepy) x modo parallel (blocos em paralelo)
+
+Uso:
+    python benchmarks/parallel_cut.py --input video.mp4 --start 00:00:00 --end 00:40:00
+    python benchmarks/parallel_cut.py --duration 600   # gera um vídeo sintético de 10 minutos
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Permitir executar a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.engine import cut, parse_time
+from app.engine.ffmpeg import run_ffmpeg, get_duration
+from app.engine.parallel_encode import PARALLEL_WORKERS
+
+
+def generate_source(path, duration):
+    """
+    Gera um vídeo sintético 1080p com áudio e keyframes a cada 2 segundos
+    """
+    run_ffmpeg([
+        '-f', 'lavfi', '-i', f'testsrc2=size=1920x1080:rate=30:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-g', '60',
+        '-c:a', 'aac',
+        path
+    ])
+
+
+def run(mode, input_path, output_path, start_time, end_time):
+    """
+    Executa um corte e retorna o tempo decorrido em segundos
+    """
+    started = time.perf_counter()
+    cut(input_path, output_path, start_time, end_time, mode=mode)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do corte recodificado em paralelo")
+    parser.add_argument("--input", type=str, help="Vídeo de origem (se omitido, um vídeo sintético é gerado)")
+    parser.add_argument("--start", type=str, default="00:00:00", help="Tempo inicial (HH:MM:SS)")
+    parser.add_argument("--end", type=str, help="Tempo final (HH:MM:SS, padrão: fim do vídeo)")
+    parser.add_argument("--duration", type=int, default=300, help="Duração do vídeo sintético em segundos (padrão: 300)")
+    parser.add_argument("--modes", type=str, nargs='+', default=['reencode', 'parallel'], help="Modos a comparar")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_') as work_dir:
+        input_path = args.input
+        if not input_path:
+            input_path = os.path.join(work_dir, 'source.mp4')
+            print(f"Gerando vídeo sintético de {args.duration}s...")
+            generate_source(input_path, args.duration)
+
+        start_time = parse_time(args.start)
+        end_time = parse_time(args.end) if args.end else get_duration(input_path)
+        if end_time is None:
+            parser.error(f"Não foi possível obter a duração de {input_path}; informe --end")
+
+        print(f"Intervalo: {start_time:.3f}s - {end_time:.3f}s | núcleos: {os.cpu_count()} | codificadores paralelos: {PARALLEL_WORKERS}")
+
+        results = {}
+        for mode in args.modes:
+            output_path = os.path.join(work_dir, f'cut_{mode}.mp4')
+            elapsed = run(mode, input_path, output_path, start_time, end_time)
+            results[mode] = elapsed
+            print(f"{mode:>10}: {elapsed:8.2f}s ({(end_time - start_time) / elapsed:.2f}x tempo real)")
+
+        if 'reencode' in results and 'parallel' in results:
+            print(f"Ganho do modo parallel: {results['reencode'] / results['parallel']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from app.engine import concat_videos
+import argparse
+import json
+import os
+
+def main():
+    parser = argparse.ArgumentParser(description="Comando para concatenar vídeos sem recodificar as entradas compatíveis")
+    parser.add_argument("--input", type=str, action="append", required=True, help="Arquivo a ser concatenado (repetir para cada arquivo, na ordem)")
+    parser.add_argument("--output", type=str, required=True, help="Local a ser salvo")
+
+    args = parser.parse_args()
+
+    for input_file in args.input:
+        if not os.path.exists(input_file):
+            print(f"Erro: Arquivo {input_file} não encontrado.")
+            exit(1)
+
+    if len(args.input) < 2:
+        print("Erro: Informe ao menos dois arquivos com --input.")
+        exit(1)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Progresso em JSON para ser capturado pelo processo pai
+    def report_progress(percent):
+        print(json.dumps({'status': 'concatenating', 'percent': percent}), flush=True)
+
+    try:
+        print(f"Concatenando {len(args.input)} arquivos")
+
+        report = concat_videos(
+            args.input,
+            args.output,
+            log=print,
+            progress=report_progress,
+            work_dir=output_dir or None
+        )
+
+        # Relatório de entradas copiadas e recodificadas
+        print(json.dumps({'status': 'concatenated', 'inputs': report}), flush=True)
+        print(f"Vídeo concatenado salvo em: {args.output}")
+
+    except Exception as e:
+        print(f"Erro ao processar o vídeo: {str(e)}")
+        exit(1)
+
+if __name__ == "__main__":
+    main()
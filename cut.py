@@ -1,17 +1,21 @@
-from moviepy import VideoFileClip
+from app.engine import cut, cut_multiple, CUT_MODES
 import argparse
+import json
 import os
 
 def time_to_seconds(t):
-    h, m, s = map(int, t.split(':'))
-    return h * 3600 + m * 60 + s
+    # Aceita frações de segundo (HH:MM:SS.mmm) para cortes com precisão de quadro
+    h, m, s = t.split(':')
+    return int(h) * 3600 + int(m) * 60 + float(s)
 
 def main():
     parser = argparse.ArgumentParser(description="Comando para realizar cortes de vídeo em Python")
-    parser.add_argument("--start", type=str, required=True, help="Tempo inicial do corte. Ex: 01:00:00 (Formato HH:MM:SS)")
-    parser.add_argument("--end", type=str, required=True, help="Tempo final do corte. Ex: 01:05:00 (Formato HH:MM:SS)")
+    parser.add_argument("--start", type=str, help="Tempo inicial do corte. Ex: 01:00:00 ou 01:00:00.500 (Formato HH:MM:SS[.mmm])")
+    parser.add_argument("--end", type=str, help="Tempo final do corte. Ex: 01:05:00 ou 01:05:00.250 (Formato HH:MM:SS[.mmm])")
     parser.add_argument("--input", type=str, required=True, help="Arquivo a ser cortado")
-    parser.add_argument("--output", type=str, required=True, help="Local a ser salvo")
+    parser.add_argument("--range", type=str, nargs=2, action="append", dest="ranges", metavar=("INICIO", "FIM"), help="Intervalo de corte (pode ser repetido para gerar vários cortes lendo o vídeo uma única vez)")
+    parser.add_argument("--output", type=str, action="append", required=True, help="Local a ser salvo (repetir uma vez para cada --range, na mesma ordem)")
+    parser.add_argument("--mode", type=str, choices=CUT_MODES, default="reencode", help="Modo de corte: reencode (preciso, recodifica o vídeo), copy (rápido, corta nos keyframes sem recodificar), smart (preciso, recodifica apenas as bordas) ou parallel (preciso, recodifica blocos em paralelo usando todos os núcleos)")
 
     args = parser.parse_args()
 
@@ -19,47 +23,54 @@ def main():
         print(f"Erro: Arquivo {args.input} não encontrado.")
         exit(1)
 
-    start_time = time_to_seconds(args.start)
-    end_time = time_to_seconds(args.end)
+    if args.ranges:
+        ranges = args.ranges
+    elif args.start and args.end:
+        ranges = [(args.start, args.end)]
+    else:
+        print("Erro: Informe --start e --end ou ao menos um --range.")
+        exit(1)
 
-    if start_time >= end_time:
-        print("Erro: O tempo inicial deve ser menor que o tempo final.")
+    if len(args.output) != len(ranges):
+        print(f"Erro: Foram informados {len(ranges)} intervalo(s) e {len(args.output)} saída(s).")
         exit(1)
 
+    cuts = []
+    for (start, end), output in zip(ranges, args.output):
+        start_time = time_to_seconds(start)
+        end_time = time_to_seconds(end)
+
+        if start_time >= end_time:
+            print("Erro: O tempo inicial deve ser menor que o tempo final.")
+            exit(1)
+
+        cuts.append((start_time, end_time, output))
+
     try:
         print(f"Carregando vídeo: {args.input}")
-        
-        clip = VideoFileClip(args.input)
-        
-        if end_time > clip.duration:
-            print(f"Aviso: Tempo final ({end_time}s) maior que duração do vídeo ({clip.duration}s)")
-            end_time = clip.duration
-        
-        if start_time >= clip.duration:
-            print(f"Erro: Tempo inicial ({start_time}s) é maior que a duração do vídeo ({clip.duration}s)")
-            clip.close()
-            exit(1)
 
-        print(f"Cortando vídeo de {args.start} até {args.end}")
-        
-        subclip = clip.subclipped(start_time, end_time)
-
-        output_dir = os.path.dirname(args.output)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        subclip.write_videofile(
-            args.output, 
-            codec="libx264", 
-            audio_codec="aac",
-            temp_audiofile="temp-audio.m4a",
-            remove_temp=True
-        )
-
-        print(f"Vídeo cortado salvo em: {args.output}")
-        
-        subclip.close()
-        clip.close()
+        if len(cuts) == 1:
+            start_time, end_time, output = cuts[0]
+            print(f"Cortando vídeo de {ranges[0][0]} até {ranges[0][1]} (modo: {args.mode})")
+
+            # Progresso em JSON para ser capturado pelo processo pai
+            def report_progress(data):
+                print(json.dumps({'status': 'cutting', **data}), flush=True)
+
+            cut(args.input, output, start_time, end_time, mode=args.mode, log=print, progress=report_progress)
+
+            print(f"Vídeo cortado salvo em: {output}")
+        else:
+            print(f"Cortando {len(cuts)} intervalos em uma única leitura (modo: {args.mode})")
+
+            # Progresso em JSON para ser capturado pelo processo pai
+            def report_progress(data):
+                print(json.dumps({'status': 'cutting', **data}), flush=True)
+
+            cut_multiple(args.input, cuts, mode=args.mode, log=print, progress=report_progress)
+
+            for (start, end), (_, _, output) in zip(ranges, cuts):
+                print(f"Corte {start} - {end} salvo em: {output}")
 
     except Exception as e:
         print(f"Erro ao processar o vídeo: {str(e)}")
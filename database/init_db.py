@@ -18,6 +18,48 @@ DB_DATABASE = os.getenv("DB_DATABASE", "cut")
 DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "root")
 
+# Colunas adicionadas depois da criação das tabelas (aplicadas a bancos existentes)
+COLUMN_MIGRATIONS = [
+    ("videos", "width", "INT AFTER duration"),
+    ("videos", "height", "INT AFTER width"),
+    ("videos", "video_codec", "VARCHAR(50) AFTER height"),
+    ("videos", "audio_codec", "VARCHAR(50) AFTER video_codec"),
+    ("videos", "bitrate", "BIGINT AFTER audio_codec"),
+    ("videos", "mezzanine_filename", "VARCHAR(255) AFTER bitrate"),
+    ("videos", "mezzanine_keyframe_interval", "FLOAT AFTER mezzanine_filename"),
+]
+
+# Valores aceitos na coluna status (a definição é reaplicada em bancos existentes)
+VIDEO_STATUS_COLUMN = "ENUM('pending', 'downloading', 'processing', 'completed', 'partial', 'error')"
+
+def migrate_database(cursor):
+    """
+    Atualiza as tabelas de um banco criado por uma versão anterior do esquema
+
+    Pode ser executada várias vezes: apenas as colunas ausentes são adicionadas.
+
+    Args:
+        cursor: Cursor conectado ao banco de dados
+
+    Returns:
+        list: Colunas adicionadas, no formato "tabela.coluna"
+    """
+    added = []
+    for table, column, definition in COLUMN_MIGRATIONS:
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+            (DB_DATABASE, table, column)
+        )
+        if cursor.fetchone()[0]:
+            continue
+
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        added.append(f"{table}.{column}")
+
+    cursor.execute(f"ALTER TABLE videos MODIFY COLUMN status {VIDEO_STATUS_COLUMN}")
+    return added
+
 def init_database():
     """Inicializa o banco de dados"""
     try:
@@ -47,6 +89,11 @@ def init_database():
                 if command.strip():
                     cursor.execute(command)
             
+            # Aplicar as colunas novas a tabelas criadas por versões anteriores
+            added = migrate_database(cursor)
+            for column in added:
+                print(f"✅ Coluna '{column}' adicionada")
+            
             connection.commit()
             print("✅ Esquema do banco de dados criado com sucesso")
         
@@ -4,8 +4,26 @@ CREATE TABLE IF NOT EXISTS videos (
     platform VARCHAR(50),
     url TEXT,
     filename VARCHAR(255),
-    status ENUM('pending', 'downloading', 'completed', 'error'),
+    status ENUM('pending', 'downloading', 'processing', 'completed', 'partial', 'error'),
     duration FLOAT,
+    width INT,
+    height INT,
+    video_codec VARCHAR(50),
+    audio_codec VARCHAR(50),
+    bitrate BIGINT,
+    mezzanine_filename VARCHAR(255),
+    mezzanine_keyframe_interval FLOAT,
     created_at DATETIME,
     updated_at DATETIME
+);
+
+-- Resultados das análises de cada vídeo (ex: cenas), em JSON
+CREATE TABLE IF NOT EXISTS video_analysis (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    video_id INT NOT NULL,
+    kind VARCHAR(50) NOT NULL,
+    data LONGTEXT,
+    created_at DATETIME,
+    updated_at DATETIME,
+    UNIQUE KEY uq_video_analysis (video_id, kind)
 );
\ No newline at end of file
@@ -1,4 +1,5 @@
 import yt_dlp
+from yt_dlp.utils import download_range_func
 import argparse
 import sys
 import json
@@ -35,12 +36,81 @@ def progress_hook(d):
         }
         print(json.dumps(error_info), flush=True)
 
+def source_size(info):
+    """
+    Obtém o tamanho (bytes) do arquivo completo do formato escolhido, quando informado
+    """
+    size = info.get('filesize') or info.get('filesize_approx')
+    if size:
+        return size
+    formats = info.get('requested_formats') or []
+    sizes = [f.get('filesize') or f.get('filesize_approx') for f in formats]
+    return sum(sizes) if sizes and all(sizes) else None
+
+def download_section(ydl_opts, url, start, end):
+    """
+    Baixa apenas o trecho [start, end] (segundos) do vídeo
+    
+    Usa o download de seções do yt-dlp: apenas os segmentos (HLS/DASH) ou os
+    intervalos de bytes que cobrem o trecho são baixados, sem recodificar. O
+    início do trecho corresponde ao tempo zero do arquivo baixado.
+    
+    Returns:
+        dict: Informações do trecho baixado ou None se o download parcial não for possível
+    """
+    with yt_dlp.YoutubeDL({**ydl_opts, 'progress_hooks': []}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    
+    duration = info.get('duration')
+    if not duration or info.get('is_live'):
+        print(json.dumps({"status": "info", "message": "Duração desconhecida; baixando o vídeo completo"}), flush=True)
+        return None
+    
+    end = min(end, duration)
+    if start <= 0 and end >= duration:
+        return None
+    
+    filenames = []
+    def finished_hook(d):
+        if d['status'] == 'finished' and d.get('filename'):
+            filenames.append(d['filename'])
+    
+    try:
+        with yt_dlp.YoutubeDL({
+            **ydl_opts,
+            'download_ranges': download_range_func(None, [(start, end)]),
+            'progress_hooks': ydl_opts['progress_hooks'] + [finished_hook],
+        }) as ydl:
+            ydl.download([url])
+    except yt_dlp.utils.DownloadError as e:
+        print(json.dumps({"status": "info", "message": f"Download parcial não suportado ({str(e)}); baixando o vídeo completo"}), flush=True)
+        return None
+    
+    if not filenames or not os.path.exists(filenames[-1]):
+        print(json.dumps({"status": "info", "message": "Trecho baixado não encontrado; baixando o vídeo completo"}), flush=True)
+        return None
+    
+    downloaded = os.path.getsize(filenames[-1])
+    total = source_size(info)
+    return {
+        'status': 'section',
+        'start': start,
+        'end': end,
+        'duration': duration,
+        'filename': filenames[-1],
+        'downloaded_bytes': downloaded,
+        'source_bytes': total,
+        'saved_bytes': max(total - downloaded, 0) if total else None
+    }
+
 def main():
     parser = argparse.ArgumentParser(description="Download de vídeos do YouTube")
     parser.add_argument("--url", type=str, required=True, help="URL do vídeo a ser baixado")
     parser.add_argument("--output", type=str, required=True, help="Caminho para salvar o vídeo")
     parser.add_argument("--cookies", type=str, help="Caminho para o arquivo de cookies")
     parser.add_argument("--cookies-from-browser", type=str, help="Navegador para extrair cookies (chrome, firefox, opera, edge, safari)")
+    parser.add_argument("--section-start", type=float, help="Início (segundos) do trecho a baixar (opcional)")
+    parser.add_argument("--section-end", type=float, help="Fim (segundos) do trecho a baixar (opcional)")
 
     args = parser.parse_args()
 
@@ -65,6 +135,13 @@ def main():
         print(json.dumps({"status": "info", "message": f"Extraindo cookies do navegador: {args.cookies_from_browser}"}), flush=True)
     
     try:
+        # Baixar apenas o trecho, se informado; o vídeo completo só quando isso não for possível
+        if args.section_start is not None and args.section_end is not None:
+            section = download_section(ydl_opts, args.url, args.section_start, args.section_end)
+            if section:
+                print(json.dumps(section), flush=True)
+                return
+        
         yt = yt_dlp.YoutubeDL(ydl_opts)
         yt.download([args.url])
     except yt_dlp.utils.DownloadError as e:
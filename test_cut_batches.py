@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Testes do agrupamento de cortes da mesma origem em lotes (sem banco de dados nem ffmpeg)
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services import video_service as video_service_module
+from app.services.video_service import VideoService
+from app.engine import jobs
+from app.engine.errors import EngineError
+
+
+class FakeTimer:
+    """Janela de agrupamento que só termina quando o teste chama _flush_cut_batch"""
+
+    def __init__(self, interval, function, args=None):
+        self.daemon = False
+
+    def start(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.cancelled = []
+
+    def cancel(self, task_id):
+        self.cancelled.append(task_id)
+        return True
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(video_service_module, 'CUT_BATCH_WINDOW', 1.0)
+    monkeypatch.setattr(video_service_module, 'CUT_BATCH_MAX_SIZE', 3)
+    monkeypatch.setattr(video_service_module.threading, 'Timer', FakeTimer)
+
+    # Sem __init__: o serviço real conecta ao banco e agenda a atualização de cookies
+    service = VideoService.__new__(VideoService)
+    service.tasks = {}
+    service._inflight_cuts = {}
+    service._cut_cache_lock = threading.Lock()
+    service._cut_batches = {}
+    service._cut_batch_lock = threading.Lock()
+    service.engine_pool = FakePool()
+    service.submitted = []
+    service._submit_job = lambda task_id, job, video_id=None, on_done=None: service.submitted.append((task_id, job, on_done))
+    return service
+
+
+def add_cut(service, task_id, start, end, mode='copy', output=None):
+    output = output or f'/tmp/batch_test_{task_id}.mp4'
+    service.tasks[task_id] = {'id': task_id, 'type': 'cut', 'status': 'running', 'output_path': output, 'output': '', 'error': ''}
+    job = {'type': 'cut', 'input': '/videos/source.mp4', 'mode': mode, 'ranges': [[start, end, output]]}
+    service._schedule_cut(task_id, job)
+    return job
+
+
+def flush(service):
+    for key, batch in list(service._cut_batches.items()):
+        service._flush_cut_batch(key, batch)
+
+
+def test_cuts_of_the_same_source_are_batched(service):
+    add_cut(service, 'a', 0, 10)
+    add_cut(service, 'b', 20, 30)
+    assert service.submitted == []
+
+    flush(service)
+
+    [(batch_id, job, on_done)] = service.submitted
+    assert job['batch'] is True
+    assert job['ranges'] == [[0, 10, '/tmp/batch_test_a.mp4'], [20, 30, '/tmp/batch_test_b.mp4']]
+    assert service.tasks['a']['batch_id'] == batch_id
+
+
+def test_full_batch_is_sent_without_waiting(service):
+    for task_id in 'abc':
+        add_cut(service, task_id, 0, 10)
+
+    assert len(service.submitted) == 1
+    assert service._cut_batches == {}
+
+
+def test_reencode_without_segment_cache_is_not_batched(service):
+    add_cut(service, 'a', 0, 10, mode='reencode')
+
+    assert [task_id for task_id, _, _ in service.submitted] == ['a']
+
+
+def test_single_cut_in_the_window_runs_alone(service):
+    add_cut(service, 'a', 0, 10)
+    flush(service)
+
+    [(task_id, job, _)] = service.submitted
+    assert task_id == 'a' and 'batch' not in job
+
+
+def test_duplicate_output_is_sent_separately(service):
+    add_cut(service, 'a', 0, 10, output='/tmp/same.mp4')
+    add_cut(service, 'b', 20, 30, output='/tmp/same.mp4')
+    add_cut(service, 'c', 40, 50)
+
+    submitted = {task_id: job for task_id, job, _ in service.submitted}
+    assert 'b' in submitted and 'batch' not in submitted['b']
+
+
+def test_failed_range_fails_only_its_task(service, tmp_path):
+    outputs = [str(tmp_path / 'a.mp4'), str(tmp_path / 'b.mp4')]
+    add_cut(service, 'a', 0, 10, output=outputs[0])
+    add_cut(service, 'b', 20, 30, output=outputs[1])
+    flush(service)
+    [(batch_id, job, on_done)] = service.submitted
+
+    open(outputs[0], 'wb').close()
+    future = Future()
+    future.set_result({'output_paths': outputs, 'range_errors': [None, 'Tempo final excede a duração']})
+    on_done(future)
+
+    assert service.tasks['a']['status'] == 'completed'
+    assert service.tasks['b']['status'] == 'error'
+    assert 'duração' in service.tasks['b']['error']
+
+
+def test_cancelled_member_drops_only_its_output(service, tmp_path):
+    outputs = [str(tmp_path / 'a.mp4'), str(tmp_path / 'b.mp4')]
+    add_cut(service, 'a', 0, 10, output=outputs[0])
+    add_cut(service, 'b', 20, 30, output=outputs[1])
+    flush(service)
+    [(batch_id, job, on_done)] = service.submitted
+
+    result, status_code = service.cancel_task('b')
+    assert status_code == 200 and result['status'] == 'cancelled'
+    # Ainda há um corte ativo no lote: o job continua
+    assert service.engine_pool.cancelled == []
+
+    for path in outputs:
+        open(path, 'wb').close()
+    future = Future()
+    future.set_result({'output_paths': outputs, 'range_errors': [None, None]})
+    on_done(future)
+
+    assert service.tasks['a']['status'] == 'completed'
+    assert service.tasks['b']['status'] == 'cancelled'
+    assert os.path.exists(outputs[0]) and not os.path.exists(outputs[1])
+
+
+def test_cancelling_every_member_cancels_the_batch(service):
+    add_cut(service, 'a', 0, 10)
+    add_cut(service, 'b', 20, 30)
+    flush(service)
+    [(batch_id, _, _)] = service.submitted
+
+    service.cancel_task('a')
+    service.cancel_task('b')
+
+    assert service.engine_pool.cancelled == [batch_id]
+
+
+def test_batch_job_reports_errors_per_range(monkeypatch):
+    cut_calls = []
+
+    def cut_multiple(input_path, ranges, **kwargs):
+        raise EngineError('falha no corte conjunto')
+
+    def cut(input_path, output_path, start_time, end_time, **kwargs):
+        cut_calls.append(output_path)
+        if output_path == 'b.mp4':
+            raise EngineError('falha em b')
+
+    def validate_range(start_time, end_time, duration, log=None):
+        if end_time > duration:
+            raise EngineError('Tempo final excede a duração')
+        return end_time
+
+    monkeypatch.setattr(jobs, 'source_duration', lambda path: 100.0)
+    monkeypatch.setattr(jobs, 'validate_range', validate_range)
+    monkeypatch.setattr(jobs, 'cut_multiple', cut_multiple)
+    monkeypatch.setattr(jobs, 'cut', cut)
+
+    result = jobs.run_job({
+        'type': 'cut', 'input': 'in.mp4', 'mode': 'copy', 'batch': True,
+        'ranges': [[0, 10, 'a.mp4'], [20, 30, 'b.mp4'], [90, 120, 'c.mp4'], [40, 50, 'd.mp4']]
+    })
+
+    # O intervalo inválido nem é cortado; após a falha conjunta, cada um é cortado sozinho
+    assert cut_calls == ['a.mp4', 'b.mp4', 'd.mp4']
+    assert result['range_errors'] == [None, 'falha em b', 'Tempo final excede a duração', None]
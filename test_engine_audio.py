@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Testes da escolha do trecho mais intenso do áudio (start_time="auto")
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.errors import EngineError
+from app.engine.audio import pick_highlight
+
+
+def features(rms_db, onset=None, duration=None):
+    return {
+        'seconds': len(rms_db),
+        'duration': duration,
+        'rms_db': rms_db,
+        'onset': onset if onset is not None else [0.0] * len(rms_db),
+    }
+
+
+def test_picks_the_loudest_window():
+    rms = [-40.0] * 10
+    rms[6] = rms[7] = -5.0
+
+    assert pick_highlight(features(rms, duration=10.0), 2) == (6.0, 8.0)
+
+
+def test_onsets_count_towards_the_score():
+    rms = [-20.0] * 10
+    onset = [0.0] * 10
+    onset[2] = 5.0
+
+    assert pick_highlight(features(rms, onset, duration=10.0), 1) == (2.0, 3.0)
+
+
+def test_end_is_limited_to_the_duration():
+    rms = [-40.0] * 10
+    rms[8] = rms[9] = -5.0
+
+    # Janela de 3 segundos (2.5 arredondado para cima) terminando no último segundo
+    assert pick_highlight(features(rms, duration=9.8), 2.5) == (7.0, 9.5)
+    assert pick_highlight(features(rms, duration=9.2), 2.5) == (7.0, 9.2)
+
+
+def test_length_longer_than_the_audio():
+    assert pick_highlight(features([-10.0] * 5, duration=4.6), 30) == (0.0, 4.6)
+
+
+def test_flat_audio_starts_at_zero():
+    assert pick_highlight(features([-20.0] * 10, duration=10.0), 3) == (0.0, 3.0)
+
+
+def test_duration_falls_back_to_seconds():
+    assert pick_highlight(features([-10.0] * 5), 30) == (0.0, 5)
+
+
+@pytest.mark.parametrize('length', [0, -1])
+def test_rejects_non_positive_length(length):
+    with pytest.raises(EngineError):
+        pick_highlight(features([-10.0] * 5, duration=5.0), length)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de arquivos (LRU limitado por tamanho), das chaves e do hash de conteúdo
+"""
+
+import os
+import sys
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.cache import LRUFileCache, cache_key, content_hash, known_content_hash, file_identity, link_file
+
+
+def write(path, size, fill=b'x'):
+    with open(path, 'wb') as f:
+        f.write(fill * size)
+    return str(path)
+
+
+def put(cache, directory, key, size):
+    return cache.put(key, write(directory / f'{key}.bin', size))
+
+
+def test_cache_key_is_stable_and_order_independent_for_dicts():
+    assert cache_key('hash', 1.5, {'mode': 'copy', 'format': '.mp4'}) == cache_key('hash', 1.5, {'format': '.mp4', 'mode': 'copy'})
+    assert cache_key('hash', 1.5, 2.0) != cache_key('hash', 2.0, 1.5)
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = LRUFileCache(str(tmp_path), 300)
+    put(cache, tmp_path, 'a', 100)
+    put(cache, tmp_path, 'b', 100)
+    put(cache, tmp_path, 'c', 100)
+
+    # 'a' usado por último: 'b' passa a ser o mais antigo
+    assert cache.get('a')
+    removed = put(cache, tmp_path, 'd', 100)
+
+    assert removed == [str(tmp_path / 'b.bin')]
+    assert not os.path.exists(tmp_path / 'b.bin')
+    assert cache.get('b') is None
+    assert cache.total_bytes() == 300
+
+
+def test_eviction_keeps_the_new_entry(tmp_path):
+    cache = LRUFileCache(str(tmp_path), 100)
+    put(cache, tmp_path, 'a', 50)
+
+    # Maior que o limite sozinho: as demais entradas saem, a nova fica
+    removed = put(cache, tmp_path, 'big', 500)
+
+    assert removed == [str(tmp_path / 'a.bin')]
+    assert cache.get('big') == str(tmp_path / 'big.bin')
+
+
+def test_zero_limit_never_evicts(tmp_path):
+    cache = LRUFileCache(str(tmp_path), 0)
+    for key in 'abcde':
+        assert put(cache, tmp_path, key, 1000) == []
+
+    assert cache.total_bytes() == 5000
+
+
+def test_index_survives_reload_and_drops_missing_files(tmp_path):
+    cache = LRUFileCache(str(tmp_path), 0)
+    put(cache, tmp_path, 'a', 10)
+    put(cache, tmp_path, 'b', 10)
+    os.remove(tmp_path / 'b.bin')
+
+    reloaded = LRUFileCache(str(tmp_path), 0)
+    assert reloaded.get('a') == str(tmp_path / 'a.bin')
+    assert reloaded.get('b') is None
+
+
+def test_changed_file_is_not_served(tmp_path):
+    cache = LRUFileCache(str(tmp_path), 0)
+    path = write(tmp_path / 'a.bin', 10)
+    cache.put('a', path)
+    write(tmp_path / 'a.bin', 20)
+
+    assert cache.get('a') is None
+
+
+def disk_usage(*directories):
+    """
+    Bytes ocupados pelos arquivos dos diretórios, contando cada inode uma única vez
+    """
+    inodes = {}
+    for directory in directories:
+        for name in os.listdir(directory):
+            stat = os.stat(os.path.join(directory, name))
+            if not name.startswith('.'):
+                inodes[(stat.st_dev, stat.st_ino)] = stat.st_size
+    return sum(inodes.values())
+
+
+def test_store_links_the_delivered_file(tmp_path):
+    outputs = tmp_path / 'cuts'
+    outputs.mkdir()
+    cache = LRUFileCache(str(tmp_path / 'cache'), 0)
+
+    delivered = write(outputs / 'first.mp4', 100)
+    cache.store('k1', delivered)
+
+    # Mesmo arquivo nos dois diretórios: o espaço é ocupado uma única vez
+    assert os.path.samefile(cache.get('k1'), delivered)
+    assert disk_usage(outputs, tmp_path / 'cache') == 100
+
+
+def test_eviction_lowers_disk_usage(tmp_path):
+    outputs = tmp_path / 'cuts'
+    outputs.mkdir()
+    cache = LRUFileCache(str(tmp_path / 'cache'), 250)
+
+    first = write(outputs / 'first.mp4', 100)
+    cache.store('k1', first)
+    # Outra requisição recebeu o mesmo corte em outro arquivo
+    copy = str(outputs / 'first-again.mp4')
+    link_file(cache.get('k1'), copy)
+    cache.add_link('k1', copy)
+    cache.store('k2', write(outputs / 'second.mp4', 100, b'y'))
+    assert disk_usage(outputs, tmp_path / 'cache') == 200
+
+    removed = cache.store('k3', write(outputs / 'third.mp4', 100, b'z'))
+
+    # k1 saiu junto com os dois arquivos entregues, liberando o espaço
+    assert set(removed) == {str(tmp_path / 'cache' / 'k1.mp4'), first, copy}
+    assert not os.path.exists(first) and not os.path.exists(copy)
+    assert disk_usage(outputs, tmp_path / 'cache') == 200
+    assert cache.total_bytes() == 200
+
+
+def test_eviction_keeps_a_rewritten_delivery(tmp_path):
+    outputs = tmp_path / 'cuts'
+    outputs.mkdir()
+    cache = LRUFileCache(str(tmp_path / 'cache'), 150)
+
+    first = write(outputs / 'first.mp4', 100)
+    cache.store('k1', first)
+    # A saída foi regravada por outro corte com o mesmo nome
+    os.remove(first)
+    write(outputs / 'first.mp4', 30, b'n')
+
+    cache.store('k2', write(outputs / 'second.mp4', 100, b'y'))
+
+    assert cache.get('k1') is None
+    assert os.path.getsize(first) == 30
+
+
+def test_link_file_replaces_the_target(tmp_path):
+    source = write(tmp_path / 'source.mp4', 10, b'a')
+    target = write(tmp_path / 'target.mp4', 3, b'b')
+    link_file(source, target)
+
+    with open(target, 'rb') as f:
+        assert f.read() == b'a' * 10
+
+    # Remover o alvo não afeta a origem
+    os.remove(target)
+    assert os.path.exists(source)
+
+
+def test_content_hash_is_stored_next_to_the_file(tmp_path):
+    path = write(tmp_path / 'video.mp4', 10)
+
+    identity, hashed = file_identity(path)
+    assert not hashed and identity.startswith('stat:')
+    assert known_content_hash(path) is None
+
+    sha256 = content_hash(path)
+    assert known_content_hash(path) == sha256
+    assert file_identity(path) == (sha256, True)
+
+    # O hash guardado deixa de valer se o arquivo mudar
+    write(tmp_path / 'video.mp4', 11)
+    assert known_content_hash(path) is None
+
+
+def _put_many(directory, prefix, count):
+    cache = LRUFileCache(directory, 0)
+    for n in range(count):
+        path = os.path.join(directory, f'{prefix}{n}.bin')
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        cache.put(f'{prefix}{n}', path)
+
+
+def test_processes_sharing_the_index_keep_every_entry(tmp_path):
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_put_many, args=(str(tmp_path), prefix, 30)) for prefix in 'ab']
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    cache = LRUFileCache(str(tmp_path), 0)
+    assert cache.total_bytes() == 60
+
+
+def test_index_changed_by_another_instance_is_reloaded(tmp_path):
+    first = LRUFileCache(str(tmp_path), 0)
+    second = LRUFileCache(str(tmp_path), 0)
+    put(first, tmp_path, 'a', 10)
+    put(second, tmp_path, 'b', 10)
+
+    assert first.get('b') == str(tmp_path / 'b.bin')
+    assert first.total_bytes() == 20
+
+
+def test_checkout_survives_eviction(tmp_path):
+    cache = LRUFileCache(str(tmp_path / 'cache'), 150)
+    (tmp_path / 'cache').mkdir()
+    put(cache, tmp_path / 'cache', 'a', 100)
+
+    target = str(tmp_path / 'job_a.ts')
+    assert cache.checkout('a', target)
+    assert not cache.checkout('missing', str(tmp_path / 'job_b.ts'))
+
+    # Outro corte remove 'a' pelo limite: o arquivo entregue ao job continua
+    put(cache, tmp_path / 'cache', 'b', 100)
+    assert cache.get('a') is None
+    assert os.path.getsize(target) == 100
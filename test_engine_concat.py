@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Testes da escolha da referência da concatenação (ffprobe substituído por dados fixos)
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine import concat
+from app.engine.errors import EngineError
+from app.engine.concat import plan_concat
+
+
+def video(codec='h264', width=1920, height=1080, fps='30/1'):
+    return {'codec_type': 'video', 'codec_name': codec, 'profile': 'High', 'width': width, 'height': height,
+            'pix_fmt': 'yuv420p', 'r_frame_rate': fps, 'sample_aspect_ratio': '1:1'}
+
+
+def audio(codec='aac', sample_rate=48000, channels=2):
+    return {'codec_type': 'audio', 'codec_name': codec, 'sample_rate': str(sample_rate), 'channels': channels}
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """
+    Registra as entradas por nome: {caminho: (streams, duração)}
+    """
+    media = {}
+
+    def probe(path):
+        streams, duration = media[path]
+        return {'streams': streams, 'format': {'duration': str(duration)}}
+
+    monkeypatch.setattr(concat, 'probe', probe)
+    return media
+
+
+def actions(entries):
+    return {entry['path']: entry['action'] for entry in entries}
+
+
+def test_equal_inputs_are_all_copied(sources):
+    sources['a.mp4'] = ([video(), audio()], 10)
+    sources['b.mp4'] = ([video(), audio()], 20)
+
+    entries, target = plan_concat(['a.mp4', 'b.mp4'])
+
+    assert actions(entries) == {'a.mp4': 'copy', 'b.mp4': 'copy'}
+    assert target['path'] == 'a.mp4'
+
+
+def test_equal_inputs_with_an_unencodable_codec_are_copied(sources):
+    sources['a.webm'] = ([video('vp9'), audio('opus')], 10)
+    sources['b.webm'] = ([video('vp9'), audio('opus')], 10)
+
+    entries, target = plan_concat(['a.webm', 'b.webm'])
+
+    assert actions(entries) == {'a.webm': 'copy', 'b.webm': 'copy'}
+
+
+def test_longest_total_duration_wins(sources):
+    # Duas entradas curtas em 720p não somam a duração da entrada em 1080p
+    sources['short1.mp4'] = ([video(width=1280, height=720), audio()], 20)
+    sources['long.mp4'] = ([video(), audio()], 60)
+    sources['short2.mp4'] = ([video(width=1280, height=720), audio()], 30)
+
+    entries, target = plan_concat(['short1.mp4', 'long.mp4', 'short2.mp4'])
+
+    assert target['path'] == 'long.mp4'
+    assert actions(entries) == {'short1.mp4': 'transcode', 'long.mp4': 'copy', 'short2.mp4': 'transcode'}
+
+
+def test_majority_is_by_duration_not_by_count(sources):
+    sources['a.mp4'] = ([video(fps='25/1'), audio()], 10)
+    sources['b.mp4'] = ([video(fps='25/1'), audio()], 10)
+    sources['c.mp4'] = ([video(), audio()], 45)
+
+    entries, target = plan_concat(['a.mp4', 'b.mp4', 'c.mp4'])
+
+    assert target['path'] == 'c.mp4'
+
+
+def test_unencodable_reference_falls_through_to_the_next_candidate(sources):
+    # A maior duração é vp9, que não pode ser gerado para as demais entradas
+    sources['a.webm'] = ([video('vp9'), audio('opus')], 100)
+    sources['b.mp4'] = ([video(), audio()], 10)
+    sources['c.mp4'] = ([video(width=1280, height=720), audio()], 5)
+
+    entries, target = plan_concat(['a.webm', 'b.mp4', 'c.mp4'])
+
+    assert target['path'] == 'b.mp4'
+    assert actions(entries) == {'a.webm': 'transcode', 'b.mp4': 'copy', 'c.mp4': 'transcode'}
+
+
+def test_unencodable_audio_also_falls_through(sources):
+    sources['a.mp4'] = ([video(), audio('opus')], 100)
+    sources['b.mp4'] = ([video(), audio('mp3')], 10)
+
+    entries, target = plan_concat(['a.mp4', 'b.mp4'])
+
+    assert target['path'] == 'b.mp4'
+
+
+def test_no_encodable_candidate_is_an_error(sources):
+    sources['a.webm'] = ([video('vp9'), audio('opus')], 10)
+    sources['b.webm'] = ([video('av1'), audio('opus')], 10)
+
+    with pytest.raises(EngineError):
+        plan_concat(['a.webm', 'b.webm'])
+
+
+def test_reference_without_audio_drops_the_audio_of_the_others(sources):
+    sources['silent.mp4'] = ([video()], 60)
+    sources['a.mp4'] = ([video(), audio()], 10)
+    sources['b.mp4'] = ([video(), audio('mp3', 44100, 1)], 10)
+
+    entries, target = plan_concat(['a.mp4', 'silent.mp4', 'b.mp4'])
+
+    assert target['audio'] is None
+    # Mesmo vídeo: o áudio é apenas descartado, sem recodificar
+    assert actions(entries) == {'a.mp4': 'copy', 'silent.mp4': 'copy', 'b.mp4': 'copy'}
+
+
+def test_input_without_audio_is_transcoded_when_the_reference_has_audio(sources):
+    sources['a.mp4'] = ([video(), audio()], 60)
+    sources['silent.mp4'] = ([video()], 10)
+
+    entries, target = plan_concat(['a.mp4', 'silent.mp4'])
+
+    assert actions(entries) == {'a.mp4': 'copy', 'silent.mp4': 'transcode'}
+
+
+def test_missing_sample_aspect_ratio_matches_square_pixels(sources):
+    unknown = video()
+    unknown['sample_aspect_ratio'] = '0:1'
+    sources['a.mp4'] = ([video(), audio()], 10)
+    sources['b.mp4'] = ([unknown, audio()], 10)
+
+    entries, target = plan_concat(['a.mp4', 'b.mp4'])
+
+    assert actions(entries) == {'a.mp4': 'copy', 'b.mp4': 'copy'}
+
+
+def test_input_without_video_is_an_error(sources):
+    sources['a.mp4'] = ([video(), audio()], 10)
+    sources['b.m4a'] = ([audio()], 10)
+
+    with pytest.raises(EngineError):
+        plan_concat(['a.mp4', 'b.m4a'])
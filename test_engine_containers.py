@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Testes da leitura de keyframes dos containers MP4/MKV e do índice persistido
+
+Os arquivos são montados em memória com a estrutura mínima de caixas MP4 e
+elementos EBML usada pelo parser; nenhum teste depende do ffmpeg.
+"""
+
+import os
+import sys
+import struct
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.errors import MediaParseError
+from app.engine.containers import detect_container, iter_boxes, mp4_keyframes, mkv_keyframes, read_keyframes
+from app.engine.keyframe_index import KeyframeIndex, build_index, load_index, save_index, get_or_build_index, index_path_for
+
+
+# ---------------------------------------------------------------------------
+# Montagem de MP4
+# ---------------------------------------------------------------------------
+
+def box(box_type, *children):
+    payload = b''.join(children)
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def full_box(box_type, payload, version=0, flags=0):
+    return box(box_type, struct.pack('>I', (version << 24) | flags) + payload)
+
+
+def table(box_type, rows, fmt):
+    return full_box(box_type, struct.pack('>I', len(rows)) + b''.join(struct.pack(fmt, *row) for row in rows))
+
+
+def mvhd(timescale, duration):
+    return full_box(b'mvhd', struct.pack('>III', 0, 0, timescale) + struct.pack('>I', duration) + bytes(80))
+
+
+def tkhd(track_id):
+    return full_box(b'tkhd', struct.pack('>III', 0, 0, track_id) + bytes(68))
+
+
+def mdhd(timescale, duration):
+    return full_box(b'mdhd', struct.pack('>IIII', 0, 0, timescale, duration) + bytes(4))
+
+
+def hdlr(handler):
+    return full_box(b'hdlr', struct.pack('>I', 0) + handler + bytes(12) + b'\0')
+
+
+def video_trak(stbl_children, timescale=1000, duration=10000, track_id=1, edts=b''):
+    return box(
+        b'trak',
+        tkhd(track_id),
+        edts,
+        box(b'mdia', mdhd(timescale, duration), hdlr(b'vide'), box(b'minf', box(b'stbl', *stbl_children)))
+    )
+
+
+def sample_tables(sample_count=10, delta=1000, sync=(1, 6), sample_size=100, chunk_offset=1000):
+    """Tabelas de uma trilha com todas as amostras em um único chunk"""
+    return [
+        table(b'stts', [(sample_count, delta)], '>II'),
+        table(b'stss', [(number,) for number in sync], '>I'),
+        full_box(b'stsz', struct.pack('>II', sample_size, sample_count)),
+        table(b'stsc', [(1, sample_count, 1)], '>III'),
+        table(b'stco', [(chunk_offset,)], '>I'),
+    ]
+
+
+def mp4_file(*traks, timescale=1000, duration=10000):
+    return box(b'ftyp', b'isom', struct.pack('>I', 0), b'isom') + box(b'moov', mvhd(timescale, duration), *traks)
+
+
+# ---------------------------------------------------------------------------
+# Montagem de Matroska
+# ---------------------------------------------------------------------------
+
+def ebml_id(element_id):
+    length = (element_id.bit_length() + 7) // 8
+    return element_id.to_bytes(length, 'big')
+
+
+def ebml_size(size):
+    # Tamanho em 8 bytes (marcador 0x01): válido para qualquer tamanho usado nos testes
+    return bytes([0x01]) + size.to_bytes(7, 'big')
+
+
+def element(element_id, *children):
+    payload = b''.join(children)
+    return ebml_id(element_id) + ebml_size(len(payload)) + payload
+
+
+def uint_element(element_id, value, size=4):
+    return element(element_id, value.to_bytes(size, 'big'))
+
+
+def simple_block(track, relative, keyframe):
+    return element(0xA3, bytes([0x80 | track]), struct.pack('>hB', relative, 0x80 if keyframe else 0), b'\0' * 4)
+
+
+def mkv_file(clusters, cues=None, timecode_scale=1000000, duration_ms=6000.0):
+    info = element(0x1549A966, uint_element(0x2AD7B1, timecode_scale), element(0x4489, struct.pack('>d', duration_ms)))
+    tracks = element(
+        0x1654AE6B,
+        element(0xAE, uint_element(0xD7, 1, 1), uint_element(0x83, 2, 1)),
+        element(0xAE, uint_element(0xD7, 2, 1), uint_element(0x83, 1, 1)),
+    )
+    body = info + tracks + (cues or b'') + b''.join(clusters)
+    return element(0x1A45DFA3, uint_element(0x4286, 1, 1)) + element(0x18538067, body)
+
+
+def cluster(timecode, *blocks):
+    return element(0x1F43B675, uint_element(0xE7, timecode), *blocks)
+
+
+# ---------------------------------------------------------------------------
+# Testes
+# ---------------------------------------------------------------------------
+
+def test_detect_container():
+    assert detect_container(mp4_file(video_trak(sample_tables()))) == 'mp4'
+    assert detect_container(mkv_file([cluster(0, simple_block(2, 0, True))])) == 'mkv'
+    assert detect_container(b'RIFF\0\0\0\0AVI ') is None
+    assert detect_container(b'') is None
+
+
+def test_iter_boxes_sizes():
+    data = box(b'free', b'abcd') + struct.pack('>I4sQ', 1, b'wide', 20) + b'1234' + struct.pack('>I4s', 0, b'mdat') + b'xy'
+    boxes = list(iter_boxes(data, 0, len(data)))
+
+    assert [b.type for b in boxes] == [b'free', b'wide', b'mdat']
+    assert (boxes[1].data_start, boxes[1].end) == (28, 32)
+    # Tamanho 0: a caixa vai até o fim do intervalo
+    assert boxes[2].end == len(data)
+
+
+def test_iter_boxes_invalid_size():
+    data = struct.pack('>I4s', 4, b'free')
+    with pytest.raises(MediaParseError):
+        list(iter_boxes(data, 0, len(data)))
+
+
+def test_mp4_keyframes_from_sample_tables():
+    data = mp4_file(video_trak(sample_tables()))
+    duration, keyframes = mp4_keyframes(data)
+
+    assert duration == 10.0
+    # Amostras 1 e 6 (base 1) de 100 bytes a partir da posição 1000
+    assert keyframes == [(0.0, 1000), (5.0, 1500)]
+
+
+def test_mp4_keyframes_without_stss_are_all_sync():
+    tables = [t for t in sample_tables(sample_count=3) if t[4:8] != b'stss']
+    _, keyframes = mp4_keyframes(mp4_file(video_trak(tables)))
+
+    assert [time for time, _ in keyframes] == [0.0, 1.0, 2.0]
+
+
+def test_mp4_keyframes_with_composition_and_edit_list():
+    tables = sample_tables(sample_count=4, sync=(1, 3)) + [table(b'ctts', [(4, 2000)], '>II')]
+    # Edição que começa no tempo de mídia 2000 (compensa o atraso de composição)
+    edts = box(b'edts', table(b'elst', [(4000, 2000, 0x00010000)], '>IiI'))
+    _, keyframes = mp4_keyframes(mp4_file(video_trak(tables, edts=edts)))
+
+    assert [time for time, _ in keyframes] == [0.0, 2.0]
+
+
+def test_mp4_keyframes_uses_co64_and_multiple_chunks():
+    tables = [
+        table(b'stts', [(4, 500)], '>II'),
+        table(b'stss', [(1,), (3,)], '>I'),
+        full_box(b'stsz', struct.pack('>II', 0, 4) + struct.pack('>IIII', 10, 20, 30, 40)),
+        table(b'stsc', [(1, 2, 1)], '>III'),
+        table(b'co64', [(5000,), (9000,)], '>Q'),
+    ]
+    _, keyframes = mp4_keyframes(mp4_file(video_trak(tables)))
+
+    assert keyframes == [(0.0, 5000), (1.0, 9000)]
+
+
+def test_mp4_keyframes_fragmented():
+    trex = full_box(b'trex', struct.pack('>IIIII', 1, 1, 1000, 50, 0x00010000))
+    moov = box(b'moov', mvhd(1000, 0), video_trak([]), box(b'mvex', trex))
+    # Primeira amostra de cada fragmento é sync (first_sample_flags = 0), as demais usam o padrão do trex
+    traf = lambda decode_time: box(
+        b'traf',
+        full_box(b'tfhd', struct.pack('>I', 1), flags=0x020000),
+        full_box(b'tfdt', struct.pack('>I', decode_time)),
+        full_box(b'trun', struct.pack('>IiI', 3, 0, 0), flags=0x000005),
+    )
+    data = box(b'ftyp', b'iso6', struct.pack('>I', 0)) + moov
+    data += box(b'moof', traf(0)) + box(b'moof', traf(3000))
+    duration, keyframes = mp4_keyframes(data)
+
+    # Sem duração no mvhd: usa a do mdhd da trilha
+    assert duration == 10.0
+    assert [time for time, _ in keyframes] == [0.0, 3.0]
+
+
+def test_mp4_without_moov():
+    with pytest.raises(MediaParseError):
+        mp4_keyframes(box(b'ftyp', b'isom') + box(b'mdat', b'x'))
+
+
+def test_mp4_without_video_track():
+    trak = box(b'trak', tkhd(1), box(b'mdia', mdhd(1000, 1000), hdlr(b'soun')))
+    with pytest.raises(MediaParseError):
+        mp4_keyframes(mp4_file(trak))
+
+
+def test_mkv_keyframes_from_cluster_blocks():
+    clusters = [
+        cluster(0, simple_block(2, 0, True), simple_block(1, 0, True), simple_block(2, 40, False)),
+        cluster(3000, simple_block(2, 0, True), simple_block(2, 40, False)),
+    ]
+    data = mkv_file(clusters)
+    duration, keyframes = mkv_keyframes(data)
+
+    assert duration == 6.0
+    # Apenas os blocos-chave da trilha de vídeo (2); a posição é a do cluster
+    assert [time for time, _ in keyframes] == [0.0, 3.0]
+    assert keyframes[0][1] < keyframes[1][1]
+    assert data[keyframes[1][1]:keyframes[1][1] + 4] == ebml_id(0x1F43B675)
+
+
+def test_mkv_keyframes_prefer_cues():
+    cue_point = lambda time, position: element(
+        0xBB, uint_element(0xB3, time), element(0xB7, uint_element(0xF7, 2, 1), uint_element(0xF1, position))
+    )
+    cues = element(0x1C53BB6B, cue_point(0, 100), cue_point(2500, 200), cue_point(4000, 300))
+    data = mkv_file([cluster(0, simple_block(2, 0, True))], cues=cues)
+    _, keyframes = mkv_keyframes(data)
+
+    assert [time for time, _ in keyframes] == [0.0, 2.5, 4.0]
+
+
+def test_mkv_without_video_track():
+    info = element(0x1549A966, uint_element(0x2AD7B1, 1000000))
+    data = element(0x1A45DFA3, uint_element(0x4286, 1, 1)) + element(0x18538067, info)
+    with pytest.raises(MediaParseError):
+        mkv_keyframes(data)
+
+
+def test_read_keyframes_rejects_unknown_container(tmp_path):
+    path = tmp_path / 'video.avi'
+    path.write_bytes(b'RIFF\0\0\0\0AVI LIST')
+    with pytest.raises(MediaParseError):
+        read_keyframes(str(path))
+
+
+def test_keyframe_index_lookup():
+    index = KeyframeIndex([(5.0, 500), (0.0, 0), (10.0, 1000)], duration=12.0)
+
+    assert index.keyframes_between(0.0, 5.0) == [0.0, 5.0]
+    assert index.keyframes_between(5.1, 9.9) == []
+    assert index.keyframe_before(7.0) == (5.0, 500)
+    assert index.keyframe_before(5.0) == (5.0, 500)
+    assert index.keyframe_after(5.0) == (5.0, 500)
+    assert index.keyframe_after(10.5) is None
+    assert index.keyframe_before(-1.0) is None
+
+
+def test_index_is_persisted_and_invalidated(tmp_path):
+    path = str(tmp_path / 'video.mp4')
+    with open(path, 'wb') as f:
+        f.write(mp4_file(video_trak(sample_tables())))
+
+    index = get_or_build_index(path)
+    assert index.container == 'mp4'
+    assert os.path.exists(index_path_for(path))
+    assert load_index(path).keyframes == index.keyframes
+
+    # Arquivo alterado: o índice salvo deixa de valer
+    with open(path, 'ab') as f:
+        f.write(box(b'free'))
+    assert load_index(path) is None
+
+
+def test_get_or_build_index_unsupported(tmp_path):
+    path = str(tmp_path / 'video.avi')
+    with open(path, 'wb') as f:
+        f.write(b'RIFF\0\0\0\0AVI LIST')
+
+    assert get_or_build_index(path) is None
+
+
+def test_build_index_without_keyframes(tmp_path):
+    path = str(tmp_path / 'video.mp4')
+    with open(path, 'wb') as f:
+        f.write(mp4_file(video_trak([])))
+
+    with pytest.raises(MediaParseError):
+        build_index(path)
+
+
+def test_save_index_roundtrip(tmp_path):
+    path = str(tmp_path / 'video.mkv')
+    with open(path, 'wb') as f:
+        f.write(b'data')
+    stat = os.stat(path)
+    save_index(path, KeyframeIndex([(0.0, 0), (2.0, 64)], duration=4.0, container='mkv',
+                                   source_size=stat.st_size, source_mtime=stat.st_mtime))
+
+    loaded = load_index(path)
+    assert loaded.keyframes == [(0.0, 0), (2.0, 64)]
+    assert loaded.duration == 4.0
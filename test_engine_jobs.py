@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Testes da conversão de tempos e da estimativa de espaço usadas pelos jobs do motor
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.errors import EngineError
+from app.engine import jobs
+from app.engine.jobs import parse_time, format_time, estimate_work_bytes
+
+
+def test_parse_time():
+    assert parse_time('00:00:00') == 0.0
+    assert parse_time('01:02:03') == 3723.0
+    assert parse_time('00:01:02.500') == 62.5
+    # Campos fora do intervalo usual são somados normalmente
+    assert parse_time('0:90:00') == 5400.0
+
+
+@pytest.mark.parametrize('value', ['', '10', '00:10', 'aa:bb:cc', '00:00:00:00', None, '-00:00:01', '00:-1:00'])
+def test_parse_time_rejects_invalid_values(value):
+    with pytest.raises(EngineError):
+        parse_time(value)
+
+
+def test_format_time():
+    assert format_time(0) == '00:00:00.000'
+    assert format_time(3723.5) == '01:02:03.500'
+    assert format_time(59.9996) == '00:01:00.000'
+    # Tempos negativos são limitados a zero
+    assert format_time(-3) == '00:00:00.000'
+
+
+@pytest.mark.parametrize('seconds', [0.0, 0.001, 61.25, 3599.999, 86400.0])
+def test_format_time_is_inverse_of_parse_time(seconds):
+    assert parse_time(format_time(seconds)) == pytest.approx(seconds)
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    path = tmp_path / 'source.mp4'
+    path.write_bytes(b'\0' * 100000)
+    monkeypatch.setattr(jobs, 'source_duration', lambda input_path: 100.0)
+    return str(path)
+
+
+def test_estimate_counts_only_the_cut_ranges(source):
+    job = {'type': 'cut', 'input': source, 'ranges': [[0, 10, 'a.mp4'], [50, 60, 'b.mp4']]}
+    # 20% da origem, mais a margem
+    assert estimate_work_bytes(job) == int(100000 * 0.2 * (1 + jobs.WORK_BYTES_MARGIN))
+
+
+def test_estimate_of_auto_cut_uses_its_length(source):
+    job = {'type': 'cut', 'input': source, 'ranges': [[None, None, 'a.mp4']], 'auto_length': 5}
+    assert estimate_work_bytes(job) == int(100000 * 0.05 * (1 + jobs.WORK_BYTES_MARGIN))
+
+
+def test_estimate_is_limited_to_the_source_size(source):
+    job = {'type': 'cut', 'input': source, 'ranges': [[0, 90, 'a.mp4']]}
+    assert estimate_work_bytes(job) == 100000
+
+
+def test_estimate_without_duration_uses_the_source_size(source, monkeypatch):
+    monkeypatch.setattr(jobs, 'source_duration', lambda input_path: None)
+    job = {'type': 'cut', 'input': source, 'ranges': [[0, 10, 'a.mp4']]}
+    assert estimate_work_bytes(job) == 100000
+    # Jobs que não são cortes leem a origem inteira
+    assert estimate_work_bytes({'type': 'scenes', 'input': source}) == 100000
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Testes do agrupamento e do progresso dos cortes de vários intervalos (sem ffmpeg)
+"""
+
+import os
+import sys
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.multi_cut import plan_range_groups, range_progress
+
+
+def test_close_ranges_share_one_read():
+    ranges = [(10.0, 20.0, 'a'), (25.0, 40.0, 'b'), (45.0, 50.0, 'c')]
+
+    assert plan_range_groups(ranges, max_gap=30) == [[0, 1, 2]]
+
+
+def test_distant_ranges_are_read_separately():
+    ranges = [(0.0, 10.0, 'a'), (3600.0, 3610.0, 'b'), (20.0, 30.0, 'c')]
+
+    assert plan_range_groups(ranges, max_gap=30) == [[0, 2], [1]]
+
+
+def test_gap_measured_from_the_end_of_the_group():
+    # O primeiro intervalo cobre o segundo: a distância conta a partir de 100 s
+    ranges = [(0.0, 100.0, 'a'), (10.0, 20.0, 'b'), (120.0, 130.0, 'c')]
+
+    assert plan_range_groups(ranges, max_gap=30) == [[0, 1, 2]]
+    assert plan_range_groups(ranges, max_gap=10) == [[0, 1], [2]]
+
+
+def test_zero_gap_joins_only_touching_ranges():
+    ranges = [(0.0, 10.0, 'a'), (10.0, 20.0, 'b'), (20.5, 30.0, 'c')]
+
+    assert plan_range_groups(ranges, max_gap=0) == [[0, 1], [2]]
+
+
+def test_empty_ranges():
+    assert plan_range_groups([], max_gap=30) == []
+
+
+def test_range_progress_clamped():
+    ranges = [(0.0, 10.0, 'a'), (10.0, 20.0, 'b'), (30.0, 40.0, 'c')]
+
+    assert range_progress(15.0, ranges) == [100.0, 50.0, 0.0]
+
+
+def test_copy_ranges_seek_to_distant_groups(monkeypatch):
+    from app.engine import multi_cut
+
+    class Index:
+        def keyframe_before(self, time):
+            return (time // 2 * 2, 0)
+
+    calls = []
+    monkeypatch.setattr(multi_cut, 'get_or_build_index', lambda path: Index())
+    monkeypatch.setattr(multi_cut, 'run_ffmpeg_progress', lambda args, on_progress: calls.append(args))
+
+    multi_cut._copy_ranges('in.mp4', [(11.0, 20.0, 'a'), (3601.0, 3610.0, 'b'), (25.0, 30.0, 'c')], max_gap=30)
+
+    # Uma leitura por grupo, cada uma começando no keyframe do seu primeiro intervalo
+    assert [call[:4] for call in calls] == [
+        ['-ss', '10.000000', '-t', '20.000000'],
+        ['-ss', '3600.000000', '-t', '10.000000'],
+    ]
+    assert [call[-1] for call in calls] == ['c', 'b']
+
+
+def test_copy_ranges_without_index_align_with_ffprobe(monkeypatch):
+    from app.engine import multi_cut
+
+    calls = []
+    monkeypatch.setattr(multi_cut, 'get_or_build_index', lambda path: None)
+    # A leitura a partir de 13 s começa no keyframe anterior (12 s)
+    monkeypatch.setattr(multi_cut, 'list_keyframes', lambda path, start, end: [12.0] if start > 0 else [0.0, 6.0, 12.0])
+    monkeypatch.setattr(multi_cut, 'run_ffmpeg_progress', lambda args, on_progress: calls.append(args))
+
+    multi_cut._copy_ranges('in.mp4', [(13.0, 20.0, 'a')])
+
+    assert calls[0][:2] == ['-ss', '12.000000']
+
+
+def test_keyframe_before_rescans_from_the_start(monkeypatch):
+    from app.engine import multi_cut
+
+    windows = []
+
+    def list_keyframes(path, start, end):
+        windows.append(start)
+        return [] if start > 0 else [0.0, 4.0]
+
+    monkeypatch.setattr(multi_cut, 'list_keyframes', list_keyframes)
+
+    assert multi_cut._keyframe_before('in.mkv', None, 7.0) == 4.0
+    assert windows == [7.0, 0.0]
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Testes da divisão em blocos do modo parallel (sem ffmpeg)
+"""
+
+import os
+import sys
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.parallel_encode import plan_chunks
+
+# Keyframes a cada 2 segundos
+KEYFRAMES = [float(k) for k in range(0, 62, 2)]
+
+
+def test_chunks_split_on_nearest_keyframes():
+    assert plan_chunks(0.0, 40.0, KEYFRAMES, workers=4, min_chunk=10) == [
+        (0.0, 10.0), (10.0, 20.0), (20.0, 30.0), (30.0, 40.0)
+    ]
+
+
+def test_chunks_start_on_keyframe_inside_the_file():
+    assert plan_chunks(10.0, 50.0, KEYFRAMES, workers=4, min_chunk=10) == [
+        (10.0, 20.0), (20.0, 30.0), (30.0, 40.0), (40.0, 50.0)
+    ]
+
+
+def test_chunks_cover_the_interval_exactly():
+    chunks = plan_chunks(1.3, 37.7, KEYFRAMES, workers=3, min_chunk=5)
+
+    assert chunks[0][0] == 1.3
+    assert chunks[-1][1] == 37.7
+    assert all(end == next_start for (_, end), (next_start, _) in zip(chunks[:-1], chunks[1:]))
+    assert all(start in KEYFRAMES for start, _ in chunks[1:])
+
+
+def test_chunk_count_limited_by_min_chunk():
+    assert plan_chunks(0.0, 15.0, KEYFRAMES, workers=8, min_chunk=10) == [(0.0, 15.0)]
+    assert len(plan_chunks(0.0, 30.0, KEYFRAMES, workers=8, min_chunk=10)) == 3
+
+
+def test_chunk_count_limited_by_workers():
+    assert len(plan_chunks(0.0, 60.0, KEYFRAMES, workers=2, min_chunk=1)) == 2
+
+
+def test_sparse_keyframes_merge_boundaries():
+    assert plan_chunks(0.0, 40.0, [0.0, 25.0], workers=4, min_chunk=10) == [(0.0, 25.0), (25.0, 40.0)]
+
+
+def test_keyframes_only_at_the_edges():
+    assert plan_chunks(0.0, 40.0, [0.0, 40.0, 44.0], workers=4, min_chunk=10) == [(0.0, 40.0)]
+
+
+def test_end_past_last_keyframe():
+    # Todas as divisões depois do último keyframe caem nele
+    assert plan_chunks(50.0, 90.0, KEYFRAMES, workers=4, min_chunk=10) == [(50.0, 60.0), (60.0, 90.0)]
+
+
+def test_empty_keyframe_list():
+    assert plan_chunks(0.0, 40.0, [], workers=4, min_chunk=10) == [(0.0, 40.0)]
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Testes dos histogramas por bloco e da detecção de cenas
+
+Os quadros lidos do ffmpeg são substituídos por blocos gerados em memória.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine import scenes
+from app.engine.errors import EngineError
+from app.engine.scenes import HISTOGRAM_BINS, _histograms, detect_scenes
+
+FPS = 4
+WIDTH = 4
+HEIGHT = 2
+
+
+def test_histograms_match_numpy_per_frame():
+    rng = np.random.default_rng(7)
+    frames = rng.integers(0, 256, size=(9, 300), dtype=np.uint8)
+    # Extremos de cada faixa
+    frames[0, :4] = [0, 7, 8, 255]
+
+    expected = np.array([
+        np.histogram(frame, bins=HISTOGRAM_BINS, range=(0, 256))[0] / frame.size
+        for frame in frames
+    ])
+
+    np.testing.assert_allclose(_histograms(frames), expected)
+    np.testing.assert_allclose(_histograms(frames).sum(axis=1), 1.0)
+
+
+def test_histograms_of_a_single_frame():
+    frames = np.full((1, 10), 200, dtype=np.uint8)
+    histograms = _histograms(frames)
+
+    assert histograms.shape == (1, HISTOGRAM_BINS)
+    assert histograms[0, 200 // (256 // HISTOGRAM_BINS)] == 1.0
+
+
+def video(*parts):
+    """Concatena trechos (quadros, luminância) em quadros brutos em tons de cinza"""
+    return np.concatenate([
+        np.full((count, WIDTH * HEIGHT), value, dtype=np.uint8)
+        for count, value in parts
+    ])
+
+
+def fake_frames(monkeypatch, frames, chunk=None):
+    """Substitui a saída do ffmpeg por blocos do tamanho pedido (ou do tamanho informado)"""
+    data = frames.tobytes()
+
+    def iter_output(args, chunk_size):
+        size = chunk or chunk_size
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+
+    monkeypatch.setattr(scenes, 'iter_ffmpeg_output', iter_output)
+    monkeypatch.setattr(scenes, 'probe', lambda path: {'streams': [{'codec_type': 'video'}]})
+    monkeypatch.setattr(scenes, 'get_duration', lambda path: len(frames) / FPS)
+
+
+def detect(block_frames=4, min_scene=1.0):
+    return detect_scenes('video.mp4', fps=FPS, width=WIDTH, height=HEIGHT, min_scene=min_scene, block_frames=block_frames)
+
+
+def test_cut_exactly_on_a_block_boundary(monkeypatch):
+    # O quadro 4 é o primeiro do segundo bloco: só é comparado com o último quadro do bloco anterior
+    fake_frames(monkeypatch, video((4, 0), (8, 255)))
+
+    result = detect(block_frames=4)
+
+    assert result['cuts_ms'] == [1000]
+    assert result['frames'] == 12
+    assert result['scenes'] == [
+        {'start_ms': 0, 'end_ms': 1000, 'score': None},
+        {'start_ms': 1000, 'end_ms': 3000, 'score': 1.0},
+    ]
+
+
+def test_cuts_inside_and_across_blocks(monkeypatch):
+    fake_frames(monkeypatch, video((6, 0), (6, 255), (8, 100)))
+
+    assert detect(block_frames=4)['cuts_ms'] == [1500, 3000]
+
+
+def test_chunks_that_split_frames(monkeypatch):
+    # Blocos de 5 bytes: os quadros (8 bytes) ficam divididos entre leituras
+    frames = video((4, 0), (8, 255))
+    fake_frames(monkeypatch, frames, chunk=5)
+
+    result = detect()
+
+    assert result['cuts_ms'] == [1000]
+    assert result['frames'] == 12
+
+
+def test_block_size_does_not_change_the_cuts(monkeypatch):
+    frames = video((5, 10), (7, 200), (4, 90), (9, 250))
+    fake_frames(monkeypatch, frames)
+
+    cuts = [detect(block_frames=block)['cuts_ms'] for block in (1, 2, 3, 4, 7, 100)]
+
+    assert cuts == [cuts[0]] * len(cuts)
+    assert cuts[0] == [1250, 3000, 4000]
+
+
+def test_short_scenes_are_merged(monkeypatch):
+    # A segunda mudança ocorre 0.5s depois da primeira
+    fake_frames(monkeypatch, video((4, 0), (2, 255), (6, 0)))
+
+    assert detect(min_scene=1.0)['cuts_ms'] == [1000]
+    assert detect(min_scene=0.25)['cuts_ms'] == [1000, 1500]
+
+
+def test_no_frames_is_an_error(monkeypatch):
+    fake_frames(monkeypatch, video((0, 0)))
+
+    with pytest.raises(EngineError):
+        detect()
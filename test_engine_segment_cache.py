@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Testes da grade de segmentos alinhados aos keyframes do cache de segmentos (sem ffmpeg)
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.errors import EngineError
+from app.engine.segment_cache import plan_segments
+
+# Keyframes a cada 2 segundos
+KEYFRAMES = [float(k) for k in range(0, 62, 2)]
+
+
+def test_interval_on_the_grid():
+    assert plan_segments(10.0, 30.0, KEYFRAMES, 10) == [(10.0, 20.0, 1), (20.0, 30.0, 2)]
+
+
+def test_partial_edges_have_no_index():
+    assert plan_segments(5.0, 35.0, KEYFRAMES, 10) == [
+        (5.0, 10.0, None), (10.0, 20.0, 1), (20.0, 30.0, 2), (30.0, 35.0, None)
+    ]
+
+
+def test_overlapping_cuts_share_segments():
+    first = {part for part in plan_segments(3.0, 33.0, KEYFRAMES, 10) if part[2] is not None}
+    second = {part for part in plan_segments(12.0, 48.0, KEYFRAMES, 10) if part[2] is not None}
+
+    assert first & second == {(20.0, 30.0, 2)}
+
+
+def test_grid_points_move_to_the_next_keyframe():
+    keyframes = [0.0, 4.0, 11.0, 23.0, 31.0]
+
+    assert plan_segments(0.0, 31.0, keyframes, 10) == [(0.0, 11.0, 0), (11.0, 23.0, 1), (23.0, 31.0, 2)]
+
+
+def test_end_past_last_keyframe():
+    # Sem keyframe depois de 60 s, o último segmento inteiro termina em 60 s
+    assert plan_segments(45.0, 75.0, KEYFRAMES, 10) == [
+        (45.0, 50.0, None), (50.0, 60.0, 5), (60.0, 75.0, None)
+    ]
+
+
+def test_interval_shorter_than_a_segment():
+    assert plan_segments(12.0, 18.0, KEYFRAMES, 10) == [(12.0, 18.0, None)]
+
+
+def test_empty_keyframe_list():
+    assert plan_segments(0.0, 30.0, [], 10) == [(0.0, 30.0, None)]
+
+
+def test_rejects_invalid_segment_duration():
+    with pytest.raises(EngineError):
+        plan_segments(0.0, 30.0, KEYFRAMES, 0)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Testes da detecção de silêncios e do planejamento dos trechos mantidos (silence_trim)
+
+O PCM lido do ffmpeg é substituído por blocos gerados em memória.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine import silence
+from app.engine.silence import detect_silences, plan_kept_segments
+
+SAMPLE_RATE = 100
+
+
+def signal(*parts):
+    """Concatena trechos (segundos, amplitude) em amostras float32"""
+    return np.concatenate([
+        np.full(int(round(seconds * SAMPLE_RATE)), amplitude, dtype=np.float32)
+        for seconds, amplitude in parts
+    ])
+
+
+def fake_pcm(monkeypatch, samples, block=37):
+    """Substitui a leitura do áudio por blocos de tamanho irregular (não múltiplos da janela)"""
+    def iter_blocks(input_path, sample_rate, block_samples):
+        for start in range(0, len(samples), block):
+            yield samples[start:start + block]
+
+    monkeypatch.setattr(silence, 'iter_pcm_blocks', iter_blocks)
+    monkeypatch.setattr(silence, 'get_duration', lambda path: len(samples) / SAMPLE_RATE)
+
+
+def detect(min_silence=1.0):
+    return detect_silences('video.mp4', threshold_db=-35.0, min_silence=min_silence, sample_rate=SAMPLE_RATE, hop_ms=100)
+
+
+def test_detects_silences_between_sounds(monkeypatch):
+    fake_pcm(monkeypatch, signal((1, 0.5), (2, 0.0), (1, 0.5), (0.5, 0.0), (1, 0.5)))
+    silences, duration = detect()
+
+    # O silêncio de 0.5 s é mais curto que min_silence
+    assert silences == [(pytest.approx(1.0), pytest.approx(3.0))]
+    assert duration == pytest.approx(5.5)
+
+
+def test_silences_at_the_start_and_at_the_end(monkeypatch):
+    fake_pcm(monkeypatch, signal((1.5, 0.0), (1, 0.5), (1.5, 0.001)))
+    silences, duration = detect()
+
+    assert silences == [(0.0, pytest.approx(1.5)), (pytest.approx(2.5), pytest.approx(4.0))]
+    assert duration == pytest.approx(4.0)
+
+
+def test_no_silence(monkeypatch):
+    fake_pcm(monkeypatch, signal((3, 0.5)))
+
+    assert detect() == ([], pytest.approx(3.0))
+
+
+def test_only_silence(monkeypatch):
+    fake_pcm(monkeypatch, signal((3, 0.0)))
+
+    assert detect() == ([(0.0, pytest.approx(3.0))], pytest.approx(3.0))
+
+
+def test_kept_segments_between_silences():
+    kept = plan_kept_segments([(2.0, 4.0), (6.0, 8.0)], 10.0, padding=0.1)
+
+    assert kept == [(0.0, pytest.approx(2.1)), (pytest.approx(3.9), pytest.approx(6.1)), (pytest.approx(7.9), 10.0)]
+
+
+def test_padding_is_not_applied_at_zero_and_at_the_duration():
+    kept = plan_kept_segments([(0.0, 2.0), (8.0, 10.0)], 10.0, padding=0.1)
+
+    assert kept == [(pytest.approx(1.9), pytest.approx(8.1))]
+
+
+def test_zero_padding():
+    assert plan_kept_segments([(0.0, 2.0), (4.0, 6.0)], 6.0, padding=0.0) == [(2.0, 4.0)]
+
+
+def test_silence_shorter_than_the_padding_is_kept():
+    assert plan_kept_segments([(3.0, 3.1)], 10.0, padding=0.1) == [(0.0, 10.0)]
+
+
+def test_short_kept_segments_are_dropped():
+    # Entre os dois silêncios sobram 0.05 s, abaixo de MIN_KEPT_SECONDS
+    assert plan_kept_segments([(0.0, 2.0), (2.05, 5.0)], 5.0, padding=0.0) == []
+
+
+def test_no_silences_keeps_everything():
+    assert plan_kept_segments([], 7.5) == [(0.0, 7.5)]
+
+
+def test_everything_silent():
+    assert plan_kept_segments([(0.0, 7.5)], 7.5) == []
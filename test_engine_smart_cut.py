@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Testes do planejamento dos trechos do smart cut (sem ffmpeg)
+"""
+
+import os
+import sys
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.smart_cut import plan_smart_cut
+
+KEYFRAMES = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+
+def test_partial_gops_on_both_edges():
+    assert plan_smart_cut(1.0, 9.0, KEYFRAMES) == [
+        ('encode', 1.0, 2.0),
+        ('copy', 2.0, 8.0),
+        ('encode', 8.0, 9.0),
+    ]
+
+
+def test_start_on_keyframe_has_no_leading_encode():
+    assert plan_smart_cut(2.0, 7.0, KEYFRAMES) == [('copy', 2.0, 6.0), ('encode', 6.0, 7.0)]
+
+
+def test_start_and_end_on_keyframes_is_a_single_copy():
+    assert plan_smart_cut(2.0, 6.0, KEYFRAMES) == [('copy', 2.0, 6.0)]
+
+
+def test_keyframe_within_tolerance_counts_as_boundary():
+    assert plan_smart_cut(2.0004, 6.0, KEYFRAMES) == [('copy', 2.0, 6.0)]
+
+
+def test_end_past_last_keyframe():
+    assert plan_smart_cut(3.0, 12.0, KEYFRAMES[:3]) == [('encode', 3.0, 4.0), ('encode', 4.0, 12.0)]
+
+
+def test_single_keyframe_inside_has_no_copy():
+    assert plan_smart_cut(5.0, 7.0, KEYFRAMES) == [('encode', 5.0, 6.0), ('encode', 6.0, 7.0)]
+
+
+def test_no_keyframe_inside_encodes_everything():
+    assert plan_smart_cut(4.5, 5.5, KEYFRAMES) == [('encode', 4.5, 5.5)]
+
+
+def test_empty_keyframe_list():
+    assert plan_smart_cut(1.0, 3.0, []) == [('encode', 1.0, 3.0)]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Testes da escolha das miniaturas e da divisão em sprite sheets (sem ffmpeg)
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine import thumbnails
+from app.engine.errors import EngineError
+from app.engine.thumbnails import plan_thumbnail_times, generate_thumbnails, MAX_SHEET_HEIGHT
+
+
+def test_regular_keyframes_follow_the_interval():
+    keyframes = [i * 2.0 for i in range(11)]
+    assert plan_thumbnail_times(keyframes, 4) == [0.0, 4.0, 8.0, 12.0, 16.0, 20.0]
+
+
+def test_irregular_keyframes_are_counted_from_the_last_chosen():
+    # O próximo keyframe é escolhido pela distância até o último escolhido, não até a grade fixa
+    # (10.4 está a mais de 10s do início, mas a apenas 4.9s de 5.5)
+    keyframes = [0.0, 3.0, 5.5, 6.0, 9.9, 10.4, 17.0, 18.0]
+    assert plan_thumbnail_times(keyframes, 5) == [0.0, 5.5, 17.0]
+
+
+def test_keyframe_just_below_the_interval_is_accepted():
+    # Tolerância de 1 ms para timestamps arredondados (mesma do filtro select)
+    assert plan_thumbnail_times([0.0, 4.9995, 9.9975], 5) == [0.0, 4.9995]
+
+
+def test_sparse_keyframes_are_all_used():
+    # Keyframes mais distantes que o intervalo: um por keyframe
+    assert plan_thumbnail_times([0.0, 12.0, 30.0], 5) == [0.0, 12.0, 30.0]
+    assert plan_thumbnail_times([], 5) == []
+
+
+def test_first_keyframe_is_always_chosen():
+    assert plan_thumbnail_times([1.25, 2.0, 6.25], 5) == [1.25, 6.25]
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """
+    Vídeo 1920x1080 com keyframes configuráveis; o ffmpeg não é executado
+    """
+    path = tmp_path / 'source.mp4'
+    path.write_bytes(b'')
+    media = SimpleNamespace(keyframes=[], duration=None, filters=None)
+
+    def run_ffmpeg_progress(args, on_progress=None):
+        media.filters = args[args.index('-vf') + 1]
+
+    monkeypatch.setattr(thumbnails, 'probe', lambda input_path: {'streams': [{'codec_type': 'video', 'width': 1920, 'height': 1080}]})
+    monkeypatch.setattr(thumbnails, 'get_or_build_index', lambda input_path: SimpleNamespace(times=media.keyframes, duration=media.duration))
+    monkeypatch.setattr(thumbnails, 'run_ffmpeg_progress', run_ffmpeg_progress)
+    media.path = str(path)
+    media.output_dir = str(tmp_path / 'thumbs')
+    return media
+
+
+def test_thumbnails_fit_in_one_sheet(source):
+    source.keyframes = [float(i) for i in range(25)]
+    source.duration = 25.0
+
+    manifest = generate_thumbnails(source.path, source.output_dir, 1, width=160, columns=10)
+
+    # 160x90, 25 miniaturas em 3 linhas de 10
+    assert (manifest['height'], manifest['columns'], manifest['rows']) == (90, 10, 3)
+    assert manifest['sheets'] == ['sprite_001.jpg']
+    assert 'tile=10x3' in source.filters
+    last = manifest['thumbnails'][-1]
+    assert (last['x'], last['y'], last['end']) == (4 * 160, 2 * 90, 25.0)
+
+
+def test_thumbnails_are_split_at_the_max_sheet_height(source):
+    rows_per_sheet = MAX_SHEET_HEIGHT // 90
+    count = rows_per_sheet * 10 + 5
+    source.keyframes = [float(i) for i in range(count)]
+    source.duration = float(count)
+
+    manifest = generate_thumbnails(source.path, source.output_dir, 1, width=160, columns=10)
+
+    assert manifest['rows'] == rows_per_sheet
+    assert rows_per_sheet * manifest['height'] <= MAX_SHEET_HEIGHT
+    assert manifest['sheets'] == ['sprite_001.jpg', 'sprite_002.jpg']
+    assert f'tile=10x{rows_per_sheet}' in source.filters
+
+    # A primeira miniatura após a divisão volta ao canto da segunda sheet
+    first_of_second = manifest['thumbnails'][rows_per_sheet * 10]
+    assert (first_of_second['sheet'], first_of_second['x'], first_of_second['y']) == ('sprite_002.jpg', 0, 0)
+    last_of_first = manifest['thumbnails'][rows_per_sheet * 10 - 1]
+    assert (last_of_first['sheet'], last_of_first['y']) == ('sprite_001.jpg', (rows_per_sheet - 1) * 90)
+
+
+def test_fewer_thumbnails_than_columns_shrink_the_grid(source):
+    source.keyframes = [0.0, 2.0, 4.0]
+    source.duration = 5.0
+
+    manifest = generate_thumbnails(source.path, source.output_dir, 2, width=160, columns=10)
+
+    assert (manifest['columns'], manifest['rows']) == (3, 1)
+    assert [thumbnail['end'] for thumbnail in manifest['thumbnails']] == [2.0, 4.0, 5.0]
+
+
+def test_invalid_interval_is_an_error(source):
+    with pytest.raises(EngineError):
+        generate_thumbnails(source.path, source.output_dir, 0)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Testes da validação das transformações e do grafo de filtros gerado (sem ffmpeg)
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adicionar diretório raiz ao path para importações
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.engine.errors import EngineError
+from app.engine.transforms import normalize_transform, build_transform_graph
+
+
+def normalize(*transforms):
+    return [normalize_transform(transform, index) for index, transform in enumerate(transforms)]
+
+
+def test_normalize_fills_defaults():
+    assert normalize_transform({'type': 'watermark', 'image': 'logo.png'}) == {
+        'type': 'watermark', 'image': 'logo.png', 'position': 'bottom-right', 'margin': 10, 'opacity': 1.0, 'width': None
+    }
+    assert normalize_transform({'type': 'loudnorm', 'integrated': -23}) == {
+        'type': 'loudnorm', 'integrated': -23.0, 'true_peak': -1.5, 'lra': 11.0
+    }
+    assert normalize_transform({'type': 'fps', 'fps': 30}) == {'type': 'fps', 'fps': 30.0}
+
+
+@pytest.mark.parametrize('transform', [
+    {'type': 'scale'},
+    {'type': 'scale', 'width': 641},
+    {'type': 'scale', 'height': -2},
+    {'type': 'fps', 'fps': 0},
+    {'type': 'watermark'},
+    {'type': 'watermark', 'image': 'logo.png', 'position': 'middle'},
+    {'type': 'watermark', 'image': 'logo.png', 'opacity': 0},
+    {'type': 'loudnorm', 'integrated': 0},
+    {'type': 'rotate'},
+])
+def test_normalize_rejects_invalid_transforms(transform):
+    with pytest.raises(EngineError):
+        normalize_transform(transform)
+
+
+def test_error_names_the_transform_position():
+    with pytest.raises(EngineError, match='Transformação 3'):
+        normalize({'type': 'fps', 'fps': 30}, {'type': 'scale', 'width': 640}, {'type': 'fps', 'fps': -1})
+
+
+def test_mixed_transforms_are_chained_in_order():
+    transforms = normalize(
+        {'type': 'fps', 'fps': 24},
+        {'type': 'loudnorm'},
+        {'type': 'scale', 'height': 720},
+        {'type': 'watermark', 'image': 'logo.png', 'position': 'top-left', 'margin': 8, 'opacity': 0.5, 'width': 120},
+    )
+
+    graph, images, video, audio = build_transform_graph(transforms, has_audio=True)
+
+    assert graph.split(';') == [
+        '[0:v:0]fps=24[v0]',
+        '[0:a:0]loudnorm=I=-16:TP=-1.5:LRA=11,aresample=48000[a1]',
+        '[v0]scale=-2:720[v2]',
+        '[1:v]format=rgba,scale=120:-1,colorchannelmixer=aa=0.5[wm3]',
+        '[v2][wm3]overlay=8:8:format=auto[v3]',
+    ]
+    assert images == ['logo.png']
+    assert (video, audio) == ('[v3]', '[a1]')
+
+
+def test_each_watermark_is_a_separate_input():
+    transforms = normalize(
+        {'type': 'watermark', 'image': 'logo.png'},
+        {'type': 'scale', 'width': 1280, 'height': 720},
+        {'type': 'watermark', 'image': 'badge.png', 'position': 'center'},
+    )
+
+    graph, images, video, audio = build_transform_graph(transforms, has_audio=True)
+
+    assert images == ['logo.png', 'badge.png']
+    assert graph.split(';') == [
+        '[1:v]format=rgba[wm0]',
+        '[0:v:0][wm0]overlay=W-w-10:H-h-10:format=auto[v0]',
+        '[v0]scale=1280:720:force_original_aspect_ratio=increase,crop=1280:720,setsar=1[v1]',
+        '[2:v]format=rgba[wm2]',
+        '[v1][wm2]overlay=(W-w)/2:(H-h)/2:format=auto[v2]',
+    ]
+    # Sem normalização de áudio, a stream original é copiada
+    assert (video, audio) == ('[v2]', None)
+
+
+def test_audio_only_transforms_pass_the_video_through():
+    transforms = normalize({'type': 'loudnorm'}, {'type': 'loudnorm', 'integrated': -23})
+
+    graph, images, video, audio = build_transform_graph(transforms, has_audio=True)
+
+    assert graph.split(';') == [
+        '[0:a:0]loudnorm=I=-16:TP=-1.5:LRA=11,aresample=48000[a0]',
+        '[a0]loudnorm=I=-23:TP=-1.5:LRA=11,aresample=48000[a1]',
+        '[0:v:0]null[v]',
+    ]
+    assert images == []
+    assert (video, audio) == ('[v]', '[a1]')
+
+
+def test_loudnorm_requires_an_audio_stream():
+    with pytest.raises(EngineError):
+        build_transform_graph(normalize({'type': 'scale', 'width': 640}, {'type': 'loudnorm'}), has_audio=False)